@@ -10,6 +10,7 @@ import pytz
 import os
 from pathlib import Path
 from backend.config import settings
+from backend.utils.candle_frame import CandleFrame
 
 
 class BaseBot(ABC):
@@ -266,14 +267,53 @@ class BaseBot(ABC):
         
         return timestamps
     
-    def _candles_to_dataframe(self, candles: List[Dict]) -> pd.DataFrame:
-        """Convert candle list to pandas DataFrame"""
+    def _candles_to_dataframe(self, candles) -> pd.DataFrame:
+        """Convert candles (CandleFrame or list of dicts) to pandas DataFrame"""
+        if isinstance(candles, CandleFrame):
+            return candles.to_dataframe()
         df = pd.DataFrame(candles)
         if not df.empty and 'start_ts' in df.columns:
             if isinstance(df['start_ts'].iloc[0], str):
                 df['start_ts'] = pd.to_datetime(df['start_ts'])
         return df
     
+    def _model_forward(self, batch: np.ndarray) -> np.ndarray:
+        """
+        Single inference pass of self.model on a NumPy batch.
+        
+        Calls the Keras model directly instead of model.predict(), which sets up
+        a tf.data pipeline and callbacks on every call and dominates the cost of
+        step-by-step forecasting loops.
+        
+        Args:
+            batch: Input array of shape (batch, sequence_length, n_features)
+        
+        Returns:
+            Model output as a NumPy array
+        """
+        outputs = self.model(batch, training=False)
+        return outputs.numpy() if hasattr(outputs, 'numpy') else np.asarray(outputs)
+    
+    def _create_rollout_buffer(self, sequence: np.ndarray, steps: int) -> np.ndarray:
+        """
+        Preallocate the input buffer for an autoregressive forecast.
+        
+        The window for step i is buffer[:, i:i + sequence_length, :] and the
+        features generated at step i are written to row sequence_length + i, so
+        the loop slides a view instead of concatenating a new array each step.
+        
+        Args:
+            sequence: Scaled input of shape (1, sequence_length, n_features)
+            steps: Number of future steps that will be generated
+        
+        Returns:
+            Array of shape (1, sequence_length + steps, n_features)
+        """
+        length = sequence.shape[1]
+        buffer = np.empty((1, length + steps, sequence.shape[2]), dtype=np.float32)
+        buffer[:, :length, :] = sequence
+        return buffer
+    
     def _calculate_trend_direction(self, predicted_series: List[Dict]) -> int:
         """
         Calculate trend direction from predicted series.
@@ -25,6 +25,7 @@ except ImportError:
     logger.warning("scikit-learn not available. Ensemble bot will use fallback.")
 
 from backend.bots.base_bot import BaseBot
+from backend.utils.model_cache import model_cache
 from backend.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -51,12 +52,19 @@ class EnsembleBot(BaseBot):
         try:
             model_path = self.get_model_path(self.model_path)
             if os.path.exists(model_path):
-                with open(model_path, 'rb') as f:
-                    saved = pickle.load(f)
-                    self.models = saved['models']
-                    self.scaler = saved['scaler']
-                    self.feature_names = saved['feature_names']
-                logger.info(f"{self.name} loaded existing models")
+                def load():
+                    with open(model_path, 'rb') as f:
+                        saved = pickle.load(f)
+                    logger.info(f"{self.name} loaded existing models")
+                    return saved
+                
+                saved = model_cache.get_or_load(
+                    self.name, self._current_symbol, self._current_timeframe,
+                    [model_path], load
+                )
+                self.models = saved['models']
+                self.scaler = saved['scaler']
+                self.feature_names = saved['feature_names']
             else:
                 self._create_models()
                 logger.info(f"{self.name} created new models")
@@ -135,7 +143,7 @@ class EnsembleBot(BaseBot):
                 return self._fallback_prediction(candles, horizon_minutes, timeframe)
             
             # Prepare data
-            df = pd.DataFrame(candles)
+            df = self._candles_to_dataframe(candles)
             features_df = self._engineer_features(df)
             
             if len(features_df) < 10:
@@ -226,39 +234,41 @@ class EnsembleBot(BaseBot):
                 'ridge': 0.25
             }
             
+            # The model inputs do not change across the horizon, so every model is
+            # evaluated once (one forward pass each) instead of once per future step
+            predictions = []
+            weights = []
+            
+            for model_name, model in self.models.items():
+                try:
+                    # Check if model is fitted before predicting
+                    is_fitted = False
+                    if hasattr(model, 'n_features_in_'):
+                        is_fitted = True  # Tree-based models
+                    elif hasattr(model, 'coef_'):
+                        is_fitted = True  # Linear models
+                    
+                    if not is_fitted:
+                        # Skip unfitted models silently (already checked at start)
+                        continue
+                    
+                    if hasattr(model, 'predict'):
+                        # Suppress warnings during prediction
+                        with warnings.catch_warnings():
+                            warnings.filterwarnings('ignore', category=RuntimeWarning, module='sklearn')
+                            pred = model.predict(X)[0]
+                        predictions.append(pred)
+                        weights.append(model_weights.get(model_name, 0.33))
+                except Exception as e:
+                    # Only log once per model to avoid spam
+                    if not hasattr(self, f'_model_error_logged_{model_name}'):
+                        logger.warning(f"{self.name} model {model_name} prediction failed: {e}")
+                        setattr(self, f'_model_error_logged_{model_name}', True)
+                    continue
+            
             predicted_series = []
             
             for i, ts in enumerate(future_timestamps):
-                predictions = []
-                weights = []
-                
-                for model_name, model in self.models.items():
-                    try:
-                        # Check if model is fitted before predicting
-                        is_fitted = False
-                        if hasattr(model, 'n_features_in_'):
-                            is_fitted = True  # Tree-based models
-                        elif hasattr(model, 'coef_'):
-                            is_fitted = True  # Linear models
-                        
-                        if not is_fitted:
-                            # Skip unfitted models silently (already checked at start)
-                            continue
-                        
-                        if hasattr(model, 'predict'):
-                            # Suppress warnings during prediction
-                            with warnings.catch_warnings():
-                                warnings.filterwarnings('ignore', category=RuntimeWarning, module='sklearn')
-                                pred = model.predict(X)[0]
-                            predictions.append(pred)
-                            weights.append(model_weights.get(model_name, 0.33))
-                    except Exception as e:
-                        # Only log once per model to avoid spam
-                        if not hasattr(self, f'_model_error_logged_{model_name}'):
-                            logger.warning(f"{self.name} model {model_name} prediction failed: {e}")
-                            setattr(self, f'_model_error_logged_{model_name}', True)
-                        continue
-                
                 if predictions:
                     # Weighted ensemble
                     ensemble_pred = np.average(predictions, weights=weights)
@@ -316,16 +326,10 @@ class EnsembleBot(BaseBot):
     
     def _engineer_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """Engineer comprehensive features for ML models using unified feature engineering"""
-        from backend.utils.feature_engineering import engineer_comprehensive_features
+        from backend.utils.feature_context import comprehensive_features
         
         # Use comprehensive feature engineering
-        features_df = engineer_comprehensive_features(
-            df,
-            include_indicators=True,
-            include_volume_features=True,
-            include_price_features=True,
-            include_returns_features=True
-        )
+        features_df = comprehensive_features(df)
         
         # Ensure we have the core columns for ensemble models
         core_cols = ['open', 'high', 'low', 'close', 'volume']
@@ -344,7 +348,7 @@ class EnsembleBot(BaseBot):
     def _fallback_prediction(self, candles: List[Dict], horizon_minutes: int, timeframe: str) -> Dict:
         """Fallback prediction using recent statistical analysis"""
         try:
-            df = pd.DataFrame(candles)
+            df = self._candles_to_dataframe(candles)
             last_close = float(df['close'].iloc[-1])
             
             # HYBRID APPROACH: Blend recent (5) and short-term (10) trends
@@ -444,7 +448,7 @@ class EnsembleBot(BaseBot):
                 logger.info(f"{self.name} loaded {len(df)} candles via data_loader", extra=metadata)
             else:
                 # Fallback to legacy candle list
-                df = pd.DataFrame(candles)
+                df = self._candles_to_dataframe(candles)
                 logger.warning(f"{self.name} using legacy candle list (no context set)")
             
             features_df = self._engineer_features(df)
@@ -33,6 +33,7 @@ except ImportError:
     logger.warning("TensorFlow not available. LSTM bot will use fallback predictions.")
 
 from backend.bots.base_bot import BaseBot
+from backend.utils.model_cache import model_cache
 from backend.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -113,21 +114,29 @@ class LSTMBot(BaseBot):
             scaler_path = self.get_model_path(self.scaler_path)
             
             if os.path.exists(model_path) and os.path.exists(scaler_path):
-                custom_objects = {'TemporalAttention': TemporalAttention}
-                self.model = keras.models.load_model(model_path, custom_objects=custom_objects)
+                def load():
+                    custom_objects = {'TemporalAttention': TemporalAttention}
+                    model = keras.models.load_model(model_path, custom_objects=custom_objects)
+                    
+                    # Recompile to reset optimizer state
+                    model.compile(
+                        optimizer=keras.optimizers.Adam(learning_rate=0.001),
+                        loss='huber',
+                        metrics=['mae']
+                    )
+                    
+                    with open(scaler_path, 'rb') as f:
+                        scalers = pickle.load(f)
+                    logger.info(f"{self.name} loaded existing model")
+                    return {"model": model, "scaler_X": scalers['scaler_X'], "scaler_y": scalers['scaler_y']}
                 
-                # Recompile to reset optimizer state
-                self.model.compile(
-                    optimizer=keras.optimizers.Adam(learning_rate=0.001),
-                    loss='huber',
-                    metrics=['mae']
+                loaded = model_cache.get_or_load(
+                    self.name, self._current_symbol, self._current_timeframe,
+                    [model_path, scaler_path], load
                 )
-                
-                with open(scaler_path, 'rb') as f:
-                    scalers = pickle.load(f)
-                    self.scaler_X = scalers['scaler_X']
-                    self.scaler_y = scalers['scaler_y']
-                logger.info(f"{self.name} loaded existing model")
+                self.model = loaded["model"]
+                self.scaler_X = loaded["scaler_X"]
+                self.scaler_y = loaded["scaler_y"]
             else:
                 self._create_model()
                 logger.info(f"{self.name} created new model")
@@ -193,7 +202,7 @@ class LSTMBot(BaseBot):
                 return self._fallback_prediction(candles, horizon_minutes, timeframe)
             
             # Prepare data
-            df = pd.DataFrame(candles)
+            df = self._candles_to_dataframe(candles)
             features = self._prepare_features(df)
             
             if len(features) < self.sequence_length:
@@ -224,7 +233,6 @@ class LSTMBot(BaseBot):
             last_sequence_scaled = last_sequence_scaled.reshape(1, self.sequence_length, -1)
             
             predicted_series = []
-            current_sequence = last_sequence_scaled.copy()
             
             last_ts = df['start_ts'].iloc[-1]
             if isinstance(last_ts, str):
@@ -238,8 +246,12 @@ class LSTMBot(BaseBot):
             
             confidence_base = 0.85  # Higher base confidence for advanced model
             
+            # Rolling window over a preallocated buffer; one direct model call per step
+            buffer = self._create_rollout_buffer(last_sequence_scaled, len(future_timestamps))
+            
             for i, ts in enumerate(future_timestamps):
-                prediction_scaled = self.model.predict(current_sequence, verbose=0)
+                current_sequence = buffer[:, i:i + self.sequence_length, :]
+                prediction_scaled = self._model_forward(current_sequence)
                 
                 if hasattr(self.scaler_y, 'mean_'):
                     prediction = self.scaler_y.inverse_transform(prediction_scaled)[0][0]
@@ -257,17 +269,12 @@ class LSTMBot(BaseBot):
                 
                 # Update sequence (simplified: repeat last known features but update price)
                 # Ideally we would re-calculate all indicators, but that's expensive in loop
-                new_features = np.zeros((1, 1, actual_n_features))
+                next_row = self.sequence_length + i
                 # Fill with last known features
-                new_features[0, 0, :] = current_sequence[0, -1, :]
+                buffer[0, next_row, :] = buffer[0, next_row - 1, :]
                 # Update price-related features (approximate)
                 # Assuming first 4 are OHLC
-                new_features[0, 0, 3] = (predicted_price - self.scaler_X.mean_[3]) / self.scaler_X.scale_[3]
-                
-                current_sequence = np.concatenate([
-                    current_sequence[:, 1:, :],
-                    new_features
-                ], axis=1)
+                buffer[0, next_row, 3] = (predicted_price - self.scaler_X.mean_[3]) / self.scaler_X.scale_[3]
                 
                 last_close = predicted_price
             
@@ -296,15 +303,9 @@ class LSTMBot(BaseBot):
     
     def _prepare_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """Prepare comprehensive features for LSTM model"""
-        from backend.utils.feature_engineering import engineer_comprehensive_features
+        from backend.utils.feature_context import comprehensive_features
         
-        features_df = engineer_comprehensive_features(
-            df,
-            include_indicators=True,
-            include_volume_features=True,
-            include_price_features=True,
-            include_returns_features=True
-        )
+        features_df = comprehensive_features(df)
         
         # Expanded feature set for advanced model
         key_features = [
@@ -330,7 +331,7 @@ class LSTMBot(BaseBot):
     def _fallback_prediction(self, candles: List[Dict], horizon_minutes: int, timeframe: str) -> Dict:
         """Fallback prediction using recent trend analysis"""
         try:
-            df = pd.DataFrame(candles)
+            df = self._candles_to_dataframe(candles)
             last_close = float(df['close'].iloc[-1])
             
             # Simple trend following
@@ -388,7 +389,7 @@ class LSTMBot(BaseBot):
             return {"error": "TensorFlow not available"}
         
         try:
-            df = pd.DataFrame(candles)
+            df = self._candles_to_dataframe(candles)
             features = self._prepare_features(df)
             
             if len(features) < self.sequence_length + 10:
@@ -241,16 +241,10 @@ class MLBot(BaseBot):
     
     def _create_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """Create comprehensive features for ML model using unified feature engineering"""
-        from backend.utils.feature_engineering import engineer_comprehensive_features
+        from backend.utils.feature_context import comprehensive_features
         
         # Use comprehensive feature engineering
-        features_df = engineer_comprehensive_features(
-            df,
-            include_indicators=True,
-            include_volume_features=True,
-            include_price_features=True,
-            include_returns_features=True
-        )
+        features_df = comprehensive_features(df)
         
         # Add lagged features for time series context
         features_df['feature_lag_1'] = features_df['close'].shift(1)
@@ -122,7 +122,7 @@ class NiftyBot(BaseBot):
                 logger.warning(f"{self.name} needs at least {self.sequence_length} candles")
                 return self._fallback_prediction(candles, horizon_minutes, timeframe)
             
-            df = pd.DataFrame(candles)
+            df = self._candles_to_dataframe(candles)
             features = self._prepare_features(df)
             
             if len(features) < self.sequence_length:
@@ -235,7 +235,7 @@ class NiftyBot(BaseBot):
             if not candles:
                 return self._empty_prediction()
             
-            df = pd.DataFrame(candles)
+            df = self._candles_to_dataframe(candles)
             last_close = float(df['close'].iloc[-1])
             last_ts = df['start_ts'].iloc[-1]
             if isinstance(last_ts, str):
@@ -9,12 +9,23 @@ class Settings(BaseSettings):
     """Application settings"""
     database_url: str = "sqlite:///./trading_predictions.db"
     default_symbol: str = "TCS.NS"
-    prediction_interval: int = 300  # seconds
+    prediction_interval: int = 300  # seconds; unused since predictions run at bar close (kept for existing .env files)
+    bar_close_settle_seconds: float = 2.0  # Wait after a bar closes before fetching it, so providers have published it
+    live_candle_poll_seconds: int = 0  # Forming-candle polling between bar closes (0 = off)
     yahoo_finance_interval: str = "5m"
     log_level: str = "WARNING"  # Changed from INFO to WARNING to reduce log verbosity
     
     # WebSocket settings
     ws_heartbeat_interval: int = 30
+    ws_binary_frames: bool = False  # Send broadcasts as binary frames (UTF-8 JSON) instead of text frames
+    ws_connection_metadata: bool = False  # Tag broadcasts with _connection_age_ms/_latency_ms (encodes once per connection)
+    ws_max_pending_events: int = 100  # Ordered events (training/status) buffered per connection; candle/prediction updates are conflated
+    ws_slow_consumer_policy: str = "drop_oldest"  # When a connection's event backlog is full: "drop_oldest" or "disconnect"
+    ws_delta_omit_fields: str = "bot_raw_outputs,validation_flags,feature_snapshot"  # Prediction fields left out of delta streams
+    ws_per_message_deflate: bool = True  # permessage-deflate compression (uvicorn.run in main.py)
+    broadcast_bus: str = "auto"  # WebSocket fan-out across workers: "redis", "memory" or "auto" (redis when redis_enabled; in-process if unreachable at startup)
+    broadcast_channel: str = "ws:broadcast"  # Redis pub/sub channel (also prefixes the leader lease and subscription keys)
+    broadcast_heartbeat_seconds: float = 5.0  # Scheduler leader lease renewal and subscription advertisement interval
     
     # CORS settings - Railway/Vercel deployment support
     allowed_origins: str = "http://localhost:5155,http://localhost:3000,http://192.168.167.178:5155,https://*.railway.app,https://*.vercel.app"
@@ -39,12 +50,24 @@ class Settings(BaseSettings):
     # Cache settings
     dataset_version: str = "v1"  # Version for cache keys
     data_root: str = "data"  # Base directory for data pipeline artifacts (can be absolute path for external storage)
+    lake_compaction_interval_minutes: int = 15  # How often small candle lake files are merged
+    lake_compaction_min_files: int = 4  # Files in a partition before it is compacted
+    ingestion_queue_max_rows: int = 100000  # Candle rows buffered for write-behind lake appends before submitters block
+    ingestion_flush_rows: int = 5000  # Rows buffered for one symbol/timeframe before it is written
+    ingestion_flush_interval_seconds: float = 2.0  # Longest a buffered bar waits before it is written
+    ingestion_put_timeout_seconds: float = 5.0  # Longest a submitter blocks on a full queue before writing inline
     model_storage_path: str = "models"  # Directory for storing trained models (can be absolute path for external storage)
+    model_cache_max_mb: int = 1024  # Budget for deserialized bot models kept in memory (LRU by on-disk size)
+    indicator_cache_max_rows: int = 500000  # Candle rows of cached indicator values across all symbols (LRU)
+    indicator_cache_entry_rows: int = 20000  # Rows of history kept per symbol/timeframe series
     
     # Prediction settings
     default_horizon_minutes: int = 180  # 3 hours
     min_candles_for_prediction: int = 50
     
+    # Backtest settings
+    backtest_sweep_max_combinations: int = 1000  # Largest parameter grid a single sweep request may run
+    
     # Supported timeframes
     supported_timeframes: List[str] = ["1m", "5m", "15m", "1h", "4h", "1d", "5d", "1wk", "1mo", "3mo"]
     
@@ -65,10 +88,27 @@ class Settings(BaseSettings):
     twelvedata_cache_ttl: int = 300  # Cache TTL in seconds (5 minutes)
     twelvedata_enabled: bool = True  # Enable/disable Twelve Data integration
     twelvedata_rate_limit: int = 800  # Requests per day (free tier: 800, paid tiers: higher)
+    twelvedata_pool_size: int = 10  # Keep-alive HTTP connections shared by Twelve Data requests
+    twelvedata_batch_size: int = 120  # Symbols per multi-symbol time_series request (API maximum: 120)
     
     # Data provider settings
-    primary_data_provider: str = "yahoo"  # "yahoo" or "twelvedata"
+    primary_data_provider: str = "yahoo"  # "yahoo", "twelvedata" or "replay" (recorded candles, no network)
     use_twelvedata_as_fallback: bool = True  # Use Twelve Data as fallback if Yahoo Finance fails
+    replay_source: str = "lake"  # Replay candles from the candle lake, or a directory of <SYMBOL>_<interval>.parquet/.json/.csv fixtures
+    replay_latency_ms: float = 0.0  # Simulated provider latency per replayed call
+    replay_latency_jitter_ms: float = 0.0  # Uniform random jitter added to the replay latency
+    replay_error_rate: float = 0.0  # Share of replayed calls that fail with an injected error
+    replay_seed: int = 0  # Seed for replay jitter and error injection (reproducible runs)
+    
+    # Provider request budgets (token buckets shared by all fetch paths)
+    yahoo_requests_per_minute: float = 120  # Yahoo Finance history/download calls
+    twelvedata_requests_per_minute: float = 8  # Twelve Data API credits (one per symbol of a batch; free tier: 8)
+    freddy_requests_per_minute: float = 30  # Freddy AI model calls
+    rate_limit_burst_seconds: float = 15.0  # Bucket capacity, in seconds of refill
+    rate_limit_live_reserve: float = 0.25  # Share of each bucket only live subscription fetches may use
+    rate_limit_max_wait_live_seconds: float = 2.0  # Longest a live fetch waits for budget before serving cached data
+    rate_limit_max_wait_backfill_seconds: float = 15.0  # Same for history/API fetches
+    rate_limit_max_wait_training_seconds: float = 120.0  # Same for training fetches and label generation
     
     class Config:
         env_file = ".env"
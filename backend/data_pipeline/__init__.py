@@ -2,3 +2,6 @@
 
 from .ingestion import DataPipeline, DataArtifacts  # noqa: F401
 from .feature_store import FeatureStore  # noqa: F401
+from .write_behind import IngestionQueue  # noqa: F401
+
+__all__ = ["DataPipeline", "DataArtifacts", "FeatureStore", "IngestionQueue"]
@@ -33,6 +33,10 @@ class DataPipelineConfig:
     def silver_root(self) -> Path:
         return self.data_root / "silver"
 
+    @property
+    def lake_root(self) -> Path:
+        return self.data_root / "lake"
+
 
 def get_config(data_root: Optional[str] = None) -> DataPipelineConfig:
     """Factory returning a configuration object, optionally overriding data root."""
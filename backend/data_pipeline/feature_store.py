@@ -7,8 +7,14 @@ from typing import Optional
 import pandas as pd
 
 from .config import DataPipelineConfig, get_config
+from .ingestion import build_silver_features
+from .lake import CandleLake
 from .storage import ParquetStorage
 
+# Bars read before a requested window/lookback so rolling silver features
+# (10-bar windows, 20-bar EMA) are warmed up at the first returned row
+SILVER_WARMUP_ROWS = 100
+
 
 class FeatureStore:
     """Read silver-layer datasets and expose windowed feature retrieval."""
@@ -16,6 +22,7 @@ class FeatureStore:
     def __init__(self, config: Optional[DataPipelineConfig] = None):
         self._config = config or get_config()
         self._storage = ParquetStorage(self._config)
+        self._lake = CandleLake(self._config)
 
     def load_features(
         self,
@@ -25,15 +32,33 @@ class FeatureStore:
         dataset_version: Optional[str] = None,
         run_id: Optional[str] = None,
     ) -> Optional[pd.DataFrame]:
-        """Return latest silver dataset, optionally truncated to lookback rows."""
+        """
+        Return silver features, optionally truncated to lookback rows.
+
+        Without a run_id the consolidated candle lake history is used, with
+        silver features derived on read (only the newest partitions are opened
+        when lookback is given); a run_id (or a dataset without lake data)
+        reads the matching per-run silver snapshot.
+        """
 
-        df = self._storage.read_latest(
-            layer="silver",
-            symbol=symbol,
-            timeframe=timeframe,
-            dataset_version=dataset_version,
-            run_id=run_id,
-        )
+        df = None
+        if run_id is None:
+            if lookback:
+                bronze = self._lake.read_tail(
+                    symbol, timeframe, lookback + SILVER_WARMUP_ROWS, dataset_version
+                )
+            else:
+                bronze = self._lake.read(symbol, timeframe, dataset_version)
+            if bronze is not None:
+                df = build_silver_features(bronze)
+        if df is None:
+            df = self._storage.read_latest(
+                layer="silver",
+                symbol=symbol,
+                timeframe=timeframe,
+                dataset_version=dataset_version,
+                run_id=run_id,
+            )
         if df is None:
             return None
         df = df.sort_values("start_ts")
@@ -50,22 +75,46 @@ class FeatureStore:
         dataset_version: Optional[str] = None,
         run_id: Optional[str] = None,
     ) -> Optional[pd.DataFrame]:
-        """Slice by time window ending at as_of (default now)."""
+        """
+        Slice by time window ending at as_of (default now).
+
+        Only the lake partitions (or snapshot row groups) overlapping the
+        window are decoded. Naive datetimes are taken as UTC.
+        """
 
-        df = self.load_features(
-            symbol,
-            timeframe,
-            dataset_version=dataset_version,
-            run_id=run_id,
-        )
+        window_end = pd.Timestamp(as_of or datetime.utcnow())
+        if window_end.tzinfo is None:
+            window_end = window_end.tz_localize("UTC")
+        window_start = window_end - timedelta(minutes=window_minutes)
+
+        df = None
+        if run_id is None:
+            bronze = self._lake.read(
+                symbol,
+                timeframe,
+                dataset_version,
+                start=window_start,
+                end=window_end,
+                warmup_rows=SILVER_WARMUP_ROWS,
+            )
+            if bronze is not None:
+                df = build_silver_features(bronze)
+        if df is None:
+            df = self._storage.read_latest(
+                layer="silver",
+                symbol=symbol,
+                timeframe=timeframe,
+                dataset_version=dataset_version,
+                run_id=run_id,
+                start=window_start,
+                end=window_end,
+            )
         if df is None:
             return None
-        as_of = as_of or datetime.utcnow()
-        window_start = as_of - timedelta(minutes=window_minutes)
-        mask = (pd.to_datetime(df["start_ts"]) >= window_start) & (
-            pd.to_datetime(df["start_ts"]) <= as_of
-        )
-        sliced = df.loc[mask]
+
+        # Drops warm-up rows, and filters snapshots whose start_ts could not be pushed down
+        start_ts = pd.to_datetime(df["start_ts"], utc=True)
+        sliced = df.loc[(start_ts >= window_start) & (start_ts <= window_end)]
         if sliced.empty:
             return None
-        return sliced.reset_index(drop=True)
+        return sliced.sort_values("start_ts").reset_index(drop=True)
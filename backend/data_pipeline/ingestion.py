@@ -10,9 +10,11 @@ import numpy as np
 import pandas as pd
 import pytz
 
+from backend.config import settings
 from backend.utils.exchange_calendar import exchange_calendar
 
 from .config import DataPipelineConfig, get_config
+from .lake import CandleLake, LakeAppendResult
 from .schemas import CandleRecord
 from .storage import ParquetStorage
 from .versioning import DatasetVersion, VersionManager
@@ -32,6 +34,30 @@ _INTERVAL_MINUTES: Dict[str, int] = {
 }
 
 
+def build_silver_features(df_bronze: pd.DataFrame) -> pd.DataFrame:
+    """Derive silver-layer features from a chronologically sorted bronze frame."""
+
+    df = df_bronze.copy()
+    if df.empty:
+        return df
+
+    df["return_1"] = df["close"].pct_change()
+    df["return_5"] = df["close"].pct_change(5)
+    df["rolling_mean_10"] = df["close"].rolling(10, min_periods=1).mean()
+    df["rolling_std_10"] = df["close"].rolling(10, min_periods=1).std().fillna(0.0)
+    df["volume_ma_10"] = df["volume"].rolling(10, min_periods=1).mean()
+    df["high_low_spread"] = (df["high"] - df["low"]) / df["close"].replace(0, np.nan)
+    df["momentum_10"] = df["close"] - df["close"].shift(10)
+    df["ema_20"] = df["close"].ewm(span=20, adjust=False).mean()
+    df["is_gap_up"] = (df["open"] > df["close"].shift(1)).astype(int)
+    df["is_gap_down"] = (df["open"] < df["close"].shift(1)).astype(int)
+
+    # Replace inf/nan
+    df = df.replace([np.inf, -np.inf], np.nan).dropna(subset=["close"])
+    df = df.fillna(0.0)
+    return df.reset_index(drop=True)
+
+
 @dataclass
 class DataArtifacts:
     raw_path: Path
@@ -49,6 +75,7 @@ class DataPipeline:
     def __init__(self, config: Optional[DataPipelineConfig] = None):
         self._config = config or get_config()
         self._storage = ParquetStorage(self._config)
+        self._lake = CandleLake(self._config, compact_min_files=settings.lake_compaction_min_files)
         self._version_mgr = VersionManager(self._config)
         self._tz = pytz.timezone(self._config.timezone)
 
@@ -126,6 +153,47 @@ class DataPipeline:
             metadata=metadata,
         )
 
+    def append(
+        self,
+        symbol: str,
+        timeframe: str,
+        candles: Iterable[Dict],
+        provider: Optional[str] = None,
+        dataset_version: Optional[str] = None,
+    ) -> LakeAppendResult:
+        """Append new or changed bronze bars to the candle lake (no per-run snapshots)."""
+
+        candles = list(candles)
+        if not candles:
+            raise ValueError("No candles supplied for ingestion")
+
+        records = self._validate_records(candles)
+        df_raw = self._prepare_raw(records, provider)
+        df_bronze = self._bronze_transform(df_raw, timeframe)
+        return self._lake.append(
+            df_bronze,
+            symbol=symbol,
+            timeframe=timeframe,
+            dataset_version=dataset_version,
+        )
+
+    def read_candles(
+        self,
+        symbol: str,
+        timeframe: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        dataset_version: Optional[str] = None,
+    ) -> Optional[pd.DataFrame]:
+        """Bronze bars stored in the candle lake for [start, end]."""
+
+        return self._lake.read(symbol, timeframe, dataset_version=dataset_version, start=start, end=end)
+
+    def compact(self, dataset_version: Optional[str] = None) -> int:
+        """Merge small candle lake files; returns the number of partitions compacted."""
+
+        return self._lake.compact(dataset_version=dataset_version)
+
     def _validate_records(self, candles: List[Dict]) -> List[CandleRecord]:
         records: List[CandleRecord] = []
         for candle in candles:
@@ -158,25 +226,7 @@ class DataPipeline:
         return df
 
     def _silver_transform(self, df_bronze: pd.DataFrame) -> pd.DataFrame:
-        df = df_bronze.copy()
-        if df.empty:
-            return df
-
-        df["return_1"] = df["close"].pct_change()
-        df["return_5"] = df["close"].pct_change(5)
-        df["rolling_mean_10"] = df["close"].rolling(10, min_periods=1).mean()
-        df["rolling_std_10"] = df["close"].rolling(10, min_periods=1).std().fillna(0.0)
-        df["volume_ma_10"] = df["volume"].rolling(10, min_periods=1).mean()
-        df["high_low_spread"] = (df["high"] - df["low"]) / df["close"].replace(0, np.nan)
-        df["momentum_10"] = df["close"] - df["close"].shift(10)
-        df["ema_20"] = df["close"].ewm(span=20, adjust=False).mean()
-        df["is_gap_up"] = (df["open"] > df["close"].shift(1)).astype(int)
-        df["is_gap_down"] = (df["open"] < df["close"].shift(1)).astype(int)
-
-        # Replace inf/nan
-        df = df.replace([np.inf, -np.inf], np.nan).dropna(subset=["close"])
-        df = df.fillna(0.0)
-        return df.reset_index(drop=True)
+        return build_silver_features(df_bronze)
 
     def _session_type(self, ts: datetime) -> str:
         status = exchange_calendar.validate_trading_session(ts)
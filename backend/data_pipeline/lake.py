@@ -0,0 +1,343 @@
+"""Append-only candle lake partitioned by symbol/timeframe/trading date."""
+from __future__ import annotations
+
+import itertools
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from backend.utils.logger import get_logger
+
+from .config import DataPipelineConfig
+from .storage import manifest, time_range_filters
+
+logger = get_logger(__name__)
+
+# Columns compared to decide whether an incoming bar is new or changed
+COMPARE_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+# Timeframes partitioned per trading date; coarser ones are partitioned per year
+_INTRADAY_TIMEFRAMES = {"1m", "5m", "15m", "30m", "1h", "4h"}
+
+# Serializes appends (known-bar bookkeeping) and compaction file swaps across
+# every CandleLake in the process; readers retry if a swap removed a listed file
+_LAKE_LOCK = threading.RLock()
+
+
+@dataclass
+class LakeAppendResult:
+    dataset_version: str
+    symbol: str
+    timeframe: str
+    rows_received: int
+    rows_written: int
+    files: List[Path] = field(default_factory=list)
+
+
+class CandleLake:
+    """
+    Append-only Parquet store for bronze candles.
+
+    Layout: <lake_root>/<dataset>/<symbol>/<timeframe>/date=YYYY-MM-DD/*.parquet
+    (year=YYYY for daily and coarser timeframes). Each append writes one small
+    file per touched partition containing only bars that are new or whose OHLCV
+    changed; readers consolidate a partition by keeping the last version of
+    each start_ts in file-name (write) order. compact() rewrites partitions
+    with many small files as a single file.
+    """
+
+    def __init__(
+        self,
+        config: DataPipelineConfig,
+        compact_min_files: int = 4,
+        max_known_partitions: int = 256,
+    ):
+        self._config = config
+        self._compact_min_files = compact_min_files
+        self._max_known_partitions = max_known_partitions
+        # Partition dir -> {start_ts ns: OHLCV tuple} of bars already stored
+        self._known: "OrderedDict[Path, Dict[int, Tuple]]" = OrderedDict()
+        self._counter = itertools.count()
+
+    def series_dir(self, symbol: str, timeframe: str, dataset_version: Optional[str] = None) -> Path:
+        dataset = dataset_version or self._config.dataset_namespace
+        return self._config.lake_root / dataset / symbol.replace(".", "_") / timeframe
+
+    @staticmethod
+    def partition_name(ts: pd.Timestamp, timeframe: str) -> str:
+        if timeframe in _INTRADAY_TIMEFRAMES:
+            return f"date={ts:%Y-%m-%d}"
+        return f"year={ts:%Y}"
+
+    def _partition_key(self, value: datetime) -> str:
+        """Sortable date of a bound in the exchange timezone (YYYY-MM-DD)"""
+        return f"{self._as_timestamp(value).tz_convert(self._config.timezone):%Y-%m-%d}"
+
+    @staticmethod
+    def _dir_range(partition_dir: Path) -> Tuple[str, str]:
+        """First and last date key a partition covers (a year partition spans the whole year)"""
+        value = partition_dir.name.split("=", 1)[-1]
+        if len(value) > 4:
+            return value, value
+        return value + "-01-01", value + "-12-31"
+
+    def append(
+        self,
+        df: pd.DataFrame,
+        symbol: str,
+        timeframe: str,
+        dataset_version: Optional[str] = None,
+    ) -> LakeAppendResult:
+        """Write the bars of `df` that are not already stored with the same OHLCV."""
+
+        dataset = dataset_version or self._config.dataset_namespace
+        result = LakeAppendResult(
+            dataset_version=dataset,
+            symbol=symbol,
+            timeframe=timeframe,
+            rows_received=len(df),
+            rows_written=0,
+        )
+        if df.empty:
+            return result
+
+        df = df.drop_duplicates(subset=["start_ts"], keep="last").sort_values("start_ts")
+        series_dir = self.series_dir(symbol, timeframe, dataset)
+        partitions = df["start_ts"].map(lambda ts: self.partition_name(ts, timeframe))
+
+        with _LAKE_LOCK:
+            for name, part in df.groupby(partitions, sort=True):
+                partition_dir = series_dir / name
+                known = self._known_bars(partition_dir)
+                bars = self._bar_values(part)
+                changed = [known.get(ts) != values for ts, values in bars]
+                delta = part.loc[changed]
+                if delta.empty:
+                    continue
+                result.files.append(self._write_file(partition_dir, delta))
+                result.rows_written += len(delta)
+                known.update(bar for bar, is_changed in zip(bars, changed) if is_changed)
+
+        return result
+
+    def read(
+        self,
+        symbol: str,
+        timeframe: str,
+        dataset_version: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        warmup_rows: int = 0,
+    ) -> Optional[pd.DataFrame]:
+        """
+        Consolidated history of a symbol/timeframe, deduplicated on start_ts.
+
+        With start/end only partitions overlapping the range are opened and
+        rows are filtered through Parquet row-group statistics. warmup_rows
+        additionally returns up to that many bars before `start` for features
+        that need preceding history.
+        """
+
+        return self._retrying(
+            lambda: self._read(symbol, timeframe, dataset_version, start, end, warmup_rows),
+            self.series_dir(symbol, timeframe, dataset_version),
+        )
+
+    def read_tail(
+        self,
+        symbol: str,
+        timeframe: str,
+        rows: int,
+        dataset_version: Optional[str] = None,
+    ) -> Optional[pd.DataFrame]:
+        """Latest `rows` bars, opening partitions from the newest backwards."""
+
+        series_dir = self.series_dir(symbol, timeframe, dataset_version)
+
+        def _tail() -> Optional[pd.DataFrame]:
+            frames: List[pd.DataFrame] = []
+            count = 0
+            for partition_dir in reversed(manifest.subdirs(series_dir)):
+                if count >= rows:
+                    break
+                frame = self._read_partition(partition_dir)
+                if frame is not None and not frame.empty:
+                    frames.insert(0, frame)
+                    count += len(frame)
+            if not frames:
+                return None
+            df = pd.concat(frames, ignore_index=True).sort_values("start_ts")
+            return df.tail(rows).reset_index(drop=True)
+
+        return self._retrying(_tail, series_dir)
+
+    @staticmethod
+    def _retrying(read, series_dir: Path):
+        try:
+            return read()
+        except FileNotFoundError:
+            # A compaction replaced files after they were listed; list again
+            manifest.invalidate(series_dir)
+            return read()
+
+    def _read(
+        self,
+        symbol: str,
+        timeframe: str,
+        dataset_version: Optional[str],
+        start: Optional[datetime],
+        end: Optional[datetime],
+        warmup_rows: int,
+    ) -> Optional[pd.DataFrame]:
+        series_dir = self.series_dir(symbol, timeframe, dataset_version)
+        partition_dirs = manifest.subdirs(series_dir)
+        if not partition_dirs:
+            return None
+
+        first_key = self._partition_key(start) if start is not None else None
+        last_key = self._partition_key(end) if end is not None else None
+        # Partitions whose date range overlaps [start, end]
+        selected = [
+            partition_dir for partition_dir in partition_dirs
+            if (first_key is None or self._dir_range(partition_dir)[1] >= first_key)
+            and (last_key is None or self._dir_range(partition_dir)[0] <= last_key)
+        ]
+        warmup = warmup_rows > 0 and start is not None
+
+        frames = [
+            # Keep the rows before `start` of the first partition when warming up
+            self._read_partition(partition_dir, None if (warmup and index == 0) else start, end)
+            for index, partition_dir in enumerate(selected)
+        ]
+        frames = [frame for frame in frames if frame is not None and not frame.empty]
+
+        if warmup:
+            start_ts = self._as_timestamp(start)
+            rows_before = int((frames[0]["start_ts"] < start_ts).sum()) if frames else 0
+            earlier = [d for d in partition_dirs if self._dir_range(d)[1] < first_key]
+            for partition_dir in reversed(earlier):
+                if rows_before >= warmup_rows:
+                    break
+                frame = self._read_partition(partition_dir)
+                if frame is not None and not frame.empty:
+                    frames.insert(0, frame)
+                    rows_before += len(frame)
+
+        if not frames:
+            return None
+        df = pd.concat(frames, ignore_index=True).sort_values("start_ts").reset_index(drop=True)
+        if warmup:
+            rows_before = int((df["start_ts"] < start_ts).sum())
+            df = df.iloc[max(0, rows_before - warmup_rows):].reset_index(drop=True)
+        return df
+
+    @staticmethod
+    def _as_timestamp(value: datetime) -> pd.Timestamp:
+        ts = pd.Timestamp(value)
+        return ts.tz_localize("UTC") if ts.tzinfo is None else ts
+
+    def compact(self, dataset_version: Optional[str] = None) -> int:
+        """
+        Merge small files into one file per partition.
+
+        Partitions are compacted once they hold compact_min_files files, or as
+        soon as they hold more than one file and a newer partition exists (the
+        trading day is over). Returns the number of partitions compacted.
+        """
+
+        dataset_root = self._config.lake_root / (dataset_version or self._config.dataset_namespace)
+        if not dataset_root.exists():
+            return 0
+
+        compacted = 0
+        for series_dir in sorted(p for p in dataset_root.glob("*/*") if p.is_dir()):
+            partition_dirs = sorted(p for p in series_dir.iterdir() if p.is_dir())
+            for index, partition_dir in enumerate(partition_dirs):
+                files = self._partition_files(partition_dir)
+                is_closed = index < len(partition_dirs) - 1
+                if len(files) >= self._compact_min_files or (is_closed and len(files) > 1):
+                    try:
+                        self._compact_partition(partition_dir, files)
+                        compacted += 1
+                    except Exception as exc:
+                        logger.warning("Candle lake compaction failed", partition=str(partition_dir), error=str(exc))
+        if compacted:
+            logger.info("Candle lake compacted", partitions=compacted, dataset=dataset_root.name)
+        return compacted
+
+    def _compact_partition(self, partition_dir: Path, files: List[Path]) -> None:
+        merged = self._consolidate(files)
+        # Named after the newest merged file so later appends still sort after it
+        target = partition_dir / f"{files[-1].stem}-compacted.parquet"
+        tmp_path = target.with_suffix(".tmp")
+        merged.to_parquet(tmp_path, index=False, row_group_size=max(len(merged), 1))
+        with _LAKE_LOCK:
+            os.replace(tmp_path, target)
+            for path in files:
+                if path != target:
+                    path.unlink(missing_ok=True)
+            manifest.invalidate(partition_dir)
+
+    def _known_bars(self, partition_dir: Path) -> Dict[int, Tuple]:
+        known = self._known.get(partition_dir)
+        if known is None:
+            stored = self._read_partition(partition_dir)
+            known = dict(self._bar_values(stored)) if stored is not None else {}
+            self._known[partition_dir] = known
+            while len(self._known) > self._max_known_partitions:
+                self._known.popitem(last=False)
+        else:
+            self._known.move_to_end(partition_dir)
+        return known
+
+    @staticmethod
+    def _bar_values(df: pd.DataFrame) -> List[Tuple[int, Tuple]]:
+        timestamps = df["start_ts"].map(lambda ts: ts.value).tolist()
+        values = df[COMPARE_COLUMNS].astype(float).itertuples(index=False, name=None)
+        return list(zip(timestamps, values))
+
+    def _write_file(self, partition_dir: Path, df: pd.DataFrame) -> Path:
+        if not partition_dir.exists():
+            partition_dir.mkdir(parents=True, exist_ok=True)
+            manifest.invalidate(partition_dir.parent)
+        # time-ordered names: consolidation keeps the last version of each bar
+        name = f"{time.time_ns():020d}-{os.getpid()}-{next(self._counter):06d}"
+        path = partition_dir / f"{name}.parquet"
+        tmp_path = partition_dir / f"{name}.tmp"
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+        manifest.invalidate(partition_dir)
+        return path
+
+    @staticmethod
+    def _partition_files(partition_dir: Path) -> List[Path]:
+        return manifest.files(partition_dir)
+
+    def _read_partition(
+        self,
+        partition_dir: Path,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Optional[pd.DataFrame]:
+        files = self._partition_files(partition_dir)
+        if not files:
+            return None
+        return self._consolidate(files, start, end)
+
+    @staticmethod
+    def _consolidate(
+        files: List[Path],
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> pd.DataFrame:
+        frames = [pd.read_parquet(path, filters=time_range_filters(path, start, end)) for path in files]
+        df = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+        df = df.drop_duplicates(subset=["start_ts"], keep="last")
+        return df.sort_values("start_ts").reset_index(drop=True)
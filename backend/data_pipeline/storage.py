@@ -1,16 +1,105 @@
 """Parquet storage helpers for the data pipeline."""
 from __future__ import annotations
 
+import threading
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List
+from typing import Dict, List, Optional, Tuple
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 from .config import DataPipelineConfig
 
 
+class DirectoryManifest:
+    """
+    In-process cache of sorted directory listings.
+
+    A listing is reused while the directory's mtime is unchanged; writers in
+    this process also invalidate explicitly, so coarse filesystem timestamps
+    cannot hide a file they just added.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[Tuple[Path, str], Tuple[int, List[Path]]] = {}
+        self._lock = threading.Lock()
+
+    def files(self, directory: Path, pattern: str = "*.parquet") -> List[Path]:
+        return self._listing(directory, pattern)
+
+    def subdirs(self, directory: Path) -> List[Path]:
+        return self._listing(directory, "")
+
+    def invalidate(self, directory: Path) -> None:
+        """Forget listings of `directory` and everything below it"""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == directory or directory in key[0].parents]:
+                del self._entries[key]
+
+    def _listing(self, directory: Path, pattern: str) -> List[Path]:
+        try:
+            mtime = directory.stat().st_mtime_ns
+        except FileNotFoundError:
+            return []
+        key = (directory, pattern)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+        if pattern:
+            listing = sorted(directory.glob(pattern))
+        else:
+            listing = sorted(path for path in directory.iterdir() if path.is_dir())
+        with self._lock:
+            self._entries[key] = (mtime, listing)
+        return listing
+
+
+# Shared by every storage/lake instance in the process
+manifest = DirectoryManifest()
+
+
+def time_range_filters(
+    path: Path,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> Optional[List[Tuple]]:
+    """
+    Parquet filters restricting start_ts to [start, end].
+
+    Bounds are cast to the file's start_ts type so pyarrow can skip row groups
+    using their min/max statistics. Returns None when no bound is given or the
+    column is not a timestamp (callers then filter in pandas).
+    """
+
+    if start is None and end is None:
+        return None
+    try:
+        field = pq.read_schema(path).field("start_ts")
+    except KeyError:
+        return None
+    if not pa.types.is_timestamp(field.type):
+        return None
+
+    def _bound(value: datetime) -> pa.Scalar:
+        ts = pd.Timestamp(value)
+        if ts.tzinfo is None:
+            ts = ts.tz_localize("UTC")
+        if field.type.tz is None:
+            ts = ts.tz_convert("UTC").tz_localize(None)
+        return pa.scalar(ts, type=field.type)
+
+    filters = []
+    if start is not None:
+        filters.append(("start_ts", ">=", _bound(start)))
+    if end is not None:
+        filters.append(("start_ts", "<=", _bound(end)))
+    return filters
+
+
 @dataclass(frozen=True)
 class StoragePaths:
     base_dir: Path
@@ -57,6 +146,7 @@ class ParquetStorage:
         filepath = paths.filepath(suffix)
         self._ensure_dir(filepath)
         df.to_parquet(filepath, index=False)
+        manifest.invalidate(filepath.parent)
         return filepath
 
     def read_latest(
@@ -66,21 +156,26 @@ class ParquetStorage:
         timeframe: str,
         dataset_version: Optional[str] = None,
         run_id: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
     ) -> Optional[pd.DataFrame]:
+        """Read the latest (or run_id) file, decoding only rows with start_ts in [start, end]."""
         base_dir = self._layer_root(layer)
         dataset = dataset_version or self._config.dataset_namespace
         target_dir = base_dir / dataset / symbol.replace(".", "_") / timeframe
-        if not target_dir.exists():
-            return None
-        parquet_files = sorted(target_dir.glob("*.parquet"))
+        parquet_files = manifest.files(target_dir)
         if not parquet_files:
             return None
         if run_id:
             for path in reversed(parquet_files):
                 if run_id in path.name:
-                    return pd.read_parquet(path)
+                    return self._read(path, start, end)
             return None
-        return pd.read_parquet(parquet_files[-1])
+        return self._read(parquet_files[-1], start, end)
+
+    @staticmethod
+    def _read(path: Path, start: Optional[datetime], end: Optional[datetime]) -> pd.DataFrame:
+        return pd.read_parquet(path, filters=time_range_filters(path, start, end))
 
     def list_runs(
         self,
@@ -92,10 +187,8 @@ class ParquetStorage:
         base_dir = self._layer_root(layer)
         dataset = dataset_version or self._config.dataset_namespace
         target_dir = base_dir / dataset / symbol.replace(".", "_") / timeframe
-        if not target_dir.exists():
-            return []
         runs: List[str] = []
-        for path in sorted(target_dir.glob("*.parquet")):
+        for path in manifest.files(target_dir):
             stem_parts = path.stem.split("_")
             if len(stem_parts) >= 3:
                 runs.append(stem_parts[-2])  # run_id position
@@ -0,0 +1,261 @@
+"""Write-behind queue that moves candle lake appends off the fetch path."""
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from backend.utils.logger import get_logger
+from backend.utils.metrics import (
+    record_ingestion_backpressure,
+    record_ingestion_flush,
+    update_ingestion_queue_depth,
+)
+
+from .ingestion import DataPipeline
+from .lake import LakeAppendResult
+
+logger = get_logger(__name__)
+
+# (dataset_version, symbol, timeframe, provider)
+_Key = Tuple[Optional[str], str, str, str]
+
+
+@dataclass
+class _PendingWrite:
+    """Bars waiting to be appended for one series, keyed by start_ts"""
+
+    bars: Dict[str, Dict] = field(default_factory=dict)
+    queued_at: float = field(default_factory=time.monotonic)
+
+
+class IngestionQueue:
+    """
+    Bounded write-behind buffer in front of DataPipeline.append().
+
+    submit() merges candles into a pending batch per dataset/symbol/timeframe
+    (the newest version of a bar wins) and returns immediately; a daemon
+    worker appends a batch once it holds flush_rows bars or has waited
+    flush_interval seconds. When max_pending_rows are buffered, submit()
+    blocks until the worker frees space; after put_timeout the caller drains
+    the queue itself, so producers are slowed down rather than data dropped.
+    All appends run under one lock, in submission order, so a newer version
+    of a bar is never overwritten by an older one.
+    """
+
+    def __init__(
+        self,
+        pipeline: DataPipeline,
+        on_flush: Optional[Callable[[str, str, str, LakeAppendResult], None]] = None,
+        max_pending_rows: int = 100000,
+        flush_rows: int = 5000,
+        flush_interval: float = 2.0,
+        put_timeout: float = 5.0,
+    ):
+        self._pipeline = pipeline
+        self._on_flush = on_flush
+        self.max_pending_rows = max(1, int(max_pending_rows))
+        self.flush_rows = max(1, int(flush_rows))
+        self.flush_interval = max(0.0, float(flush_interval))
+        self.put_timeout = max(0.0, float(put_timeout))
+
+        self._pending: Dict[_Key, _PendingWrite] = {}
+        self._rows = 0
+        self._writing = 0
+        # Producers waiting for space; the worker writes everything while > 0
+        self._blocked = 0
+        self._flush_requested = False
+        self._stopped = False
+        self._cond = threading.Condition()
+        # Held while batches are taken from the queue and appended
+        self._write_lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+
+    @property
+    def pending_rows(self) -> int:
+        return self._rows
+
+    def has_pending(self, symbol: str, timeframe: str) -> bool:
+        """Whether bars of symbol/timeframe are buffered or being written"""
+        with self._cond:
+            return self._writing > 0 or any(
+                key[1] == symbol and key[2] == timeframe for key in self._pending
+            )
+
+    def submit(
+        self,
+        symbol: str,
+        timeframe: str,
+        candles: Iterable[Dict],
+        provider: Optional[str] = None,
+        dataset_version: Optional[str] = None,
+    ) -> None:
+        """Queue candles (dicts with an ISO start_ts) for appending to the lake."""
+
+        candles = list(candles)
+        if not candles:
+            return
+        key: _Key = (dataset_version, symbol, timeframe, provider or "unknown")
+
+        with self._cond:
+            inline = self._stopped or not self._wait_for_space(key, candles)
+            self._merge(key, candles)
+            if not self._stopped:
+                self._ensure_worker()
+            self._cond.notify_all()
+
+        if inline:
+            # Stopped, or still full after put_timeout: write from the caller
+            self._drain(force=True)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Write everything buffered; returns False if the timeout expired first."""
+
+        with self._cond:
+            if self._worker is not None and self._worker.is_alive():
+                self._flush_requested = True
+                self._cond.notify_all()
+                return self._cond.wait_for(lambda: not self._pending and not self._writing, timeout)
+        self._drain(force=True)
+        return True
+
+    def stop(self, timeout: Optional[float] = 10.0) -> None:
+        """Flush buffered bars and stop the worker; later submits write inline."""
+
+        self.flush(timeout)
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+            worker = self._worker
+        if worker is not None:
+            worker.join(timeout)
+        self._drain(force=True)
+
+    def _wait_for_space(self, key: _Key, candles: List[Dict]) -> bool:
+        """Block (lock held) until the new bars fit; False if put_timeout expired"""
+        pending = self._pending.get(key)
+        new_rows = len(candles) if pending is None else sum(
+            1 for candle in candles if str(candle["start_ts"]) not in pending.bars
+        )
+        if not self._rows or self._rows + new_rows <= self.max_pending_rows:
+            return True
+
+        started = time.monotonic()
+        self._blocked += 1
+        self._cond.notify_all()
+        try:
+            fits = self._cond.wait_for(
+                lambda: not self._rows or self._rows + new_rows <= self.max_pending_rows,
+                self.put_timeout,
+            )
+        finally:
+            self._blocked -= 1
+        record_ingestion_backpressure("waited" if fits else "inline", time.monotonic() - started)
+        if not fits:
+            logger.warning(
+                "Ingestion queue full, writing inline",
+                symbol=key[1],
+                timeframe=key[2],
+                pending_rows=self._rows,
+            )
+        return fits
+
+    def _merge(self, key: _Key, candles: List[Dict]) -> None:
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = _PendingWrite()
+        before = len(pending.bars)
+        for candle in candles:
+            pending.bars[str(candle["start_ts"])] = candle
+        self._rows += len(pending.bars) - before
+        update_ingestion_queue_depth(self._rows)
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name="ingestion-queue", daemon=True)
+            self._worker.start()
+
+    def _due(self, now: float) -> Tuple[List[_Key], Optional[float]]:
+        """Keys ready to write (lock held) and seconds until the next one is"""
+        if self._flush_requested or self._blocked or self._rows >= self.max_pending_rows:
+            return list(self._pending), None
+        due: List[_Key] = []
+        next_in: Optional[float] = None
+        for key, pending in self._pending.items():
+            remaining = pending.queued_at + self.flush_interval - now
+            if len(pending.bars) >= self.flush_rows or remaining <= 0:
+                due.append(key)
+            elif next_in is None or remaining < next_in:
+                next_in = remaining
+        return due, next_in
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._stopped:
+                    due, next_in = self._due(time.monotonic())
+                    if due:
+                        break
+                    if self._flush_requested:
+                        self._flush_requested = False
+                        self._cond.notify_all()
+                    self._cond.wait(next_in)
+                if self._stopped:
+                    return
+            self._drain()
+
+    def _drain(self, force: bool = False) -> None:
+        """Take due batches (all of them with force) and append them in order"""
+        with self._write_lock:
+            with self._cond:
+                keys = list(self._pending) if force else self._due(time.monotonic())[0]
+                batches = [(key, self._pending.pop(key)) for key in keys]
+                self._writing += 1
+            try:
+                for key, pending in batches:
+                    self._write(key, pending)
+            finally:
+                with self._cond:
+                    self._rows -= sum(len(pending.bars) for _, pending in batches)
+                    self._writing -= 1
+                    update_ingestion_queue_depth(self._rows)
+                    self._cond.notify_all()
+
+    def _write(self, key: _Key, pending: _PendingWrite) -> None:
+        dataset_version, symbol, timeframe, provider = key
+        started = time.monotonic()
+        try:
+            result = self._pipeline.append(
+                symbol=symbol,
+                timeframe=timeframe,
+                candles=list(pending.bars.values()),
+                provider=provider,
+                dataset_version=dataset_version,
+            )
+        except Exception as exc:
+            logger.warning(
+                "Write-behind lake append failed",
+                symbol=symbol,
+                timeframe=timeframe,
+                rows=len(pending.bars),
+                error=str(exc),
+            )
+            return
+        finally:
+            record_ingestion_flush(timeframe, len(pending.bars), time.monotonic() - started)
+
+        logger.debug(
+            "Write-behind lake append",
+            symbol=symbol,
+            timeframe=timeframe,
+            dataset=result.dataset_version,
+            written=result.rows_written,
+            received=result.rows_received,
+            queued_for=round(started - pending.queued_at, 3),
+        )
+        if result.rows_written and self._on_flush is not None:
+            try:
+                self._on_flush(symbol, timeframe, provider, result)
+            except Exception as exc:
+                logger.warning("Write-behind flush callback failed", symbol=symbol, timeframe=timeframe, error=str(exc))
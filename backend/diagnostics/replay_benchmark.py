@@ -0,0 +1,224 @@
+"""
+Replay Pipeline Benchmark
+
+Runs the fetch -> predict -> broadcast path against the replay provider, so
+throughput and latency can be measured without network access and with the
+same inputs on every run:
+
+1. DataFetcher.fetch_candles_batch (replay provider, caches bypassed)
+2. FreddyMerger.predict for every symbol
+3. ConnectionManager candle + prediction broadcasts to in-process clients
+
+Candles come from the candle lake, or from a fixture directory that
+--generate fills with seeded random-walk sessions first.
+
+Usage:
+    python -m backend.diagnostics.replay_benchmark --generate /tmp/replay-fixtures
+    python -m backend.diagnostics.replay_benchmark --source lake --symbols TCS.NS --iterations 50
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+import pytz
+
+from backend.config import settings
+from backend.utils.exchange_calendar import exchange_calendar
+
+IST = pytz.timezone("Asia/Kolkata")
+
+_BAR_MINUTES = {"1m": 1, "5m": 5, "15m": 15, "30m": 30, "1h": 60}
+
+
+def generate_fixtures(directory: Path, symbols: List[str], timeframe: str, sessions: int, end: date, seed: int):
+    """Write <SYMBOL>_<timeframe>.parquet random-walk candles for the last `sessions` trading days up to `end`"""
+    directory.mkdir(parents=True, exist_ok=True)
+    minutes = _BAR_MINUTES[timeframe]
+    days = []
+    day = end
+    while len(days) < sessions:
+        if exchange_calendar.is_trading_day(day):
+            days.append(day)
+        day -= timedelta(days=1)
+
+    starts = []
+    for day in reversed(days):
+        session_open = IST.localize(datetime.combine(day, exchange_calendar.market_open))
+        session_close = IST.localize(datetime.combine(day, exchange_calendar.get_market_close_time(day)))
+        starts.extend(pd.date_range(session_open, session_close - timedelta(minutes=minutes), freq=f"{minutes}min"))
+
+    for index, symbol in enumerate(symbols):
+        rng = np.random.default_rng(seed + index)
+        close = 1000.0 * np.exp(np.cumsum(rng.normal(0.0, 0.002, len(starts))))
+        open_ = np.concatenate([[close[0]], close[:-1]])
+        spread = np.abs(rng.normal(0.0, 0.001, len(starts))) * close
+        frame = pd.DataFrame({
+            "start_ts": starts,
+            "open": open_,
+            "high": np.maximum(open_, close) + spread,
+            "low": np.minimum(open_, close) - spread,
+            "close": close,
+            "volume": rng.integers(1_000, 100_000, len(starts)).astype(float),
+        })
+        frame.to_parquet(directory / f"{symbol.replace('.', '_')}_{timeframe}.parquet", index=False)
+    print(f"Wrote {len(symbols)} fixtures of {len(starts)} {timeframe} bars to {directory}")
+
+
+class _NullWebSocket:
+    """In-process client that counts delivered messages and bytes"""
+
+    def __init__(self):
+        self.received = 0
+        self.received_bytes = 0
+
+    async def accept(self):
+        return None
+
+    async def send_text(self, data: str):
+        self.received += 1
+        self.received_bytes += len(data.encode("utf-8"))
+
+    async def send_bytes(self, data: bytes):
+        self.received += 1
+        self.received_bytes += len(data)
+
+    async def send_json(self, message: Dict, mode: str = "text"):
+        await self.send_text(json.dumps(message, separators=(",", ":"), ensure_ascii=False))
+
+
+def _summary(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {"count": 0}
+    values = np.array(samples) * 1000.0
+    return {
+        "count": len(samples),
+        "p50_ms": round(float(np.percentile(values, 50)), 3),
+        "p95_ms": round(float(np.percentile(values, 95)), 3),
+        "max_ms": round(float(values.max()), 3),
+    }
+
+
+async def run_benchmark(args) -> Dict:
+    # Imported after the provider is selected so module singletons see it
+    from backend.freddy_merger import freddy_merger
+    from backend.services.replay_provider import replay_provider
+    from backend.utils.candle_frame import CandleFrame
+    from backend.utils.data_fetcher import data_fetcher
+    from backend.websocket_manager import ConnectionManager
+
+    replay_provider.configure(
+        source=args.source,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+
+    manager = ConnectionManager()
+    clients = []
+    for index in range(args.clients):
+        websocket = _NullWebSocket()
+        await manager.connect(websocket)
+        manager.subscribe(websocket, args.symbols[index % len(args.symbols)], args.timeframe, delta=args.delta)
+        clients.append(websocket)
+
+    stages = {"fetch": [], "predict": [], "broadcast": [], "iteration": []}
+    predictions = 0
+    started = time.perf_counter()
+    for _ in range(args.iterations):
+        iteration_start = time.perf_counter()
+        candles_by_symbol = await data_fetcher.fetch_candles_batch(
+            args.symbols, interval=args.timeframe, period=args.period, bypass_cache=True
+        )
+        stages["fetch"].append(time.perf_counter() - iteration_start)
+
+        for symbol, candles in candles_by_symbol.items():
+            if not candles:
+                continue
+            predict_start = time.perf_counter()
+            prediction = await freddy_merger.predict(
+                symbol,
+                CandleFrame.from_records(candles),
+                horizon_minutes=args.horizon,
+                timeframe=args.timeframe,
+                selected_bots=args.bots,
+            )
+            stages["predict"].append(time.perf_counter() - predict_start)
+            predictions += 1
+
+            broadcast_start = time.perf_counter()
+            await manager.broadcast_candle(symbol, args.timeframe, candles[-1])
+            await manager.broadcast_prediction({"symbol": symbol, "timeframe": args.timeframe, **prediction})
+            await asyncio.gather(*(queue.join() for queue in list(manager.message_queues.values())))
+            stages["broadcast"].append(time.perf_counter() - broadcast_start)
+
+        stages["iteration"].append(time.perf_counter() - iteration_start)
+    elapsed = time.perf_counter() - started
+
+    for websocket in clients:
+        manager.disconnect(websocket)
+
+    return {
+        "symbols": len(args.symbols),
+        "iterations": args.iterations,
+        "clients": args.clients,
+        "elapsed_s": round(elapsed, 3),
+        "predictions_per_s": round(predictions / elapsed, 2) if elapsed else 0.0,
+        "messages_delivered": sum(websocket.received for websocket in clients),
+        "bytes_delivered": sum(websocket.received_bytes for websocket in clients),
+        "stages": {name: _summary(samples) for name, samples in stages.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark fetch -> predict -> broadcast on replayed candles")
+    parser.add_argument("--symbols", nargs="+", default=["TCS.NS", "INFY.NS", "RELIANCE.NS"])
+    parser.add_argument("--timeframe", default="5m")
+    parser.add_argument("--period", default="5d")
+    parser.add_argument("--horizon", type=int, default=180)
+    parser.add_argument("--bots", nargs="+", default=["rsi_bot", "macd_bot", "ma_bot"])
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--clients", type=int, default=10, help="In-process WebSocket subscribers")
+    parser.add_argument("--delta", action="store_true", help="Subscribe clients to delta streams")
+    parser.add_argument("--source", default=None, help='"lake" or a fixture directory (defaults to --generate or settings)')
+    parser.add_argument("--generate", type=Path, help="Write seeded random-walk fixtures to this directory and replay them")
+    parser.add_argument("--sessions", type=int, default=10, help="Trading sessions per generated fixture")
+    parser.add_argument("--end-date", default="2025-11-07", help="Last session of generated fixtures (YYYY-MM-DD)")
+    parser.add_argument("--latency-ms", type=float, default=settings.replay_latency_ms)
+    parser.add_argument("--jitter-ms", type=float, default=settings.replay_latency_jitter_ms)
+    parser.add_argument("--error-rate", type=float, default=settings.replay_error_rate)
+    parser.add_argument("--seed", type=int, default=settings.replay_seed)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    if args.generate:
+        generate_fixtures(
+            args.generate, args.symbols, args.timeframe, args.sessions, date.fromisoformat(args.end_date), args.seed
+        )
+    args.source = args.source or (str(args.generate) if args.generate else settings.replay_source)
+
+    # Network-free run: replayed candles, no Redis round-trips
+    settings.primary_data_provider = "replay"
+    settings.redis_enabled = False
+
+    report = asyncio.run(run_benchmark(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"\nReplay benchmark: {report['symbols']} symbols x {report['iterations']} iterations, "
+          f"{report['clients']} clients, {report['elapsed_s']}s, {report['predictions_per_s']} predictions/s, "
+          f"{report['messages_delivered']} messages / {report['bytes_delivered']} bytes delivered")
+    print(f"{'stage':<12}{'count':>8}{'p50 ms':>12}{'p95 ms':>12}{'max ms':>12}")
+    for name, stats in report["stages"].items():
+        print(f"{name:<12}{stats.get('count', 0):>8}{stats.get('p50_ms', 0):>12}{stats.get('p95_ms', 0):>12}{stats.get('max_ms', 0):>12}")
+
+
+if __name__ == "__main__":
+    main()
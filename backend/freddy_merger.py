@@ -3,11 +3,10 @@ Freddy API - Prediction Merger
 Re-architected to use regime-aware gating, champion-challenger weighting,
 and probabilistic confidence bands.
 """
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 import asyncio
 from datetime import datetime
 import numpy as np
-import pandas as pd
 
 from backend.bots.rsi_bot import RSIBot
 from backend.bots.macd_bot import MACDBot
@@ -21,6 +20,8 @@ from backend.ml.training.registry import ExperimentRegistry
 from backend.ml.validators import prediction_validator
 from backend.services.regime_detector import detect_regime
 from backend.services.model_performance_tracker import model_performance_tracker
+from backend.utils.candle_frame import CandleFrame, candles_to_dataframe
+from backend.utils.feature_context import feature_context
 from backend.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -224,12 +225,14 @@ class FreddyMerger:
     async def predict(
         self,
         symbol: str,
-        candles: List[Dict],
+        candles: Union[List[Dict], CandleFrame],
         horizon_minutes: int = 180,
         timeframe: str = "5m",
         selected_bots: Optional[List[str]] = None,
     ) -> Dict:
         logger.info("Freddy predicting for %s horizon=%sm", symbol, horizon_minutes)
+        # Parse once; every bot gets zero-copy views of the same columns
+        candles = CandleFrame.coerce(candles)
 
         reference_close = self._extract_reference_close(candles)
         if reference_close is None:
@@ -260,8 +263,10 @@ class FreddyMerger:
             elif hasattr(bot, "_load_or_create_models"):
                 bot._load_or_create_models()
 
-        bot_tasks = [bot.predict(candles, horizon_minutes, timeframe) for bot in bots_to_use]
-        bot_predictions = await asyncio.gather(*bot_tasks, return_exceptions=True)
+        # Bots share one comprehensive feature frame for these candles
+        with feature_context():
+            bot_tasks = [bot.predict(candles, horizon_minutes, timeframe) for bot in bots_to_use]
+            bot_predictions = await asyncio.gather(*bot_tasks, return_exceptions=True)
 
         sanitization_summary = {"retained": [], "dropped": [], "sanitized": []}
         valid_predictions = []
@@ -325,7 +330,7 @@ class FreddyMerger:
         # Capture feature snapshot for audit trail
         feature_snapshot = {}
         if candles:
-            df = pd.DataFrame(candles)
+            df = candles_to_dataframe(candles)
             if len(df) > 20:
                 feature_snapshot = {
                     "latest_close": float(df['close'].iloc[-1]),
@@ -9,6 +9,7 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.triggers.cron import CronTrigger
 from contextlib import asynccontextmanager
+import functools
 import logging
 import json
 import asyncio
@@ -16,12 +17,18 @@ import pytz
 from typing import Dict, Set
 from datetime import datetime, timedelta
 
-from backend.database import init_db, SessionLocal, Candle
+from backend.database import init_db, SessionLocal
 from backend.routes import history, prediction, evaluation, recommendation, debug, models, training, market, intraday, freddy, versioning, ai_training
 from backend.utils.data_fetcher import data_fetcher
+from backend.utils.rate_limiter import FetchPriority, fetch_priority
 from backend.freddy_merger import freddy_merger
+from backend.services.candle_repository import candle_repository
+from backend.data_pipeline import DataPipeline
 from backend.config import settings
 from backend.websocket_manager import manager
+from backend.utils.broadcast_bus import broadcast_bus
+from backend.utils.exchange_calendar import IST, exchange_calendar
+from backend.services.candle_close_scheduler import CandleCloseScheduler, closed_candles
 from backend.utils.metrics import record_prediction, update_websocket_connections, record_regime
 
 # Configure structured logging
@@ -30,6 +37,7 @@ configure_logging(settings.log_level)
 logger = get_logger(__name__)
 
 scheduler = AsyncIOScheduler()
+_data_pipeline = DataPipeline()
 
 
 def get_network_ip():
@@ -46,278 +54,283 @@ def get_network_ip():
         return "Unable to detect"
 
 
-async def scheduled_data_fetch_and_predict():
+# Candle history fetched for predictions, per timeframe
+# NOTE: Yahoo Finance requires at least 5d period for 5m intervals on Indian stocks
+_PREDICTION_PERIODS = {
+    "1m": "7d",
+    "5m": "5d",
+    "15m": "5d",
+    "30m": "5d",
+    "1h": "5d",
+    "4h": "5d",
+    "1d": "1mo"
+}
+
+
+async def _predict_and_publish(db, symbol: str, timeframe: str, candles: list):
+    """Generate, store and broadcast a prediction for symbol/timeframe from its candles"""
+    # Generate prediction
+    request_id = get_request_id()
+    logger.info(
+        "generating_prediction",
+        request_id=request_id,
+        symbol=symbol,
+        timeframe=timeframe,
+        horizon_minutes=settings.default_horizon_minutes,
+        candles_count=len(candles)
+    )
+    start_time = datetime.utcnow()
+    
+    prediction_result = await freddy_merger.predict(
+        symbol=symbol,
+        candles=candles,
+        horizon_minutes=settings.default_horizon_minutes,
+        timeframe=timeframe
+    )
+    
+    latency_ms = (datetime.utcnow() - start_time).total_seconds() * 1000
+    
+    try:
+        regime = prediction_result.get("trend", {}).get("regime", "unknown")
+        record_regime(symbol, timeframe, str(regime))
+    except Exception as regime_error:  # pragma: no cover - non-critical metric
+        logger.warning("Failed to record regime metric", error=str(regime_error))
+    
+    # Log prediction with full context
+    feature_snapshot = {
+        "last_candles": [candles[i] for i in range(max(0, len(candles)-5), len(candles))],
+        "latest_price": candles[-1]["close"] if candles else None,
+        "price_range": {
+            "min": min(c.get("low", 0) for c in candles[-20:]) if len(candles) >= 20 else None,
+            "max": max(c.get("high", 0) for c in candles[-20:]) if len(candles) >= 20 else None
+        },
+        "volume_avg": sum(c.get("volume", 0) for c in candles[-20:]) / min(20, len(candles)) if candles else None
+    }
+    
+    logger.info(
+        "prediction_generated",
+        request_id=request_id,
+        symbol=symbol,
+        timeframe=timeframe,
+        horizon_minutes=settings.default_horizon_minutes,
+        prediction_count=len(prediction_result.get("predicted_series", [])),
+        confidence=prediction_result.get("overall_confidence"),
+        bot_contributions_count=len(prediction_result.get("bot_contributions", {})),
+        latency_ms=round(latency_ms, 2),
+        input_candles_count=len(candles),
+        feature_snapshot=feature_snapshot,
+        trend=prediction_result.get("trend", {}),
+        model_version=prediction_result.get("model_version", "unknown")
+    )
+    
+    # Store prediction
+    from backend.database import Prediction
+    prediction = Prediction(
+        symbol=prediction_result["symbol"],
+        produced_at=datetime.fromisoformat(
+            prediction_result["produced_at"].replace('Z', '+00:00')
+        ),
+        horizon_minutes=prediction_result["horizon_minutes"],
+        timeframe=prediction_result["timeframe"],
+        predicted_series=prediction_result["predicted_series"],
+        confidence=prediction_result["overall_confidence"],
+        bot_contributions=prediction_result["bot_contributions"],
+        trend=prediction_result.get("trend")
+    )
+    db.add(prediction)
+    db.commit()
+    
+    # Broadcast prediction
+    await manager.broadcast_prediction(prediction_result)
+    
+    # Record metrics
+    record_prediction("freddy_merger", symbol, timeframe, latency_ms / 1000.0)
+    update_websocket_connections(len(manager.active_connections))
+    
+    logger.info(f"Prediction generated and broadcast for {symbol}")
+
+
+async def _bar_close_subscriptions():
+    """Every worker's subscriptions plus the default symbol/timeframe (always predicted)"""
+    default = {"symbol": settings.default_symbol, "timeframe": settings.yahoo_finance_interval}
+    return await broadcast_bus.cluster_subscriptions(manager.get_all_subscriptions() + [default])
+
+
+async def scheduled_bar_close(timeframe: str, symbols: list, close_at: datetime):
     """
-    Background task that runs every N minutes:
-    1. Fetch latest candles
+    Runs when a bar of `timeframe` closes, for the symbols subscribed to it:
+    1. Fetch the closed bar (one batched provider call)
     2. Store in DB
-    3. Generate predictions
-    4. Broadcast updates
+    3. Broadcast the candle
+    4. Generate, store and broadcast predictions
     """
-    logger.info("Running scheduled data fetch and prediction...")
+    if not broadcast_bus.is_leader():
+        return
+    logger.info("Bar closed", timeframe=timeframe, symbols=len(symbols), close_at=close_at.isoformat())
+    
+    with fetch_priority(FetchPriority.LIVE):
+        candles_by_symbol = await data_fetcher.fetch_candles_batch(
+            symbols,
+            interval=timeframe,
+            period=_PREDICTION_PERIODS.get(timeframe, "5d"),
+            bypass_cache=True
+        )
     
     db = SessionLocal()
     try:
-        # Get default symbol and timeframe
-        symbol = settings.default_symbol
-        timeframe = settings.yahoo_finance_interval
-        
-        # Fetch latest candles
-        # NOTE: Yahoo Finance requires at least 5d period for 5m intervals on Indian stocks
-        try:
-            period_map = {
-                "1m": "7d",
-                "5m": "5d",  # Changed from 1d to 5d - Yahoo Finance requirement
-                "15m": "5d",
-                "1h": "5d",
-                "4h": "5d",
-                "1d": "1mo"
-            }
-            period = period_map.get(timeframe, "5d")
-            
-            candles = await data_fetcher.fetch_candles(
-                symbol=symbol,
-                interval=timeframe,
-                period=period
-            )
-            
+        for symbol in symbols:
+            # Drop the bar that started at the close and is still forming
+            candles = closed_candles(candles_by_symbol.get(symbol) or [], close_at)
             if not candles:
                 logger.debug(f"No candles fetched for {symbol} (may be market closed or symbol unavailable)")
-                return
-        except Exception as e:
-            logger.debug(f"Failed to fetch candles for {symbol}: {e}")
-            return
-        
-        # Store in database
-        for candle_data in candles[-10:]:  # Store last 10 candles
-            # Convert start_ts from ISO string to datetime if needed
-            candle_dict = candle_data.copy()
-            if isinstance(candle_dict.get('start_ts'), str):
-                candle_dict['start_ts'] = datetime.fromisoformat(
-                    candle_dict['start_ts'].replace('Z', '+00:00')
-                )
-            
-            # Check if exists (compare datetime objects)
-            existing = db.query(Candle).filter(
-                Candle.symbol == symbol,
-                Candle.timeframe == timeframe,
-                Candle.start_ts == candle_dict["start_ts"]
-            ).first()
-            
-            if not existing:
-                candle = Candle(
+                continue
+            try:
+                # Store the last bars; the closed bar replaces its forming version
+                candle_repository.upsert_candles(db, symbol, timeframe, candles[-10:], update_existing=True)
+                db.commit()
+                
+                await manager.broadcast_candle(symbol, timeframe, candles[-1])
+                await _predict_and_publish(db, symbol, timeframe, candles)
+            except Exception as e:
+                logger.error(
+                    "Error in bar close prediction",
                     symbol=symbol,
                     timeframe=timeframe,
-                    **candle_dict
+                    error=str(e),
+                    error_type=type(e).__name__,
+                    exc_info=True
                 )
-                db.add(candle)
-        
-        db.commit()
-        
-        # Broadcast latest candle
-        if candles:
-            await manager.broadcast_candle(symbol, timeframe, candles[-1])
-        
-        # Generate prediction
-        request_id = get_request_id()
-        logger.info(
-            "generating_prediction",
-            request_id=request_id,
-            symbol=symbol,
-            timeframe=timeframe,
-            horizon_minutes=settings.default_horizon_minutes,
-            candles_count=len(candles)
-        )
-        start_time = datetime.utcnow()
-        
-        prediction_result = await freddy_merger.predict(
-            symbol=symbol,
-            candles=candles,
-            horizon_minutes=settings.default_horizon_minutes,
-            timeframe=timeframe
-        )
-        
-        latency_ms = (datetime.utcnow() - start_time).total_seconds() * 1000
-
-        try:
-            regime = prediction_result.get("trend", {}).get("regime", "unknown")
-            record_regime(symbol, timeframe, str(regime))
-        except Exception as regime_error:  # pragma: no cover - non-critical metric
-            logger.warning("Failed to record regime metric", error=str(regime_error))
-        
-        # Log prediction with full context
-        feature_snapshot = {
-            "last_candles": [candles[i] for i in range(max(0, len(candles)-5), len(candles))],
-            "latest_price": candles[-1]["close"] if candles else None,
-            "price_range": {
-                "min": min(c.get("low", 0) for c in candles[-20:]) if len(candles) >= 20 else None,
-                "max": max(c.get("high", 0) for c in candles[-20:]) if len(candles) >= 20 else None
-            },
-            "volume_avg": sum(c.get("volume", 0) for c in candles[-20:]) / min(20, len(candles)) if candles else None
-        }
-        
-        logger.info(
-            "prediction_generated",
-            request_id=request_id,
-            symbol=symbol,
-            timeframe=timeframe,
-            horizon_minutes=settings.default_horizon_minutes,
-            prediction_count=len(prediction_result.get("predicted_series", [])),
-            confidence=prediction_result.get("overall_confidence"),
-            bot_contributions_count=len(prediction_result.get("bot_contributions", {})),
-            latency_ms=round(latency_ms, 2),
-            input_candles_count=len(candles),
-            feature_snapshot=feature_snapshot,
-            trend=prediction_result.get("trend", {}),
-            model_version=prediction_result.get("model_version", "unknown")
-        )
-        
-        # Store prediction
-        from backend.database import Prediction
-        prediction = Prediction(
-            symbol=prediction_result["symbol"],
-            produced_at=datetime.fromisoformat(
-                prediction_result["produced_at"].replace('Z', '+00:00')
-            ),
-            horizon_minutes=prediction_result["horizon_minutes"],
-            timeframe=prediction_result["timeframe"],
-            predicted_series=prediction_result["predicted_series"],
-            confidence=prediction_result["overall_confidence"],
-            bot_contributions=prediction_result["bot_contributions"],
-            trend=prediction_result.get("trend")
-        )
-        db.add(prediction)
-        db.commit()
-        
-        # Broadcast prediction
-        await manager.broadcast_prediction(prediction_result)
-        
-        # Record metrics
-        record_prediction("freddy_merger", symbol, timeframe, latency_ms / 1000.0)
-        update_websocket_connections(len(manager.active_connections))
-        
-        logger.info(f"Prediction generated and broadcast for {symbol}")
-        
-    except Exception as e:
-        logger.error(
-            "Error in scheduled data fetch and prediction task",
-            error=str(e),
-            error_type=type(e).__name__,
-            exc_info=True
-        )
-        db.rollback()
+                db.rollback()
     finally:
         db.close()
 
 
+bar_close_scheduler = CandleCloseScheduler(
+    scheduled_bar_close,
+    _bar_close_subscriptions,
+    settle_seconds=settings.bar_close_settle_seconds,
+)
+
+
 # Rate limiting for API calls - track last fetch time per symbol/timeframe
 _last_fetch_times: Dict[str, datetime] = {}
 _MIN_FETCH_INTERVAL = timedelta(seconds=5)  # Minimum 5 seconds between API calls per symbol/timeframe
 
 async def scheduled_realtime_candle_updates():
     """
-    Real-time candle updates - runs every 5 seconds
-    to broadcast live candle updates to all subscribed clients.
-    This provides TradingView-like real-time updates.
+    Real-time candle updates - runs every live_candle_poll_seconds (off by
+    default; closed bars come from scheduled_bar_close) to broadcast the
+    forming candle to all subscribed clients, TradingView-like.
     
     Uses rate limiting to prevent API overload and checks market hours
     to avoid unnecessary API calls when market is closed.
     """
-    # Quick check: if no active connections, skip entirely (performance optimization)
-    if not manager.active_connections:
-        return
-    
-    # Check if market is open (avoid API calls during non-trading hours)
-    if not exchange_calendar.is_market_open():
+    # Check if market is open (avoid API calls during non-trading hours);
+    # replayed candles are served at any time
+    if settings.primary_data_provider != "replay" and not exchange_calendar.is_market_open(datetime.now(IST)):
         # Market is closed, skip data fetch
         return
     
-    # Get all active subscriptions
-    subscriptions = manager.get_all_subscriptions()
+    # Get active subscriptions of every worker (this job only runs on the
+    # scheduler leader; updates reach other workers through the broadcast bus)
+    subscriptions = await broadcast_bus.cluster_subscriptions(manager.get_all_subscriptions())
     
     if not subscriptions:
         return  # No active subscriptions
     
+    # Group symbols by timeframe and by whether the rate limit allows a fresh
+    # API fetch, so each group is pulled with one batched provider call
+    groups: Dict[tuple, Dict[str, None]] = {}
+    now = datetime.utcnow()
+    for subscription in subscriptions:
+        symbol = subscription.get("symbol")
+        timeframe = subscription.get("timeframe")
+        
+        if not symbol or not timeframe:
+            continue
+        
+        # Rate limiting: check if we should fetch from API or use cache
+        cache_key = f"{symbol}_{timeframe}"
+        last_fetch = _last_fetch_times.get(cache_key)
+        should_fetch_from_api = False
+        if last_fetch is None or (now - last_fetch) >= _MIN_FETCH_INTERVAL:
+            should_fetch_from_api = True
+            _last_fetch_times[cache_key] = now
+        
+        groups.setdefault((timeframe, should_fetch_from_api), {})[symbol] = None
+    
     db = SessionLocal()
     try:
+        batches = list(groups.items())
+        # Fetch latest candles (use cache if rate limited, otherwise bypass cache);
+        # live subscriptions are served first from the provider budgets
+        with fetch_priority(FetchPriority.LIVE):
+            results = await asyncio.gather(
+                *(
+                    data_fetcher.fetch_candles_batch(
+                        list(symbols),
+                        interval=timeframe,
+                        period="1d",
+                        bypass_cache=should_fetch_from_api
+                    )
+                    for (timeframe, should_fetch_from_api), symbols in batches
+                ),
+                return_exceptions=True
+            )
         
-        # Fetch updates for each subscribed symbol/timeframe
-        for subscription in subscriptions:
-            symbol = subscription.get("symbol")
-            timeframe = subscription.get("timeframe")
-            
-            if not symbol or not timeframe:
+        broadcasts = []
+        for ((timeframe, _), symbols), candles_by_symbol in zip(batches, results):
+            if isinstance(candles_by_symbol, Exception):
+                logger.error(
+                    "Error fetching candle batch",
+                    timeframe=timeframe,
+                    symbols=len(symbols),
+                    error=str(candles_by_symbol),
+                    error_type=type(candles_by_symbol).__name__
+                )
                 continue
             
-            try:
-                # Rate limiting: check if we should fetch from API or use cache
-                cache_key = f"{symbol}_{timeframe}"
-                last_fetch = _last_fetch_times.get(cache_key)
-                now = datetime.utcnow()
-                
-                should_fetch_from_api = False
-                if last_fetch is None or (now - last_fetch) >= _MIN_FETCH_INTERVAL:
-                    should_fetch_from_api = True
-                    _last_fetch_times[cache_key] = now
-                
-                # Fetch latest candles (use cache if rate limited, otherwise bypass cache)
-                candles = await data_fetcher.fetch_candles(
-                    symbol=symbol,
-                    interval=timeframe,
-                    period="1d",
-                    bypass_cache=should_fetch_from_api  # Only bypass cache if not rate limited
-                )
-                
+            for symbol in symbols:
+                candles = candles_by_symbol.get(symbol)
                 if not candles:
                     continue
                 
                 # Get the latest candle (which is currently forming)
                 latest_candle = candles[-1]
                 
-                # Store in database if new
-                candle_dict = latest_candle.copy()
-                if isinstance(candle_dict.get('start_ts'), str):
-                    candle_dict['start_ts'] = datetime.fromisoformat(
-                        candle_dict['start_ts'].replace('Z', '+00:00')
+                try:
+                    # Insert, or merge into the stored candle (live update)
+                    candle_repository.upsert_candles(
+                        db, symbol, timeframe, [latest_candle], update_existing=True
                     )
-                
-                # Check if exists (compare datetime objects)
-                existing = db.query(Candle).filter(
-                    Candle.symbol == symbol,
-                    Candle.timeframe == timeframe,
-                    Candle.start_ts == candle_dict["start_ts"]
-                ).first()
-                
-                if not existing:
-                    candle = Candle(
+                except Exception as e:
+                    logger.error(
+                        "Error updating candle",
                         symbol=symbol,
                         timeframe=timeframe,
-                        **candle_dict
+                        error=str(e),
+                        error_type=type(e).__name__
                     )
-                    db.add(candle)
-                else:
-                    # Update existing candle (live update)
-                    existing.open = candle_dict.get('open', existing.open)
-                    existing.high = max(existing.high, candle_dict.get('high', existing.high))
-                    existing.low = min(existing.low, candle_dict.get('low', existing.low))
-                    existing.close = candle_dict.get('close', existing.close)
-                    existing.volume = candle_dict.get('volume', existing.volume)
-                
-                # Broadcast candle update to subscribed clients
-                await manager.broadcast_candle(symbol, timeframe, latest_candle)
-                
-            except Exception as e:
+                    continue
+                broadcasts.append((symbol, timeframe, latest_candle))
+        
+        # Commit all DB changes at once (batch commit is more efficient)
+        db.commit()
+        
+        # Broadcast candle updates to subscribed clients concurrently
+        sent = await asyncio.gather(
+            *(manager.broadcast_candle(symbol, timeframe, candle) for symbol, timeframe, candle in broadcasts),
+            return_exceptions=True
+        )
+        for (symbol, timeframe, _), outcome in zip(broadcasts, sent):
+            if isinstance(outcome, Exception):
                 logger.error(
-                    "Error updating candle",
+                    "Error broadcasting candle update",
                     symbol=symbol,
                     timeframe=timeframe,
-                    error=str(e),
-                    error_type=type(e).__name__
+                    error=str(outcome),
+                    error_type=type(outcome).__name__
                 )
-                continue
-        
-        # Commit all DB changes at once (batch commit is more efficient)
-        db.commit()
         
     except Exception as e:
         logger.error(
@@ -378,6 +391,29 @@ async def scheduled_auto_training():
     logger.info(f"   Bots: {bots}")
 
 
+async def scheduled_lake_compaction():
+    """Merge the small candle lake files written by the fetch loops."""
+    loop = asyncio.get_running_loop()
+    try:
+        await loop.run_in_executor(None, _data_pipeline.compact)
+    except Exception as e:
+        logger.error(
+            "Error compacting candle lake",
+            error=str(e),
+            error_type=type(e).__name__
+        )
+
+
+def _leader_only(job):
+    """Run a scheduled job only on the worker holding the scheduler lease, so its outputs are published once"""
+    @functools.wraps(job)
+    async def run():
+        if not broadcast_bus.is_leader():
+            return
+        await job()
+    return run
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup and shutdown"""
@@ -385,31 +421,30 @@ async def lifespan(app: FastAPI):
     logger.info("Starting trading prediction app...")
     init_db()
     
-    # Start scheduler
-    scheduler.add_job(
-        scheduled_data_fetch_and_predict,
-        trigger=IntervalTrigger(seconds=settings.prediction_interval),
-        id="data_fetch_and_predict",
-        name="Fetch data and generate predictions",
-        replace_existing=True
-    )
+    # Receive broadcasts published by any worker
+    await broadcast_bus.start(manager.deliver, manager.get_all_subscriptions)
     
-    # Start real-time candle updates scheduler (runs every 5 seconds to avoid overload)
-    scheduler.add_job(
-        scheduled_realtime_candle_updates,
-        trigger=IntervalTrigger(seconds=5),  # Update every 5 seconds to avoid scheduler overload
-        id="realtime_candle_updates",
-        name="Real-time candle updates",
-        replace_existing=True,
-        max_instances=3,  # Allow up to 3 concurrent instances to handle slow API responses
-        coalesce=True,  # Combine multiple pending executions into one
-        misfire_grace_time=10  # Allow 10 second delay before considering it a misfire
-    )
+    # Start scheduler
+    # Fetch, predict and broadcast at every bar close of the subscribed timeframes
+    bar_close_scheduler.start()
+    
+    # Optional forming-candle polling between bar closes
+    if settings.live_candle_poll_seconds > 0:
+        scheduler.add_job(
+            _leader_only(scheduled_realtime_candle_updates),
+            trigger=IntervalTrigger(seconds=settings.live_candle_poll_seconds),
+            id="realtime_candle_updates",
+            name="Real-time candle updates",
+            replace_existing=True,
+            max_instances=3,  # Allow up to 3 concurrent instances to handle slow API responses
+            coalesce=True,  # Combine multiple pending executions into one
+            misfire_grace_time=10  # Allow 10 second delay before considering it a misfire
+        )
     
     # Schedule automatic training at 9:00 AM IST daily
     ist = pytz.timezone('Asia/Kolkata')
     scheduler.add_job(
-        scheduled_auto_training,
+        _leader_only(scheduled_auto_training),
         trigger=CronTrigger(hour=9, minute=0, timezone=ist),
         id="auto_training_0900",
         name="Auto training at 9:00 AM IST",
@@ -418,16 +453,27 @@ async def lifespan(app: FastAPI):
     
     # Schedule automatic training at 3:30 PM IST daily
     scheduler.add_job(
-        scheduled_auto_training,
+        _leader_only(scheduled_auto_training),
         trigger=CronTrigger(hour=15, minute=30, timezone=ist),
         id="auto_training_1530",
         name="Auto training at 3:30 PM IST",
         replace_existing=True
     )
     
+    # Compact candle lake partitions in the background
+    scheduler.add_job(
+        _leader_only(scheduled_lake_compaction),
+        trigger=IntervalTrigger(minutes=settings.lake_compaction_interval_minutes),
+        id="lake_compaction",
+        name="Candle lake compaction",
+        replace_existing=True,
+        coalesce=True
+    )
+    
     scheduler.start()
-    logger.info(f"Scheduler started. Data fetch runs every {settings.prediction_interval} seconds.")
-    logger.info("✅ Real-time candle updates enabled (every 1 second)")
+    logger.info("Scheduler started. Data fetch and predictions run at each bar close (exchange sessions).")
+    if settings.live_candle_poll_seconds > 0:
+        logger.info(f"✅ Real-time candle updates enabled (every {settings.live_candle_poll_seconds} seconds)")
     logger.info("✅ Scheduled auto-training configured:")
     logger.info("   - 9:00 AM IST daily")
     logger.info("   - 3:30 PM IST daily")
@@ -454,6 +500,14 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     scheduler.shutdown()
+    await bar_close_scheduler.stop()
+    await broadcast_bus.stop()
+    # Write candles still buffered for the candle lake
+    await asyncio.get_running_loop().run_in_executor(None, data_fetcher.close)
+    # Close pooled Twelve Data connections
+    if settings.twelvedata_enabled:
+        from backend.services.twelvedata_service import twelvedata_service
+        twelvedata_service.close()
     logger.info("Application shutdown")
 
 
@@ -518,6 +572,11 @@ async def metrics():
     """Prometheus metrics endpoint"""
     return Response(content=get_metrics(), media_type="text/plain")
 
+@app.get("/ws/connections")
+async def websocket_connections():
+    """Per-connection WebSocket backlog: pending messages, lag, conflated and dropped counts"""
+    return {"connections": manager.get_connection_stats()}
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint with component-level status checks"""
@@ -526,6 +585,8 @@ async def health_check():
         "timestamp": datetime.utcnow().isoformat(),
         "active_connections": len(manager.active_connections),
         "scheduler_running": scheduler.running,
+        "broadcast_bus": broadcast_bus.name,
+        "scheduler_leader": broadcast_bus.is_leader(),
         "components": {}
     }
     
@@ -592,12 +653,15 @@ async def websocket_endpoint(websocket: WebSocket):
     WebSocket endpoint for real-time updates.
     
     Client messages:
-    - {"action": "subscribe", "symbol": "TCS.NS", "timeframe": "5m"}
+    - {"action": "subscribe", "symbol": "TCS.NS", "timeframe": "5m", "delta": true}
+    - {"action": "resync"}
     - {"action": "unsubscribe"}
     
     Server messages:
     - {"type": "candle:update", "symbol": "...", "candle": {...}}
     - {"type": "prediction:update", "symbol": "...", "predicted_series": [...]}
+    - With "delta": candle:snapshot / prediction:snapshot, then candle:delta /
+      prediction:delta with _base_sequence (see websocket_manager)
     """
     await manager.connect(websocket)
     
@@ -612,18 +676,23 @@ async def websocket_endpoint(websocket: WebSocket):
             if action == "subscribe":
                 symbol = message.get("symbol", settings.default_symbol)
                 timeframe = message.get("timeframe", settings.yahoo_finance_interval)
-                manager.subscribe(websocket, symbol, timeframe)
+                delta = bool(message.get("delta", False))
+                manager.subscribe(websocket, symbol, timeframe, delta=delta)
                 
                 # Send confirmation
                 await websocket.send_json({
                     "type": "subscribed",
                     "symbol": symbol,
-                    "timeframe": timeframe
+                    "timeframe": timeframe,
+                    "delta": delta
                 })
             
+            elif action == "resync":
+                # Delta client detected a _sequence gap: resend snapshots
+                manager.resync(websocket)
+            
             elif action == "unsubscribe":
-                if websocket in manager.subscriptions:
-                    del manager.subscriptions[websocket]
+                manager.unsubscribe(websocket)
                 await websocket.send_json({"type": "unsubscribed"})
             
             elif action == "ping":
@@ -659,6 +728,7 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8182,
         reload=True,
-        log_level="info"
+        log_level="info",
+        ws_per_message_deflate=settings.ws_per_message_deflate
     )
 
@@ -12,6 +12,7 @@ import logging
 
 from backend.services.freddy_ai_service import freddy_ai_service, FreddyAIResponse
 from backend.utils.data_fetcher import data_fetcher
+from backend.utils.rate_limiter import FetchPriority, fetch_priority
 from backend.database import SessionLocal, Candle, ModelTrainingRecord, Prediction, PredictionEvaluation
 from backend.utils.logger import get_logger
 from backend.services.technical_analysis_service import TechnicalAnalysisService
@@ -95,12 +96,13 @@ class AITrainingOrchestrator:
         period = period_map.get(timeframe, "60d")
         
         # ALWAYS bypass cache for training data
-        candles = await data_fetcher.fetch_candles(
-            symbol=symbol,
-            interval=timeframe,
-            period=period,
-            bypass_cache=True  # CRITICAL: Always get fresh data
-        )
+        with fetch_priority(FetchPriority.TRAINING):
+            candles = await data_fetcher.fetch_candles(
+                symbol=symbol,
+                interval=timeframe,
+                period=period,
+                bypass_cache=True  # CRITICAL: Always get fresh data
+            )
         
         if not candles:
             logger.error(f"No data fetched for {symbol}/{timeframe}")
@@ -358,8 +360,10 @@ class AITrainingOrchestrator:
                     )
                 )
             
-            # Wait for batch to complete
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            # Wait for batch to complete (Freddy calls are paced by the
+            # provider budget at training priority)
+            with fetch_priority(FetchPriority.TRAINING):
+                results = await asyncio.gather(*tasks, return_exceptions=True)
             
             for result in results:
                 if isinstance(result, Exception):
@@ -370,10 +374,6 @@ class AITrainingOrchestrator:
                     metadata["freddy_calls"] += 1
                 else:
                     failed_count += 1
-            
-            # Rate limiting: small delay between batches
-            if i + batch_size < len(sample_indices):
-                await asyncio.sleep(1)  # 1 second between batches
         
         # Calculate success rate
         total_attempts = len(sample_indices)
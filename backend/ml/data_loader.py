@@ -7,6 +7,7 @@ from datetime import datetime, timedelta
 import pandas as pd
 import numpy as np
 from backend.database import SessionLocal, Candle
+from backend.services.candle_repository import candle_repository
 from backend.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -134,6 +135,7 @@ class MLDataLoader:
             metadata["source"] = "yahoo_finance"
             
             from backend.utils.data_fetcher import data_fetcher
+            from backend.utils.rate_limiter import FetchPriority, fetch_priority
             
             # Map days to period
             period_map = {
@@ -142,11 +144,12 @@ class MLDataLoader:
             }
             period = period_map.get(timeframe, "60d")
             
-            fetched_candles = await data_fetcher.fetch_candles(
-                symbol=symbol,
-                interval=timeframe,
-                period=period
-            )
+            with fetch_priority(FetchPriority.TRAINING):
+                fetched_candles = await data_fetcher.fetch_candles(
+                    symbol=symbol,
+                    interval=timeframe,
+                    period=period
+                )
             
             if fetched_candles:
                 metadata["candles_from_yahoo"] = len(fetched_candles)
@@ -167,29 +170,7 @@ class MLDataLoader:
     ):
         """Store fetched candles to database"""
         try:
-            for candle_data in candles:
-                candle_dict = candle_data.copy()
-                # Convert start_ts if needed
-                if isinstance(candle_dict.get('start_ts'), str):
-                    candle_dict['start_ts'] = datetime.fromisoformat(
-                        candle_dict['start_ts'].replace('Z', '+00:00')
-                    )
-                
-                # Check if candle already exists
-                existing = db.query(Candle).filter(
-                    Candle.symbol == symbol,
-                    Candle.timeframe == timeframe,
-                    Candle.start_ts == candle_dict['start_ts']
-                ).first()
-                
-                if not existing:
-                    candle = Candle(
-                        symbol=symbol,
-                        timeframe=timeframe,
-                        **candle_dict
-                    )
-                    db.add(candle)
-            
+            candle_repository.upsert_candles(db, symbol, timeframe, candles)
             db.commit()
             logger.info(f"Stored {len(candles)} candles to DB for {symbol}/{timeframe}")
         except Exception as e:
@@ -4,7 +4,7 @@ Enhanced with volatility-aware validation and directional consistency checks.
 """
 from typing import Dict, List, Tuple, Optional
 import numpy as np
-import pandas as pd
+from backend.utils.candle_frame import candles_to_dataframe
 from backend.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -160,7 +160,7 @@ class PredictionValidator:
         """Check if predicted volatility aligns with actual market volatility"""
         try:
             # Calculate actual volatility from recent candles
-            df_actual = pd.DataFrame(recent_candles)
+            df_actual = candles_to_dataframe(recent_candles)
             if 'close' not in df_actual.columns:
                 return True, None, {}  # Skip if no close column
             
@@ -240,7 +240,7 @@ class PredictionValidator:
                 return True, None, {}
             
             # Determine recent trend direction
-            df_recent = pd.DataFrame(recent_candles)
+            df_recent = candles_to_dataframe(recent_candles)
             if 'close' not in df_recent.columns:
                 return True, None, {}
             
@@ -3,19 +3,15 @@ Backtesting API endpoints.
 """
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
-from typing import List, Optional, Dict
+from typing import Any, List, Optional, Dict
+import asyncio
 from datetime import datetime
 from sqlalchemy.orm import Session
+from backend.config import settings
 from backend.database import SessionLocal, BacktestResult
-from backend.utils.backtest_engine import backtest_engine
-from backend.utils.signal_strategies import (
-    MultiIndicatorStrategy,
-    RSIStrategy,
-    MACDCrossoverStrategy,
-    BollingerBandsStrategy,
-    ADXTrendStrategy,
-    VWAPStrategy
-)
+from backend.utils.backtest_engine import BacktestEngine, backtest_engine
+from backend.utils.signal_strategies import MultiIndicatorStrategy, STRATEGIES
+from backend.utils.parameter_sweep import grid_size, run_parameter_sweep
 from backend.utils.data_fetcher import data_fetcher
 import logging
 
@@ -45,19 +41,75 @@ class BacktestRequest(BaseModel):
     take_profit_pct: float = 0.0
     order_type: str = "market"
     timeframe: str = "5m"
+    mode: str = "event"  # event (bar-by-bar) or vectorized (indicators/signals precomputed once)
+
+
+class SweepRequest(BaseModel):
+    """Parameter sweep request model"""
+    symbol: str
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    initial_capital: float = 100000.0
+    strategy: str = "multi_indicator"
+    # e.g. {"stop_loss_pct": [0.01, 0.02], "oversold": [25, 30]}
+    param_grid: Dict[str, List[Any]] = {}
+    rank_by: str = "sharpe_ratio"
+    top_n: Optional[int] = 20  # None = return all combinations
+    max_workers: Optional[int] = None  # Clamped to the CPU count
+    persist: bool = True
+    timeframe: str = "5m"
+
+
+class PortfolioBacktestRequest(BaseModel):
+    """Multi-symbol portfolio backtest request model"""
+    symbols: List[str]
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    initial_capital: float = 1000000.0
+    strategy: str = "multi_indicator"
+    position_size_pct: float = 0.1  # Of total portfolio value per position
+    max_positions: int = 5  # Across all symbols
+    stop_loss_pct: float = 0.0
+    take_profit_pct: float = 0.0
+    timeframe: str = "5m"
 
 
 def get_strategy(strategy_name: str):
     """Get strategy instance by name"""
-    strategies = {
-        "multi_indicator": MultiIndicatorStrategy(),
-        "rsi": RSIStrategy(),
-        "macd": MACDCrossoverStrategy(),
-        "bollinger": BollingerBandsStrategy(),
-        "adx": ADXTrendStrategy(),
-        "vwap": VWAPStrategy()
-    }
-    return strategies.get(strategy_name, MultiIndicatorStrategy())
+    strategy_class = STRATEGIES.get(strategy_name, MultiIndicatorStrategy)
+    return strategy_class()
+
+
+def _parse_date(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+def _build_backtest_record(symbol: str, strategy_name: str, results: Dict, results_json: Dict) -> BacktestResult:
+    """Map engine/sweep results onto a BacktestResult row"""
+    return BacktestResult(
+        symbol=symbol,
+        strategy_name=strategy_name,
+        start_date=_parse_date(results["start_date"]),
+        end_date=_parse_date(results["end_date"]),
+        initial_capital=results["initial_capital"],
+        final_value=results["final_value"],
+        total_return_pct=results["metrics"]["total_return_pct"],
+        cagr_pct=results["metrics"]["cagr_pct"],
+        sharpe_ratio=results["metrics"]["sharpe_ratio"],
+        sortino_ratio=results["metrics"]["sortino_ratio"],
+        max_drawdown_pct=results["metrics"]["max_drawdown"]["max_drawdown_pct"],
+        volatility_pct=results["metrics"]["volatility_pct"],
+        total_trades=results["statistics"]["total_trades"],
+        winning_trades=results["statistics"]["winning_trades"],
+        losing_trades=results["statistics"]["losing_trades"],
+        win_rate=results["statistics"]["win_rate"],
+        profit_factor=results["statistics"].get("profit_factor"),  # Absent when no trades closed
+        results_json=results_json,
+        equity_curve=results["equity_curve"],
+        trades=results["trades"]
+    )
 
 
 @router.post("/run")
@@ -86,12 +138,8 @@ async def run_backtest(request: BacktestRequest, db: Session = Depends(get_db)):
             raise HTTPException(status_code=404, detail=f"No data found for {request.symbol}")
         
         # Parse dates
-        start_date = None
-        end_date = None
-        if request.start_date:
-            start_date = datetime.fromisoformat(request.start_date.replace('Z', '+00:00'))
-        if request.end_date:
-            end_date = datetime.fromisoformat(request.end_date.replace('Z', '+00:00'))
+        start_date = _parse_date(request.start_date)
+        end_date = _parse_date(request.end_date)
         
         # Get strategy
         strategy = get_strategy(request.strategy)
@@ -109,32 +157,12 @@ async def run_backtest(request: BacktestRequest, db: Session = Depends(get_db)):
             position_size_pct=request.position_size_pct,
             max_positions=request.max_positions,
             stop_loss_pct=request.stop_loss_pct,
-            take_profit_pct=request.take_profit_pct
+            take_profit_pct=request.take_profit_pct,
+            mode=request.mode
         )
         
         # Save to database
-        backtest_record = BacktestResult(
-            symbol=request.symbol,
-            strategy_name=request.strategy,
-            start_date=datetime.fromisoformat(results["start_date"].replace('Z', '+00:00')),
-            end_date=datetime.fromisoformat(results["end_date"].replace('Z', '+00:00')),
-            initial_capital=results["initial_capital"],
-            final_value=results["final_value"],
-            total_return_pct=results["metrics"]["total_return_pct"],
-            cagr_pct=results["metrics"]["cagr_pct"],
-            sharpe_ratio=results["metrics"]["sharpe_ratio"],
-            sortino_ratio=results["metrics"]["sortino_ratio"],
-            max_drawdown_pct=results["metrics"]["max_drawdown"]["max_drawdown_pct"],
-            volatility_pct=results["metrics"]["volatility_pct"],
-            total_trades=results["statistics"]["total_trades"],
-            winning_trades=results["statistics"]["winning_trades"],
-            losing_trades=results["statistics"]["losing_trades"],
-            win_rate=results["statistics"]["win_rate"],
-            profit_factor=results["statistics"]["profit_factor"],
-            results_json=results,
-            equity_curve=results["equity_curve"],
-            trades=results["trades"]
-        )
+        backtest_record = _build_backtest_record(request.symbol, request.strategy, results, results)
         
         db.add(backtest_record)
         db.commit()
@@ -157,6 +185,201 @@ async def run_backtest(request: BacktestRequest, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/portfolio")
+async def run_portfolio_backtest(request: PortfolioBacktestRequest, db: Session = Depends(get_db)):
+    """
+    Backtest a basket of symbols sharing one capital pool and position limit.
+    
+    Args:
+        request: Portfolio backtest configuration
+        db: Database session
+    
+    Returns:
+        Portfolio backtest results with per-symbol breakdown
+    """
+    symbols = list(dict.fromkeys(request.symbols))
+    if not symbols:
+        raise HTTPException(status_code=400, detail="At least one symbol is required")
+    
+    try:
+        period = "1mo" if not request.start_date else "max"
+        fetched = await asyncio.gather(
+            *[
+                data_fetcher.fetch_candles(
+                    symbol=symbol,
+                    interval=request.timeframe,
+                    period=period,
+                    bypass_cache=False
+                )
+                for symbol in symbols
+            ],
+            return_exceptions=True
+        )
+        
+        candles_by_symbol = {}
+        for symbol, candles in zip(symbols, fetched):
+            if isinstance(candles, Exception) or not candles:
+                logger.warning(f"Skipping {symbol} in portfolio backtest: no data ({candles if isinstance(candles, Exception) else 'empty'})")
+                continue
+            candles_by_symbol[symbol] = candles
+        
+        if not candles_by_symbol:
+            raise HTTPException(status_code=404, detail="No data found for any requested symbol")
+        
+        logger.info(f"Running portfolio backtest for {len(candles_by_symbol)} symbols with {request.strategy} strategy")
+        loop = asyncio.get_event_loop()
+        results = await loop.run_in_executor(
+            None,
+            lambda: BacktestEngine().run_portfolio_backtest(
+                candles_by_symbol=candles_by_symbol,
+                initial_capital=request.initial_capital,
+                strategy=get_strategy(request.strategy),
+                start_date=_parse_date(request.start_date),
+                end_date=_parse_date(request.end_date),
+                position_size_pct=request.position_size_pct,
+                max_positions=request.max_positions,
+                stop_loss_pct=request.stop_loss_pct,
+                take_profit_pct=request.take_profit_pct
+            )
+        )
+        
+        backtest_record = _build_backtest_record(
+            ",".join(results["symbols"]), request.strategy, results, results
+        )
+        db.add(backtest_record)
+        db.commit()
+        db.refresh(backtest_record)
+        
+        return {
+            "backtest_id": backtest_record.id,
+            "results": results,
+            "summary": {
+                "symbols": len(results["symbols"]),
+                "total_return": f"{results['metrics']['total_return_pct']:.2f}%",
+                "sharpe_ratio": results['metrics']['sharpe_ratio'],
+                "max_drawdown": f"{results['metrics']['max_drawdown']['max_drawdown_pct']:.2f}%",
+                "win_rate": f"{results['statistics']['win_rate']:.2f}%",
+                "total_trades": results['statistics']['total_trades']
+            }
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Portfolio backtest error: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/sweep")
+async def run_sweep(request: SweepRequest, db: Session = Depends(get_db)):
+    """
+    Backtest every combination of a parameter grid and return them ranked.
+    
+    Indicators are computed once for the symbol and shared by all combinations,
+    which run in parallel worker processes.
+    
+    Args:
+        request: Sweep configuration
+        db: Database session
+    
+    Returns:
+        Ranked table of parameter combinations with performance metrics
+    """
+    if request.strategy not in STRATEGIES:
+        raise HTTPException(status_code=400, detail=f"Unknown strategy '{request.strategy}'")
+    combinations = grid_size(request.param_grid)
+    if combinations > settings.backtest_sweep_max_combinations:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Parameter grid has {combinations} combinations "
+                   f"(limit: {settings.backtest_sweep_max_combinations})"
+        )
+    
+    try:
+        period = "1mo" if not request.start_date else "max"
+        candles = await data_fetcher.fetch_candles(
+            symbol=request.symbol,
+            interval=request.timeframe,
+            period=period,
+            bypass_cache=False
+        )
+        
+        if not candles:
+            raise HTTPException(status_code=404, detail=f"No data found for {request.symbol}")
+        
+        logger.info(f"Running parameter sweep for {request.symbol} with {request.strategy} strategy")
+        loop = asyncio.get_event_loop()
+        try:
+            ranked = await loop.run_in_executor(
+                None,
+                lambda: run_parameter_sweep(
+                    symbol=request.symbol,
+                    candles=candles,
+                    param_grid=request.param_grid,
+                    strategy_name=request.strategy,
+                    initial_capital=request.initial_capital,
+                    start_date=_parse_date(request.start_date),
+                    end_date=_parse_date(request.end_date),
+                    rank_by=request.rank_by,
+                    max_workers=request.max_workers
+                )
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        backtest_ids = []
+        if request.persist and ranked:
+            records = [
+                _build_backtest_record(
+                    request.symbol,
+                    request.strategy,
+                    result,
+                    {
+                        "sweep": True,
+                        "params": result["params"],
+                        "rank": result["rank"],
+                        "rank_by": request.rank_by,
+                        "metrics": result["metrics"],
+                        "statistics": result["statistics"]
+                    }
+                )
+                for result in ranked
+            ]
+            # Single transaction for the whole grid
+            db.add_all(records)
+            db.commit()
+            backtest_ids = [record.id for record in records]
+        
+        table = [
+            {
+                "rank": result["rank"],
+                "params": result["params"],
+                "score": result["score"],
+                "final_value": result["final_value"],
+                "metrics": result["metrics"],
+                "statistics": result["statistics"],
+                "backtest_id": backtest_ids[idx] if backtest_ids else None
+            }
+            for idx, result in enumerate(ranked)
+        ]
+        if request.top_n is not None:
+            table = table[:request.top_n]
+        
+        return {
+            "symbol": request.symbol,
+            "strategy": request.strategy,
+            "rank_by": request.rank_by,
+            "combinations": len(ranked),
+            "results": table
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Parameter sweep error: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/results")
 async def get_backtest_results(
     symbol: Optional[str] = Query(None),
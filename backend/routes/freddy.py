@@ -10,7 +10,7 @@ from sqlalchemy.orm import Session
 from backend.database import Candle, get_db
 from backend.services.freddy_ai_service import freddy_ai_service
 from backend.utils.data_fetcher import data_fetcher
-from backend.utils.indicators import calculate_all_indicators, get_latest_indicators
+from backend.utils.indicator_cache import indicator_cache
 from backend.utils.logger import get_logger
 
 
@@ -164,8 +164,7 @@ async def run_custom_prompt(
 
     candles = await _load_candles(db, request.symbol, request.timeframe)
 
-    df = calculate_all_indicators(candles)
-    indicators = get_latest_indicators(df)
+    indicators = indicator_cache.get_latest(request.symbol, request.timeframe, candles)
 
     current_price = None
     if candles:
@@ -14,6 +14,7 @@ from backend.database import get_db, Candle
 from backend.utils.data_fetcher import data_fetcher
 from backend.utils.exchange_calendar import exchange_calendar
 from backend.data_pipeline import FeatureStore
+from backend.services.candle_repository import candle_repository
 from backend.services.window_loader import (
     TIMEFRAME_MINUTES as _TA_TIMEFRAME_MINUTES,
     WINDOW_DAYS as _TA_WINDOW_DAYS,
@@ -266,6 +267,7 @@ async def get_history(
             existing_timestamps = {c.start_ts for c in candles}
         
         new_candles_to_store = []
+        rows_to_store = []
         ist = pytz.timezone('Asia/Kolkata')
         current_time = datetime.now(ist)
         
@@ -308,12 +310,7 @@ async def get_history(
                 
                 candle_dict = candle_data.copy()
                 candle_dict['start_ts'] = candle_ts
-                candle = Candle(
-                    symbol=symbol,
-                    timeframe=timeframe,
-                    **candle_dict
-                )
-                db.add(candle)
+                rows_to_store.append(candle_dict)
                 new_candles_to_store.append(candle_data)
                 existing_timestamps.add(candle_ts)
             except (ValueError, AttributeError) as e:
@@ -321,10 +318,11 @@ async def get_history(
                 continue
         
         try:
+            candle_repository.upsert_candles(db, symbol, timeframe, rows_to_store)
             db.commit()
         except Exception as e:
             db.rollback()
-            # Duplicate entries are OK, just continue
+            logger.warning(f"Failed to store fetched candles for {symbol}/{timeframe}: {e}")
         
         # Merge fetched candles with DB candles if we had some
         if candles:
@@ -10,7 +10,7 @@ import logging
 
 from backend.database import get_db
 from backend.freddy_merger import freddy_merger
-from backend.utils.indicators import calculate_all_indicators, get_latest_indicators
+from backend.utils.indicator_cache import indicator_cache
 from backend.utils.candlestick_patterns import detect_all_patterns, get_pattern_sentiment
 from backend.bots.rsi_bot import RSIBot
 from backend.bots.macd_bot import MACDBot
@@ -226,8 +226,7 @@ async def get_comprehensive_intraday_prediction(
         prediction_candles = ta_candles[-PREDICTION_CANDLE_LIMIT:]
 
         # 1. Calculate all technical indicators on the full TA window
-        df = calculate_all_indicators(ta_candles)
-        latest_indicators = get_latest_indicators(df)
+        latest_indicators = indicator_cache.get_latest(symbol, timeframe, ta_candles)
         
         # 2. Detect candlestick patterns
         patterns = detect_all_patterns(ta_candles)
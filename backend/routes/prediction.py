@@ -4,7 +4,7 @@ Prediction endpoints.
 from fastapi import APIRouter, Depends, Query, HTTPException
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Union
 from datetime import datetime, timedelta
 import time
 import os
@@ -13,11 +13,13 @@ import logging
 from backend.database import get_db, Prediction, Candle, ModelTrainingRecord
 from backend.ml.training import TrainingOrchestrator
 from backend.freddy_merger import freddy_merger
+from backend.utils.candle_frame import CandleFrame
 from backend.utils.data_fetcher import data_fetcher
 from backend.websocket_manager import manager
 from backend.services.prediction_evaluator import prediction_evaluator
 import asyncio
 from backend.services.candle_loader import candle_loader
+from backend.services.candle_repository import candle_repository
 
 logger = logging.getLogger(__name__)
 
@@ -217,29 +219,16 @@ async def trigger_prediction(
             raise HTTPException(status_code=404, detail="No data available for symbol")
         
         # Store in DB
-        for candle_data in fetched_candles:
-            # Convert start_ts from ISO string to datetime if needed
-            candle_dict = candle_data.copy()
-            if isinstance(candle_dict.get('start_ts'), str):
-                candle_dict['start_ts'] = datetime.fromisoformat(
-                    candle_dict['start_ts'].replace('Z', '+00:00')
-                )
-            candle = Candle(
-                symbol=request.symbol,
-                timeframe=request.timeframe,
-                **candle_dict
-            )
-            db.add(candle)
-        
+        candle_repository.upsert_candles(db, request.symbol, request.timeframe, fetched_candles)
         db.commit()
         candles_list = fetched_candles
     else:
         candles_list = [c.to_dict() for c in reversed(candles)]
     
-    # Run Freddy prediction
+    # Run Freddy prediction (bots share one columnar copy of the candles)
     result = await freddy_merger.predict(
         symbol=request.symbol,
-        candles=candles_list,
+        candles=CandleFrame.from_records(candles_list),
         horizon_minutes=request.horizon_minutes,
         timeframe=request.timeframe,
         selected_bots=request.selected_bots
@@ -425,7 +414,7 @@ async def get_available_bots():
 
 async def train_bot_incremental(
     bot,
-    candles_list: List[Dict],
+    candles_list: Union[List[Dict], CandleFrame],
     training_record: ModelTrainingRecord,
     epochs: int,
     batch_size: int,
@@ -437,7 +426,10 @@ async def train_bot_incremental(
             raise ValueError("No candles supplied for incremental training")
 
         # Sort candles by start_ts ascending (oldest first)
-        candles_list = sorted(candles_list, key=lambda x: x.get('start_ts', ''))
+        if isinstance(candles_list, CandleFrame):
+            candles_list = candles_list.sorted()
+        else:
+            candles_list = sorted(candles_list, key=lambda x: x.get('start_ts', ''))
         
         # Split into batches
         total_batches = (len(candles_list) + batch_size - 1) // batch_size
@@ -457,16 +449,12 @@ async def train_bot_incremental(
             },
         )
         
-        # Initialize accumulated data for incremental training
-        accumulated_candles = []
-        
         for batch_num in range(total_batches):
-            start_idx = batch_num * batch_size
             end_idx = min((batch_num + 1) * batch_size, len(candles_list))
-            batch_candles = candles_list[start_idx:end_idx]
             
-            # Accumulate candles (include previous batches)
-            accumulated_candles.extend(batch_candles)
+            # Accumulate candles (include previous batches); a prefix slice
+            # of a CandleFrame is a view
+            accumulated_candles = candles_list[:end_idx]
             
             # Update progress
             progress_percent = ((batch_num + 1) / total_batches) * 100
@@ -559,6 +547,7 @@ async def train_bot(
             fallback_period=fallback_period,
             min_points=500,
             bypass_cache=True,
+            as_frame=True,
         )
 
         if not candles_list:
@@ -397,6 +397,7 @@ async def train_model_async(bot, symbol: str, timeframe: str, db: Session):
     """Async wrapper for model training"""
     import time
     from backend.utils.data_fetcher import data_fetcher
+    from backend.utils.rate_limiter import FetchPriority, fetch_priority
     from backend.database import ModelTrainingRecord
     
     start_time = time.time()
@@ -416,7 +417,8 @@ async def train_model_async(bot, symbol: str, timeframe: str, db: Session):
         }
         period = period_map.get(timeframe, "60d")
         
-        candles = await data_fetcher.fetch_candles(symbol, timeframe, period, bypass_cache=True)
+        with fetch_priority(FetchPriority.TRAINING):
+            candles = await data_fetcher.fetch_candles(symbol, timeframe, period, bypass_cache=True)
         
         if not candles or len(candles) < 300:
             logger.warning(f"Not enough data for {symbol}/{timeframe}: {len(candles) if candles else 0} candles (required: 300)")
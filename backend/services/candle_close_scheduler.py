@@ -0,0 +1,153 @@
+"""
+Candle-close scheduler.
+
+Replaces fixed-interval polling with one job per timeframe that runs when
+that timeframe's bars close. Closes come from the ExchangeCalendar sessions
+(bars aligned to the session open, the last one ending at the possibly early
+close), so nothing runs after hours, on weekends or on holidays: the
+scheduler sleeps until the next close of any timeframe, and only timeframes
+with subscribers get a job. A job still running when its timeframe closes
+again is not started twice; the newest close is run once it finishes.
+"""
+import asyncio
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from backend.utils.exchange_calendar import IST, ExchangeCalendar, exchange_calendar
+from backend.utils.logger import get_logger
+from backend.utils.metrics import record_bar_close_job
+
+logger = get_logger(__name__)
+
+# Bar length per timeframe; a session or longer means the bar closes at market close
+TIMEFRAME_MINUTES = {"1m": 1, "5m": 5, "15m": 15, "30m": 30, "1h": 60, "4h": 240, "1d": 1440}
+
+BarCloseJob = Callable[[str, List[str], datetime], Awaitable[None]]
+SubscriptionsSource = Callable[[], Awaitable[List[Dict]]]
+
+
+def closed_candles(candles: List[Dict], close_at: datetime) -> List[Dict]:
+    """
+    Candles (sorted by start_ts) that closed by `close_at`.
+
+    A few seconds after a close, intraday providers already return the bar
+    starting at `close_at`; that one is still forming and is dropped.
+    """
+    end = len(candles)
+    while end and datetime.fromisoformat(str(candles[end - 1]["start_ts"]).replace("Z", "+00:00")) >= close_at:
+        end -= 1
+    return candles[:end]
+
+
+class CandleCloseScheduler:
+    """Runs a job per subscribed timeframe at each bar close (see module docstring)"""
+
+    def __init__(
+        self,
+        job: BarCloseJob,
+        subscriptions: SubscriptionsSource,
+        calendar: ExchangeCalendar = exchange_calendar,
+        settle_seconds: float = 2.0,
+        timeframes: Optional[Dict[str, int]] = None,
+    ):
+        """
+        Args:
+            job: Called with (timeframe, symbols, bar close time)
+            subscriptions: Returns the current {"symbol", "timeframe"} subscriptions
+            calendar: Trading sessions the bar closes are aligned to
+            settle_seconds: Delay after a close so providers have published the bar
+            timeframes: Bar length in minutes per timeframe (defaults to TIMEFRAME_MINUTES)
+        """
+        self._job = job
+        self._subscriptions = subscriptions
+        self.calendar = calendar
+        self.settle_seconds = max(0.0, float(settle_seconds))
+        self.timeframes = timeframes or TIMEFRAME_MINUTES
+        self._task: Optional[asyncio.Task] = None
+        self._last_close: Optional[datetime] = None
+        self._running: Dict[str, asyncio.Task] = {}
+        self._pending: Dict[str, Tuple[List[str], datetime]] = {}
+
+    def next_closes(self, now: datetime) -> Dict[str, datetime]:
+        """Next bar close of every timeframe strictly after `now`"""
+        return {
+            timeframe: self.calendar.get_next_bar_close(now, minutes)
+            for timeframe, minutes in self.timeframes.items()
+        }
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        tasks = [task for task in [self._task, *self._running.values()] if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._running.clear()
+        self._pending.clear()
+
+    async def _run(self):
+        while True:
+            now = datetime.now(IST)
+            if self._last_close is not None and now < self._last_close:
+                # Woken early: never fire the same close twice
+                now = self._last_close
+            closes = self.next_closes(now)
+            close_at = min(closes.values())
+            logger.debug("Sleeping until bar close", close_at=close_at.isoformat())
+            await asyncio.sleep((close_at - datetime.now(IST)).total_seconds() + self.settle_seconds)
+            self._last_close = close_at
+
+            try:
+                subscriptions = await self._subscriptions()
+            except Exception as e:
+                logger.error("Reading subscriptions for bar close failed", error=str(e))
+                continue
+
+            for timeframe, at in closes.items():
+                if at != close_at:
+                    continue
+                symbols = sorted({
+                    sub["symbol"] for sub in subscriptions
+                    if sub.get("timeframe") == timeframe and sub.get("symbol")
+                })
+                if symbols:
+                    self.dispatch(timeframe, symbols, close_at)
+                else:
+                    record_bar_close_job(timeframe, "idle")
+
+    def dispatch(self, timeframe: str, symbols: List[str], close_at: datetime):
+        """Run the job for a bar close, or coalesce it into the run still in progress"""
+        running = self._running.get(timeframe)
+        if running is not None and not running.done():
+            self._pending[timeframe] = (symbols, close_at)
+            record_bar_close_job(timeframe, "coalesced")
+            logger.warning("Bar close job still running, coalescing", timeframe=timeframe, close_at=close_at.isoformat())
+            return
+        self._running[timeframe] = asyncio.create_task(self._execute(timeframe, symbols, close_at))
+
+    async def _execute(self, timeframe: str, symbols: List[str], close_at: datetime):
+        while True:
+            started = time.monotonic()
+            try:
+                await self._job(timeframe, symbols, close_at)
+                outcome = "ok"
+            except Exception as e:
+                outcome = "error"
+                logger.error(
+                    "Bar close job failed",
+                    timeframe=timeframe,
+                    symbols=len(symbols),
+                    close_at=close_at.isoformat(),
+                    error=str(e),
+                    error_type=type(e).__name__,
+                )
+            record_bar_close_job(timeframe, outcome, time.monotonic() - started)
+
+            pending = self._pending.pop(timeframe, None)
+            if pending is None:
+                return
+            symbols, close_at = pending
@@ -2,11 +2,12 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 
 import pytz
 
 from backend.data_pipeline import FeatureStore
+from backend.utils.candle_frame import CandleFrame
 from backend.utils.data_fetcher import data_fetcher
 from backend.utils.logger import get_logger
 from backend.services.version_registry import version_registry
@@ -50,36 +51,6 @@ class CandleLoader:
     def __init__(self):
         self._feature_store = FeatureStore()
 
-    def _df_to_candles(self, df) -> List[Dict]:
-        if df is None or df.empty:
-            return []
-
-        base_cols = ["start_ts", "open", "high", "low", "close", "volume"]
-        missing = [col for col in base_cols if col not in df.columns]
-        for col in missing:
-            df[col] = 0.0
-
-        ordered_df = df[base_cols].sort_values("start_ts").dropna(subset=["start_ts", "close"])
-
-        candles: List[Dict] = []
-        for row in ordered_df.itertuples(index=False):
-            ts_iso = _normalize_timestamp(row.start_ts)
-            if not ts_iso:
-                continue
-
-            candles.append(
-                {
-                    "start_ts": ts_iso,
-                    "open": float(row.open),
-                    "high": float(row.high),
-                    "low": float(row.low),
-                    "close": float(row.close),
-                    "volume": float(row.volume) if row.volume is not None else 0.0,
-                }
-            )
-
-        return candles
-
     def _sanitize_live_candles(self, candles: Optional[List[Dict]]) -> List[Dict]:
         if not candles:
             return []
@@ -119,8 +90,12 @@ class CandleLoader:
         *,
         min_points: int = 1,
         bypass_cache: bool = False,
-    ) -> List[Dict]:
-        """Load a window of candles ending now, preferring feature store data."""
+        as_frame: bool = False,
+    ) -> Union[List[Dict], CandleFrame]:
+        """
+        Load a window of candles ending now, preferring feature store data.
+        With as_frame=True a CandleFrame is returned instead of candle dicts.
+        """
 
         as_of = datetime.now(pytz.UTC)
         override = version_registry.get_dataset_override(symbol, timeframe)
@@ -135,9 +110,9 @@ class CandleLoader:
             run_id=run_id,
         )
 
-        candles = self._df_to_candles(df)
-        if len(candles) >= min_points:
-            return candles
+        frame = CandleFrame.from_dataframe(df)
+        if len(frame) >= min_points:
+            return frame if as_frame else frame.to_records()
 
         logger.info(
             "CandleLoader fetching live data",
@@ -149,7 +124,8 @@ class CandleLoader:
             period=fallback_period,
             bypass_cache=bypass_cache,
         )
-        return self._sanitize_live_candles(live)
+        sanitized = self._sanitize_live_candles(live)
+        return CandleFrame.from_records(sanitized) if as_frame else sanitized
 
     async def load_recent_rows(
         self,
@@ -160,8 +136,12 @@ class CandleLoader:
         *,
         min_points: int = 1,
         bypass_cache: bool = False,
-    ) -> List[Dict]:
-        """Load latest N rows for training/predictions."""
+        as_frame: bool = False,
+    ) -> Union[List[Dict], CandleFrame]:
+        """
+        Load latest N rows for training/predictions.
+        With as_frame=True a CandleFrame is returned instead of candle dicts.
+        """
 
         override = version_registry.get_dataset_override(symbol, timeframe)
         dataset_version = override.get("dataset_version") if override else None
@@ -173,9 +153,11 @@ class CandleLoader:
             dataset_version=dataset_version,
             run_id=run_id,
         )
-        candles = self._df_to_candles(df)
-        if len(candles) >= min_points:
-            return candles[-rows:]
+        frame = CandleFrame.from_dataframe(df)
+        if len(frame) >= min_points:
+            if rows > 0:
+                frame = frame.tail(rows)
+            return frame if as_frame else frame.to_records()
 
         logger.info(
             "CandleLoader fallback to live rows",
@@ -189,8 +171,8 @@ class CandleLoader:
         )
         sanitized = self._sanitize_live_candles(live)
         if rows > 0:
-            return sanitized[-rows:]
-        return sanitized
+            sanitized = sanitized[-rows:]
+        return CandleFrame.from_records(sanitized) if as_frame else sanitized
 
 
 # Singleton instance
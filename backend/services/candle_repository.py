@@ -0,0 +1,131 @@
+"""Batched candle writes using INSERT ... ON CONFLICT on the candles unique key."""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from backend.database import Candle
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Conflict target: uq_candles_symbol_timeframe_start_ts
+CONFLICT_COLUMNS = ("symbol", "timeframe", "start_ts")
+
+_VALUE_COLUMNS = ("open", "high", "low", "close", "volume")
+
+_DIALECT_INSERTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+
+def _parse_start_ts(value) -> Optional[datetime]:
+    if isinstance(value, str):
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if hasattr(value, "to_pydatetime"):
+        return value.to_pydatetime()
+    return value
+
+
+class CandleRepository:
+    """Write access to the candles table"""
+
+    def upsert_candles(
+        self,
+        db: Session,
+        symbol: str,
+        timeframe: str,
+        candles: List[Dict],
+        update_existing: bool = False,
+    ) -> int:
+        """
+        Insert a batch of candles with one INSERT ... ON CONFLICT statement.
+
+        The statement is executed once with all rows as parameters, which the
+        SQLite and PostgreSQL drivers run as a single prepared/multi-row insert.
+        The caller owns the transaction (commit/rollback).
+
+        Args:
+            db: Database session
+            symbol: Stock symbol
+            timeframe: Candle timeframe
+            candles: Candle dicts with start_ts (ISO string or datetime) and OHLCV
+            update_existing: Merge into existing rows as a live update (new
+                open/close/volume, widened high/low) instead of leaving them as is
+
+        Returns:
+            Number of candle rows submitted
+        """
+        rows = self._rows(symbol, timeframe, candles)
+        if not rows:
+            return 0
+
+        dialect = db.get_bind().dialect.name
+        make_insert = _DIALECT_INSERTS.get(dialect)
+        if make_insert is None:
+            self._upsert_per_row(db, rows, update_existing)
+            return len(rows)
+
+        stmt = make_insert(Candle)
+        if update_existing:
+            excluded = stmt.excluded
+            # SQLite's scalar max()/min() correspond to GREATEST()/LEAST()
+            greatest = func.max if dialect == "sqlite" else func.greatest
+            least = func.min if dialect == "sqlite" else func.least
+            stmt = stmt.on_conflict_do_update(
+                index_elements=list(CONFLICT_COLUMNS),
+                set_={
+                    "open": excluded.open,
+                    "high": greatest(Candle.high, excluded.high),
+                    "low": least(Candle.low, excluded.low),
+                    "close": excluded.close,
+                    "volume": excluded.volume,
+                },
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=list(CONFLICT_COLUMNS))
+
+        db.execute(stmt, rows)
+        logger.debug(f"Upserted {len(rows)} candles for {symbol}/{timeframe}")
+        return len(rows)
+
+    @staticmethod
+    def _rows(symbol: str, timeframe: str, candles: List[Dict]) -> List[Dict]:
+        """Column dicts for the insert, deduplicated on start_ts (last one wins)"""
+        rows: Dict[datetime, Dict] = {}
+        for candle in candles:
+            start_ts = _parse_start_ts(candle.get("start_ts"))
+            if start_ts is None:
+                continue
+            row = {"symbol": symbol, "timeframe": timeframe, "start_ts": start_ts}
+            for column in _VALUE_COLUMNS:
+                row[column] = candle.get(column)
+            row["created_at"] = datetime.utcnow()
+            rows[start_ts] = row
+        return list(rows.values())
+
+    @staticmethod
+    def _upsert_per_row(db: Session, rows: List[Dict], update_existing: bool):
+        """Fallback for dialects without ON CONFLICT support"""
+        for row in rows:
+            existing = db.query(Candle).filter(
+                Candle.symbol == row["symbol"],
+                Candle.timeframe == row["timeframe"],
+                Candle.start_ts == row["start_ts"],
+            ).first()
+            if existing is None:
+                db.add(Candle(**row))
+            elif update_existing:
+                existing.open = row["open"]
+                existing.high = max(existing.high, row["high"])
+                existing.low = min(existing.low, row["low"])
+                existing.close = row["close"]
+                existing.volume = row["volume"]
+
+
+candle_repository = CandleRepository()
@@ -14,6 +14,7 @@ from pydantic import BaseModel, Field
 from backend.config import settings
 from backend.utils.logger import get_logger
 from backend.utils.redis_cache import redis_cache
+from backend.utils.rate_limiter import fetch_scheduler
 
 logger = get_logger(__name__)
 
@@ -146,6 +147,17 @@ class FreddyAIServiceManager:
         except Exception as e:
             logger.debug(f"Cache write error: {e}")
     
+    async def _cached_response(self, cache_key: str) -> Optional[FreddyAIResponse]:
+        """Last cached analysis, served when the request budget is exhausted"""
+        cached = await self._get_from_cache(cache_key)
+        if not cached:
+            return None
+        try:
+            return FreddyAIResponse(**cached)
+        except Exception as e:
+            logger.warning(f"Failed to parse cached response: {e}")
+            return None
+    
     def _build_stock_analysis_prompt(self, symbol: str, current_price: Optional[float] = None) -> str:
         """
         Build a comprehensive prompt for stock analysis.
@@ -515,6 +527,10 @@ Format as JSON matching the volume_analysis, support_resistance, and risk_metric
                 except Exception as e:
                     logger.warning(f"Failed to parse cached response: {e}")
         
+        # Budget exhausted: serve the last cached analysis, if any
+        if not await fetch_scheduler.acquire("freddy"):
+            return await self._cached_response(cache_key)
+        
         # Build prompt
         prompt = self._build_stock_analysis_prompt(symbol, current_price)
         
@@ -614,6 +630,10 @@ Format as JSON matching the volume_analysis, support_resistance, and risk_metric
                 except Exception as exc:
                     logger.warning(f"Failed to hydrate cached custom response: {exc}")
 
+        # Budget exhausted: serve the last cached response, if any
+        if not await fetch_scheduler.acquire("freddy"):
+            return await self._cached_response(cache_key)
+
         # Build base structured prompt and append user request
         base_prompt = self._build_stock_analysis_prompt(symbol, current_price)
 
@@ -770,6 +790,10 @@ Format as JSON matching the volume_analysis, support_resistance, and risk_metric
             if cached:
                 return cached
         
+        # Budget exhausted: serve the last cached levels, if any
+        if not await fetch_scheduler.acquire("freddy"):
+            return await self._get_from_cache(cache_key)
+        
         # Build prompt
         prompt = self._build_volume_analysis_prompt(symbol)
         
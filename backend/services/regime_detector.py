@@ -5,7 +5,8 @@ from dataclasses import dataclass
 from typing import Dict, List, Tuple
 
 import numpy as np
-import pandas as pd
+
+from backend.utils.candle_frame import candles_to_dataframe
 
 
 @dataclass
@@ -26,7 +27,7 @@ class RegimeDetector:
         if not candles:
             return RegimeResult("unknown", 0.0, 0.0, 0.0)
 
-        df = pd.DataFrame(candles[-self.lookback :])
+        df = candles_to_dataframe(candles[-self.lookback :])
         df = df.dropna(subset=["close"])
         if df.empty:
             return RegimeResult("unknown", 0.0, 0.0, 0.0)
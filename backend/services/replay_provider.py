@@ -0,0 +1,176 @@
+"""
+Replay Provider
+Serves recorded candles in place of Yahoo Finance / Twelve Data so the fetch,
+prediction and broadcast paths can be exercised without network access.
+
+Candles come from the candle lake (dataset_version) or from a fixture
+directory holding <SYMBOL>_<interval>.parquet / .json / .csv files with
+start_ts and OHLCV columns. Every call can be delayed by a simulated provider
+latency and fail with an injected ReplayError; both are drawn from a seed, the
+symbol/interval and the call number for that pair, so runs are reproducible
+regardless of thread scheduling. Selected with primary_data_provider="replay".
+"""
+import asyncio
+import random
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from backend.config import settings
+from backend.utils.candle_frame import CandleFrame
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ReplayError(Exception):
+    """Injected provider failure"""
+
+
+class ReplayProvider:
+    """Recorded-candle provider with latency and error injection (see module docstring)"""
+
+    def __init__(self):
+        self._frames: Dict[Tuple[str, str], CandleFrame] = {}
+        self._calls: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+        self._pipeline = None
+        self.configure(
+            source=settings.replay_source,
+            latency_ms=settings.replay_latency_ms,
+            jitter_ms=settings.replay_latency_jitter_ms,
+            error_rate=settings.replay_error_rate,
+            seed=settings.replay_seed,
+        )
+
+    def configure(
+        self,
+        source: Optional[str] = None,
+        latency_ms: Optional[float] = None,
+        jitter_ms: Optional[float] = None,
+        error_rate: Optional[float] = None,
+        seed: Optional[int] = None,
+    ):
+        """
+        Update replay settings; changing the source drops loaded candles.
+
+        Args:
+            source: "lake" or a fixture directory
+            latency_ms: Simulated latency per provider call
+            jitter_ms: Uniform jitter added to the latency
+            error_rate: Share of calls that raise ReplayError
+            seed: Seed for latency jitter and error injection
+        """
+        with self._lock:
+            if source is not None and source != getattr(self, "source", None):
+                self.source = source
+                self._frames.clear()
+            if latency_ms is not None:
+                self.latency_ms = max(0.0, float(latency_ms))
+            if jitter_ms is not None:
+                self.jitter_ms = max(0.0, float(jitter_ms))
+            if error_rate is not None:
+                self.error_rate = min(max(float(error_rate), 0.0), 1.0)
+            if seed is not None:
+                self.seed = int(seed)
+                self._calls.clear()
+
+    def _load_frame(self, symbol: str, interval: str) -> CandleFrame:
+        if self.source == "lake":
+            if self._pipeline is None:
+                from backend.data_pipeline import DataPipeline
+                self._pipeline = DataPipeline()
+            df = self._pipeline.read_candles(symbol, interval, dataset_version=settings.dataset_version)
+            return CandleFrame.from_dataframe(df)
+
+        base = Path(self.source) / f"{symbol.replace('.', '_')}_{interval}"
+        for suffix, reader in ((".parquet", pd.read_parquet), (".json", pd.read_json), (".csv", pd.read_csv)):
+            path = base.with_suffix(suffix)
+            if path.exists():
+                return CandleFrame.from_dataframe(reader(path))
+        return CandleFrame.empty()
+
+    def frame(self, symbol: str, interval: str) -> CandleFrame:
+        """All recorded candles of symbol/interval (loaded once)"""
+        key = (symbol, interval)
+        frame = self._frames.get(key)
+        if frame is None:
+            frame = self._load_frame(symbol, interval)
+            with self._lock:
+                self._frames[key] = frame
+            logger.info("Replay candles loaded", symbol=symbol, interval=interval, rows=len(frame), source=self.source)
+        return frame
+
+    def last_timestamp(self, symbol: str, interval: str) -> Optional[datetime]:
+        """Start of the newest recorded bar: the replay clock for period windows"""
+        frame = self.frame(symbol, interval)
+        return frame.start_ts[-1].to_pydatetime() if len(frame) else None
+
+    def _draw(self, symbol: str, interval: str) -> Tuple[float, bool]:
+        """Latency (seconds) and whether to fail, for the next call on symbol/interval"""
+        key = (symbol, interval)
+        with self._lock:
+            call = self._calls.get(key, 0)
+            self._calls[key] = call + 1
+        rng = random.Random(f"{self.seed}:{symbol}:{interval}:{call}")
+        latency = (self.latency_ms + rng.uniform(0.0, self.jitter_ms)) / 1000.0
+        return latency, rng.random() < self.error_rate
+
+    def _window(self, symbol: str, interval: str, start: Optional[datetime], fail: bool) -> List[Dict]:
+        if fail:
+            raise ReplayError(f"Injected replay error for {symbol} {interval}")
+        frame = self.frame(symbol, interval)
+        if start is None or not len(frame):
+            return frame.to_records()
+        start_ts = pd.Timestamp(start)
+        if start_ts.tzinfo is None:
+            start_ts = start_ts.tz_localize(frame.tz)
+        start_ns = start_ts.value
+        return frame[int(np.searchsorted(frame.start_ns, start_ns)):].to_records()
+
+    async def fetch(self, symbol: str, interval: str, start: Optional[datetime] = None) -> List[Dict]:
+        """
+        Recorded candles starting at or after `start` (all if None).
+
+        Raises:
+            ReplayError: When the call is selected for error injection
+        """
+        latency, fail = self._draw(symbol, interval)
+        if latency:
+            await asyncio.sleep(latency)
+        return self._window(symbol, interval, start, fail)
+
+    def fetch_many_sync(
+        self,
+        starts: Dict[str, Optional[datetime]],
+        interval: str,
+    ) -> Dict[str, List[Dict]]:
+        """
+        Blocking multi-symbol fetch, like one batched provider call: a single
+        latency (the slowest symbol's draw) and per-symbol error injection.
+
+        Args:
+            starts: Window start per symbol (None for all recorded candles)
+
+        Returns:
+            Mapping of symbol to candles (failed symbols are omitted)
+        """
+        draws = {symbol: self._draw(symbol, interval) for symbol in starts}
+        latency = max((draw[0] for draw in draws.values()), default=0.0)
+        if latency:
+            time.sleep(latency)
+
+        results = {}
+        for symbol, start in starts.items():
+            try:
+                results[symbol] = self._window(symbol, interval, start, draws[symbol][1])
+            except ReplayError as e:
+                logger.warning("Replay batch symbol failed", symbol=symbol, error=str(e))
+        return results
+
+
+# Singleton instance
+replay_provider = ReplayProvider()
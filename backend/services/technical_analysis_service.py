@@ -7,6 +7,7 @@ from datetime import datetime, timedelta
 import pandas as pd
 import numpy as np
 from backend.database import SessionLocal, Candle
+from backend.utils.indicator_cache import indicator_cache
 from backend.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -51,10 +52,14 @@ class TechnicalAnalysisService:
                 "candles_found": len(candles)
             }
         
-        df = pd.DataFrame(candles)
-        
-        # Compute all TA indicators
-        indicators = self._compute_indicators(df)
+        # Compute all TA indicators (reused until a new or changed candle arrives)
+        indicators = indicator_cache.get_or_compute(
+            "technical_analysis",
+            symbol,
+            timeframe,
+            candles,
+            lambda: self._compute_indicators(pd.DataFrame(candles))
+        )
         
         # Generate signals
         signals = self._generate_signals(indicators)
@@ -67,7 +72,7 @@ class TechnicalAnalysisService:
             "timeframe": timeframe,
             "analyzed_at": datetime.utcnow().isoformat(),
             "data_window_days": window_days,
-            "candles_analyzed": len(df),
+            "candles_analyzed": len(candles),
             "indicators": indicators,
             "signals": signals,
             "recommendation": recommendation,
@@ -5,18 +5,27 @@ Provides time series data, technical indicators, and WebSocket support.
 Follows service manager pattern with proper error handling and caching.
 """
 import asyncio
+import contextvars
+import functools
 from typing import List, Dict, Optional, Any
 from datetime import datetime, timedelta
 import logging
+import threading
+import httpx
+import pandas as pd
 from twelvedata import TDClient
 from backend.config import settings
+from backend.utils.candle_frame import CandleFrame, OHLCV_COLUMNS
 from backend.utils.logger import get_logger
 from backend.utils.redis_cache import redis_cache
+from backend.utils.rate_limiter import fetch_scheduler
 import json
 import pytz
 
 logger = get_logger(__name__)
 
+_BASE_URL = "https://api.twelvedata.com"
+
 
 class TwelveDataServiceManager:
     """
@@ -33,6 +42,8 @@ class TwelveDataServiceManager:
         self.rate_limit = settings.twelvedata_rate_limit
         self._client = None  # Will be created lazily
         self._cached_api_key = None  # Track API key used for client
+        self._http: Optional[httpx.Client] = None  # Pooled REST connections, created lazily
+        self._http_lock = threading.Lock()
         
         if not self.enabled:
             logger.warning("Twelve Data is disabled in configuration")
@@ -177,222 +188,232 @@ class TwelveDataServiceManager:
         }
         return period_map.get(period, 100)
     
-    def _normalize_candle_data(self, candle_data: Dict, interval: str) -> Dict:
+    def _normalize_candle_data(self, values: List[Dict], interval: str) -> List[Dict]:
         """
-        Normalize Twelve Data candle format to match Yahoo Finance format.
+        Normalize Twelve Data candles to match Yahoo Finance format.
+        
+        Timestamps and prices of the whole response are parsed column-wise;
+        naive datetimes are taken as IST (requests ask for timezone=Asia/Kolkata).
         
         Args:
-            candle_data: Raw candle data from Twelve Data
+            values: Raw candle dicts from a time_series 'values' list
             interval: Interval string
         
         Returns:
-            Normalized candle dictionary
+            Normalized candle dictionaries sorted by start_ts ascending
+            (candles with an unparseable datetime or close are dropped)
         """
-        ist = pytz.timezone('Asia/Kolkata')
+        if not values:
+            return []
+        
+        df = pd.DataFrame.from_records(values)
+        if 'datetime' not in df.columns:
+            logger.warning(f"Twelve Data candles without datetime field ({interval})")
+            return []
+        df = df.rename(columns={'datetime': 'start_ts'})
+        for column in OHLCV_COLUMNS:
+            if column in df.columns:
+                df[column] = pd.to_numeric(df[column], errors='coerce')
+        
+        frame = CandleFrame.from_dataframe(df)
+        if len(frame) < len(df):
+            logger.warning(f"Dropped {len(df) - len(frame)} Twelve Data candles with unparseable datetime or close")
+        return frame.to_records()
+    
+    @property
+    def http(self) -> httpx.Client:
+        """Keep-alive HTTP client shared by all REST calls (thread-safe)"""
+        with self._http_lock:
+            if self._http is None or self._http.is_closed:
+                self._http = httpx.Client(
+                    base_url=_BASE_URL,
+                    timeout=self.timeout,
+                    limits=httpx.Limits(
+                        max_connections=settings.twelvedata_pool_size,
+                        max_keepalive_connections=settings.twelvedata_pool_size,
+                    ),
+                )
+            return self._http
+    
+    def close(self):
+        """Close pooled HTTP connections"""
+        with self._http_lock:
+            if self._http is not None:
+                self._http.close()
+                self._http = None
+    
+    def _request_time_series(self, td_symbols: List[str], td_interval: str, outputsize: int) -> Dict[str, Dict]:
+        """
+        One time_series request for up to twelvedata_batch_size symbols.
+        
+        Returns:
+            Mapping of Twelve Data symbol to its response object
+            (symbols the API reported an error for are omitted)
+        """
+        response = self.http.get(
+            "/time_series",
+            params={
+                "symbol": ",".join(td_symbols),
+                "interval": td_interval,
+                "outputsize": outputsize,
+                "timezone": "Asia/Kolkata",
+            },
+            # Header rather than query param so the key stays out of URLs and logs
+            headers={"Authorization": f"apikey {self.api_key}"},
+        )
+        response.raise_for_status()
+        data = response.json()
+        
+        if data.get("status") == "error":
+            raise RuntimeError(f"Twelve Data error {data.get('code')}: {data.get('message')}")
+        # A single symbol is answered unwrapped, several are keyed by symbol
+        by_symbol = {td_symbols[0]: data} if len(td_symbols) == 1 else data
+        
+        results = {}
+        for td_symbol, item in by_symbol.items():
+            if not isinstance(item, dict) or item.get("status") == "error":
+                message = item.get("message") if isinstance(item, dict) else item
+                logger.debug(f"Twelve Data returned no series for {td_symbol}: {message}")
+                continue
+            results[td_symbol] = item
+        return results
+    
+    def fetch_time_series_many_sync(
+        self,
+        symbols: List[str],
+        interval: str = "5m",
+        outputsize: int = 100
+    ) -> Dict[str, List[Dict]]:
+        """
+        Blocking multi-symbol time series fetch (for worker threads).
         
-        # Parse datetime - Twelve Data can return different formats
-        datetime_str = candle_data.get('datetime', '')
-        dt = None
+        Symbols are requested comma-separated, twelvedata_batch_size per
+        request, over the pooled HTTP client. Batches the Twelve Data credit
+        budget cannot cover in time are skipped.
         
-        if datetime_str:
+        Returns:
+            Mapping of symbol to normalized candles (symbols without data are omitted)
+        """
+        if not self.enabled or not self.api_key:
+            return {}
+        
+        td_interval = self._convert_yahoo_interval(interval)
+        by_td_symbol = {self._convert_twelvedata_symbol(symbol): symbol for symbol in dict.fromkeys(symbols)}
+        td_symbols = list(by_td_symbol)
+        batch_size = max(1, settings.twelvedata_batch_size)
+        
+        results: Dict[str, List[Dict]] = {}
+        for start in range(0, len(td_symbols), batch_size):
+            batch = td_symbols[start:start + batch_size]
+            # Each symbol of a batch costs one API credit
+            if not fetch_scheduler.acquire_sync("twelvedata", tokens=len(batch)):
+                continue
             try:
-                # Try different datetime formats
-                formats = [
-                    '%Y-%m-%d %H:%M:%S',      # '2024-01-01 09:15:00'
-                    '%Y-%m-%dT%H:%M:%S',      # '2024-01-01T09:15:00'
-                    '%Y-%m-%d %H:%M:%S%z',    # With timezone
-                    '%Y-%m-%dT%H:%M:%S%z',   # ISO format with timezone
-                ]
-                
-                for fmt in formats:
-                    try:
-                        dt = datetime.strptime(datetime_str, fmt)
-                        break
-                    except ValueError:
-                        continue
-                
-                if dt is None:
-                    # Fallback: try parsing as ISO format
-                    try:
-                        dt = datetime.fromisoformat(datetime_str.replace('Z', '+00:00'))
-                    except:
-                        # Last resort: parse as string
-                        dt = datetime.strptime(datetime_str.split('.')[0], '%Y-%m-%d %H:%M:%S')
-                
-                # Assume IST timezone for Indian stocks if no timezone info
-                if dt.tzinfo is None:
-                    dt = ist.localize(dt)
-                else:
-                    # Convert to IST if needed
-                    dt = dt.astimezone(ist)
-                    
+                series = self._request_time_series(batch, td_interval, outputsize)
+            except httpx.HTTPStatusError as e:
+                logger.error(f"Twelve Data API error for {len(batch)} symbols: HTTP {e.response.status_code}")
+                continue
             except Exception as e:
-                logger.warning(f"Failed to parse datetime {datetime_str}: {e}")
-                dt = datetime.now(ist)
-        else:
-            dt = datetime.now(ist)
-        
-        return {
-            'start_ts': dt.isoformat(),
-            'open': float(candle_data.get('open', 0)),
-            'high': float(candle_data.get('high', 0)),
-            'low': float(candle_data.get('low', 0)),
-            'close': float(candle_data.get('close', 0)),
-            'volume': float(candle_data.get('volume', 0))
-        }
+                logger.error(f"Twelve Data API error for {len(batch)} symbols: {e}")
+                continue
+            for td_symbol, item in series.items():
+                symbol = by_td_symbol.get(td_symbol)
+                if symbol is None:
+                    continue
+                candles = self._normalize_candle_data(item.get('values') or [], interval)
+                if candles:
+                    results[symbol] = candles
+        
+        logger.info(f"Fetched {interval} series for {len(results)} of {len(td_symbols)} symbols from Twelve Data")
+        return results
     
-    async def fetch_time_series(
+    async def fetch_time_series_many(
         self,
-        symbol: str,
+        symbols: List[str],
         interval: str = "5m",
         outputsize: int = 100,
         use_cache: bool = True
-    ) -> Optional[List[Dict]]:
+    ) -> Dict[str, List[Dict]]:
         """
-        Fetch time series data from Twelve Data.
+        Fetch time series data for many symbols with batched requests.
         
         Args:
-            symbol: Stock symbol (e.g., 'TCS.NS', 'RELIANCE.BO')
+            symbols: Stock symbols (e.g., ['TCS.NS', 'RELIANCE.BO'])
             interval: Candle interval ('1m', '5m', '15m', '1h', '1d')
-            outputsize: Number of candles to fetch
+            outputsize: Number of candles to fetch per symbol
             use_cache: Whether to use cached responses
         
         Returns:
-            List of candle dictionaries with OHLCV data or None if failed
+            Mapping of symbol to candle list (symbols without data are omitted)
         """
-        if not self.enabled:
-            logger.debug("Twelve Data is disabled")
-            return None
-        
-        if not self.client:
-            logger.warning("Twelve Data client not initialized")
-            return None
-        
-        # Convert symbol and interval formats
-        td_symbol = self._convert_twelvedata_symbol(symbol)
-        td_interval = self._convert_yahoo_interval(interval)
-        
-        cache_key = self._get_cache_key(symbol, interval, str(outputsize))
+        if not self.enabled or not self.client:
+            logger.debug("Twelve Data is disabled or not initialized")
+            return {}
         
-        # Check cache first
+        results: Dict[str, List[Dict]] = {}
+        missing = list(dict.fromkeys(symbols))
         if use_cache:
-            cached = await self._get_from_cache(cache_key)
-            if cached:
-                logger.debug(f"Using cached Twelve Data response for {symbol}")
-                return cached
+            cached = await asyncio.gather(
+                *(self._get_from_cache(self._get_cache_key(symbol, interval, str(outputsize))) for symbol in missing)
+            )
+            results = {symbol: candles for symbol, candles in zip(missing, cached) if candles}
+            missing = [symbol for symbol in missing if symbol not in results]
+            if results:
+                logger.debug(f"Using cached Twelve Data responses for {len(results)} symbols")
+        if not missing:
+            return results
         
         try:
-            # Fetch time series data
-            # Run in thread pool since TDClient might be blocking
-            loop = asyncio.get_event_loop()
-            
-            def fetch_sync():
-                try:
-                    # Capture API key in closure to ensure it's available in thread
-                    api_key_to_use = str(self.api_key) if self.api_key else None
-                    if not api_key_to_use or len(api_key_to_use) < 20:
-                        logger.error(f"Invalid API key in executor thread: length={len(api_key_to_use) if api_key_to_use else 0}")
-                        return None
-                    
-                    logger.debug(f"Using API key: {api_key_to_use[:8]}... (length: {len(api_key_to_use)})")
-                    client = TDClient(apikey=api_key_to_use)
-                    ts = client.time_series(
-                        symbol=td_symbol,
-                        interval=td_interval,
-                        outputsize=outputsize,
-                        timezone="Asia/Kolkata"
-                    )
-                    return ts.as_json()
-                except Exception as e:
-                    logger.error(f"Twelve Data API error: {e}")
-                    import traceback
-                    logger.debug(f"Traceback: {traceback.format_exc()}")
-                    return None
-            
-            data = await loop.run_in_executor(None, fetch_sync)
-            
-            if not data:
-                return None
-            
-            # Normalize candle data
-            candles = []
-            if isinstance(data, dict):
-                # Single symbol response with 'values' key
-                values = data.get('values', [])
-                for candle_data in values:
-                    normalized = self._normalize_candle_data(candle_data, interval)
-                    candles.append(normalized)
-            elif isinstance(data, (list, tuple)):
-                # Multiple symbols response or tuple of candles
-                for item in data:
-                    if isinstance(item, dict):
-                        # Check if it's a candle dict (has 'datetime', 'open', etc.) or a wrapper
-                        if 'datetime' in item or 'open' in item:
-                            # It's a candle dictionary directly
-                            normalized = self._normalize_candle_data(item, interval)
-                            candles.append(normalized)
-                        elif 'values' in item:
-                            # It's a wrapper with 'values' key
-                            values = item.get('values', [])
-                            for candle_data in values:
-                                normalized = self._normalize_candle_data(candle_data, interval)
-                                candles.append(normalized)
-            else:
-                logger.warning(f"Unexpected data type from Twelve Data: {type(data)}")
-                return None
-            
-            # Sort by timestamp ascending
-            candles.sort(key=lambda x: x.get('start_ts', ''))
-            
-            # Cache the results
-            if use_cache and candles:
-                await self._set_cache(cache_key, candles)
-            
-            logger.info(f"Fetched {len(candles)} candles from Twelve Data for {symbol}")
-            return candles
-            
+            loop = asyncio.get_running_loop()
+            fetched = await loop.run_in_executor(
+                None,
+                functools.partial(
+                    contextvars.copy_context().run,
+                    self.fetch_time_series_many_sync,
+                    missing,
+                    interval,
+                    outputsize
+                )
+            )
         except Exception as e:
             logger.error(f"Error fetching time series from Twelve Data: {e}", exc_info=True)
-            return None
+            return results
+        
+        if use_cache:
+            for symbol, candles in fetched.items():
+                await self._set_cache(self._get_cache_key(symbol, interval, str(outputsize)), candles)
+        results.update(fetched)
+        return results
     
-    async def fetch_candles(
+    async def fetch_time_series(
         self,
         symbol: str,
         interval: str = "5m",
-        period: str = "1d",
+        outputsize: int = 100,
         use_cache: bool = True
     ) -> Optional[List[Dict]]:
         """
-        Fetch candle data matching DataFetcher interface.
+        Fetch time series data from Twelve Data.
         
         Args:
             symbol: Stock symbol (e.g., 'TCS.NS', 'RELIANCE.BO')
             interval: Candle interval ('1m', '5m', '15m', '1h', '1d')
-            period: Time period ('1d', '5d', '1mo', 'max')
+            outputsize: Number of candles to fetch
             use_cache: Whether to use cached responses
         
         Returns:
-            List of candle dictionaries with OHLCV data (sorted by start_ts ascending)
+            List of candle dictionaries with OHLCV data or None if failed
+        """
+        results = await self.fetch_time_series_many([symbol], interval, outputsize, use_cache)
+        return results.get(symbol)
+    
+    def _filter_candles(self, symbol: str, candles: List[Dict], interval: str) -> List[Dict]:
+        """
+        Apply same filtering as DataFetcher:
+        - Filter out future dates
+        - Filter out non-trading days
+        - Filter out outside trading hours for intraday
         """
-        # Convert period to outputsize
-        outputsize = self._convert_period_to_outputsize(period)
-        
-        # Fetch from Twelve Data
-        candles = await self.fetch_time_series(
-            symbol=symbol,
-            interval=interval,
-            outputsize=outputsize,
-            use_cache=use_cache
-        )
-        
-        if not candles:
-            return None
-        
-        # Apply same filtering as DataFetcher:
-        # - Filter out future dates
-        # - Filter out non-trading days
-        # - Filter out outside trading hours for intraday
-        
         from backend.utils.exchange_calendar import exchange_calendar
         
         ist = pytz.timezone('Asia/Kolkata')
@@ -433,12 +454,61 @@ class TwelveDataServiceManager:
                 logger.warning(f"Error filtering candle: {e}")
                 continue
         
-        # Sort by timestamp ascending
-        filtered_candles.sort(key=lambda x: datetime.fromisoformat(x.get('start_ts', '').replace('Z', '+00:00')) if isinstance(x.get('start_ts'), str) else datetime.min)
-        
+        # Normalized candles are already sorted by start_ts ascending
         logger.info(f"Filtered {len(filtered_candles)} valid candles from {len(candles)} total for {symbol}")
         return filtered_candles
     
+    def fetch_candles_many_sync(
+        self,
+        symbols: List[str],
+        interval: str = "5m",
+        period: str = "1d",
+        outputsize: Optional[int] = None
+    ) -> Dict[str, List[Dict]]:
+        """Blocking multi-symbol fetch_candles (for worker threads; no response cache)"""
+        if outputsize is None:
+            outputsize = self._convert_period_to_outputsize(period)
+        fetched = self.fetch_time_series_many_sync(symbols, interval, outputsize)
+        return {symbol: self._filter_candles(symbol, candles, interval) for symbol, candles in fetched.items()}
+    
+    async def fetch_candles(
+        self,
+        symbol: str,
+        interval: str = "5m",
+        period: str = "1d",
+        use_cache: bool = True,
+        outputsize: Optional[int] = None
+    ) -> Optional[List[Dict]]:
+        """
+        Fetch candle data matching DataFetcher interface.
+        
+        Args:
+            symbol: Stock symbol (e.g., 'TCS.NS', 'RELIANCE.BO')
+            interval: Candle interval ('1m', '5m', '15m', '1h', '1d')
+            period: Time period ('1d', '5d', '1mo', 'max')
+            use_cache: Whether to use cached responses
+            outputsize: Number of latest candles to fetch (overrides period)
+        
+        Returns:
+            List of candle dictionaries with OHLCV data (sorted by start_ts ascending)
+        """
+        # Convert period to outputsize
+        if outputsize is None:
+            outputsize = self._convert_period_to_outputsize(period)
+        
+        # Fetch from Twelve Data
+        candles = await self.fetch_time_series(
+            symbol=symbol,
+            interval=interval,
+            outputsize=outputsize,
+            use_cache=use_cache
+        )
+        
+        if not candles:
+            return None
+        
+        return self._filter_candles(symbol, candles, interval)
+    
     async def fetch_with_indicators(
         self,
         symbol: str,
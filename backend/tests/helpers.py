@@ -0,0 +1,30 @@
+"""Shared builders for backend tests."""
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytz
+
+
+def build_session_candles(days: int = 8, seed: int = 3, start_price: float = 1500.0):
+    """5m candles from 09:00 to 15:35 IST so some bars fall outside market hours."""
+    ist = pytz.timezone("Asia/Kolkata")
+    rng = np.random.default_rng(seed)
+    candles = []
+    price = start_price
+    for day in range(days):
+        session_start = ist.localize(datetime(2025, 1, 6, 9, 0) + timedelta(days=day))
+        for idx in range(80):
+            open_ = price
+            close = price + rng.normal(0, 5)
+            candles.append(
+                {
+                    "start_ts": (session_start + timedelta(minutes=5 * idx)).isoformat(),
+                    "open": open_,
+                    "high": max(open_, close) + abs(rng.normal(0, 1.5)),
+                    "low": min(open_, close) - abs(rng.normal(0, 1.5)),
+                    "close": close,
+                    "volume": float(rng.integers(500, 20000)),
+                }
+            )
+            price = close
+    return candles
@@ -0,0 +1,161 @@
+import math
+import unittest
+from unittest import mock
+
+from backend.tests.helpers import build_session_candles
+from backend.utils.backtest_engine import BacktestEngine
+from backend.utils import parameter_sweep
+from backend.utils.parameter_sweep import expand_grid, grid_size, run_parameter_sweep
+from backend.utils.signal_strategies import (
+    ADXTrendStrategy,
+    BollingerBandsStrategy,
+    MACDCrossoverStrategy,
+    MultiIndicatorStrategy,
+    RSIStrategy,
+    VWAPStrategy,
+)
+
+
+class BacktestModesTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.candles = build_session_candles()
+
+    def _run(self, strategy, mode):
+        return BacktestEngine().run_backtest(
+            symbol="TEST.NS",
+            candles=self.candles,
+            initial_capital=100000.0,
+            strategy=strategy,
+            stop_loss_pct=0.01,
+            take_profit_pct=0.02,
+            mode=mode,
+        )
+
+    def test_vectorized_matches_event_mode(self):
+        strategies = [
+            MultiIndicatorStrategy(),
+            RSIStrategy(),
+            MACDCrossoverStrategy(),
+            BollingerBandsStrategy(),
+            ADXTrendStrategy(),
+            VWAPStrategy(),
+        ]
+        for strategy in strategies:
+            with self.subTest(strategy=type(strategy).__name__):
+                event = self._run(strategy, "event")
+                vectorized = self._run(strategy, "vectorized")
+
+                self.assertEqual(len(event["trades"]), len(vectorized["trades"]))
+                for expected, actual in zip(event["trades"], vectorized["trades"]):
+                    for key in ("type", "time", "price", "quantity", "reason"):
+                        self.assertEqual(expected.get(key), actual.get(key))
+                    if expected["type"] == "entry":
+                        self.assertEqual(expected["signal"]["action"], actual["signal"]["action"])
+                        self.assertTrue(
+                            math.isclose(
+                                expected["signal"]["confidence"],
+                                actual["signal"]["confidence"],
+                                rel_tol=1e-9,
+                            )
+                        )
+                self.assertEqual(event["equity_curve"], vectorized["equity_curve"])
+                self.assertEqual(event["final_value"], vectorized["final_value"])
+
+    def test_invalid_mode_rejected(self):
+        with self.assertRaises(ValueError):
+            self._run(RSIStrategy(), "turbo")
+
+
+class PortfolioBacktestTest(unittest.TestCase):
+    def test_single_symbol_matches_run_backtest(self):
+        candles = build_session_candles()
+        kwargs = dict(initial_capital=100000.0, stop_loss_pct=0.01, take_profit_pct=0.02)
+        single = BacktestEngine().run_backtest(
+            symbol="TEST.NS", candles=candles, strategy=RSIStrategy(), mode="vectorized", **kwargs
+        )
+        portfolio = BacktestEngine().run_portfolio_backtest(
+            {"TEST.NS": candles}, strategy=RSIStrategy(), max_positions=1, **kwargs
+        )
+        self.assertEqual(len(single["trades"]), len(portfolio["trades"]))
+        for expected, actual in zip(single["trades"], portfolio["trades"]):
+            for key in ("type", "price", "quantity", "reason"):
+                self.assertEqual(expected.get(key), actual.get(key))
+        self.assertEqual(single["final_value"], portfolio["final_value"])
+
+    def test_shared_capital_and_position_limit(self):
+        basket = {
+            f"SYM{k}.NS": build_session_candles(days=4, seed=k, start_price=4000.0 + 100 * k)
+            for k in range(6)
+        }
+        results = BacktestEngine().run_portfolio_backtest(
+            basket, initial_capital=1000000.0, strategy=RSIStrategy(), max_positions=2
+        )
+        self.assertEqual(sorted(results["symbols"]), sorted(basket))
+        # One equity point per distinct in-session timestamp (+ initial capital)
+        self.assertEqual(len(results["equity_curve"]), 4 * 76 + 1)
+
+        open_count = 0
+        max_open = 0
+        for trade in results["trades"]:
+            open_count += 1 if trade["type"] == "entry" else -1
+            max_open = max(max_open, open_count)
+        self.assertLessEqual(max_open, 2)
+        self.assertGreater(len({t["symbol"] for t in results["trades"]}), 1)
+
+
+class ParameterSweepTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.candles = build_session_candles(days=4)
+
+    def test_expand_grid(self):
+        grid = expand_grid({"stop_loss_pct": [0.01, 0.02], "oversold": [25, 30, 35]})
+        self.assertEqual(len(grid), 6)
+        self.assertIn({"stop_loss_pct": 0.02, "oversold": 35}, grid)
+
+    def test_grid_size(self):
+        grid = {"stop_loss_pct": [0.01, 0.02], "oversold": [25, 30, 35], "order_type": "market"}
+        self.assertEqual(grid_size(grid), len(expand_grid(grid)))
+        self.assertEqual(grid_size({}), 1)
+
+    def test_workers_clamped_to_cpu_count(self):
+        with mock.patch.object(parameter_sweep.os, "cpu_count", return_value=1), \
+                mock.patch.object(parameter_sweep, "ProcessPoolExecutor") as pool:
+            ranked = run_parameter_sweep(
+                "TEST.NS", self.candles, {"oversold": [25, 30]}, strategy_name="rsi", max_workers=64
+            )
+        pool.assert_not_called()
+        self.assertEqual(len(ranked), 2)
+
+    def test_sweep_matches_individual_runs_and_is_ranked(self):
+        grid = {"stop_loss_pct": [0.005, 0.01], "oversold": [30, 40], "overbought": [60, 70]}
+        ranked = run_parameter_sweep(
+            symbol="TEST.NS",
+            candles=self.candles,
+            param_grid=grid,
+            strategy_name="rsi",
+            max_workers=2,
+        )
+        self.assertEqual(len(ranked), 8)
+        scores = [r["metrics"]["sharpe_ratio"] for r in ranked]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        self.assertEqual([r["rank"] for r in ranked], list(range(1, 9)))
+
+        for result in ranked:
+            params = result["params"]
+            expected = BacktestEngine().run_backtest(
+                symbol="TEST.NS",
+                candles=self.candles,
+                initial_capital=100000.0,
+                strategy=RSIStrategy(overbought=params["overbought"], oversold=params["oversold"]),
+                stop_loss_pct=params["stop_loss_pct"],
+            )
+            self.assertEqual(expected["final_value"], result["final_value"])
+            self.assertEqual(expected["metrics"], result["metrics"])
+
+    def test_unknown_parameter_rejected(self):
+        with self.assertRaises(ValueError):
+            run_parameter_sweep("TEST.NS", self.candles, {"adx_threshold": [20]}, strategy_name="rsi")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import asyncio
+import unittest
+from datetime import date, datetime, timedelta
+
+from backend.services.candle_close_scheduler import CandleCloseScheduler, closed_candles
+from backend.utils.exchange_calendar import IST, ExchangeCalendar
+
+
+class NextBarCloseTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.calendar = ExchangeCalendar()
+        self.calendar.holidays = {date(2025, 1, 7)}
+        self.calendar.early_closures = {date(2025, 1, 8): datetime.strptime("13:00", "%H:%M").time()}
+
+    def close(self, after: datetime, minutes: int) -> datetime:
+        return self.calendar.get_next_bar_close(IST.localize(after), minutes).replace(tzinfo=None)
+
+    def test_bars_align_to_session_open_and_end_at_close(self):
+        self.assertEqual(self.close(datetime(2025, 1, 6, 8, 0), 5), datetime(2025, 1, 6, 9, 20))
+        self.assertEqual(self.close(datetime(2025, 1, 6, 9, 20), 5), datetime(2025, 1, 6, 9, 25))
+        self.assertEqual(self.close(datetime(2025, 1, 6, 15, 16), 60), datetime(2025, 1, 6, 15, 30))
+        self.assertEqual(self.close(datetime(2025, 1, 6, 10, 0), 1440), datetime(2025, 1, 6, 15, 30))
+
+    def test_after_hours_holidays_and_early_closes(self):
+        # Monday after close -> Tuesday is a holiday -> Wednesday, which closes early
+        self.assertEqual(self.close(datetime(2025, 1, 6, 15, 30), 15), datetime(2025, 1, 8, 9, 30))
+        self.assertEqual(self.close(datetime(2025, 1, 8, 12, 50), 60), datetime(2025, 1, 8, 13, 0))
+        # Friday evening -> Monday
+        self.assertEqual(self.close(datetime(2025, 1, 10, 16, 0), 1), datetime(2025, 1, 13, 9, 16))
+
+
+class ClosedCandlesTest(unittest.TestCase):
+    def test_forming_bar_after_close_is_dropped(self):
+        close_at = IST.localize(datetime(2025, 1, 6, 9, 30))
+        # Provider response a few seconds after the 09:30 close: the 09:30 bar has started forming
+        response = [
+            {"start_ts": (close_at + timedelta(minutes=5 * offset)).isoformat(), "close": 100.0 + offset}
+            for offset in (-3, -2, -1, 0)
+        ]
+
+        candles = closed_candles(response, close_at)
+
+        self.assertEqual(candles, response[:3])
+        self.assertEqual(candles[-1]["start_ts"], "2025-01-06T09:25:00+05:30")
+        self.assertEqual(closed_candles(response[:3], close_at), response[:3])
+        self.assertEqual(closed_candles(response[3:], close_at), [])
+
+
+class ImmediateCalendar:
+    """Every timeframe closes 20ms from now"""
+
+    def get_next_bar_close(self, after, minutes):
+        return max(after, datetime.now(IST)) + timedelta(milliseconds=20)
+
+
+class CandleCloseSchedulerTest(unittest.TestCase):
+    def test_jobs_run_only_for_subscribed_timeframes(self):
+        calls = []
+
+        async def job(timeframe, symbols, close_at):
+            calls.append((timeframe, tuple(symbols)))
+
+        async def subscriptions():
+            return [{"symbol": "TCS.NS", "timeframe": "5m"}, {"symbol": "INFY.NS", "timeframe": "5m"}]
+
+        async def run():
+            scheduler = CandleCloseScheduler(
+                job, subscriptions, calendar=ImmediateCalendar(), settle_seconds=0, timeframes={"5m": 5, "15m": 15}
+            )
+            scheduler.start()
+            await asyncio.sleep(0.1)
+            await scheduler.stop()
+
+        asyncio.run(run())
+
+        self.assertTrue(calls)
+        self.assertEqual(set(calls), {("5m", ("INFY.NS", "TCS.NS"))})
+
+    def test_overlapping_closes_are_coalesced(self):
+        runs = []
+
+        async def run():
+            gate = asyncio.Event()
+
+            async def job(timeframe, symbols, close_at):
+                runs.append(close_at)
+                await gate.wait()
+
+            scheduler = CandleCloseScheduler(job, None, settle_seconds=0)
+            closes = [IST.localize(datetime(2025, 1, 6, 9, 20)) + timedelta(minutes=5 * idx) for idx in range(3)]
+            for close_at in closes:
+                scheduler.dispatch("5m", ["TCS.NS"], close_at)
+                await asyncio.sleep(0)
+            gate.set()
+            await scheduler._running["5m"]
+            return closes
+
+        closes = asyncio.run(run())
+
+        # The middle close was superseded while the first job was still running
+        self.assertEqual(runs, [closes[0], closes[2]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from backend.utils.candle_frame import CandleFrame, candles_to_dataframe
+
+
+def build_candles(count: int):
+    start = pd.Timestamp("2025-01-06 09:15", tz="Asia/Kolkata")
+    return [
+        {
+            "start_ts": (start + pd.Timedelta(minutes=5 * idx)).isoformat(),
+            "open": 100.0 + idx,
+            "high": 101.0 + idx,
+            "low": 99.0 + idx,
+            "close": 100.5 + idx,
+            "volume": 1000.0 + idx,
+        }
+        for idx in range(count)
+    ]
+
+
+class CandleFrameTest(unittest.TestCase):
+    def test_records_round_trip(self):
+        candles = build_candles(50)
+        frame = CandleFrame.from_records(candles)
+
+        self.assertEqual(len(frame), 50)
+        self.assertEqual(frame.to_records(), candles)
+        self.assertEqual(frame[-1], candles[-1])
+        self.assertEqual(CandleFrame.from_dataframe(pd.DataFrame(candles)).to_records(), candles)
+
+    def test_slices_and_dataframe_share_memory(self):
+        frame = CandleFrame.from_records(build_candles(50))
+        window = frame[10:20]
+        df = candles_to_dataframe(window)
+
+        self.assertTrue(np.shares_memory(window.close, frame.close))
+        self.assertTrue(np.shares_memory(df["close"].to_numpy(), frame.close))
+        self.assertEqual(str(df["start_ts"].dtype), "datetime64[ns, Asia/Kolkata]")
+        self.assertFalse(frame.close.flags.writeable)
+
+    def test_invalid_timestamps_dropped_and_naive_taken_as_exchange_time(self):
+        frame = CandleFrame.from_records([
+            {"start_ts": "2025-01-06T09:20:00Z", "close": 2.0},
+            {"start_ts": "not-a-time", "close": 3.0},
+            {"start_ts": "2025-01-06T09:15:00", "close": 1.0},
+        ]).sorted()
+
+        self.assertEqual([c["start_ts"] for c in frame],
+                         ["2025-01-06T09:15:00+05:30", "2025-01-06T14:50:00+05:30"])
+        self.assertEqual(frame.close.tolist(), [1.0, 2.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
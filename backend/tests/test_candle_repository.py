@@ -0,0 +1,77 @@
+import unittest
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from backend.database import Base, Candle
+from backend.services.candle_repository import CandleRepository
+
+
+def build_candles(count: int, start: datetime = datetime(2025, 1, 6, 9, 15)):
+    return [
+        {
+            "start_ts": (start + timedelta(minutes=5 * idx)).isoformat(),
+            "open": 100.0 + idx,
+            "high": 101.0 + idx,
+            "low": 99.0 + idx,
+            "close": 100.5 + idx,
+            "volume": 1000.0 + idx,
+        }
+        for idx in range(count)
+    ]
+
+
+class CandleRepositoryTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine, tables=[Candle.__table__])
+        self.db = sessionmaker(bind=self.engine)()
+        self.repository = CandleRepository()
+        self.statements = []
+        event.listen(self.engine, "before_cursor_execute", self._record_statement)
+
+    def tearDown(self) -> None:
+        self.db.close()
+        self.engine.dispose()
+
+    def _record_statement(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT"):
+            self.statements.append(statement)
+
+    def test_batch_insert_is_one_statement_and_skips_existing(self):
+        candles = build_candles(500)
+        self.repository.upsert_candles(self.db, "TCS.NS", "5m", candles[:300])
+        self.db.commit()
+        self.repository.upsert_candles(self.db, "TCS.NS", "5m", candles)
+        self.db.commit()
+
+        self.assertEqual(len(self.statements), 2)
+        self.assertEqual(self.db.query(Candle).count(), 500)
+
+    def test_update_existing_merges_live_candle(self):
+        candle = build_candles(1)[0]
+        self.repository.upsert_candles(self.db, "TCS.NS", "5m", [candle])
+        self.db.commit()
+
+        live = dict(candle, high=candle["high"] - 0.5, low=candle["low"] - 2.0, close=98.0, volume=1500.0)
+        self.repository.upsert_candles(self.db, "TCS.NS", "5m", [live], update_existing=True)
+        self.db.commit()
+
+        stored = self.db.query(Candle).one()
+        self.assertEqual(stored.high, candle["high"])
+        self.assertEqual(stored.low, candle["low"] - 2.0)
+        self.assertEqual(stored.close, 98.0)
+        self.assertEqual(stored.volume, 1500.0)
+
+    def test_existing_rows_untouched_without_update(self):
+        candle = build_candles(1)[0]
+        self.repository.upsert_candles(self.db, "TCS.NS", "5m", [candle])
+        self.repository.upsert_candles(self.db, "TCS.NS", "5m", [dict(candle, close=1.0)])
+        self.db.commit()
+
+        self.assertEqual(self.db.query(Candle).one().close, candle["close"])
+
+
+if __name__ == "__main__":
+    unittest.main()
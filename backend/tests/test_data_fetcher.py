@@ -0,0 +1,214 @@
+import asyncio
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+import pandas as pd
+
+from backend.data_pipeline import DataPipeline, IngestionQueue
+from backend.data_pipeline.config import get_config
+from backend.utils import data_fetcher as data_fetcher_module
+from backend.utils.data_fetcher import IST, DataFetcher
+from backend.utils.exchange_calendar import exchange_calendar
+from backend.utils.rate_limiter import FetchPriority, fetch_priority
+
+
+def build_candles(start: datetime, count: int, close: float = 100.0):
+    return [
+        {
+            "start_ts": (start + timedelta(minutes=5 * idx)).isoformat(),
+            "open": close,
+            "high": close + 1,
+            "low": close - 1,
+            "close": close,
+            "volume": 1000.0,
+        }
+        for idx in range(count)
+    ]
+
+
+class FetchCoalescingTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.fetcher = DataFetcher()
+        self.calls = []
+        self.release = threading.Event()
+
+        def fake_fetch(symbol, interval, period, bypass_cache):
+            self.calls.append((symbol, interval, period, bypass_cache))
+            self.release.wait(timeout=5)
+            return [{"start_ts": "2025-01-06T09:15:00+05:30", "close": 100.0}]
+
+        self.fetcher._fetch_candles_sync = fake_fetch
+
+    def _gather(self, *requests, priorities=None):
+        async def fetch(args, priority):
+            with fetch_priority(priority):
+                return await self.fetcher.fetch_candles(*args)
+
+        async def run():
+            tasks = [
+                asyncio.ensure_future(fetch(args, (priorities or {}).get(idx, FetchPriority.BACKFILL)))
+                for idx, args in enumerate(requests)
+            ]
+            await asyncio.sleep(0.05)
+            self.release.set()
+            return await asyncio.gather(*tasks)
+
+        return asyncio.run(run())
+
+    def test_identical_concurrent_requests_share_one_fetch(self):
+        results = self._gather(*[("TCS.NS", "5m", "1d")] * 5)
+
+        self.assertEqual(len(self.calls), 1)
+        self.assertTrue(all(result == results[0] for result in results))
+        self.assertEqual(self.fetcher._inflight, {})
+
+    def test_fresh_request_does_not_join_cached_fetch(self):
+        self._gather(("TCS.NS", "5m", "1d"), ("TCS.NS", "5m", "1d", True), ("TCS.NS", "5m", "5d"))
+
+        self.assertEqual(len(self.calls), 3)
+
+    def test_live_request_does_not_join_lower_priority_fetch(self):
+        self._gather(
+            *[("TCS.NS", "5m", "1d")] * 3,
+            priorities={0: FetchPriority.TRAINING, 1: FetchPriority.LIVE, 2: FetchPriority.TRAINING},
+        )
+
+        # The live caller starts its own fetch; the second training caller joins either
+        self.assertEqual(len(self.calls), 2)
+
+
+class LiveFetchPoolTest(unittest.TestCase):
+    def setUp(self) -> None:
+        pipeline = DataPipeline(config=get_config(tempfile.mkdtemp(prefix="fetcher-tests-")))
+        queue = IngestionQueue(pipeline)
+        self.addCleanup(queue.stop)
+        for target, name, value in (
+            (data_fetcher_module, "_data_pipeline", pipeline),
+            (data_fetcher_module, "_ingestion_queue", queue),
+            (data_fetcher_module.settings, "use_twelvedata_as_fallback", False),
+        ):
+            patcher = mock.patch.object(target, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.fetcher = DataFetcher()
+
+        self.symbols = [f"SYM{idx}.NS" for idx in range(data_fetcher_module._live_executor._max_workers + 2)]
+
+    def _fetch_live(self, fetch):
+        async def run():
+            with fetch_priority(FetchPriority.LIVE):
+                return await asyncio.wait_for(fetch(), timeout=10)
+
+        def slow_history(*args, **kwargs):
+            threading.Event().wait(0.05)
+            return pd.DataFrame()
+
+        with mock.patch.object(data_fetcher_module.yf, "Ticker") as ticker:
+            ticker.return_value.history.side_effect = slow_history
+            results = asyncio.run(run())
+        self.assertEqual(ticker.return_value.history.call_count, len(self.symbols))
+        return results
+
+    def test_more_live_fetches_than_live_workers_complete(self):
+        results = self._fetch_live(lambda: asyncio.gather(
+            *(self.fetcher.fetch_candles(symbol, "5m", "1d", True) for symbol in self.symbols)
+        ))
+
+        self.assertEqual(results, [[]] * len(self.symbols))
+
+    def test_failed_batch_falls_back_per_symbol(self):
+        self.fetcher._download_yahoo = mock.Mock(side_effect=RuntimeError("download failed"))
+
+        results = self._fetch_live(lambda: self.fetcher.fetch_candles_batch(self.symbols, "5m", "1d", True))
+
+        self.assertEqual(results, {symbol: [] for symbol in self.symbols})
+
+
+class IncrementalFetchTest(unittest.TestCase):
+    def setUp(self) -> None:
+        pipeline = DataPipeline(config=get_config(tempfile.mkdtemp(prefix="fetcher-tests-")))
+        queue = IngestionQueue(pipeline)
+        self.addCleanup(queue.stop)
+        for name, value in (("_data_pipeline", pipeline), ("_ingestion_queue", queue)):
+            patcher = mock.patch.object(data_fetcher_module, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.pipeline = pipeline
+        self.fetcher = DataFetcher()
+        self.requests = []
+        self.responses = []
+
+        async def fake_fetch(symbol, interval, period, bypass_cache, since=None):
+            self.requests.append((period, since))
+            return self.responses.pop(0)
+
+        self.fetcher._fetch_candles_async = fake_fetch
+
+    def test_refresh_fetches_only_bars_after_high_water_mark(self):
+        start = datetime.now(IST).replace(second=0, microsecond=0) - timedelta(hours=2)
+        history = build_candles(start, 10)
+        self.responses = [history, build_candles(start + timedelta(minutes=45), 3, close=105.0)]
+
+        first = self.fetcher._fetch_candles_sync("TCS.NS", "5m", "60d", True)
+        second = self.fetcher._fetch_candles_sync("TCS.NS", "5m", "60d", True)
+
+        self.assertEqual(self.requests[0], ("60d", None))
+        self.assertEqual(self.requests[1][1], start + timedelta(minutes=45))
+        self.assertEqual(len(first), 10)
+        self.assertEqual(len(second), 12)
+        self.assertEqual(second[:9], history[:9])
+        self.assertEqual([c["close"] for c in second[9:]], [105.0] * 3)
+
+    def test_complete_lake_sessions_seed_the_series(self):
+        window_start = DataFetcher._period_start("5d")
+        day = window_start.date()
+        today = datetime.now(IST).date()
+        while day < today:
+            if exchange_calendar.is_trading_day(day):
+                session = IST.localize(datetime.combine(day, exchange_calendar.market_open))
+                self.pipeline.append("TCS.NS", "5m", build_candles(session, 75), provider="test")
+            day += timedelta(days=1)
+        self.responses = [[]]
+
+        candles = self.fetcher._fetch_candles_sync("TCS.NS", "5m", "5d", True)
+
+        period, since = self.requests[0]
+        self.assertIsNotNone(since)
+        self.assertEqual(since.isoformat(), candles[-1]["start_ts"])
+        self.assertGreaterEqual(datetime.fromisoformat(candles[0]["start_ts"]), window_start)
+
+    def test_batch_download_splits_one_provider_call_per_symbol(self):
+        day = datetime.now(IST).date() - timedelta(days=1)
+        while not exchange_calendar.is_trading_day(day):
+            day -= timedelta(days=1)
+        session = IST.localize(datetime.combine(day, exchange_calendar.market_open))
+        downloads = []
+
+        def fake_download(symbols, interval, period=None, start=None):
+            downloads.append((tuple(symbols), period, start))
+            index = pd.date_range(session, periods=3, freq="5min")
+            return {
+                symbol: pd.DataFrame(
+                    {"Open": price, "High": price + 1, "Low": price - 1, "Close": price, "Volume": 10.0},
+                    index=index,
+                )
+                for price, symbol in enumerate(symbols, start=100)
+            }
+
+        self.fetcher._download_yahoo = fake_download
+        results = self.fetcher._fetch_candles_batch_sync(["TCS.NS", "INFY.NS", "SBIN.NS"], "5m", "60d", True)
+        refreshed = self.fetcher._fetch_candles_batch_sync(["TCS.NS", "INFY.NS"], "5m", "60d", True)
+
+        self.assertEqual(downloads[0], (("TCS.NS", "INFY.NS", "SBIN.NS"), "60d", None))
+        self.assertEqual(downloads[1], (("TCS.NS", "INFY.NS"), None, session + timedelta(minutes=10)))
+        self.assertEqual({symbol: len(candles) for symbol, candles in results.items()},
+                         {"TCS.NS": 3, "INFY.NS": 3, "SBIN.NS": 3})
+        self.assertEqual(results["INFY.NS"][-1]["close"], 101.0)
+        self.assertEqual(refreshed["TCS.NS"], results["TCS.NS"])
+
+
+if __name__ == "__main__":
+    unittest.main()
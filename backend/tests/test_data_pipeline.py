@@ -7,7 +7,7 @@ from pathlib import Path
 import pandas as pd
 import pytz
 
-from backend.data_pipeline import DataPipeline, FeatureStore
+from backend.data_pipeline import DataPipeline, FeatureStore, IngestionQueue
 from backend.data_pipeline.config import get_config
 
 
@@ -103,5 +103,164 @@ class DataPipelineIntegrationTest(unittest.TestCase):
             self.assertLessEqual(window["start_ts"].iloc[0], window["start_ts"].iloc[-1])
 
 
+class CandleLakeTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.mkdtemp(prefix="lake-tests-")
+        self.config = get_config(self.tmp_dir)
+        self.pipeline = DataPipeline(config=self.config)
+        self.store = FeatureStore(config=self.config)
+        self.symbol = "TCS.NS"
+        self.timeframe = "5m"
+        self.ist = pytz.timezone("Asia/Kolkata")
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _build_candles(self, day: datetime, count: int = 30):
+        base_time = self.ist.localize(day.replace(hour=9, minute=15))
+        return [
+            {
+                "start_ts": (base_time + timedelta(minutes=5 * idx)).isoformat(),
+                "open": 3250.0 + idx,
+                "high": 3255.0 + idx,
+                "low": 3245.0 + idx,
+                "close": 3252.0 + idx,
+                "volume": 100000 + idx * 10,
+            }
+            for idx in range(count)
+        ]
+
+    def _partition_files(self, day: str):
+        partition = self.config.lake_root / "v1" / "TCS_NS" / self.timeframe / f"date={day}"
+        return sorted(partition.glob("*.parquet"))
+
+    def test_append_writes_only_new_or_changed_bars(self):
+        candles = self._build_candles(datetime(2025, 11, 6))
+        first = self.pipeline.append(self.symbol, self.timeframe, candles[:20], dataset_version="v1")
+        self.assertEqual(first.rows_written, 20)
+
+        repeat = self.pipeline.append(self.symbol, self.timeframe, candles[:20], dataset_version="v1")
+        self.assertEqual(repeat.rows_written, 0)
+        self.assertEqual(repeat.files, [])
+
+        updated = [dict(c) for c in candles]
+        updated[19]["close"] = updated[19]["high"]
+        second = self.pipeline.append(self.symbol, self.timeframe, updated, dataset_version="v1")
+        self.assertEqual(second.rows_written, 11)
+
+        history = self.store.load_features(self.symbol, self.timeframe, dataset_version="v1")
+        self.assertEqual(len(history), 30)
+        self.assertEqual(history["close"].iloc[19], updated[19]["high"])
+        self.assertTrue(history["start_ts"].is_monotonic_increasing)
+        self.assertIn("ema_20", history.columns)
+
+    def test_compaction_merges_partition_files(self):
+        day_one = self._build_candles(datetime(2025, 11, 6))
+        day_two = self._build_candles(datetime(2025, 11, 7))
+        for end in (10, 20, 30):
+            self.pipeline.append(self.symbol, self.timeframe, day_one[:end], dataset_version="v1")
+        self.pipeline.append(self.symbol, self.timeframe, day_two[:5], dataset_version="v1")
+        before = self.store.load_features(self.symbol, self.timeframe, dataset_version="v1")
+
+        compacted = self.pipeline.compact(dataset_version="v1")
+
+        self.assertEqual(compacted, 1)
+        self.assertEqual(len(self._partition_files("2025-11-06")), 1)
+        after = self.store.load_features(self.symbol, self.timeframe, dataset_version="v1")
+        pd.testing.assert_frame_equal(before, after)
+
+    def test_time_window_reads_only_overlapping_partitions(self):
+        for day in (3, 4, 6, 7):
+            self.pipeline.append(
+                self.symbol, self.timeframe, self._build_candles(datetime(2025, 11, day), count=75), dataset_version="v1"
+            )
+        full = self.store.load_features(self.symbol, self.timeframe, dataset_version="v1")
+
+        opened = []
+        lake = self.store._lake
+        original = lake._read_partition
+        lake._read_partition = lambda partition_dir, *args: opened.append(partition_dir.name) or original(partition_dir, *args)
+        window = self.store.load_time_window(
+            self.symbol,
+            self.timeframe,
+            window_minutes=60,
+            as_of=self.ist.localize(datetime(2025, 11, 7, 12, 0)),
+            dataset_version="v1",
+        )
+
+        # 2025-11-06/04 only supply warm-up rows; 2025-11-03 is never opened
+        self.assertEqual(opened, ["date=2025-11-07", "date=2025-11-06", "date=2025-11-04"])
+        self.assertEqual(len(window), 13)
+        expected = full.set_index("start_ts").loc[window["start_ts"]]
+        for column in ("close", "rolling_mean_10", "momentum_10"):
+            self.assertEqual(list(window[column]), list(expected[column]))
+
+    def test_daily_time_window_reads_year_partition(self):
+        start = self.ist.localize(datetime(2026, 1, 5, 9, 15))
+        candles = [
+            {
+                "start_ts": (start + timedelta(days=idx)).isoformat(),
+                "open": 3250.0 + idx,
+                "high": 3255.0 + idx,
+                "low": 3245.0 + idx,
+                "close": 3252.0 + idx,
+                "volume": 100000 + idx * 10,
+            }
+            for idx in range(200)
+        ]
+        self.pipeline.append(self.symbol, "1d", candles, dataset_version="v1")
+
+        lake = self.store._lake
+        window_start = self.ist.localize(datetime(2026, 5, 1))
+        window_end = self.ist.localize(datetime(2026, 6, 1))
+        full = lake.read(self.symbol, "1d", dataset_version="v1")
+        expected = full[(full["start_ts"] >= window_start) & (full["start_ts"] <= window_end)]
+        bars = lake.read(self.symbol, "1d", dataset_version="v1", start=window_start, end=window_end)
+        window = self.store.load_time_window(
+            self.symbol,
+            "1d",
+            window_minutes=31 * 24 * 60,
+            as_of=window_end,
+            dataset_version="v1",
+        )
+
+        self.assertGreater(len(expected), 0)
+        self.assertEqual(list(bars["start_ts"]), list(expected["start_ts"]))
+        self.assertEqual(list(window["start_ts"]), list(expected["start_ts"]))
+
+    def test_write_behind_queue_batches_submits_per_series(self):
+        appends = []
+        original = self.pipeline.append
+        self.pipeline.append = lambda **kwargs: appends.append(len(kwargs["candles"])) or original(**kwargs)
+        queue = IngestionQueue(self.pipeline, flush_rows=1000, flush_interval=60.0)
+        self.addCleanup(queue.stop)
+        candles = self._build_candles(datetime(2025, 11, 6))
+        updated = [dict(c, close=c["high"]) for c in candles[10:20]]
+
+        for chunk in (candles[:10], candles[5:20], updated, candles[20:]):
+            queue.submit(self.symbol, self.timeframe, chunk, provider="test", dataset_version="v1")
+        self.assertEqual(queue.pending_rows, 30)
+        self.assertTrue(queue.flush(timeout=5.0))
+
+        self.assertEqual(appends, [30])
+        self.assertEqual(queue.pending_rows, 0)
+        history = self.store.load_features(self.symbol, self.timeframe, dataset_version="v1")
+        self.assertEqual(list(history["close"]), [c["close"] for c in candles[:10] + updated + candles[20:]])
+
+    def test_full_write_behind_queue_blocks_until_flushed(self):
+        queue = IngestionQueue(self.pipeline, max_pending_rows=20, flush_rows=1000, flush_interval=60.0)
+        self.addCleanup(queue.stop)
+        candles = self._build_candles(datetime(2025, 11, 6))
+
+        queue.submit(self.symbol, self.timeframe, candles[:15], dataset_version="v1")
+        queue.submit(self.symbol, self.timeframe, candles[15:], dataset_version="v1")
+
+        # The second submit only fit after the worker wrote the first batch
+        self.assertLessEqual(queue.pending_rows, 15)
+        queue.flush(timeout=5.0)
+        history = self.store.load_features(self.symbol, self.timeframe, dataset_version="v1")
+        self.assertEqual(len(history), 30)
+
+
 if __name__ == "__main__":
     unittest.main()
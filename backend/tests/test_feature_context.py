@@ -0,0 +1,38 @@
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from backend.tests.helpers import build_session_candles
+from backend.utils import feature_context as fc
+
+
+class FeatureContextTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.candles = build_session_candles(days=2)
+
+    def test_window_key_ignores_timestamp_representation(self):
+        as_strings = pd.DataFrame(self.candles)
+        as_timestamps = as_strings.copy()
+        as_timestamps["start_ts"] = pd.to_datetime(as_timestamps["start_ts"])
+        self.assertEqual(fc.candle_window_key(as_strings), fc.candle_window_key(as_timestamps))
+        self.assertNotEqual(fc.candle_window_key(as_strings), fc.candle_window_key(as_strings.iloc[:-1]))
+
+    def test_features_computed_once_per_window(self):
+        with mock.patch.object(
+            fc, "engineer_comprehensive_features", wraps=fc.engineer_comprehensive_features
+        ) as engineer:
+            with fc.feature_context() as context:
+                first = fc.comprehensive_features(pd.DataFrame(self.candles))
+                first["extra"] = 1.0  # callers may add columns without touching the cache
+                second = fc.comprehensive_features(pd.DataFrame(self.candles))
+                fc.comprehensive_features(pd.DataFrame(self.candles[:-5]))
+            fc.comprehensive_features(pd.DataFrame(self.candles))
+
+        self.assertEqual(engineer.call_count, 3)
+        self.assertEqual((context.misses, context.hits), (2, 1))
+        self.assertNotIn("extra", second.columns)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import math
+import unittest
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytz
+
+from backend.utils.incremental_indicators import INDICATOR_COLUMNS, IncrementalIndicators
+from backend.utils.indicators import calculate_all_indicators
+
+
+class IncrementalIndicatorsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.ist = pytz.timezone("Asia/Kolkata")
+        self.candles = self._build_candles(days=4)
+
+    def _build_candles(self, days: int):
+        rng = np.random.default_rng(7)
+        candles = []
+        price = 3200.0
+        for day in range(days):
+            session_start = self.ist.localize(datetime(2025, 1, 6 + day, 9, 15))
+            for idx in range(75):
+                open_ = price
+                close = price + rng.normal(0, 3)
+                if idx % 17 == 0:
+                    close = open_  # flat bars exercise the zero-change paths
+                candles.append(
+                    {
+                        "start_ts": (session_start + timedelta(minutes=5 * idx)).isoformat(),
+                        "open": open_,
+                        "high": max(open_, close) + abs(rng.normal(0, 1)),
+                        "low": min(open_, close) - abs(rng.normal(0, 1)),
+                        "close": close,
+                        "volume": float(rng.integers(1000, 50000)),
+                    }
+                )
+                price = close
+        return candles
+
+    def _assert_matches_batch(self, latest, candles):
+        row = calculate_all_indicators(candles).iloc[-1]
+        for column in INDICATOR_COLUMNS:
+            expected = row.get(column)
+            expected = None if expected is None or pd.isna(expected) else float(expected)
+            actual = latest[column]
+            if expected is None:
+                self.assertIsNone(actual, f"{column} at {len(candles)} candles")
+            else:
+                self.assertIsNotNone(actual, f"{column} at {len(candles)} candles")
+                self.assertTrue(
+                    math.isclose(actual, expected, rel_tol=1e-6, abs_tol=1e-6),
+                    f"{column} at {len(candles)} candles: {actual} != {expected}",
+                )
+
+    def test_matches_calculate_all_indicators(self):
+        checkpoints = {1, 9, 14, 15, 18, 20, 21, 34, 50, 120, len(self.candles)}
+        state = IncrementalIndicators()
+        for idx, candle in enumerate(self.candles):
+            latest = state.update(candle)
+            if idx + 1 in checkpoints:
+                self._assert_matches_batch(latest, self.candles[: idx + 1])
+
+    def test_from_candles_equals_streaming(self):
+        streamed = IncrementalIndicators()
+        for candle in self.candles:
+            streamed.update(candle)
+        warmed = IncrementalIndicators.from_candles(self.candles)
+        self.assertEqual(streamed.count, warmed.count)
+        self.assertEqual(streamed.latest, warmed.latest)
+
+    def test_intraday_vwap_resets_each_session(self):
+        state = IncrementalIndicators()
+        state.update_many(self.candles[:75])
+        first_of_day = self.candles[75]
+        latest = state.update(first_of_day)
+        typical = (first_of_day["high"] + first_of_day["low"] + first_of_day["close"]) / 3
+        self.assertAlmostEqual(latest["vwap_intraday"], typical)
+        self.assertNotAlmostEqual(latest["vwap"], typical)
+
+    def test_batch_indicators_leave_dataframe_input_unchanged(self):
+        frame = pd.DataFrame(self.candles)
+        columns = list(frame.columns)
+        indicators = calculate_all_indicators(frame)
+        self.assertIn("rsi_14", indicators.columns)
+        self.assertEqual(list(frame.columns), columns)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import math
+import unittest
+
+from backend.tests.helpers import build_session_candles
+from backend.utils.incremental_indicators import INDICATOR_COLUMNS, IncrementalIndicators
+from backend.utils.indicator_cache import IndicatorCache
+from backend.utils.indicators import calculate_all_indicators
+
+
+def assert_indicators_equal(test, actual, expected):
+    for col in INDICATOR_COLUMNS:
+        a, e = actual[col], expected[col]
+        if a is None or e is None:
+            test.assertIs(a, e, col)
+        else:
+            test.assertTrue(math.isclose(a, e, rel_tol=1e-9, abs_tol=1e-9), f"{col}: {a} != {e}")
+
+
+class IndicatorCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.candles = build_session_candles(days=4)
+
+    def test_append_matches_full_computation(self):
+        cache = IndicatorCache()
+        cache.get_latest("TCS.NS", "5m", self.candles[:200])
+        latest = cache.get_latest("TCS.NS", "5m", self.candles)
+
+        expected = IncrementalIndicators.from_candles(self.candles).latest
+        assert_indicators_equal(self, latest, expected)
+        self.assertEqual(cache.stats()["rows"], len(self.candles))
+
+    def test_forming_candle_is_refolded(self):
+        cache = IndicatorCache()
+        cache.get_latest("TCS.NS", "5m", self.candles)
+
+        updated = [dict(c) for c in self.candles]
+        updated[-1]["close"] += 25.0
+        updated[-1]["high"] = max(updated[-1]["high"], updated[-1]["close"])
+        latest = cache.get_latest("TCS.NS", "5m", updated)
+
+        expected = IncrementalIndicators.from_candles(updated).latest
+        assert_indicators_equal(self, latest, expected)
+        self.assertEqual(cache.stats()["rows"], len(self.candles))
+
+    def test_cumulative_indicators_follow_the_request_window(self):
+        cache = IndicatorCache()
+        cache.get_latest("TCS.NS", "5m", self.candles[:300])
+        window = self.candles[100:]
+        latest = cache.get_latest("TCS.NS", "5m", window)
+        batch = calculate_all_indicators(window)
+
+        for col in ["obv", "vwap", "vwap_intraday"]:
+            self.assertTrue(math.isclose(latest[col], batch[col].iloc[-1], rel_tol=1e-9), col)
+
+    def test_window_longer_than_entry_limit_bypasses_cache(self):
+        cache = IndicatorCache(max_entry_rows=200)
+        latest = cache.get_latest("TCS.NS", "5m", self.candles)
+
+        expected = IncrementalIndicators.from_candles(self.candles).latest
+        assert_indicators_equal(self, latest, expected)
+        self.assertEqual(cache.stats()["entries"], 0)
+
+    def test_evicts_least_recently_used_series(self):
+        cache = IndicatorCache(max_rows=500)
+        cache.get_latest("TCS.NS", "5m", self.candles[:300])
+        cache.get_latest("INFY.NS", "5m", self.candles[:300])
+
+        stats = cache.stats()
+        self.assertEqual(stats["entries"], 1)
+        self.assertEqual(stats["rows"], 300)
+
+    def test_snapshot_reused_until_window_changes(self):
+        cache = IndicatorCache()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return {"calls": len(calls)}
+
+        cache.get_or_compute("ta", "TCS.NS", "5m", self.candles[:100], compute)
+        cache.get_or_compute("ta", "TCS.NS", "5m", self.candles[:100], compute)
+        self.assertEqual(len(calls), 1)
+
+        cache.get_or_compute("ta", "TCS.NS", "5m", self.candles[:101], compute)
+        self.assertEqual(len(calls), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from backend.utils.model_cache import ModelCache
+
+
+class ModelCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.loads = []
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def _artifact(self, name: str, size: int = 100) -> str:
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, "wb") as f:
+            f.write(b"x" * size)
+        return path
+
+    def _loader(self, tag):
+        def load():
+            self.loads.append(tag)
+            return {"model": tag}
+        return load
+
+    def test_hit_and_reload_on_file_change(self):
+        cache = ModelCache(max_bytes=10_000)
+        path = self._artifact("lstm_TCS_NS_5m.keras")
+
+        first = cache.get_or_load("lstm_bot", "TCS.NS", "5m", [path], self._loader("v1"))
+        second = cache.get_or_load("lstm_bot", "TCS.NS", "5m", [path], self._loader("v1"))
+        self.assertIs(first, second)
+        self.assertEqual(self.loads, ["v1"])
+
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        reloaded = cache.get_or_load("lstm_bot", "TCS.NS", "5m", [path], self._loader("v2"))
+        self.assertEqual(reloaded["model"], "v2")
+        self.assertEqual(cache.stats()["entries"], 1)
+
+    def test_lru_eviction_by_size(self):
+        cache = ModelCache(max_bytes=250)
+        paths = {symbol: self._artifact(f"{symbol}.pkl") for symbol in ("A", "B", "C")}
+
+        cache.get_or_load("ensemble_bot", "A", "5m", [paths["A"]], self._loader("A"))
+        cache.get_or_load("ensemble_bot", "B", "5m", [paths["B"]], self._loader("B"))
+        cache.get_or_load("ensemble_bot", "A", "5m", [paths["A"]], self._loader("A"))  # A most recent
+        cache.get_or_load("ensemble_bot", "C", "5m", [paths["C"]], self._loader("C"))  # evicts B
+
+        self.assertEqual(cache.stats()["bytes"], 200)
+        cache.get_or_load("ensemble_bot", "A", "5m", [paths["A"]], self._loader("A"))
+        cache.get_or_load("ensemble_bot", "B", "5m", [paths["B"]], self._loader("B"))
+        self.assertEqual(self.loads, ["A", "B", "C", "B"])
+
+    def test_slow_load_does_not_block_other_keys(self):
+        cache = ModelCache(max_bytes=10_000)
+        paths = {symbol: self._artifact(f"{symbol}.keras") for symbol in ("A", "B")}
+        cache.get_or_load("lstm_bot", "B", "5m", [paths["B"]], self._loader("B"))
+        started, release = threading.Event(), threading.Event()
+
+        def slow_load():
+            started.set()
+            release.wait(timeout=5)
+            self.loads.append("A")
+            return {"model": "A"}
+
+        loaders = [
+            threading.Thread(target=cache.get_or_load, args=("lstm_bot", "A", "5m", [paths["A"]], slow_load))
+            for _ in range(3)
+        ]
+        for thread in loaders:
+            thread.start()
+        self.assertTrue(started.wait(timeout=5))
+
+        hits = []
+        reader = threading.Thread(
+            target=lambda: hits.append(cache.get_or_load("lstm_bot", "B", "5m", [paths["B"]], self._loader("B")))
+        )
+        reader.start()
+        reader.join(timeout=1)
+        # Served while the load of A is still running
+        self.assertEqual(hits, [{"model": "B"}])
+        release.set()
+        for thread in loaders:
+            thread.join(timeout=5)
+        # Concurrent misses on one key share a single load
+        self.assertEqual(self.loads, ["B", "A"])
+
+
+if __name__ == "__main__":
+    unittest.main()
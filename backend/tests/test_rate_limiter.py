@@ -0,0 +1,47 @@
+import asyncio
+import unittest
+
+from backend.utils.rate_limiter import FetchPriority, FetchScheduler, fetch_priority
+
+
+class FetchSchedulerTest(unittest.TestCase):
+    def _scheduler(self, max_wait: float = 0.0) -> FetchScheduler:
+        # 4 tokens of capacity, refilled at 4 per second; 1 token reserved for live fetches
+        return FetchScheduler(
+            {"yahoo": 240},
+            burst_seconds=1.0,
+            live_reserve=0.25,
+            max_wait={priority: max_wait for priority in FetchPriority},
+        )
+
+    def test_live_reserve_is_kept_from_lower_priorities(self):
+        scheduler = self._scheduler()
+
+        granted = [scheduler.acquire_sync("yahoo", priority=FetchPriority.TRAINING) for _ in range(4)]
+        self.assertEqual(granted, [True, True, True, False])
+        self.assertTrue(scheduler.acquire_sync("yahoo", priority=FetchPriority.LIVE))
+        self.assertFalse(scheduler.acquire_sync("yahoo", priority=FetchPriority.LIVE))
+        # Providers without a budget are never limited
+        self.assertTrue(scheduler.acquire_sync("unknown", tokens=100))
+
+    def test_waiting_callers_are_served_by_priority(self):
+        scheduler = self._scheduler(max_wait=5.0)
+        order = []
+
+        async def fetch(name, priority):
+            with fetch_priority(priority):
+                await scheduler.acquire("yahoo")
+            order.append(name)
+
+        async def run():
+            scheduler.acquire_sync("yahoo", tokens=4, priority=FetchPriority.LIVE)
+            backfill = asyncio.ensure_future(fetch("backfill", FetchPriority.BACKFILL))
+            await asyncio.sleep(0.01)
+            await asyncio.gather(backfill, fetch("live", FetchPriority.LIVE))
+
+        asyncio.run(run())
+        self.assertEqual(order, ["live", "backfill"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import asyncio
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+
+from backend.services.replay_provider import ReplayError, ReplayProvider
+from backend.utils import data_fetcher as data_fetcher_module
+from backend.utils.data_fetcher import IST, DataFetcher
+
+
+class ReplayProviderTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        # Two sessions of 75 five-minute bars
+        starts = [
+            IST.localize(datetime(2025, 1, day, 9, 15)) + timedelta(minutes=5 * idx)
+            for day in (6, 7)
+            for idx in range(75)
+        ]
+        pd.DataFrame({
+            "start_ts": starts,
+            "open": 100.0,
+            "high": 101.0,
+            "low": 99.0,
+            "close": [100.0 + idx for idx in range(len(starts))],
+            "volume": 1000.0,
+        }).to_parquet(Path(self.tmp.name) / "TCS_NS_5m.parquet", index=False)
+
+    def _provider(self, **overrides) -> ReplayProvider:
+        provider = ReplayProvider()
+        provider.configure(**{"source": self.tmp.name, "latency_ms": 0, "jitter_ms": 0, "error_rate": 0, "seed": 7, **overrides})
+        return provider
+
+    def test_fetch_returns_window_from_start(self):
+        provider = self._provider()
+
+        candles = asyncio.run(provider.fetch("TCS.NS", "5m", IST.localize(datetime(2025, 1, 7, 9, 15))))
+
+        self.assertEqual(len(candles), 75)
+        self.assertEqual(pd.Timestamp(candles[0]["start_ts"]), pd.Timestamp("2025-01-07T09:15:00+05:30"))
+        self.assertEqual(len(asyncio.run(provider.fetch("TCS.NS", "5m"))), 150)
+        self.assertEqual(provider.fetch_many_sync({"INFY.NS": None}, "5m"), {"INFY.NS": []})
+
+    def test_error_injection_is_reproducible_per_seed(self):
+        def outcomes(provider):
+            results = []
+            for _ in range(20):
+                try:
+                    asyncio.run(provider.fetch("TCS.NS", "5m"))
+                    results.append(True)
+                except ReplayError:
+                    results.append(False)
+            return results
+
+        first = outcomes(self._provider(error_rate=0.5))
+        self.assertEqual(first, outcomes(self._provider(error_rate=0.5)))
+        self.assertIn(True, first)
+        self.assertIn(False, first)
+
+    def test_data_fetcher_serves_replayed_period_without_ingesting(self):
+        provider = self._provider()
+        fetcher = DataFetcher()
+        queue = mock.Mock()
+        queue.has_pending.return_value = False
+
+        with mock.patch.object(data_fetcher_module, "replay_provider", provider), \
+                mock.patch.object(data_fetcher_module, "_ingestion_queue", queue), \
+                mock.patch.object(data_fetcher_module.settings, "primary_data_provider", "replay"), \
+                mock.patch.object(data_fetcher_module.settings, "redis_enabled", False):
+            candles = asyncio.run(fetcher.fetch_candles("TCS.NS", "5m", "1d", bypass_cache=True))
+
+        # "1d" is measured from the newest recorded bar, not the wall clock
+        self.assertEqual(len(candles), 75)
+        self.assertEqual(pd.Timestamp(candles[-1]["start_ts"]), pd.Timestamp("2025-01-07T15:25:00+05:30"))
+        queue.submit.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
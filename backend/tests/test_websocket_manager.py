@@ -0,0 +1,289 @@
+import asyncio
+import json
+import unittest
+from unittest import mock
+
+from backend import websocket_manager as websocket_manager_module
+from backend.utils.broadcast_bus import BroadcastBus, RedisBroadcastBus
+from backend.websocket_manager import ConflatingQueue, ConnectionManager
+
+
+class RecordingWebSocket:
+    def __init__(self):
+        self.frames = []
+
+    async def accept(self):
+        return None
+
+    async def send_text(self, data):
+        self.frames.append(data)
+
+    async def send_bytes(self, data):
+        self.frames.append(data)
+
+    async def send_json(self, data, mode="text"):
+        self.frames.append(data)
+
+
+class BroadcastFanOutTest(unittest.TestCase):
+    def _run(self, body, **settings):
+        async def run():
+            manager = ConnectionManager()
+            sockets = [RecordingWebSocket() for _ in range(3)]
+            for websocket in sockets:
+                await manager.connect(websocket)
+            await body(manager, sockets)
+            await asyncio.gather(*(queue.join() for queue in list(manager.message_queues.values())))
+            for websocket in sockets:
+                manager.disconnect(websocket)
+            return manager, sockets
+
+        with mock.patch.multiple(websocket_manager_module.settings, **settings):
+            return asyncio.run(run())
+
+    def test_broadcast_reaches_only_indexed_subscribers_with_one_encoding(self):
+        async def body(manager, sockets):
+            manager.subscribe(sockets[0], "TCS.NS", "5m")
+            manager.subscribe(sockets[1], "TCS.NS", "5m")
+            manager.subscribe(sockets[2], "TCS.NS", "5m")
+            # Re-subscribing moves the connection to its new index entry
+            manager.subscribe(sockets[2], "INFY.NS", "5m")
+            with mock.patch.object(ConnectionManager, "_encode", wraps=ConnectionManager._encode) as encode:
+                await manager.broadcast_candle("TCS.NS", "5m", {"close": 100.0})
+            self.assertEqual(encode.call_count, 1)
+
+        manager, sockets = self._run(body, ws_binary_frames=False, ws_connection_metadata=False)
+
+        self.assertEqual(sockets[0].frames, sockets[1].frames)
+        self.assertIs(sockets[0].frames[0], sockets[1].frames[0])
+        message = json.loads(sockets[0].frames[0])
+        self.assertEqual((message["type"], message["candle"]), ("candle:update", {"close": 100.0}))
+        self.assertNotIn("_connection_age_ms", message)
+        self.assertEqual(sockets[2].frames, [])
+        self.assertEqual(manager.subscribers, {})
+
+    def test_binary_frames_and_optional_connection_metadata(self):
+        async def body(manager, sockets):
+            manager.subscribe(sockets[0], "TCS.NS", "5m")
+            await manager.broadcast_prediction({"symbol": "TCS.NS", "timeframe": "5m", "confidence": 0.7})
+
+        _, sockets = self._run(body, ws_binary_frames=True, ws_connection_metadata=False)
+        self.assertIsInstance(sockets[0].frames[0], bytes)
+        self.assertEqual(json.loads(sockets[0].frames[0])["confidence"], 0.7)
+
+        _, sockets = self._run(body, ws_binary_frames=False, ws_connection_metadata=True)
+        self.assertIn("_connection_age_ms", sockets[0].frames[0])
+        self.assertIn("_latency_ms", sockets[0].frames[0])
+
+
+class ConflatingQueueTest(unittest.TestCase):
+    def test_updates_conflate_in_place_and_events_keep_order(self):
+        queue = ConflatingQueue(max_pending_events=2)
+
+        self.assertEqual(queue.put("candle-1", ("candle:update", "TCS.NS", "5m")), "queued")
+        self.assertEqual(queue.put("progress-1"), "queued")
+        self.assertEqual(queue.put("candle-2", ("candle:update", "TCS.NS", "5m")), "conflated")
+        self.assertEqual(queue.put("progress-2"), "queued")
+        self.assertEqual(queue.put("progress-3"), "full")
+        self.assertTrue(queue.drop_oldest_event())
+        self.assertEqual(queue.put("progress-3"), "queued")
+
+        async def drain():
+            items = []
+            while queue.qsize():
+                items.append(await queue.get())
+                queue.task_done()
+            await queue.join()
+            return items
+
+        self.assertEqual(asyncio.run(drain()), ["candle-2", "progress-2", "progress-3"])
+        self.assertEqual((queue.conflated, queue.dropped), (1, 1))
+
+    def test_slow_consumer_keeps_connection_under_burst(self):
+        async def run():
+            manager = ConnectionManager()
+            websocket = RecordingWebSocket()
+            await manager.connect(websocket)
+            manager.subscribe(websocket, "TCS.NS", "5m")
+            # Nothing is sent until the burst is over
+            for idx in range(500):
+                await manager.broadcast_candle("TCS.NS", "5m", {"close": float(idx)})
+                await manager.broadcast_training_progress({"batch": idx})
+            stats = manager.get_connection_stats()
+            connected = websocket in manager.active_connections
+            if connected:
+                await manager.message_queues[websocket].join()
+                manager.disconnect(websocket)
+            return connected, stats, websocket.frames
+
+        with mock.patch.multiple(
+            websocket_manager_module.settings,
+            ws_binary_frames=False,
+            ws_connection_metadata=False,
+            ws_max_pending_events=10,
+            ws_slow_consumer_policy="drop_oldest",
+        ):
+            connected, stats, frames = asyncio.run(run())
+        self.assertTrue(connected)
+        self.assertEqual(stats[0]["pending"], 11)
+        self.assertEqual((stats[0]["conflated"], stats[0]["dropped"]), (499, 490))
+        messages = [json.loads(frame) for frame in frames]
+        self.assertEqual(messages[0]["candle"], {"close": 499.0})
+        self.assertEqual([message["batch"] for message in messages[1:]], list(range(490, 500)))
+
+        with mock.patch.multiple(
+            websocket_manager_module.settings,
+            ws_max_pending_events=10,
+            ws_slow_consumer_policy="disconnect",
+        ):
+            connected, _, _ = asyncio.run(run())
+        self.assertFalse(connected)
+
+
+def prediction(prices, produced_at="t0"):
+    return {
+        "symbol": "TCS.NS",
+        "timeframe": "5m",
+        "produced_at": produced_at,
+        "predicted_series": [{"ts": f"2025-01-06T10:{idx:02d}:00", "price": price} for idx, price in enumerate(prices)],
+        "overall_confidence": 0.6,
+        "feature_snapshot": {"latest_price": prices[0]},
+    }
+
+
+class DeltaStreamTest(unittest.TestCase):
+    def setUp(self) -> None:
+        patcher = mock.patch.multiple(
+            websocket_manager_module.settings,
+            ws_binary_frames=False,
+            ws_connection_metadata=False,
+            ws_delta_omit_fields="feature_snapshot",
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_snapshot_on_subscribe_then_changed_points_only(self):
+        async def run():
+            manager = ConnectionManager()
+            full, delta = RecordingWebSocket(), RecordingWebSocket()
+            for websocket in (full, delta):
+                await manager.connect(websocket)
+            manager.subscribe(full, "TCS.NS", "5m")
+            await manager.broadcast_candle("TCS.NS", "5m", {"start_ts": "09:15", "close": 100.0, "volume": 10.0})
+            await manager.broadcast_prediction(prediction([100.0, 101.0, 102.0]))
+
+            manager.subscribe(delta, "TCS.NS", "5m", delta=True)
+            await manager.message_queues[delta].join()
+            await manager.broadcast_candle("TCS.NS", "5m", {"start_ts": "09:15", "close": 100.5, "volume": 10.0})
+            await manager.broadcast_prediction(prediction([100.0, 101.5, 102.0], produced_at="t1"))
+            await asyncio.gather(*(queue.join() for queue in manager.message_queues.values()))
+            for websocket in (full, delta):
+                manager.disconnect(websocket)
+            return [json.loads(frame) for frame in full.frames], [json.loads(frame) for frame in delta.frames]
+
+        full, delta = asyncio.run(run())
+
+        self.assertEqual([message["type"] for message in full], ["candle:update", "prediction:update"] * 2)
+        self.assertIn("feature_snapshot", full[-1])
+        self.assertEqual(
+            [message["type"] for message in delta],
+            ["candle:snapshot", "prediction:snapshot", "candle:delta", "prediction:delta"],
+        )
+        snapshot, candle_delta, prediction_delta = delta[1], delta[2], delta[3]
+        self.assertNotIn("feature_snapshot", snapshot)
+        self.assertEqual(candle_delta["candle"], {"start_ts": "09:15", "close": 100.5})
+        self.assertEqual(candle_delta["_base_sequence"], delta[0]["_sequence"])
+        self.assertEqual(prediction_delta["_base_sequence"], snapshot["_sequence"])
+        self.assertEqual(prediction_delta["fields"], {"produced_at": "t1"})
+        self.assertEqual(prediction_delta["series_upsert"], [{"ts": "2025-01-06T10:01:00", "price": 101.5}])
+        self.assertNotIn("series_remove", prediction_delta)
+
+    def test_pending_delta_is_superseded_by_snapshot(self):
+        async def run():
+            manager = ConnectionManager()
+            websocket = RecordingWebSocket()
+            await manager.connect(websocket)
+            await manager.broadcast_prediction(prediction([100.0, 101.0]))
+            manager.subscribe(websocket, "TCS.NS", "5m", delta=True)
+            await manager.message_queues[websocket].join()
+            # Two deltas before the client reads: the second would build on an unsent one
+            await manager.broadcast_prediction(prediction([100.0, 101.5]))
+            await manager.broadcast_prediction(prediction([100.0, 101.5, 103.0]))
+            await manager.message_queues[websocket].join()
+            manager.disconnect(websocket)
+            return [json.loads(frame) for frame in websocket.frames]
+
+        messages = asyncio.run(run())
+
+        self.assertEqual([message["type"] for message in messages], ["prediction:snapshot", "prediction:snapshot"])
+        self.assertEqual([point["price"] for point in messages[-1]["predicted_series"]], [100.0, 101.5, 103.0])
+
+
+class LoopbackBus(BroadcastBus):
+    """Stands in for Redis pub/sub: every published event reaches every started worker"""
+
+    def __init__(self):
+        self.handlers = []
+        self.published = 0
+
+    async def start(self, handler, subscriptions):
+        self.handlers.append(handler)
+
+    async def publish(self, event):
+        self.published += 1
+        for handler in self.handlers:
+            await handler(json.loads(json.dumps(event)))
+        return True
+
+
+class BroadcastBusTest(unittest.TestCase):
+    def test_each_worker_delivers_published_events_to_its_own_sockets(self):
+        async def run():
+            bus = LoopbackBus()
+            workers = [ConnectionManager(bus=bus) for _ in range(2)]
+            sockets = [RecordingWebSocket() for _ in workers]
+            for worker, websocket in zip(workers, sockets):
+                await bus.start(worker.deliver, worker.get_all_subscriptions)
+                await worker.connect(websocket)
+                worker.subscribe(websocket, "TCS.NS", "5m")
+
+            # Produced on one worker only (the scheduler leader)
+            await workers[0].broadcast_candle("TCS.NS", "5m", {"close": 100.0})
+            await workers[0].broadcast_training_progress({"batch": 1})
+            for worker, websocket in zip(workers, sockets):
+                await worker.message_queues[websocket].join()
+                worker.disconnect(websocket)
+            return bus, sockets
+
+        with mock.patch.multiple(websocket_manager_module.settings, ws_binary_frames=False, ws_connection_metadata=False):
+            bus, sockets = asyncio.run(run())
+
+        self.assertEqual(bus.published, 2)
+        for websocket in sockets:
+            self.assertEqual([json.loads(frame)["type"] for frame in websocket.frames], ["candle:update", "training:progress"])
+
+    def test_unreachable_redis_falls_back_to_local_delivery(self):
+        async def run():
+            with mock.patch.multiple(
+                websocket_manager_module.settings, redis_url="redis://127.0.0.1:1/0", ws_binary_frames=False
+            ):
+                bus = RedisBroadcastBus(heartbeat_seconds=1.0)
+                manager = ConnectionManager(bus=bus)
+                await bus.start(manager.deliver, manager.get_all_subscriptions)
+                websocket = RecordingWebSocket()
+                await manager.connect(websocket)
+                manager.subscribe(websocket, "TCS.NS", "5m")
+                await manager.broadcast_candle("TCS.NS", "5m", {"close": 100.0})
+                await manager.message_queues[websocket].join()
+                manager.disconnect(websocket)
+                await bus.stop()
+            return bus, websocket
+
+        bus, websocket = asyncio.run(run())
+
+        self.assertTrue(bus.is_leader())
+        self.assertEqual(len(websocket.frames), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
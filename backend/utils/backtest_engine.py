@@ -4,16 +4,31 @@ Simulates trading strategies using historical data with realistic execution.
 """
 from typing import Dict, List, Optional, Callable
 from datetime import datetime, timedelta
+from collections import defaultdict
+import heapq
 import logging
+import numpy as np
+import pandas as pd
 from backend.utils.order_simulator import order_simulator
 from backend.utils.position_manager import PositionManager
 from backend.utils.performance_metrics import PerformanceMetrics
 from backend.utils.cost_calculator import cost_calculator
-from backend.utils.exchange_calendar import exchange_calendar
-from backend.utils.signal_strategies import generate_signal_from_indicators, MultiIndicatorStrategy, SignalStrategy
+from backend.utils.exchange_calendar import exchange_calendar, IST
+from backend.utils.signal_strategies import (
+    generate_signal_from_indicators,
+    row_indicators,
+    MultiIndicatorStrategy,
+    SignalStrategy,
+    BUY,
+    SELL,
+)
+from backend.utils.incremental_indicators import IncrementalIndicators, mask_warmup
+from backend.utils.indicators import calculate_all_indicators
 
 logger = logging.getLogger(__name__)
 
+BACKTEST_MODES = ("event", "vectorized")
+
 
 class BacktestEngine:
     """
@@ -39,6 +54,8 @@ class BacktestEngine:
         max_positions: int = 1,  # Maximum concurrent positions
         stop_loss_pct: float = 0.0,  # 0 = no stop loss
         take_profit_pct: float = 0.0,  # 0 = no take profit
+        mode: str = "event",  # "event" (bar-by-bar indicators) or "vectorized"
+        indicator_frame: Optional[pd.DataFrame] = None,  # Precomputed frame for vectorized mode
     ) -> Dict:
         """
         Run a backtest on historical data.
@@ -55,12 +72,20 @@ class BacktestEngine:
             max_positions: Maximum concurrent positions
             stop_loss_pct: Stop loss percentage (0 = disabled)
             take_profit_pct: Take profit percentage (0 = disabled)
+            mode: "event" updates indicators bar by bar; "vectorized" computes the
+                indicator frame and strategy signals once as arrays and only loops
+                for position/stop-loss bookkeeping. Both produce the same trades.
+            indicator_frame: Warmup-masked indicator frame for exactly these candles
+                (see prepare_indicator_frame). Vectorized mode only; lets callers
+                such as parameter sweeps share one indicator pass across runs.
         
         Returns:
             Backtest results dictionary
         """
         if not candles:
             raise ValueError("No candles provided for backtest")
+        if mode not in BACKTEST_MODES:
+            raise ValueError(f"Invalid backtest mode '{mode}'. Expected one of {BACKTEST_MODES}")
         
         # Initialize position manager
         self.position_manager.initialize(initial_capital)
@@ -68,17 +93,16 @@ class BacktestEngine:
         self.returns = []
         self.trades = []
         
+        if indicator_frame is not None:
+            if mode != "vectorized":
+                raise ValueError("indicator_frame is only supported in vectorized mode")
+            if start_date or end_date:
+                raise ValueError("indicator_frame must be computed on already filtered candles")
+            if len(indicator_frame) != len(candles):
+                raise ValueError("indicator_frame length does not match candles")
+        
         # Filter candles by date range
-        if start_date or end_date:
-            filtered_candles = []
-            for candle in candles:
-                candle_time = self._parse_candle_time(candle["start_ts"])
-                if start_date and candle_time < start_date:
-                    continue
-                if end_date and candle_time > end_date:
-                    continue
-                filtered_candles.append(candle)
-            candles = filtered_candles
+        candles = self.filter_candles(candles, start_date, end_date)
         
         if not candles:
             raise ValueError("No candles in date range")
@@ -87,15 +111,35 @@ class BacktestEngine:
         if strategy is None:
             strategy = MultiIndicatorStrategy()
         
+        indicator_state = None
+        actions = None
+        market_open = None
+        if mode == "vectorized":
+            # One indicator pass over the whole range; signals and market hours as arrays
+            if indicator_frame is None:
+                indicator_frame = self.prepare_indicator_frame(candles)
+            actions = strategy.generate_signals(indicator_frame)
+            market_open = self._market_open_mask(candles)
+        else:
+            # Indicators are updated once per candle (O(1)) instead of being
+            # recomputed over the whole prefix on every bar
+            indicator_state = IncrementalIndicators()
+        
         # Simulate trading day by day
         for i, candle in enumerate(candles):
-            candle_time = self._parse_candle_time(candle["start_ts"])
+            if market_open is not None:
+                if not market_open[i]:
+                    continue
+                candle_time = self._parse_candle_time(candle["start_ts"])
+            else:
+                indicator_state.update(candle)
+                candle_time = self._parse_candle_time(candle["start_ts"])
+                
+                # Check if market is open
+                if not exchange_calendar.is_market_open(candle_time):
+                    continue
             current_price = candle["close"]
             
-            # Check if market is open
-            if not exchange_calendar.is_market_open(candle_time):
-                continue
-            
             # Get current prices for all positions
             current_prices = {symbol: current_price}
             
@@ -131,17 +175,28 @@ class BacktestEngine:
                         continue
             
             # Generate trading signal from indicators
-            signal = generate_signal_from_indicators(
-                candle=candle,
-                candles=candles[:i+1],  # Use all candles up to current
-                strategy=strategy,
-                index=i
-            )
-            
-            if not signal:
-                continue
-            
-            signal_type = signal.get("action")  # "buy", "sell", or None
+            if actions is not None:
+                if actions[i] == BUY:
+                    signal_type = "buy"
+                elif actions[i] == SELL:
+                    signal_type = "sell"
+                else:
+                    continue
+                # Full signal metadata is only materialized for trade entries
+                signal = None
+            else:
+                signal = generate_signal_from_indicators(
+                    candle=candle,
+                    candles=None,
+                    strategy=strategy,
+                    index=i,
+                    indicator_state=indicator_state
+                )
+                
+                if not signal:
+                    continue
+                
+                signal_type = signal.get("action")  # "buy", "sell", or None
             
             if signal_type == "buy":
                 # Check if we can open new position
@@ -188,7 +243,9 @@ class BacktestEngine:
                         "quantity": quantity,
                         "value": order_result["trade_value"],
                         "costs": order_result["costs"]["total_cost"],
-                        "signal": signal
+                        "signal": signal if signal is not None else strategy.generate_signal(
+                            candle, row_indicators(indicator_frame, i), i
+                        )
                     })
                 except ValueError as e:
                     logger.warning(f"Insufficient capital for trade: {e}")
@@ -248,6 +305,250 @@ class BacktestEngine:
             "open_positions": [p.to_dict() for p in self.position_manager.positions]
         }
     
+    def run_portfolio_backtest(
+        self,
+        candles_by_symbol: Dict[str, List[Dict]],
+        initial_capital: float,
+        strategy: Optional[SignalStrategy] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        position_size_pct: float = 0.1,  # Of total portfolio value per trade
+        max_positions: int = 5,  # Maximum concurrent positions across all symbols
+        stop_loss_pct: float = 0.0,
+        take_profit_pct: float = 0.0,
+    ) -> Dict:
+        """
+        Run one backtest over several symbols sharing a single capital pool.
+        
+        Candle streams are merged onto one timeline with a heap keyed by
+        timestamp, so the run is O(total bars * log(symbols)). Indicators and
+        strategy signals are precomputed per symbol as in vectorized mode.
+        At each timestamp exits (stop loss, take profit, sell signals) are
+        processed before entries so freed capital can be reused, and the
+        equity curve gets exactly one point per timestamp with an open market.
+        
+        Args:
+            candles_by_symbol: Historical candles keyed by symbol
+            initial_capital: Starting capital for the whole portfolio
+            strategy: SignalStrategy instance (default MultiIndicatorStrategy)
+            start_date: Start date for backtest
+            end_date: End date for backtest
+            position_size_pct: Percentage of portfolio value per new position
+            max_positions: Maximum concurrent positions across symbols
+            stop_loss_pct: Stop loss percentage (0 = disabled)
+            take_profit_pct: Take profit percentage (0 = disabled)
+        
+        Returns:
+            Backtest results dictionary (run_backtest shape plus per-symbol breakdown)
+        """
+        if not candles_by_symbol:
+            raise ValueError("No symbols provided for portfolio backtest")
+        
+        self.position_manager.initialize(initial_capital)
+        self.equity_curve = [initial_capital]
+        self.returns = []
+        self.trades = []
+        
+        if strategy is None:
+            strategy = MultiIndicatorStrategy()
+        
+        # Per-symbol precomputation (one indicator/signal pass each)
+        streams = []
+        for symbol, candles in candles_by_symbol.items():
+            candles = self.filter_candles(candles or [], start_date, end_date)
+            if not candles:
+                logger.warning(f"No candles in date range for {symbol}, skipping")
+                continue
+            frame = self.prepare_indicator_frame(candles)
+            index = self._candle_index(candles)
+            streams.append({
+                "symbol": symbol,
+                "candles": candles,
+                "frame": frame,
+                "actions": strategy.generate_signals(frame),
+                "market_open": self._market_open_mask(candles, index),
+                "times": index.asi8,
+                "index": index,
+            })
+        
+        if not streams:
+            raise ValueError("No candles in date range")
+        
+        # Event queue: (timestamp_ns, stream number, bar index)
+        heap = [(stream["times"][0], n, 0) for n, stream in enumerate(streams)]
+        heapq.heapify(heap)
+        last_prices: Dict[str, float] = {}
+        
+        while heap:
+            timestamp = heap[0][0]
+            bars = []
+            while heap and heap[0][0] == timestamp:
+                _, n, i = heapq.heappop(heap)
+                if i + 1 < len(streams[n]["times"]):
+                    heapq.heappush(heap, (streams[n]["times"][i + 1], n, i + 1))
+                if streams[n]["market_open"][i]:
+                    bars.append((streams[n], i))
+            
+            if not bars:
+                continue
+            
+            for stream, i in bars:
+                last_prices[stream["symbol"]] = stream["candles"][i]["close"]
+            
+            # Exits first so capital released this bar is available to entries
+            exited = set()
+            for stream, i in bars:
+                symbol = stream["symbol"]
+                position = self.position_manager.get_position(symbol)
+                if not position:
+                    continue
+                candle = stream["candles"][i]
+                candle_time = stream["index"][i].to_pydatetime()
+                current_price = candle["close"]
+                
+                exit_price = None
+                reason = None
+                if stop_loss_pct > 0 and current_price <= position.entry_price * (1 - stop_loss_pct):
+                    exit_price = position.entry_price * (1 - stop_loss_pct)
+                    reason = "stop_loss"
+                elif take_profit_pct > 0 and current_price >= position.entry_price * (1 + take_profit_pct):
+                    exit_price = position.entry_price * (1 + take_profit_pct)
+                    reason = "take_profit"
+                elif stream["actions"][i] == SELL:
+                    exit_price = current_price
+                    reason = "signal"
+                
+                if reason:
+                    self._close_position(
+                        symbol=symbol,
+                        exit_price=exit_price,
+                        exit_time=candle_time,
+                        candle=candle,
+                        reason=reason
+                    )
+                    exited.add(symbol)
+            
+            for stream, i in bars:
+                symbol = stream["symbol"]
+                if stream["actions"][i] != BUY or symbol in exited:
+                    continue
+                if len(self.position_manager.positions) >= max_positions:
+                    break
+                if self.position_manager.get_position(symbol):
+                    continue
+                
+                candle = stream["candles"][i]
+                candle_time = stream["index"][i].to_pydatetime()
+                current_price = candle["close"]
+                portfolio_value = self.position_manager.get_portfolio_value(last_prices)
+                quantity = int(portfolio_value * position_size_pct / current_price)
+                if quantity <= 0:
+                    continue
+                
+                order_result = order_simulator.simulate_market_order(
+                    symbol=symbol,
+                    quantity=quantity,
+                    price=current_price,
+                    is_sell=False,
+                    daily_volume=candle.get("volume", 0),
+                    prices=[c["close"] for c in stream["candles"][max(0, i-20):i+1]],
+                    timestamp=candle_time
+                )
+                
+                try:
+                    self.position_manager.open_position(
+                        symbol=symbol,
+                        quantity=quantity,
+                        entry_price=order_result["fill_price"],
+                        entry_time=candle_time,
+                        entry_costs=order_result["costs"]["total_cost"]
+                    )
+                except ValueError as e:
+                    logger.warning(f"Insufficient capital for {symbol} trade: {e}")
+                    continue
+                
+                self.trades.append({
+                    "type": "entry",
+                    "symbol": symbol,
+                    "time": candle_time.isoformat(),
+                    "price": order_result["fill_price"],
+                    "quantity": quantity,
+                    "value": order_result["trade_value"],
+                    "costs": order_result["costs"]["total_cost"],
+                    "signal": strategy.generate_signal(candle, row_indicators(stream["frame"], i), i)
+                })
+            
+            # Mark to market once per timestamp
+            self.equity_curve.append(self.position_manager.get_portfolio_value(last_prices))
+            self.returns.append((self.equity_curve[-1] - self.equity_curve[-2]) / self.equity_curve[-2])
+        
+        final_value = self.equity_curve[-1]
+        start_time = min(stream["index"][0] for stream in streams).to_pydatetime()
+        end_time = max(stream["index"][-1] for stream in streams).to_pydatetime()
+        
+        metrics = PerformanceMetrics.calculate_metrics(
+            returns=self.returns,
+            equity_curve=self.equity_curve,
+            initial_capital=initial_capital,
+            final_value=final_value,
+            days=(end_time - start_time).days
+        )
+        
+        closing_prices = {stream["symbol"]: stream["candles"][-1]["close"] for stream in streams}
+        per_symbol = defaultdict(lambda: {"closed_trades": 0, "realized_pnl": 0.0})
+        for position in self.position_manager.closed_positions:
+            per_symbol[position.symbol]["closed_trades"] += 1
+            per_symbol[position.symbol]["realized_pnl"] += position.get_realized_pnl() or 0.0
+        
+        return {
+            "symbols": [stream["symbol"] for stream in streams],
+            "start_date": start_time.isoformat(),
+            "end_date": end_time.isoformat(),
+            "initial_capital": initial_capital,
+            "final_value": final_value,
+            "metrics": metrics,
+            "statistics": self.position_manager.get_statistics(),
+            "pnl": self.position_manager.get_total_pnl(closing_prices),
+            "per_symbol": {
+                symbol: {"closed_trades": data["closed_trades"], "realized_pnl": round(data["realized_pnl"], 2)}
+                for symbol, data in per_symbol.items()
+            },
+            "trades": self.trades,
+            "equity_curve": self.equity_curve,
+            "returns": self.returns,
+            "total_trades": len(self.trades),
+            "closed_positions": [p.to_dict() for p in self.position_manager.closed_positions],
+            "open_positions": [p.to_dict() for p in self.position_manager.positions]
+        }
+    
+    def filter_candles(
+        self,
+        candles: List[Dict],
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> List[Dict]:
+        """Restrict candles to [start_date, end_date] (either bound optional)"""
+        if not (start_date or end_date):
+            return candles
+        
+        filtered_candles = []
+        for candle in candles:
+            candle_time = self._parse_candle_time(candle["start_ts"])
+            if start_date and candle_time < start_date:
+                continue
+            if end_date and candle_time > end_date:
+                continue
+            filtered_candles.append(candle)
+        return filtered_candles
+    
+    @staticmethod
+    def prepare_indicator_frame(candles: List[Dict]) -> pd.DataFrame:
+        """
+        Indicator frame used by vectorized mode: calculate_all_indicators over
+        all candles with warmup rows masked to match bar-by-bar semantics.
+        """
+        return mask_warmup(calculate_all_indicators(candles))
+    
     def _close_position(
         self,
         symbol: str,
@@ -296,6 +597,39 @@ class BacktestEngine:
                 "reason": reason
             })
     
+    def _market_open_mask(self, candles: List[Dict], index: Optional[pd.DatetimeIndex] = None) -> np.ndarray:
+        """
+        Vectorized equivalent of exchange_calendar.is_market_open for each candle.
+        Calendar lookups run once per distinct date instead of once per bar.
+        """
+        if index is None:
+            index = self._candle_index(candles)
+        
+        dates = index.normalize()
+        seconds = (index - dates).total_seconds().to_numpy()
+        
+        open_seconds = self._seconds_of_day(exchange_calendar.market_open)
+        close_by_date = {}
+        for day in dates.unique():
+            day_date = day.date()
+            if exchange_calendar.is_trading_day(day_date):
+                close_by_date[day] = self._seconds_of_day(exchange_calendar.get_market_close_time(day_date))
+            else:
+                close_by_date[day] = -1.0  # Never open
+        close_seconds = dates.map(close_by_date).to_numpy(dtype=float)
+        
+        return (seconds >= open_seconds) & (seconds <= close_seconds)
+    
+    def _candle_index(self, candles: List[Dict]) -> pd.DatetimeIndex:
+        """Candle timestamps as an IST DatetimeIndex (naive timestamps are taken as IST)"""
+        times = [self._parse_candle_time(c["start_ts"]) for c in candles]
+        times = [IST.localize(t) if t.tzinfo is None else t for t in times]
+        return pd.DatetimeIndex(pd.to_datetime(times, utc=True)).tz_convert(IST)
+    
+    @staticmethod
+    def _seconds_of_day(value) -> float:
+        return value.hour * 3600 + value.minute * 60 + value.second + value.microsecond / 1e6
+    
     def _parse_candle_time(self, timestamp) -> datetime:
         """Parse candle timestamp"""
         if isinstance(timestamp, str):
@@ -0,0 +1,251 @@
+"""
+Broadcast bus for WebSocket fan-out across workers.
+
+ConnectionManager publishes every broadcast (candle, prediction, training,
+model status) as an event on the bus, and each worker delivers the events
+it receives to its own sockets. BroadcastBus is the in-process default:
+nothing is published and the caller delivers locally, which is exactly the
+single-worker behaviour. RedisBroadcastBus publishes on a Redis pub/sub
+channel that every worker listens on, so an update produced on one worker
+reaches clients connected to any of them.
+
+With several workers the scheduled jobs must still run once: the Redis bus
+holds a leader lease (renewed every broadcast_heartbeat_seconds) and only
+the leader runs them, and each worker advertises its subscriptions so the
+leader fetches candles for every connected client. If Redis becomes
+unreachable each worker falls back to leading itself and delivering
+locally.
+"""
+import asyncio
+import json
+import os
+import socket
+import time
+import uuid
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from backend.config import settings
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+EventHandler = Callable[[Dict], Awaitable[None]]
+SubscriptionsProvider = Callable[[], List[Dict]]
+
+# Compare-and-expire / compare-and-delete: only the lease holder may renew or release it
+_RENEW_LEASE = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+_RELEASE_LEASE = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class BroadcastBus:
+    """In-process bus: events are delivered to this worker's connections only"""
+
+    name = "memory"
+
+    async def start(self, handler: EventHandler, subscriptions: SubscriptionsProvider):
+        """Begin receiving events; `subscriptions` returns this worker's subscriptions"""
+        return None
+
+    async def stop(self):
+        return None
+
+    async def publish(self, event: Dict) -> bool:
+        """Publish an event to every worker; False means the caller must deliver it locally"""
+        return False
+
+    def is_leader(self) -> bool:
+        """Whether this worker runs the scheduled jobs"""
+        return True
+
+    async def cluster_subscriptions(self, local: List[Dict]) -> List[Dict]:
+        """Subscriptions of every worker (deduplicated by symbol/timeframe)"""
+        return local
+
+
+class RedisBroadcastBus(BroadcastBus):
+    """Redis pub/sub bus with a scheduler leader lease (see module docstring)"""
+
+    name = "redis"
+
+    def __init__(self, channel: str = "ws:broadcast", heartbeat_seconds: float = 5.0):
+        import redis.asyncio as redis_asyncio
+
+        if settings.redis_url:
+            self.client = redis_asyncio.from_url(settings.redis_url, socket_connect_timeout=5)
+        else:
+            self.client = redis_asyncio.Redis(
+                host=settings.redis_host,
+                port=settings.redis_port,
+                db=settings.redis_db,
+                password=settings.redis_password if settings.redis_password else None,
+                socket_connect_timeout=2,
+            )
+        self.channel = channel
+        self.heartbeat_seconds = max(0.5, float(heartbeat_seconds))
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._leader_key = f"{channel}:leader"
+        self._subscriptions_key = f"{channel}:subscriptions"
+        self._renew_lease = self.client.register_script(_RENEW_LEASE)
+        self._release_lease = self.client.register_script(_RELEASE_LEASE)
+        self._handler: Optional[EventHandler] = None
+        self._subscriptions: Optional[SubscriptionsProvider] = None
+        self._tasks: List[asyncio.Task] = []
+        self._running = False
+        self._leader = False
+        self._degraded = False
+
+    async def start(self, handler: EventHandler, subscriptions: SubscriptionsProvider):
+        self._handler = handler
+        self._subscriptions = subscriptions
+        self._running = True
+        await self._heartbeat()
+        if self._degraded:
+            # Unreachable at startup: behave like the in-process bus
+            self._running = False
+            logger.warning("Redis unreachable, WebSocket broadcasts stay in-process", channel=self.channel)
+            return
+        self._tasks = [
+            asyncio.create_task(self._listen()),
+            asyncio.create_task(self._heartbeat_loop()),
+        ]
+        logger.info("Broadcast bus started", bus=self.name, channel=self.channel, worker=self.worker_id)
+
+    async def stop(self):
+        self._running = False
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        try:
+            await self.client.hdel(self._subscriptions_key, self.worker_id)
+            if self._leader:
+                await self._release_lease(keys=[self._leader_key], args=[self.worker_id])
+            await self.client.aclose()
+        except Exception as e:
+            logger.warning("Broadcast bus shutdown failed", error=str(e))
+        self._leader = False
+
+    async def publish(self, event: Dict) -> bool:
+        if not self._running or self._degraded:
+            return False
+        try:
+            await self.client.publish(self.channel, json.dumps(event, separators=(",", ":")))
+            return True
+        except Exception as e:
+            logger.warning("Broadcast bus publish failed, delivering locally", error=str(e))
+            return False
+
+    def is_leader(self) -> bool:
+        # Without Redis every worker serves its own clients
+        return self._leader or self._degraded or not self._running
+
+    async def cluster_subscriptions(self, local: List[Dict]) -> List[Dict]:
+        merged = {(sub.get("symbol"), sub.get("timeframe")): sub for sub in local}
+        if not self._running or self._degraded:
+            return list(merged.values())
+        try:
+            entries = await self.client.hgetall(self._subscriptions_key)
+        except Exception as e:
+            logger.warning("Reading cluster subscriptions failed", error=str(e))
+            return list(merged.values())
+
+        stale_before = time.time() - 3 * self.heartbeat_seconds
+        for raw in entries.values():
+            try:
+                entry = json.loads(raw)
+            except ValueError:
+                continue
+            if entry.get("at", 0) < stale_before:
+                continue
+            for sub in entry.get("subscriptions", []):
+                merged.setdefault((sub.get("symbol"), sub.get("timeframe")), sub)
+        return list(merged.values())
+
+    async def _heartbeat(self):
+        """Renew (or take) the leader lease and advertise local subscriptions"""
+        ttl_ms = int(3 * self.heartbeat_seconds * 1000)
+        try:
+            leader = bool(await self.client.set(self._leader_key, self.worker_id, nx=True, px=ttl_ms))
+            if not leader:
+                leader = bool(await self._renew_lease(keys=[self._leader_key], args=[self.worker_id, ttl_ms]))
+            subscriptions = self._subscriptions() if self._subscriptions else []
+            await self.client.hset(
+                self._subscriptions_key,
+                self.worker_id,
+                json.dumps({"at": time.time(), "subscriptions": subscriptions}),
+            )
+        except Exception as e:
+            if not self._degraded:
+                logger.warning("Broadcast bus heartbeat failed, serving local clients only", error=str(e))
+            self._degraded = True
+            return
+
+        if leader != self._leader or self._degraded:
+            logger.info("Scheduler leadership", worker=self.worker_id, leader=leader)
+        self._leader = leader
+        self._degraded = False
+
+    async def _heartbeat_loop(self):
+        while self._running:
+            await asyncio.sleep(self.heartbeat_seconds)
+            await self._heartbeat()
+
+    async def _listen(self):
+        """Deliver channel events to this worker's connections, reconnecting with backoff"""
+        delay = 1.0
+        while self._running:
+            pubsub = self.client.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                delay = 1.0
+                while self._running:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message is None or message.get("type") != "message":
+                        continue
+                    try:
+                        event = json.loads(message["data"])
+                    except ValueError as e:
+                        logger.warning("Dropping malformed broadcast event", error=str(e))
+                        continue
+                    try:
+                        await self._handler(event)
+                    except Exception as e:
+                        logger.error("Broadcast delivery failed", type=event.get("type"), error=str(e))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Broadcast bus subscription lost, retrying", error=str(e), retry_in=delay)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30.0)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+
+def create_broadcast_bus() -> BroadcastBus:
+    """Bus selected by settings.broadcast_bus ("auto" uses Redis when redis_enabled)"""
+    choice = settings.broadcast_bus
+    if choice == "auto":
+        choice = "redis" if settings.redis_enabled else "memory"
+    if choice == "redis":
+        try:
+            return RedisBroadcastBus(settings.broadcast_channel, settings.broadcast_heartbeat_seconds)
+        except Exception as e:
+            logger.warning("Redis broadcast bus unavailable, using in-process bus", error=str(e))
+    return BroadcastBus()
+
+
+# Singleton instance
+broadcast_bus = create_broadcast_bus()
@@ -0,0 +1,232 @@
+"""
+Columnar candle container.
+
+CandleFrame keeps candles as int64 UTC epoch-nanosecond timestamps plus
+contiguous float64 OHLCV arrays. Timestamps are parsed once on the way in,
+slices are views over the same arrays, and to_dataframe() shares memory with
+the frame. The arrays are read-only, so one frame can be handed to several
+consumers (e.g. every bot of a merger request) without copies. Integer
+indexing and iteration still yield candle dicts, so code written against
+List[Dict] keeps working; to_records() builds the JSON form (ISO start_ts
+strings) at API/WebSocket boundaries.
+"""
+from __future__ import annotations
+
+import warnings
+from typing import Dict, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+OHLCV_COLUMNS = ("open", "high", "low", "close", "volume")
+
+# Exchange timezone used when rendering timestamps and for naive inputs
+DEFAULT_TZ = "Asia/Kolkata"
+
+
+def _as_timestamp(value, tz: str) -> pd.Timestamp:
+    try:
+        ts = pd.Timestamp(value.replace("Z", "+00:00") if isinstance(value, str) else value)
+    except (TypeError, ValueError):
+        return pd.NaT
+    if ts is pd.NaT:
+        return ts
+    return ts.tz_localize(tz) if ts.tzinfo is None else ts
+
+
+def _iso_strings(start_ns: np.ndarray, tz: str) -> List[str]:
+    """ISO-8601 strings with UTC offset, vectorized when the offset is constant"""
+    if not len(start_ns):
+        return []
+    utc = pd.DatetimeIndex(start_ns.view("datetime64[ns]"), copy=False).tz_localize("UTC")
+    local = utc.tz_convert(tz)
+    wall = local.tz_localize(None).asi8
+    offsets = np.unique(wall - start_ns)
+    if len(offsets) > 1:
+        return [ts.isoformat() for ts in local]
+    minutes = int(offsets[0] // 60_000_000_000)
+    sign = "+" if minutes >= 0 else "-"
+    suffix = f"{sign}{abs(minutes) // 60:02d}:{abs(minutes) % 60:02d}"
+    unit = "s" if not (start_ns % 1_000_000_000).any() else "us"
+    strings = np.datetime_as_string(wall.view("datetime64[ns]"), unit=unit)
+    return [value + suffix for value in strings.tolist()]
+
+
+def _epoch_ns(values, tz: str) -> np.ndarray:
+    """UTC epoch nanoseconds (NaT as iNaT); naive values are taken as `tz` local time"""
+    values = pd.Series(values, copy=False)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        try:
+            parsed = pd.to_datetime(values, errors="coerce", format="mixed")
+        except ValueError:
+            # pandas >= 3 raises on mixed timezones instead of returning objects
+            parsed = None
+    if parsed is None or parsed.dtype == object:
+        # Mixed UTC offsets (or naive mixed with aware): resolve value by value
+        parsed = pd.Series(pd.to_datetime([_as_timestamp(value, tz) for value in values], utc=True))
+    elif parsed.dt.tz is None:
+        parsed = parsed.dt.tz_localize(tz)
+    return parsed.dt.tz_convert("UTC").dt.tz_localize(None).to_numpy(dtype="datetime64[ns]").view(np.int64)
+
+
+class CandleFrame:
+    """Candles stored column-wise (see module docstring)"""
+
+    __slots__ = ("start_ns", "open", "high", "low", "close", "volume", "tz")
+
+    def __init__(
+        self,
+        start_ns,
+        open,
+        high,
+        low,
+        close,
+        volume,
+        tz: str = DEFAULT_TZ,
+    ):
+        self._assign(
+            np.array(start_ns, dtype=np.int64),
+            [np.array(values, dtype=np.float64) for values in (open, high, low, close, volume)],
+            tz,
+        )
+
+    def _assign(self, start_ns: np.ndarray, columns: List[np.ndarray], tz: str):
+        """Adopt arrays owned by this frame (no copy) and make them read-only"""
+        self.start_ns = start_ns
+        for col, values in zip(OHLCV_COLUMNS, columns):
+            setattr(self, col, values)
+        self.tz = tz
+        for values in [start_ns, *columns]:
+            values.flags.writeable = False
+
+    @classmethod
+    def _owning(cls, start_ns: np.ndarray, columns: List[np.ndarray], tz: str) -> "CandleFrame":
+        frame = cls.__new__(cls)
+        frame._assign(np.ascontiguousarray(start_ns), [np.ascontiguousarray(c) for c in columns], tz)
+        return frame
+
+    @classmethod
+    def empty(cls, tz: str = DEFAULT_TZ) -> "CandleFrame":
+        return cls._owning(np.empty(0, np.int64), [np.empty(0) for _ in OHLCV_COLUMNS], tz)
+
+    @classmethod
+    def from_records(cls, candles: Optional[Sequence[Dict]], tz: str = DEFAULT_TZ) -> "CandleFrame":
+        """Build from candle dicts; candles without a parseable start_ts are dropped"""
+        if isinstance(candles, CandleFrame):
+            return candles
+        if not candles:
+            return cls.empty(tz)
+
+        start_ns = _epoch_ns([candle.get("start_ts") for candle in candles], tz)
+        columns = [
+            np.array([candle.get(col) for candle in candles], dtype=np.float64)
+            for col in OHLCV_COLUMNS
+        ]
+        columns[4] = np.nan_to_num(columns[4], nan=0.0)
+        valid = start_ns != np.iinfo(np.int64).min
+        if not valid.all():
+            start_ns = start_ns[valid]
+            columns = [column[valid] for column in columns]
+        return cls._owning(start_ns, columns, tz)
+
+    @classmethod
+    def from_dataframe(cls, df: Optional[pd.DataFrame], tz: str = DEFAULT_TZ) -> "CandleFrame":
+        """
+        Build from a DataFrame with start_ts and OHLCV columns (missing OHLCV
+        columns are zero). Rows without start_ts or close are dropped and the
+        result is sorted by start_ts.
+        """
+        if df is None or df.empty or "start_ts" not in df.columns:
+            return cls.empty(tz)
+
+        start_ns = _epoch_ns(df["start_ts"], tz)
+        columns = [
+            df[col].to_numpy(dtype=np.float64, na_value=np.nan, copy=True) if col in df.columns else np.zeros(len(df))
+            for col in OHLCV_COLUMNS
+        ]
+        columns[4] = np.nan_to_num(columns[4], nan=0.0)
+        valid = (start_ns != np.iinfo(np.int64).min) & ~np.isnan(columns[3])
+        if not valid.all():
+            start_ns = start_ns[valid]
+            columns = [column[valid] for column in columns]
+        return cls._owning(start_ns, columns, tz).sorted()
+
+    @classmethod
+    def coerce(cls, candles: Union["CandleFrame", pd.DataFrame, Sequence[Dict], None]) -> "CandleFrame":
+        if isinstance(candles, CandleFrame):
+            return candles
+        if isinstance(candles, pd.DataFrame):
+            return cls.from_dataframe(candles)
+        return cls.from_records(candles)
+
+    def _take(self, key) -> "CandleFrame":
+        """Rows selected by a slice (views) or an index array (copies)"""
+        frame = CandleFrame.__new__(CandleFrame)
+        frame._assign(self.start_ns[key], [getattr(self, col)[key] for col in OHLCV_COLUMNS], self.tz)
+        return frame
+
+    def sorted(self) -> "CandleFrame":
+        """Frame ordered by start_ts (self if already ordered)"""
+        if len(self) < 2 or bool(np.all(self.start_ns[1:] >= self.start_ns[:-1])):
+            return self
+        return self._take(np.argsort(self.start_ns, kind="stable"))
+
+    def __len__(self) -> int:
+        return len(self.start_ns)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return self._take(key)
+        return self.record(key)
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self.to_records())
+
+    def __repr__(self) -> str:
+        if not len(self):
+            return "CandleFrame(rows=0)"
+        return f"CandleFrame(rows={len(self)}, start={self.start_ts[0]}, end={self.start_ts[-1]})"
+
+    def tail(self, rows: int) -> "CandleFrame":
+        return self._take(slice(max(len(self) - rows, 0), None))
+
+    @property
+    def start_ts(self) -> pd.DatetimeIndex:
+        return pd.DatetimeIndex(self.start_ns.view("datetime64[ns]"), copy=False).tz_localize("UTC").tz_convert(self.tz)
+
+    def record(self, index: int) -> Dict:
+        """One candle as a dict (ISO start_ts)"""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("CandleFrame index out of range")
+        record = {"start_ts": pd.Timestamp(int(self.start_ns[index]), tz="UTC").tz_convert(self.tz).isoformat()}
+        for col in OHLCV_COLUMNS:
+            record[col] = float(getattr(self, col)[index])
+        return record
+
+    def to_records(self) -> List[Dict]:
+        """Candle dicts for JSON responses (ISO start_ts with UTC offset)"""
+        timestamps = _iso_strings(self.start_ns, self.tz)
+        values = zip(*(getattr(self, col).tolist() for col in OHLCV_COLUMNS))
+        return [
+            {"start_ts": ts, "open": o, "high": h, "low": l, "close": c, "volume": v}
+            for ts, (o, h, l, c, v) in zip(timestamps, values)
+        ]
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """DataFrame view: OHLCV columns share memory with the frame"""
+        data = {"start_ts": self.start_ts}
+        for col in OHLCV_COLUMNS:
+            data[col] = getattr(self, col)
+        return pd.DataFrame(data, copy=False)
+
+
+def candles_to_dataframe(candles: Union[CandleFrame, pd.DataFrame, Sequence[Dict], None]) -> pd.DataFrame:
+    """DataFrame for candles given as CandleFrame (zero-copy), DataFrame or list of dicts"""
+    if isinstance(candles, CandleFrame):
+        return candles.to_dataframe()
+    if isinstance(candles, pd.DataFrame):
+        return candles
+    return pd.DataFrame(list(candles) if candles is not None else [])
@@ -9,22 +9,119 @@ import pandas as pd
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 from collections import OrderedDict
+from bisect import bisect_left
 import logging
 import asyncio
+import contextvars
+import functools
+import math
+import re
+import threading
 from concurrent.futures import ThreadPoolExecutor
 import pytz
 from backend.utils.redis_cache import redis_cache
-from backend.data_pipeline import DataPipeline
+from backend.utils.candle_frame import CandleFrame
+from backend.data_pipeline import DataPipeline, IngestionQueue
 from backend.utils.exchange_calendar import exchange_calendar
 from backend.config import settings
+from backend.utils.metrics import record_fetch_request, record_fetch_window
+from backend.utils.rate_limiter import BudgetExhausted, FetchPriority, current_priority, fetch_scheduler
+from backend.services.replay_provider import ReplayError, replay_provider
 
 logger = logging.getLogger(__name__)
 
 # Thread pool executor for blocking Yahoo Finance calls
 _executor = ThreadPoolExecutor(max_workers=5)
+# Live fetches get their own threads: backfill/training callers block theirs
+# while waiting for provider budget, and live fetches must not queue behind them
+_live_executor = ThreadPoolExecutor(max_workers=3)
 _data_pipeline = DataPipeline()
 
 
+def _executor_for_priority() -> ThreadPoolExecutor:
+    """Thread pool for the fetch priority of the current context"""
+    return _live_executor if current_priority() == FetchPriority.LIVE else _executor
+
+
+def _register_lake_append(symbol: str, interval: str, provider: str, appended) -> None:
+    redis_cache.register_dataset_metadata(
+        symbol=symbol,
+        interval=interval,
+        dataset_version=appended.dataset_version,
+        run_id=appended.files[-1].stem,
+        provider=provider,
+    )
+
+
+# Lake appends run behind the fetch path; callers get candles once parsed
+_ingestion_queue = IngestionQueue(
+    _data_pipeline,
+    on_flush=_register_lake_append,
+    max_pending_rows=settings.ingestion_queue_max_rows,
+    flush_rows=settings.ingestion_flush_rows,
+    flush_interval=settings.ingestion_flush_interval_seconds,
+    put_timeout=settings.ingestion_put_timeout_seconds,
+)
+
+IST = pytz.timezone('Asia/Kolkata')
+
+# Minutes per bar, used to size delta fetches
+_INTERVAL_MINUTES = {
+    "1m": 1, "5m": 5, "15m": 15, "30m": 30, "1h": 60, "4h": 240,
+    "1d": 1440, "5d": 1440, "1wk": 10080, "1mo": 43200, "3mo": 129600,
+}
+_INTRADAY_INTERVALS = {"1m", "5m", "15m", "30m", "1h", "4h"}
+# Calendar days per provider period unit ('60d', '1mo', '2y', ...)
+_PERIOD_UNIT_DAYS = {"d": 1, "wk": 7, "mo": 30, "y": 365}
+# Bars kept per in-memory series before the oldest are dropped
+_MAX_SERIES_ROWS = 20000
+
+
+def _parse_ts(value) -> datetime:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if value.tzinfo is None:
+        value = IST.localize(value)
+    return value
+
+
+class _CandleSeries:
+    """Stored candles of one symbol/interval, complete from covered_from to the newest bar"""
+
+    def __init__(self, candles: List[Dict], covered_from: datetime):
+        self.covered_from = covered_from
+        self.candles: List[Dict] = []
+        self.timestamps: List[datetime] = []
+        self.merge(candles)
+
+    @property
+    def high_water_mark(self) -> Optional[datetime]:
+        return self.timestamps[-1] if self.timestamps else None
+
+    def merge(self, candles: List[Dict]):
+        """Upsert candles by start_ts (incoming bars replace stored ones)"""
+        incoming = {_parse_ts(c['start_ts']): c for c in candles if c.get('start_ts')}
+        if not incoming:
+            return
+        cut = bisect_left(self.timestamps, min(incoming))
+        tail = dict(zip(self.timestamps[cut:], self.candles[cut:]))
+        tail.update(incoming)
+        del self.timestamps[cut:]
+        del self.candles[cut:]
+        for ts in sorted(tail):
+            self.timestamps.append(ts)
+            self.candles.append(tail[ts])
+
+        overflow = len(self.timestamps) - _MAX_SERIES_ROWS
+        if overflow > 0:
+            del self.timestamps[:overflow]
+            del self.candles[:overflow]
+            self.covered_from = self.timestamps[0]
+
+    def window(self, start: datetime) -> List[Dict]:
+        return self.candles[bisect_left(self.timestamps, start):]
+
+
 class DataFetcher:
     """Fetches stock data from Yahoo Finance"""
     
@@ -34,6 +131,12 @@ class DataFetcher:
         self.max_cache_size = max_cache_size
         self.cache_hits = 0
         self.cache_misses = 0
+        # In-flight fetches by (event loop, symbol, interval, period, bypass_cache)
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        # Stored series per (symbol, interval); refreshes fetch only bars after
+        # the newest stored bar (high-water mark)
+        self._series: OrderedDict[tuple, _CandleSeries] = OrderedDict()
+        self._series_lock = threading.Lock()
     
     def _get_from_cache(self, cache_key: str) -> Optional[List[Dict]]:
         """
@@ -77,6 +180,10 @@ class DataFetcher:
         self.cache[cache_key] = (data, datetime.now())
         logger.debug(f"Cached data for {cache_key}, cache size: {len(self.cache)}")
     
+    def close(self, timeout: float = 10.0):
+        """Write candles still queued for the candle lake and stop the ingestion worker"""
+        _ingestion_queue.stop(timeout)
+
     def get_cache_stats(self) -> Dict:
         """
         Get cache statistics including Redis stats.
@@ -100,6 +207,31 @@ class DataFetcher:
         
         return stats
     
+    def _get_cached_candles(self, symbol: str, interval: str, period: str) -> Optional[List[Dict]]:
+        """Look up Redis hot cache first, then the in-memory warm cache"""
+        # Try Redis hot cache first
+        redis_data = redis_cache.get(symbol, interval, period)
+        if redis_data is not None:
+            self.cache_hits += 1
+            logger.debug(f"✅ Redis cache HIT: {symbol}:{interval}:{period}")
+            # Also update warm cache for faster subsequent access
+            cache_key = f"{symbol}_{interval}_{period}"
+            self._set_cache(cache_key, redis_data)
+            return redis_data
+        
+        # Fallback to in-memory warm cache (LRU)
+        cache_key = f"{symbol}_{interval}_{period}"
+        cached_data = self._get_from_cache(cache_key)
+        if cached_data is not None:
+            self.cache_hits += 1
+            logger.debug(f"✅ Warm cache HIT: {cache_key}")
+            return cached_data
+        
+        # Cache miss
+        self.cache_misses += 1
+        logger.debug(f"❌ Cache MISS: {cache_key} (will fetch fresh)")
+        return None
+    
     def _fetch_candles_sync(
         self, 
         symbol: str, 
@@ -114,27 +246,9 @@ class DataFetcher:
         """
         # CRITICAL: Check caches ONLY if bypass_cache is False
         if not bypass_cache:
-            # Try Redis hot cache first
-            redis_data = redis_cache.get(symbol, interval, period)
-            if redis_data is not None:
-                self.cache_hits += 1
-                logger.debug(f"✅ Redis cache HIT: {symbol}:{interval}:{period}")
-                # Also update warm cache for faster subsequent access
-                cache_key = f"{symbol}_{interval}_{period}"
-                self._set_cache(cache_key, redis_data)
-                return redis_data
-            
-            # Fallback to in-memory warm cache (LRU)
-            cache_key = f"{symbol}_{interval}_{period}"
-            cached_data = self._get_from_cache(cache_key)
+            cached_data = self._get_cached_candles(symbol, interval, period)
             if cached_data is not None:
-                self.cache_hits += 1
-                logger.debug(f"✅ Warm cache HIT: {cache_key}")
                 return cached_data
-            
-            # Cache miss
-            self.cache_misses += 1
-            logger.debug(f"❌ Cache MISS: {cache_key} (will fetch fresh)")
         else:
             logger.info(f"🚫 Bypassing ALL caches for {symbol}:{interval}:{period}")
         
@@ -143,36 +257,330 @@ class DataFetcher:
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
             try:
-                candles = loop.run_until_complete(
-                    self._fetch_candles_async(symbol, interval, period, bypass_cache)
+                return loop.run_until_complete(
+                    self._fetch_incremental(symbol, interval, period, bypass_cache)
                 )
-                
-                # Cache the result if we got data and not bypassing cache
-                if candles and not bypass_cache:
-                    cache_key = f"{symbol}_{interval}_{period}"
-                    self._set_cache(cache_key, candles)
-                    redis_cache.set(symbol, interval, candles, period)
-                    logger.debug(f"💾 Cached fresh data: {cache_key}")
-                
-                return candles
             finally:
                 loop.close()
         except Exception as e:
             logger.error(f"❌ Error in async fetch wrapper: {e}", exc_info=True)
             return []
     
+    @staticmethod
+    def _period_start(period: str, now: Optional[datetime] = None) -> Optional[datetime]:
+        """
+        Start of the window a provider period covers, or None if open-ended ('max', 'ytd').
+        Short day ranges ('1d', '5d') count trading sessions like Yahoo does;
+        longer ones are calendar days.
+        """
+        match = re.fullmatch(r"(\d+)(d|wk|mo|y)", period)
+        if not match:
+            return None
+        count, unit = int(match.group(1)), match.group(2)
+        now = (now or datetime.now(IST)).astimezone(IST)
+        if unit == "d" and count <= 5:
+            day = now.date()
+            if now.time() < exchange_calendar.market_open:
+                day -= timedelta(days=1)
+            sessions = 0
+            for _ in range(count * 7 + 14):
+                if exchange_calendar.is_trading_day(day):
+                    sessions += 1
+                    if sessions == count:
+                        break
+                day -= timedelta(days=1)
+            return IST.localize(datetime.combine(day, datetime.min.time()))
+        return now - timedelta(days=count * _PERIOD_UNIT_DAYS[unit])
+
+    @staticmethod
+    def _bars_since(since: datetime, interval: str) -> int:
+        """Upper bound on the bars from `since` (inclusive) until now"""
+        minutes = (datetime.now(IST) - since).total_seconds() / 60
+        return max(1, math.ceil(minutes / _INTERVAL_MINUTES.get(interval, 5))) + 1
+
+    @staticmethod
+    def _clock(symbol: str, interval: str) -> Optional[datetime]:
+        """Reference time for period windows: the newest recorded bar when replaying, else now"""
+        if settings.primary_data_provider == "replay":
+            return replay_provider.last_timestamp(symbol, interval)
+        return None
+
+    def _get_series(self, symbol: str, interval: str, window_start: datetime) -> Optional[_CandleSeries]:
+        """Stored series covering window_start, from memory or seeded from the candle lake"""
+        key = (symbol, interval)
+        with self._series_lock:
+            series = self._series.get(key)
+            if series is not None:
+                self._series.move_to_end(key)
+                if series.covered_from <= window_start and series.high_water_mark is not None:
+                    return series
+
+        series = self._load_series_from_lake(symbol, interval, window_start)
+        if series is not None:
+            self._put_series(key, series)
+        return series
+
+    def _put_series(self, key: tuple, series: _CandleSeries):
+        with self._series_lock:
+            self._series[key] = series
+            self._series.move_to_end(key)
+            while len(self._series) > self.max_cache_size:
+                self._series.popitem(last=False)
+
+    def _load_series_from_lake(self, symbol: str, interval: str, window_start: datetime) -> Optional[_CandleSeries]:
+        """
+        Seed a series from lake bars since window_start, provided every trading
+        session in the window is present (and complete, for intraday bars) up to
+        the newest stored bar.
+        """
+        if interval not in _INTRADAY_INTERVALS and interval != "1d":
+            return None
+        if settings.primary_data_provider == "replay":
+            # Recorded candles are the only source while replaying
+            return None
+        try:
+            if _ingestion_queue.has_pending(symbol, interval):
+                # Read our own writes: bars still queued are not in the lake yet
+                _ingestion_queue.flush(timeout=settings.ingestion_put_timeout_seconds)
+            df = _data_pipeline.read_candles(
+                symbol, interval, start=window_start, dataset_version=settings.dataset_version
+            )
+        except Exception as e:
+            logger.debug(f"Candle lake read failed for {symbol}:{interval}: {e}")
+            return None
+        if df is None or df.empty:
+            return None
+
+        stored = df["start_ts"].dt.tz_convert(IST)
+        by_day = stored.groupby(stored.dt.date).agg(["min", "max"])
+        bar = timedelta(minutes=_INTERVAL_MINUTES[interval])
+        intraday = interval in _INTRADAY_INTERVALS
+        first_day = window_start.astimezone(IST).date()
+        last_day = stored.iloc[-1].date()
+        if intraday and window_start.astimezone(IST).time() > exchange_calendar.market_close:
+            first_day += timedelta(days=1)
+
+        day = first_day
+        while day <= last_day:
+            if exchange_calendar.is_trading_day(day):
+                if day not in by_day.index:
+                    return None
+                if intraday:
+                    session_open = max(IST.localize(datetime.combine(day, exchange_calendar.market_open)), window_start)
+                    session_close = IST.localize(datetime.combine(day, exchange_calendar.get_market_close_time(day)))
+                    first_bar, last_bar = by_day.loc[day, "min"], by_day.loc[day, "max"]
+                    if first_bar > session_open + bar or (day < last_day and last_bar < session_close - 2 * bar):
+                        return None
+            day += timedelta(days=1)
+
+        candles = [
+            {
+                "start_ts": ts.isoformat(),
+                "open": float(o),
+                "high": float(h),
+                "low": float(l),
+                "close": float(c),
+                "volume": float(v),
+            }
+            for ts, o, h, l, c, v in zip(stored, df["open"], df["high"], df["low"], df["close"], df["volume"])
+        ]
+        logger.debug(f"Seeded {symbol}:{interval} series from lake ({len(candles)} bars)")
+        return _CandleSeries(candles, window_start)
+
+    async def _fetch_incremental(
+        self,
+        symbol: str,
+        interval: str,
+        period: str,
+        bypass_cache: bool
+    ) -> List[Dict]:
+        """
+        Fetch `period` of candles. When the stored series already covers the
+        period, only bars from its high-water mark onwards are requested from
+        the provider and merged in; otherwise the full period is fetched and
+        becomes the stored series.
+        """
+        window_start = self._period_start(period, now=self._clock(symbol, interval))
+        series = self._get_series(symbol, interval, window_start) if window_start else None
+
+        if series is None:
+            try:
+                candles = await self._fetch_candles_async(symbol, interval, period, bypass_cache)
+            except BudgetExhausted:
+                return self._budget_fallback(symbol, interval, period, None, window_start)
+            record_fetch_window(interval, "full", len(candles))
+            if candles and window_start is not None:
+                self._put_series((symbol, interval), _CandleSeries(candles, window_start))
+            return candles
+
+        # The newest stored bar may still have been forming; fetch it again
+        try:
+            fresh = await self._fetch_candles_async(
+                symbol, interval, period, bypass_cache, since=series.high_water_mark
+            )
+        except BudgetExhausted:
+            return self._budget_fallback(symbol, interval, period, series, window_start)
+        record_fetch_window(interval, "delta", len(fresh))
+        with self._series_lock:
+            series.merge(fresh)
+            candles = series.window(window_start)
+        # Full fetches are cached by _finalize_candles; the merged window is cached here
+        if candles and not bypass_cache:
+            redis_cache.set(symbol, interval, candles, period)
+            self._set_cache(f"{symbol}_{interval}_{period}", candles)
+        return candles
+
+    def _budget_fallback(
+        self,
+        symbol: str,
+        interval: str,
+        period: str,
+        series: Optional[_CandleSeries],
+        window_start: Optional[datetime]
+    ) -> List[Dict]:
+        """
+        Candles served when the provider budget is exhausted: the stored
+        series as of its last refresh, else cached candles even if expired.
+        """
+        if series is not None:
+            with self._series_lock:
+                candles = series.window(window_start)
+        else:
+            candles = redis_cache.get(symbol, interval, period)
+            if candles is None:
+                cached = self.cache.get(f"{symbol}_{interval}_{period}")
+                candles = cached[0] if cached is not None else []
+        logger.warning(f"Provider budget exhausted for {symbol}:{interval}, serving {len(candles)} stored candles")
+        return candles
+    
+    @staticmethod
+    def _yahoo_frame_to_candles(df: pd.DataFrame, interval: str) -> List[Dict]:
+        """Convert a Yahoo Finance OHLCV frame to candle dicts, dropping invalid bars"""
+        candles = []
+        current_time = datetime.now(IST)
+
+        for index, row in df.iterrows():
+            # Handle timezone properly - Yahoo Finance returns in stock's local timezone
+            ts = index.to_pydatetime()
+
+            # Yahoo Finance data for NSE/BSE stocks is in IST (Asia/Kolkata)
+            # Keep timezone info to preserve correct IST times
+            # The frontend chart is configured for Asia/Kolkata timezone
+            if ts.tzinfo is None:
+                # If naive (no timezone), assume it's IST
+                ts = IST.localize(ts)
+
+            # CRITICAL: Filter out future dates - never allow data from the future
+            # Add 1 hour buffer to account for timezone differences and API delays
+            if ts > current_time + timedelta(hours=1):
+                logger.warning(f"Skipping future-dated candle: {ts.isoformat()} (current time: {current_time.isoformat()})")
+                continue
+
+            # CRITICAL: Filter out non-trading days (holidays, weekends)
+            candle_date = ts.date()
+            if not exchange_calendar.is_trading_day(candle_date):
+                logger.debug(f"Skipping non-trading day candle: {ts.isoformat()} (date: {candle_date.isoformat()})")
+                continue
+
+            # CRITICAL: Filter out data outside trading hours (for intraday timeframes)
+            # For daily/weekly/monthly timeframes, allow any time on trading day
+            # For intraday (1m, 5m, 15m, 1h), filter by trading hours
+            if interval in ['1m', '5m', '15m', '1h', '4h']:
+                if not exchange_calendar.is_market_open(ts):
+                    # For intraday, skip if outside trading hours
+                    logger.debug(f"Skipping candle outside trading hours: {ts.isoformat()}")
+                    continue
+
+            # Convert to ISO format string with timezone info
+            # This ensures JavaScript Date() interprets it correctly
+            candle = {
+                "start_ts": ts.isoformat(),  # ISO format with timezone
+                "open": float(row["Open"]),
+                "high": float(row["High"]),
+                "low": float(row["Low"]),
+                "close": float(row["Close"]),
+                "volume": float(row["Volume"]) if "Volume" in row else 0.0
+            }
+            candles.append(candle)
+        return candles
+
+    def _finalize_candles(
+        self,
+        symbol: str,
+        interval: str,
+        period: str,
+        candles: List[Dict],
+        provider_used: Optional[str],
+        bypass_cache: bool,
+        since: Optional[datetime]
+    ) -> List[Dict]:
+        """Sort and validate provider candles, queue them for the lake and cache them"""
+        # Parse timestamps once (columnar), sort ascending (oldest first) and
+        # drop candles without a valid start_ts
+        frame = CandleFrame.from_records(candles).sorted()
+        if len(frame) < len(candles):
+            logger.warning(f"Skipping {len(candles) - len(frame)} candles with missing or invalid timestamps")
+        candles = frame.to_records()
+        if candles:
+            logger.info(f"Validated {len(candles)} candles from {provider_used}: {candles[0]['start_ts']} to {candles[-1]['start_ts']}")
+
+        # Queue new/changed bars for the candle lake (written in the background;
+        # replayed candles are already recorded)
+        try:
+            if provider_used != "replay":
+                _ingestion_queue.submit(
+                    symbol=symbol,
+                    timeframe=interval,
+                    candles=candles,
+                    provider=provider_used or "unknown",
+                    dataset_version=settings.dataset_version,
+                )
+        except Exception as pipeline_error:
+            logger.warning(
+                "Data pipeline ingest failed for %s %s: %s",
+                symbol,
+                interval,
+                pipeline_error,
+            )
+
+        # Cache the results (only if not bypassing cache; delta fetches are partial)
+        if not bypass_cache and since is None:
+            # Store in Redis hot cache first
+            redis_cache.set(symbol, interval, candles, period)
+            # Also store in warm cache (in-memory LRU)
+            cache_key = f"{symbol}_{interval}_{period}"
+            self._set_cache(cache_key, candles)
+        return candles
+
     async def _fetch_candles_async(
         self,
         symbol: str,
         interval: str = "5m",
         period: str = "1d",
-        bypass_cache: bool = False
+        bypass_cache: bool = False,
+        since: Optional[datetime] = None
     ) -> List[Dict]:
         """
         Async implementation that handles provider selection and fallback.
+        With `since`, only bars starting at or after it are requested.
+        Runs on a fetch worker thread's own event loop, not the caller's.
         """
         try:
-            logger.info(f"Fetching data for {symbol}, interval={interval}, period={period}")
+            logger.info(f"Fetching data for {symbol}, interval={interval}, period={period}, since={since}")
+            # Twelve Data is sized in bars; None means "derive from period"
+            outputsize = self._bars_since(since, interval) if since is not None else None
+            use_provider_cache = not bypass_cache and since is None
+            
+            if settings.primary_data_provider == "replay":
+                start = since or self._period_start(period, now=self._clock(symbol, interval))
+                try:
+                    candles = await replay_provider.fetch(symbol, interval, start)
+                except ReplayError as e:
+                    logger.warning(f"Replay fetch failed for {symbol}: {e}")
+                    return []
+                if not candles:
+                    return []
+                return self._finalize_candles(symbol, interval, period, candles, "replay", bypass_cache, since)
             
             # Try primary provider first
             candles = None
@@ -188,7 +596,8 @@ class DataFetcher:
                             symbol=symbol,
                             interval=interval,
                             period=period,
-                            use_cache=not bypass_cache
+                            use_cache=use_provider_cache,
+                            outputsize=outputsize
                         )
                         provider_used = "twelvedata"
                         if candles:
@@ -199,16 +608,18 @@ class DataFetcher:
             
             # If primary provider failed or not configured, try Yahoo Finance
             if not candles:
+                if not await fetch_scheduler.acquire("yahoo"):
+                    raise BudgetExhausted("yahoo")
                 try:
                     logger.info(f"Using Yahoo Finance for {symbol}")
-                    # Run Yahoo Finance in thread pool since it's blocking
-                    loop = asyncio.get_event_loop()
-                    
-                    def fetch_yahoo():
-                        ticker = yf.Ticker(symbol)
-                        return ticker.history(period=period, interval=interval)
-                    
-                    df = await loop.run_in_executor(_executor, fetch_yahoo)
+                    # Blocking call, but this coroutine runs on the fetch worker
+                    # thread's own loop (_fetch_candles_sync); submitting it to
+                    # the pool that thread belongs to could deadlock the pool
+                    ticker = yf.Ticker(symbol)
+                    if since is not None:
+                        df = ticker.history(start=since, interval=interval)
+                    else:
+                        df = ticker.history(period=period, interval=interval)
                     
                     if df.empty:
                         logger.debug(f"No data returned for {symbol} (may be market closed or symbol unavailable)")
@@ -222,7 +633,8 @@ class DataFetcher:
                                         symbol=symbol,
                                         interval=interval,
                                         period=period,
-                                        use_cache=not bypass_cache
+                                        use_cache=use_provider_cache,
+                                        outputsize=outputsize
                                     )
                                     provider_used = "twelvedata_fallback"
                                     if candles:
@@ -233,55 +645,7 @@ class DataFetcher:
                         if not candles:
                             return []
                     else:
-                        # Process Yahoo Finance data
-                        candles = []
-                        ist = pytz.timezone('Asia/Kolkata')
-                        current_time = datetime.now(ist)
-                        
-                        for index, row in df.iterrows():
-                            # Handle timezone properly - Yahoo Finance returns in stock's local timezone
-                            ts = index.to_pydatetime()
-                            
-                            # Yahoo Finance data for NSE/BSE stocks is in IST (Asia/Kolkata)
-                            # Keep timezone info to preserve correct IST times
-                            # The frontend chart is configured for Asia/Kolkata timezone
-                            if ts.tzinfo is None:
-                                # If naive (no timezone), assume it's IST
-                                ts = ist.localize(ts)
-                            
-                            # CRITICAL: Filter out future dates - never allow data from the future
-                            # Add 1 hour buffer to account for timezone differences and API delays
-                            if ts > current_time + timedelta(hours=1):
-                                logger.warning(f"Skipping future-dated candle: {ts.isoformat()} (current time: {current_time.isoformat()})")
-                                continue
-                            
-                            # CRITICAL: Filter out non-trading days (holidays, weekends)
-                            candle_date = ts.date()
-                            if not exchange_calendar.is_trading_day(candle_date):
-                                logger.debug(f"Skipping non-trading day candle: {ts.isoformat()} (date: {candle_date.isoformat()})")
-                                continue
-                            
-                            # CRITICAL: Filter out data outside trading hours (for intraday timeframes)
-                            # For daily/weekly/monthly timeframes, allow any time on trading day
-                            # For intraday (1m, 5m, 15m, 1h), filter by trading hours
-                            if interval in ['1m', '5m', '15m', '1h', '4h']:
-                                if not exchange_calendar.is_market_open(ts):
-                                    # For intraday, skip if outside trading hours
-                                    logger.debug(f"Skipping candle outside trading hours: {ts.isoformat()}")
-                                    continue
-                            
-                            # Convert to ISO format string with timezone info
-                            # This ensures JavaScript Date() interprets it correctly
-                            candle = {
-                                "start_ts": ts.isoformat(),  # ISO format with timezone
-                                "open": float(row["Open"]),
-                                "high": float(row["High"]),
-                                "low": float(row["Low"]),
-                                "close": float(row["Close"]),
-                                "volume": float(row["Volume"]) if "Volume" in row else 0.0
-                            }
-                            candles.append(candle)
-                        
+                        candles = self._yahoo_frame_to_candles(df, interval)
                         provider_used = "yahoo"
                         
                 except Exception as e:
@@ -296,7 +660,8 @@ class DataFetcher:
                                     symbol=symbol,
                                     interval=interval,
                                     period=period,
-                                    use_cache=not bypass_cache
+                                    use_cache=use_provider_cache,
+                                    outputsize=outputsize
                                 )
                                 provider_used = "twelvedata_fallback"
                                 if candles:
@@ -316,83 +681,13 @@ class DataFetcher:
             if not candles:
                 return []
             
-            # Sort candles by start_ts ascending (oldest first) for chronological order
-            candles.sort(key=lambda x: datetime.fromisoformat(x.get('start_ts', '').replace('Z', '+00:00')) if isinstance(x.get('start_ts'), str) else x.get('start_ts', datetime.min))
-            
-            # CRITICAL: Validate chronological order - ensure no gaps or out-of-order dates
-            if len(candles) > 1:
-                prev_ts = None
-                filtered_candles = []
-                for candle in candles:
-                    candle_ts_str = candle.get('start_ts')
-                    if not candle_ts_str:
-                        logger.warning(f"Skipping candle without timestamp: {candle}")
-                        continue
-                    
-                    try:
-                        candle_ts = datetime.fromisoformat(candle_ts_str.replace('Z', '+00:00'))
-                        
-                        # Skip if this candle is before the previous one (out of order)
-                        if prev_ts and candle_ts < prev_ts:
-                            logger.warning(f"Skipping out-of-order candle: {candle_ts.isoformat()} (previous: {prev_ts.isoformat()})")
-                            continue
-                        
-                        filtered_candles.append(candle)
-                        prev_ts = candle_ts
-                    except (ValueError, AttributeError) as e:
-                        logger.warning(f"Skipping candle with invalid timestamp {candle_ts_str}: {e}")
-                        continue
-                
-                candles = filtered_candles
-                
-                if len(candles) > 0:
-                    first_ts = datetime.fromisoformat(candles[0]['start_ts'].replace('Z', '+00:00'))
-                    last_ts = datetime.fromisoformat(candles[-1]['start_ts'].replace('Z', '+00:00'))
-                    logger.info(f"Validated {len(candles)} candles from {provider_used}: {first_ts.isoformat()} to {last_ts.isoformat()}")
-            
-            # Persist to data pipeline for auditability
-            try:
-                artifacts = _data_pipeline.ingest(
-                    symbol=symbol,
-                    timeframe=interval,
-                    candles=candles,
-                    provider=provider_used or "unknown",
-                    dataset_version=settings.dataset_version,
-                )
-                redis_cache.register_dataset_metadata(
-                    symbol=symbol,
-                    interval=interval,
-                    dataset_version=artifacts.dataset_version,
-                    run_id=artifacts.run_id,
-                    provider=provider_used or "unknown",
-                )
-                logger.debug(
-                    "Data pipeline persisted dataset %s %s version=%s run=%s records=%s",
-                    symbol,
-                    interval,
-                    artifacts.dataset_version,
-                    artifacts.run_id,
-                    artifacts.record_count,
-                )
-            except Exception as pipeline_error:
-                logger.warning(
-                    "Data pipeline ingest failed for %s %s: %s",
-                    symbol,
-                    interval,
-                    pipeline_error,
-                )
-            
-            # Cache the results (only if not bypassing cache)
-            if not bypass_cache:
-                # Store in Redis hot cache first
-                redis_cache.set(symbol, interval, candles, period)
-                # Also store in warm cache (in-memory LRU)
-                cache_key = f"{symbol}_{interval}_{period}"
-                self._set_cache(cache_key, candles)
+            candles = self._finalize_candles(symbol, interval, period, candles, provider_used, bypass_cache, since)
             
             logger.info(f"Fetched {len(candles)} candles for {symbol} using {provider_used or 'yahoo'}")
             return candles
             
+        except BudgetExhausted:
+            raise
         except Exception as e:
             logger.error(f"Unexpected error in data fetcher: {e}", exc_info=True)
             return []
@@ -416,17 +711,269 @@ class DataFetcher:
         Returns:
             List of candle dictionaries with OHLCV data (sorted by start_ts ascending)
         """
-        # Run the blocking Yahoo Finance call in a thread pool
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
+        priority = current_priority()
+
+        # Join an identical fetch already in flight. A fresh (bypass_cache)
+        # fetch satisfies any caller; a cache-allowed one only non-bypass callers.
+        # Only flights of the same or higher priority are joined, so a live
+        # caller never inherits a training fetch's budget wait.
+        candidates = [True] if bypass_cache else [True, False]
+        for fresh in candidates:
+            for flight_priority in FetchPriority:
+                if flight_priority > priority:
+                    break
+                pending = self._inflight.get((loop, symbol, interval, period, fresh, flight_priority))
+                if pending is not None:
+                    record_fetch_request(interval, coalesced=True)
+                    logger.debug(f"Coalesced fetch for {symbol}:{interval}:{period}")
+                    candles = await asyncio.shield(pending)
+                    return list(candles)
+
+        record_fetch_request(interval, coalesced=False)
+        key = (loop, symbol, interval, period, bypass_cache, priority)
+        # Run the blocking Yahoo Finance call in a thread pool (keeping the
+        # caller's fetch priority)
+        pending = loop.run_in_executor(
+            _executor_for_priority(),
+            functools.partial(
+                contextvars.copy_context().run,
+                self._fetch_candles_sync,
+                symbol,
+                interval,
+                period,
+                bypass_cache
+            )
+        )
+        self._inflight[key] = pending
+        pending.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(pending)
+    
+    async def fetch_candle_frame(
+        self,
+        symbol: str,
+        interval: str = "5m",
+        period: str = "1d",
+        bypass_cache: bool = False
+    ) -> CandleFrame:
+        """fetch_candles() as a columnar CandleFrame (for bots and feature code)"""
+        return CandleFrame.from_records(await self.fetch_candles(symbol, interval, period, bypass_cache))
+    
+    async def fetch_candles_batch(
+        self,
+        symbols: List[str],
+        interval: str = "5m",
+        period: str = "1d",
+        bypass_cache: bool = False
+    ) -> Dict[str, List[Dict]]:
+        """
+        Fetch candles for many symbols of one interval.
+        
+        All symbols that miss the caches are pulled in one multi-symbol
+        provider call (one for symbols refreshed from their stored high-water
+        mark, one for full-period fetches) and split per symbol: a Yahoo
+        Finance multi-ticker download, or comma-separated Twelve Data
+        time_series requests when Twelve Data is the primary provider (symbols
+        it returns nothing for are then downloaded from Yahoo Finance). If the
+        batch fails, symbols are fetched one after another on the batch's
+        worker thread, so a fallback never holds more than one pool thread.
+        
+        Args:
+            symbols: Stock symbols (duplicates are ignored)
+            interval: Candle interval
+            period: Time period
+            bypass_cache: If True, skip cache and always fetch fresh data
+        
+        Returns:
+            Mapping of symbol to candle list (sorted by start_ts ascending)
+        """
+        symbols = list(dict.fromkeys(symbols))
+        if not symbols:
+            return {}
+        
+        loop = asyncio.get_running_loop()
         return await loop.run_in_executor(
-            _executor,
-            self._fetch_candles_sync,
-            symbol,
-            interval,
-            period,
-            bypass_cache
+            _executor_for_priority(),
+            functools.partial(
+                contextvars.copy_context().run,
+                self._fetch_candles_batch_or_each_sync,
+                symbols,
+                interval,
+                period,
+                bypass_cache
+            )
         )
     
+    def _fetch_candles_batch_or_each_sync(
+        self,
+        symbols: List[str],
+        interval: str,
+        period: str,
+        bypass_cache: bool
+    ) -> Dict[str, List[Dict]]:
+        """Batch fetch, falling back to sequential per-symbol fetches on this thread"""
+        try:
+            return self._fetch_candles_batch_sync(symbols, interval, period, bypass_cache)
+        except Exception as e:
+            logger.warning(f"Batch download failed for {len(symbols)} symbols ({interval}): {e}")
+        
+        return {
+            symbol: self._fetch_candles_sync(symbol, interval, period, bypass_cache)
+            for symbol in symbols
+        }
+    
+    def _fetch_candles_batch_sync(
+        self,
+        symbols: List[str],
+        interval: str,
+        period: str,
+        bypass_cache: bool
+    ) -> Dict[str, List[Dict]]:
+        """Synchronous implementation of fetch_candles_batch (runs in thread pool)."""
+        results: Dict[str, List[Dict]] = {}
+        pending = []
+        for symbol in symbols:
+            cached_data = None if bypass_cache else self._get_cached_candles(symbol, interval, period)
+            if cached_data is not None:
+                results[symbol] = cached_data
+            else:
+                pending.append(symbol)
+        if not pending:
+            return results
+        
+        window_starts = {
+            symbol: self._period_start(period, now=self._clock(symbol, interval)) for symbol in pending
+        }
+        stored: Dict[str, _CandleSeries] = {}
+        full = []
+        for symbol in pending:
+            window_start = window_starts[symbol]
+            series = self._get_series(symbol, interval, window_start) if window_start else None
+            if series is not None:
+                stored[symbol] = series
+            else:
+                full.append(symbol)
+        
+        downloaded: Dict[str, tuple] = {}
+        exhausted = set()
+        for group, window in ((list(stored), "delta"), (full, "full")):
+            if not group:
+                continue
+            try:
+                if window == "delta":
+                    since = min(stored[symbol].high_water_mark for symbol in group)
+                    downloaded.update(self._download_candles(group, interval, start=since))
+                else:
+                    downloaded.update(self._download_candles(group, interval, period=period))
+            except BudgetExhausted:
+                exhausted.update(group)
+        
+        for symbol in pending:
+            series = stored.get(symbol)
+            window_start = window_starts[symbol]
+            if symbol in exhausted:
+                results[symbol] = self._budget_fallback(symbol, interval, period, series, window_start)
+                continue
+            since = series.high_water_mark if series is not None else None
+            provider_used, candles = downloaded.get(symbol, ("yahoo", []))
+            if candles:
+                candles = self._finalize_candles(symbol, interval, period, candles, provider_used, bypass_cache, since)
+            record_fetch_window(interval, "full" if series is None else "delta", len(candles))
+            
+            if series is not None:
+                with self._series_lock:
+                    series.merge(candles)
+                    candles = series.window(window_start)
+                if candles and not bypass_cache:
+                    redis_cache.set(symbol, interval, candles, period)
+                    self._set_cache(f"{symbol}_{interval}_{period}", candles)
+            elif candles and window_start is not None:
+                self._put_series((symbol, interval), _CandleSeries(candles, window_start))
+            results[symbol] = candles
+        
+        logger.info(f"Batch fetched {len(pending)} symbols ({interval}): {len(stored)} delta, {len(full)} full")
+        return results
+    
+    def _download_candles(
+        self,
+        symbols: List[str],
+        interval: str,
+        period: Optional[str] = None,
+        start: Optional[datetime] = None
+    ) -> Dict[str, tuple]:
+        """
+        One batched provider call for `symbols` (period or start window).
+        
+        Returns:
+            Mapping of symbol to (provider name, candles)
+        """
+        if settings.primary_data_provider == "replay":
+            starts = {
+                symbol: start or self._period_start(period or "1d", now=self._clock(symbol, interval))
+                for symbol in symbols
+            }
+            fetched = replay_provider.fetch_many_sync(starts, interval)
+            return {symbol: ("replay", candles) for symbol, candles in fetched.items()}
+        
+        results: Dict[str, tuple] = {}
+        if settings.primary_data_provider == "twelvedata" and settings.twelvedata_enabled:
+            try:
+                from backend.services.twelvedata_service import twelvedata_service
+                if twelvedata_service.client:
+                    fetched = twelvedata_service.fetch_candles_many_sync(
+                        symbols,
+                        interval,
+                        period=period or "1d",
+                        outputsize=self._bars_since(start, interval) if start is not None else None
+                    )
+                    results = {symbol: ("twelvedata", candles) for symbol, candles in fetched.items() if candles}
+            except Exception as e:
+                logger.warning(f"Twelve Data batch fetch failed: {e}")
+        
+        missing = [symbol for symbol in symbols if symbol not in results]
+        if missing:
+            if not fetch_scheduler.acquire_sync("yahoo"):
+                if results:
+                    return results
+                raise BudgetExhausted("yahoo")
+            frames = self._download_yahoo(missing, interval, period=period, start=start)
+            for symbol, df in frames.items():
+                results[symbol] = ("yahoo", self._yahoo_frame_to_candles(df, interval))
+        return results
+    
+    @staticmethod
+    def _download_yahoo(
+        symbols: List[str],
+        interval: str,
+        period: Optional[str] = None,
+        start: Optional[datetime] = None
+    ) -> Dict[str, pd.DataFrame]:
+        """One multi-ticker Yahoo Finance download, split into per-symbol frames"""
+        window = {"start": start} if start is not None else {"period": period}
+        data = yf.download(
+            symbols,
+            interval=interval,
+            group_by="ticker",
+            auto_adjust=True,
+            ignore_tz=False,
+            threads=True,
+            progress=False,
+            **window
+        )
+        if data is None or data.empty:
+            return {}
+        # Older yfinance releases return flat columns for a single ticker
+        if not isinstance(data.columns, pd.MultiIndex):
+            data.columns = pd.MultiIndex.from_product([symbols[:1], data.columns])
+        
+        tickers = set(data.columns.get_level_values(0))
+        # Rows are the union of all tickers' timestamps; drop the ones a symbol lacks
+        return {
+            symbol: data[symbol].dropna(how="all")
+            for symbol in symbols
+            if symbol in tickers
+        }
+    
     def fetch_latest_price(self, symbol: str) -> Optional[float]:
         """
         Fetch the latest price for a symbol.
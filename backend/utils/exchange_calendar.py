@@ -194,6 +194,36 @@ class ExchangeCalendar:
         
         return current_date
     
+    def get_next_bar_close(self, after: datetime, interval_minutes: int) -> datetime:
+        """
+        Get the first bar close strictly after a given time.
+        Bars are aligned to the session open; the last bar of a session closes
+        at the (possibly early) market close, and non-trading days are skipped.
+        
+        Args:
+            after: Reference datetime (IST or naive)
+            interval_minutes: Bar length in minutes (a full session or more means daily bars)
+        
+        Returns:
+            Bar close datetime in IST
+        """
+        if after.tzinfo is None:
+            after = IST.localize(after)
+        else:
+            after = after.astimezone(IST)
+        
+        check_date = after.date()
+        for _ in range(366):
+            if self.is_trading_day(check_date):
+                session_open = IST.localize(datetime.combine(check_date, self.market_open))
+                session_close = IST.localize(datetime.combine(check_date, self.get_market_close_time(check_date)))
+                if after < session_close:
+                    elapsed = max(0.0, (after - session_open).total_seconds())
+                    bars = int(elapsed // (interval_minutes * 60)) + 1
+                    return min(session_open + timedelta(minutes=bars * interval_minutes), session_close)
+            check_date += timedelta(days=1)
+        raise ValueError(f"No trading session within a year after {after}")
+    
     def get_trading_calendar(self, start_date: date, end_date: date) -> List[Dict]:
         """
         Get trading calendar for date range.
@@ -0,0 +1,106 @@
+"""
+Per-request sharing of the comprehensive feature frame.
+
+Within one FreddyMerger prediction the LSTM, Transformer, Ensemble and ML
+bots all run engineer_comprehensive_features on the same candles. Running
+the merger inside feature_context() makes the first bot compute the frame
+and every other bot reuse it. Frames are keyed by a hash of the candle
+window, so a bot that trims or extends the candles still gets its own frame.
+Outside a context, comprehensive_features() simply computes the frame.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+import hashlib
+import numpy as np
+import pandas as pd
+from backend.utils.feature_engineering import engineer_comprehensive_features
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_OHLCV = ['open', 'high', 'low', 'close', 'volume']
+
+_active_context: ContextVar[Optional["FeatureContext"]] = ContextVar("feature_context", default=None)
+
+
+def candle_window_key(df: pd.DataFrame) -> str:
+    """Hash of a candle DataFrame's timestamps and OHLCV values"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(len(df)).encode())
+    columns = [col for col in _OHLCV if col in df.columns]
+    digest.update(",".join(columns).encode())
+    if columns:
+        values = df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        digest.update(np.ascontiguousarray(values).tobytes())
+    if 'start_ts' in df.columns:
+        # Strings and Timestamps for the same instant hash identically
+        timestamps = pd.to_datetime(df['start_ts'], utc=True, format='mixed')
+        digest.update(timestamps.astype('int64').to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class FeatureContext:
+    """Comprehensive feature frames computed during one request"""
+
+    def __init__(self):
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def comprehensive_features(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Feature frame for `df`, computed at most once per candle window.
+
+        Returns a shallow copy: callers may add or replace columns freely but
+        must not modify existing column values in place.
+        """
+        key = candle_window_key(df)
+        frame = self._frames.get(key)
+        if frame is None:
+            self.misses += 1
+            frame = engineer_comprehensive_features(
+                df,
+                include_indicators=True,
+                include_volume_features=True,
+                include_price_features=True,
+                include_returns_features=True
+            )
+            self._frames[key] = frame
+        else:
+            self.hits += 1
+        return frame.copy(deep=False)
+
+
+@contextmanager
+def feature_context() -> Iterator[FeatureContext]:
+    """
+    Share comprehensive features for the duration of the block.
+
+    The context is stored in a ContextVar, so asyncio tasks created inside the
+    block (e.g. bot predictions gathered by FreddyMerger) see the same cache.
+    """
+    context = FeatureContext()
+    token = _active_context.set(context)
+    try:
+        yield context
+    finally:
+        _active_context.reset(token)
+        logger.debug(f"Feature context closed: {context.misses} computed, {context.hits} reused")
+
+
+def comprehensive_features(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    engineer_comprehensive_features(df) with every feature group enabled,
+    reused from the active feature_context() when one is open.
+    """
+    context = _active_context.get()
+    if context is None:
+        return engineer_comprehensive_features(
+            df,
+            include_indicators=True,
+            include_volume_features=True,
+            include_price_features=True,
+            include_returns_features=True
+        )
+    return context.comprehensive_features(df)
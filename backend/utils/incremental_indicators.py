@@ -0,0 +1,494 @@
+"""
+Incremental (streaming) technical indicators.
+
+Keeps per-indicator state so that each new candle is folded in with a
+constant amount of work, instead of re-running pandas-ta over the whole
+candle prefix like calculate_all_indicators does. The recurrences mirror
+the pandas-ta implementations used by backend.utils.indicators (SMA-seeded
+EMAs, Wilder RMA smoothing, sample-stdev Bollinger Bands) including their
+minimum-length gates, so the latest values match the last row of
+calculate_all_indicators for the same candles.
+"""
+from collections import deque
+from datetime import date, datetime
+from typing import Deque, Dict, Iterable, List, Optional
+import math
+import pandas as pd
+import sys
+import logging
+
+logger = logging.getLogger(__name__)
+
+EPSILON = sys.float_info.epsilon
+NAN = float("nan")
+
+# Columns produced by calculate_all_indicators (excluding OHLCV/start_ts)
+INDICATOR_COLUMNS: List[str] = [
+    "rsi_14",
+    "macd",
+    "macd_signal",
+    "macd_histogram",
+    "sma_20",
+    "sma_50",
+    "ema_21",
+    "ema_9",
+    "bb_upper",
+    "bb_middle",
+    "bb_lower",
+    "atr_14",
+    "stoch_k",
+    "stoch_d",
+    "stoch_rsi_k",
+    "stoch_rsi_d",
+    "adx",
+    "adx_plus_di",
+    "adx_minus_di",
+    "mfi_14",
+    "obv",
+    "vwap",
+    "vwap_intraday",
+]
+
+
+# Minimum candle count before pandas-ta returns a series for each column.
+# Below these counts calculate_all_indicators yields NaN for the whole column.
+WARMUP_LENGTHS: Dict[str, int] = {
+    "rsi_14": 15,
+    "macd": 34,
+    "macd_signal": 34,
+    "macd_histogram": 34,
+    "sma_20": 20,
+    "sma_50": 50,
+    "ema_21": 21,
+    "ema_9": 9,
+    "bb_upper": 20,
+    "bb_middle": 20,
+    "bb_lower": 20,
+    "atr_14": 15,
+    "stoch_k": 20,
+    "stoch_d": 20,
+    "stoch_rsi_k": 15,
+    "stoch_rsi_d": 15,
+    "adx": 15,
+    "adx_plus_di": 15,
+    "adx_minus_di": 15,
+    "mfi_14": 15,
+}
+
+# Stochastic RSI additionally needs stoch_period + k_period non-NaN RSI values
+STOCH_RSI_MIN_CLEAN = 14 + 3
+
+
+def mask_warmup(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Apply prefix semantics to an indicator frame computed over a full range.
+
+    calculate_all_indicators on candles[:i+1] returns NaN for columns whose
+    pandas-ta minimum length is not yet met, while the same row of a frame
+    computed once over all candles already has a value. Masking those rows
+    makes row i of the full frame equal the last row of the prefix frame,
+    so bar-by-bar consumers see exactly what IncrementalIndicators reports.
+    """
+    frame = frame.copy()
+    rows = pd.RangeIndex(1, len(frame) + 1)
+    for column, warmup in WARMUP_LENGTHS.items():
+        if column in frame.columns:
+            frame.loc[rows < warmup, column] = float("nan")
+    if "rsi_14" in frame.columns:
+        clean_rsi = frame["rsi_14"].notna().cumsum().to_numpy()
+        for column in ("stoch_rsi_k", "stoch_rsi_d"):
+            if column in frame.columns:
+                frame.loc[clean_rsi < STOCH_RSI_MIN_CLEAN, column] = float("nan")
+    return frame
+
+
+def _isnan(value: float) -> bool:
+    return value != value
+
+
+def _div(numerator: float, denominator: float) -> float:
+    """Float division with NumPy semantics (x/0 -> inf, 0/0 -> nan)."""
+    if denominator == 0:
+        if numerator == 0 or _isnan(numerator):
+            return NAN
+        return math.copysign(math.inf, numerator)
+    return numerator / denominator
+
+
+def _mean(values: Iterable[float]) -> float:
+    """Mean of a full window; NaN if any element is NaN (pandas rolling semantics)."""
+    values = list(values)
+    if not values or any(_isnan(v) for v in values):
+        return NAN
+    return math.fsum(values) / len(values)
+
+
+class _EWM:
+    """
+    Exponentially weighted mean matching pandas ``ewm(alpha, adjust=False).mean()``.
+    Leading NaNs are skipped; NaNs after the first observation decay the old weight.
+    """
+
+    def __init__(self, alpha: float):
+        self.alpha = alpha
+        self.value = NAN
+        self._old_wt = 1.0
+
+    def update(self, x: float) -> float:
+        if _isnan(self.value):
+            if not _isnan(x):
+                self.value = x
+                self._old_wt = 1.0
+            return self.value
+
+        self._old_wt *= 1.0 - self.alpha
+        if not _isnan(x):
+            if self.value != x:
+                self.value = (self._old_wt * self.value + self.alpha * x) / (self._old_wt + self.alpha)
+            self._old_wt = 1.0
+        return self.value
+
+
+class _SeededEWM:
+    """
+    pandas-ta style smoothing seeded with the SMA of the first ``length`` inputs
+    (``presma=True``), followed by an adjust=False EWM. Used for EMA and ATR.
+    """
+
+    def __init__(self, length: int, alpha: float):
+        self.length = length
+        self._seen = 0
+        self._seed_sum = 0.0
+        self._seed_count = 0
+        self._ewm = _EWM(alpha)
+
+    def update(self, x: float) -> float:
+        if self._seen < self.length:
+            self._seen += 1
+            if not _isnan(x):
+                self._seed_sum += x
+                self._seed_count += 1
+            if self._seen < self.length:
+                return NAN
+            seed = self._seed_sum / self._seed_count if self._seed_count else NAN
+            return self._ewm.update(seed)
+        return self._ewm.update(x)
+
+
+class _RollingWindow:
+    """Fixed-length window; statistics are NaN until the window is full."""
+
+    def __init__(self, length: int):
+        self.length = length
+        self.values: Deque[float] = deque(maxlen=length)
+
+    def append(self, x: float):
+        self.values.append(x)
+
+    @property
+    def full(self) -> bool:
+        return len(self.values) == self.length
+
+    def mean(self) -> float:
+        return _mean(self.values) if self.full else NAN
+
+    def std(self, ddof: int = 1) -> float:
+        if not self.full or any(_isnan(v) for v in self.values):
+            return NAN
+        m = math.fsum(self.values) / self.length
+        var = math.fsum((v - m) ** 2 for v in self.values) / (self.length - ddof)
+        return math.sqrt(var)
+
+    def min(self) -> float:
+        return min(self.values) if self.full else NAN
+
+    def max(self) -> float:
+        return max(self.values) if self.full else NAN
+
+
+class IncrementalIndicators:
+    """
+    Streaming equivalent of calculate_all_indicators.
+
+    Feed candles in chronological order with update(); the returned dict has
+    the same keys as the indicator columns of calculate_all_indicators, with
+    None where the batch computation would yield NaN.
+    """
+
+    _STOCH_RSI_PERIOD = 14
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Clear all state."""
+        self.count = 0
+        self._prev_close: Optional[float] = None
+        self._prev_high: Optional[float] = None
+        self._prev_low: Optional[float] = None
+        self._prev_tp: Optional[float] = None
+
+        # RSI (Wilder RMA of gains/losses)
+        self._rsi_gain = _EWM(1.0 / 14)
+        self._rsi_loss = _EWM(1.0 / 14)
+
+        # Moving averages
+        self._close_20 = _RollingWindow(20)
+        self._close_50 = _RollingWindow(50)
+        self._ema_9 = _SeededEWM(9, 2.0 / (9 + 1))
+        self._ema_21 = _SeededEWM(21, 2.0 / (21 + 1))
+
+        # MACD (12, 26, 9)
+        self._ema_12 = _SeededEWM(12, 2.0 / (12 + 1))
+        self._ema_26 = _SeededEWM(26, 2.0 / (26 + 1))
+        self._macd_signal = _SeededEWM(9, 2.0 / (9 + 1))
+
+        # ATR(14) without and with a NaN first true range (ADX uses the latter)
+        self._atr = _SeededEWM(14, 1.0 / 14)
+        self._adx_atr = _SeededEWM(14, 1.0 / 14)
+
+        # Stochastic (14, 3, 3)
+        self._high_14 = _RollingWindow(14)
+        self._low_14 = _RollingWindow(14)
+        self._stoch_raw = _RollingWindow(3)
+        self._stoch_k = _RollingWindow(3)
+
+        # Stochastic RSI (14, 14, 3, 3)
+        self._rsi_window = _RollingWindow(self._STOCH_RSI_PERIOD)
+        self._rsi_clean_count = 0
+        self._stoch_rsi_k = _RollingWindow(3)
+        self._stoch_rsi_k_mean = _RollingWindow(3)
+
+        # ADX(14)
+        self._dm_plus = _EWM(1.0 / 14)
+        self._dm_minus = _EWM(1.0 / 14)
+        self._adx = _EWM(1.0 / 14)
+
+        # MFI(14)
+        self._mfi_pos = _RollingWindow(14)
+        self._mfi_neg = _RollingWindow(14)
+
+        # OBV / VWAP
+        self._obv = NAN
+        self._cum_pv = 0.0
+        self._cum_volume = 0.0
+        self._session_date: Optional[date] = None
+        self._session_pv = 0.0
+        self._session_volume = 0.0
+
+        self._latest: Dict[str, Optional[float]] = {col: None for col in INDICATOR_COLUMNS}
+
+    @property
+    def latest(self) -> Dict[str, Optional[float]]:
+        """Indicator values for the most recent candle."""
+        return dict(self._latest)
+
+    @classmethod
+    def from_candles(cls, candles: Iterable[Dict]) -> "IncrementalIndicators":
+        """Build a state warmed up on historical candles."""
+        state = cls()
+        state.update_many(candles)
+        return state
+
+    def update_many(self, candles: Iterable[Dict]) -> Dict[str, Optional[float]]:
+        """Fold several candles in order and return the latest values."""
+        for candle in candles:
+            self.update(candle)
+        return self.latest
+
+    def update(self, candle: Dict) -> Dict[str, Optional[float]]:
+        """
+        Fold one candle into the state.
+
+        Args:
+            candle: Candle dict with open/high/low/close/volume and optional start_ts
+
+        Returns:
+            Dictionary of latest indicator values (None where not yet defined)
+        """
+        high = float(candle["high"])
+        low = float(candle["low"])
+        close = float(candle["close"])
+        volume = float(candle.get("volume") or 0.0)
+        self.count += 1
+        n = self.count
+        gates = WARMUP_LENGTHS
+
+        prev_close = self._prev_close
+        values: Dict[str, float] = {}
+
+        # RSI
+        diff = close - prev_close if prev_close is not None else NAN
+        gain = NAN if _isnan(diff) else max(diff, 0.0)
+        loss = NAN if _isnan(diff) else -min(diff, 0.0)
+        avg_gain = self._rsi_gain.update(gain)
+        avg_loss = self._rsi_loss.update(loss)
+        rsi = 100.0 * _div(avg_gain, avg_gain + avg_loss)
+        values["rsi_14"] = rsi if n >= gates["rsi_14"] else NAN
+
+        # MACD
+        fast = self._ema_12.update(close)
+        slow = self._ema_26.update(close)
+        macd = fast - slow
+        signal = self._macd_signal.update(macd) if not _isnan(macd) else NAN
+        if n >= gates["macd"]:
+            values["macd"] = macd
+            values["macd_signal"] = signal
+            values["macd_histogram"] = macd - signal
+        else:
+            values["macd"] = values["macd_signal"] = values["macd_histogram"] = NAN
+
+        # Moving averages
+        self._close_20.append(close)
+        self._close_50.append(close)
+        sma_20 = self._close_20.mean()
+        values["sma_20"] = sma_20 if n >= gates["sma_20"] else NAN
+        values["sma_50"] = self._close_50.mean() if n >= gates["sma_50"] else NAN
+        ema_21 = self._ema_21.update(close)
+        ema_9 = self._ema_9.update(close)
+        values["ema_21"] = ema_21 if n >= gates["ema_21"] else NAN
+        values["ema_9"] = ema_9 if n >= gates["ema_9"] else NAN
+
+        # Bollinger Bands (20, 2)
+        if n >= gates["bb_upper"]:
+            std = self._close_20.std(ddof=1)
+            values["bb_middle"] = sma_20
+            values["bb_upper"] = sma_20 + 2.0 * std
+            values["bb_lower"] = sma_20 - 2.0 * std
+        else:
+            values["bb_upper"] = values["bb_middle"] = values["bb_lower"] = NAN
+
+        # True range / ATR
+        hl_range = abs(high - low)
+        if prev_close is None:
+            true_range = hl_range
+            adx_true_range = NAN
+        else:
+            true_range = max(hl_range, abs(high - prev_close), abs(prev_close - low))
+            adx_true_range = true_range
+        atr = self._atr.update(true_range)
+        values["atr_14"] = atr if n >= gates["atr_14"] else NAN
+
+        # Stochastic
+        self._high_14.append(high)
+        self._low_14.append(low)
+        if self._high_14.full:
+            lowest = self._low_14.min()
+            highest = self._high_14.max()
+            stoch_range = highest - lowest
+            raw = 100.0 * (close - lowest) / (stoch_range if stoch_range != 0 else EPSILON)
+            self._stoch_raw.append(raw)
+            if self._stoch_raw.full:
+                self._stoch_k.append(self._stoch_raw.mean())
+        stoch_k = self._stoch_k.values[-1] if self._stoch_k.values else NAN
+        stoch_d = self._stoch_k.mean()
+        if n >= gates["stoch_k"]:
+            values["stoch_k"] = stoch_k
+            values["stoch_d"] = stoch_d
+        else:
+            values["stoch_k"] = values["stoch_d"] = NAN
+
+        # Stochastic RSI
+        self._rsi_window.append(rsi)
+        if not _isnan(rsi):
+            self._rsi_clean_count += 1
+        stoch_rsi_k = NAN
+        if self._rsi_window.full:
+            clean = [v for v in self._rsi_window.values if not _isnan(v)]
+            if len(clean) >= 2:
+                lowest_rsi = min(clean)
+                highest_rsi = max(clean)
+                if not _isnan(rsi) and (highest_rsi - lowest_rsi) > 0:
+                    stoch_rsi_k = (rsi - lowest_rsi) / (highest_rsi - lowest_rsi) * 100
+                else:
+                    stoch_rsi_k = 50.0
+        self._stoch_rsi_k.append(stoch_rsi_k)
+        self._stoch_rsi_k_mean.append(self._stoch_rsi_k.mean())
+        if n >= gates["rsi_14"] and self._rsi_clean_count >= STOCH_RSI_MIN_CLEAN:
+            values["stoch_rsi_k"] = stoch_rsi_k
+            values["stoch_rsi_d"] = self._stoch_rsi_k_mean.mean()
+        else:
+            values["stoch_rsi_k"] = values["stoch_rsi_d"] = NAN
+
+        # ADX
+        if self._prev_high is None:
+            dm_plus = dm_minus = NAN
+        else:
+            up = high - self._prev_high
+            down = self._prev_low - low
+            dm_plus = up if (up > down and up > 0) else 0.0
+            dm_minus = down if (down > up and down > 0) else 0.0
+        adx_atr = self._adx_atr.update(adx_true_range)
+        scale = _div(100.0, adx_atr)
+        plus_di = scale * self._dm_plus.update(dm_plus)
+        minus_di = scale * self._dm_minus.update(dm_minus)
+        dx = 100.0 * _div(abs(plus_di - minus_di), plus_di + minus_di)
+        adx = self._adx.update(dx)
+        if n >= gates["adx"]:
+            values["adx"] = adx
+            values["adx_plus_di"] = plus_di
+            values["adx_minus_di"] = minus_di
+        else:
+            values["adx"] = values["adx_plus_di"] = values["adx_minus_di"] = NAN
+
+        # MFI
+        typical_price = (high + low + close) / 3.0
+        direction = 1.0 if (self._prev_tp is not None and typical_price > self._prev_tp) else -1.0
+        money_flow = typical_price * volume * direction
+        self._mfi_pos.append(max(money_flow, 0.0))
+        self._mfi_neg.append(max(-money_flow, 0.0))
+        if n >= gates["mfi_14"]:
+            gain_flow = math.fsum(self._mfi_pos.values)
+            loss_flow = math.fsum(self._mfi_neg.values)
+            values["mfi_14"] = 100.0 * gain_flow / (gain_flow + loss_flow + EPSILON)
+        else:
+            values["mfi_14"] = NAN
+
+        # OBV
+        if prev_close is not None:
+            sign = 1.0 if close > prev_close else (-1.0 if close < prev_close else 0.0)
+            self._obv = (0.0 if _isnan(self._obv) else self._obv) + sign * volume
+        values["obv"] = self._obv
+
+        # VWAP (cumulative and session-resetting)
+        self._cum_pv += typical_price * volume
+        self._cum_volume += volume
+        values["vwap"] = _div(self._cum_pv, self._cum_volume)
+
+        session = self._session_of(candle.get("start_ts"))
+        if session is None:
+            values["vwap_intraday"] = values["vwap"]
+        else:
+            if session != self._session_date:
+                self._session_date = session
+                self._session_pv = 0.0
+                self._session_volume = 0.0
+            self._session_pv += typical_price * volume
+            self._session_volume += volume
+            values["vwap_intraday"] = _div(self._session_pv, self._session_volume)
+
+        self._prev_close = close
+        self._prev_high = high
+        self._prev_low = low
+        self._prev_tp = typical_price
+
+        self._latest = {
+            col: (None if _isnan(values[col]) else values[col])
+            for col in INDICATOR_COLUMNS
+        }
+        return self.latest
+
+    @staticmethod
+    def _session_of(timestamp) -> Optional[date]:
+        """Calendar date of a candle timestamp in its own timezone."""
+        if timestamp is None:
+            return None
+        if isinstance(timestamp, str):
+            try:
+                return datetime.fromisoformat(timestamp.replace('Z', '+00:00')).date()
+            except ValueError:
+                logger.debug(f"Unparseable candle timestamp for VWAP session: {timestamp}")
+                return None
+        if isinstance(timestamp, datetime):
+            return timestamp.date()
+        return None
@@ -0,0 +1,321 @@
+"""
+Rolling indicator cache for live prediction paths.
+
+The intraday and Freddy routes recompute calculate_all_indicators over
+weeks of candles on every request, although consecutive requests differ by
+at most a few new (or one still-forming) candles. This cache keeps, per
+(symbol, timeframe), a streaming IncrementalIndicators state together with
+the timestamps it was folded over. A request whose last candle timestamp
+matches the cached one is answered from memory; newer candles are folded
+into the state one by one instead of recomputing the whole window, and a
+forming candle whose values changed is re-folded from the state saved just
+before it. Entries are versioned with INDICATOR_SET_VERSION and evicted
+least-recently-used once the total number of cached rows exceeds the budget.
+
+Cached series are anchored at the first candle they were built from. When a
+sliding request window starts later than that, smoothed indicators carry the
+longer warm-up. Cumulative OBV/VWAP would keep counting from the anchor, so
+they are recomputed over each request window instead (one vectorized pass).
+Windows longer than the per-entry row limit bypass the cache.
+
+A second, whole-result store (get_or_compute) memoizes derived snapshots
+such as the TechnicalAnalysisService indicator dict under the same key.
+"""
+from array import array
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import copy
+import threading
+import pandas as pd
+from backend.config import settings
+from backend.utils.candle_frame import candles_to_dataframe
+from backend.utils.incremental_indicators import IncrementalIndicators
+from backend.utils.indicators import (
+    calculate_all_indicators,
+    calculate_obv,
+    calculate_vwap,
+    calculate_vwap_intraday,
+    get_latest_indicators,
+)
+from backend.utils.logger import get_logger
+from backend.utils.metrics import record_indicator_cache_request, update_indicator_cache_size
+
+logger = get_logger(__name__)
+
+# Bump when the indicator set or any indicator formula changes
+INDICATOR_SET_VERSION = 1
+
+_OHLCV = ('open', 'high', 'low', 'close', 'volume')
+
+
+def _timestamp_ns(candle: Dict) -> Optional[int]:
+    """UTC epoch nanoseconds of a candle's start_ts (naive values are taken as UTC)"""
+    value = candle.get('start_ts')
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.replace('Z', '+00:00')
+    try:
+        timestamp = pd.Timestamp(value)
+    except (TypeError, ValueError):
+        return None
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.tz_localize('UTC')
+    return int(timestamp.value)
+
+
+def _window_frame(candles: List[Dict]) -> pd.DataFrame:
+    """Requested candles as a DataFrame with lower-case columns"""
+    df = candles_to_dataframe(candles)
+    df.columns = [col.lower() for col in df.columns]
+    return df
+
+
+def _window_cumulative(df: pd.DataFrame) -> Dict[str, pd.Series]:
+    """
+    Cumulative indicators over the request window, as calculate_all_indicators
+    computes them; the cached series would count from its anchor instead.
+    """
+    vwap = calculate_vwap(df)
+    return {
+        'obv': calculate_obv(df),
+        'vwap': vwap,
+        'vwap_intraday': calculate_vwap_intraday(df) if 'start_ts' in df.columns else vwap,
+    }
+
+
+def _bar(candle: Dict) -> Tuple:
+    """OHLCV values used to detect a forming candle that changed since it was cached"""
+    return tuple(candle.get(field) for field in _OHLCV)
+
+
+class _SeriesEntry:
+    """Indicator state and timestamp history for one symbol/timeframe"""
+
+    def __init__(self):
+        self.version = INDICATOR_SET_VERSION
+        self.state = IncrementalIndicators()
+        self.prior_state: Optional[IncrementalIndicators] = None  # state before the last row
+        self.timestamps = array('q')
+        self.last_bar: Optional[Tuple] = None
+
+    @property
+    def rows(self) -> int:
+        return len(self.timestamps)
+
+    def fold(self, candles: List[Dict], timestamps: List[int]):
+        """Append candles to the series, keeping the state from before the last one"""
+        last = len(candles) - 1
+        for i, (candle, ts) in enumerate(zip(candles, timestamps)):
+            if i == last:
+                self.prior_state = copy.deepcopy(self.state)
+            self.state.update(candle)
+            self.timestamps.append(ts)
+        if candles:
+            self.last_bar = _bar(candles[-1])
+
+    def drop_last(self) -> bool:
+        """Undo the last row so a forming candle can be re-folded; False if not possible"""
+        if self.prior_state is None or not self.timestamps:
+            return False
+        self.state = self.prior_state
+        self.prior_state = None
+        self.timestamps.pop()
+        self.last_bar = None
+        return True
+
+    def trim(self, max_rows: int):
+        """Drop the oldest rows beyond max_rows (the state is unaffected)"""
+        excess = len(self.timestamps) - max_rows
+        if excess > 0:
+            del self.timestamps[:excess]
+
+
+class IndicatorCache:
+    """Per symbol/timeframe indicator series, appended incrementally and LRU-evicted by rows"""
+
+    def __init__(self, max_rows: int = 500000, max_entry_rows: int = 20000, max_snapshots: int = 1024):
+        self.max_rows = max_rows
+        self.max_entry_rows = max_entry_rows
+        self.max_snapshots = max_snapshots
+        self._series: "OrderedDict[Tuple[str, str], _SeriesEntry]" = OrderedDict()
+        self._snapshots: "OrderedDict[Tuple[str, str, str], Tuple[Tuple, Any]]" = OrderedDict()
+        self._total_rows = 0
+        self._lock = threading.RLock()
+
+    def get_latest(self, symbol: str, timeframe: str, candles: List[Dict]) -> Dict[str, Optional[float]]:
+        """
+        Latest indicator values for `candles`, same keys as
+        get_latest_indicators(calculate_all_indicators(candles)).
+
+        Args:
+            symbol: Stock symbol
+            timeframe: Candle timeframe
+            candles: Chronological candle dicts with start_ts and OHLCV
+
+        Returns:
+            Dictionary of indicator values (None where not defined)
+        """
+        if not candles:
+            return {}
+        with self._lock:
+            entry = self._sync(symbol, timeframe, candles)
+            latest = entry.state.latest if entry is not None else None
+        if latest is None:
+            return get_latest_indicators(calculate_all_indicators(candles))
+        for col, values in _window_cumulative(_window_frame(candles)).items():
+            value = values.iloc[-1]
+            latest[col] = float(value) if pd.notna(value) else None
+        return latest
+
+    def get_or_compute(
+        self,
+        name: str,
+        symbol: str,
+        timeframe: str,
+        candles: List[Dict],
+        compute: Callable[[], Any]
+    ) -> Any:
+        """
+        Memoize a derived result for a candle window.
+
+        The result is reused while the window's first/last timestamps, length
+        and last candle values are unchanged, so repeated refreshes between
+        candle closes skip `compute` entirely.
+        """
+        if not candles:
+            return compute()
+        key = (name, symbol, timeframe)
+        signature = (
+            INDICATOR_SET_VERSION,
+            len(candles),
+            _timestamp_ns(candles[0]),
+            _timestamp_ns(candles[-1]),
+            _bar(candles[-1]),
+        )
+        with self._lock:
+            cached = self._snapshots.get(key)
+            if cached is not None and cached[0] == signature:
+                self._snapshots.move_to_end(key)
+                record_indicator_cache_request(timeframe, "hit")
+                return cached[1]
+
+        value = compute()
+        record_indicator_cache_request(timeframe, "rebuild")
+        with self._lock:
+            self._snapshots[key] = (signature, value)
+            self._snapshots.move_to_end(key)
+            while len(self._snapshots) > self.max_snapshots:
+                self._snapshots.popitem(last=False)
+        return value
+
+    def invalidate(self, symbol: Optional[str] = None, timeframe: Optional[str] = None):
+        """Drop cached series and snapshots, optionally only for one symbol/timeframe"""
+        with self._lock:
+            for key in list(self._series):
+                if (symbol is None or key[0] == symbol) and (timeframe is None or key[1] == timeframe):
+                    self._remove(key)
+            for key in list(self._snapshots):
+                if (symbol is None or key[1] == symbol) and (timeframe is None or key[2] == timeframe):
+                    del self._snapshots[key]
+            update_indicator_cache_size(len(self._series), self._total_rows)
+
+    def stats(self) -> Dict[str, Any]:
+        """Current cache occupancy"""
+        with self._lock:
+            return {
+                "entries": len(self._series),
+                "rows": self._total_rows,
+                "snapshots": len(self._snapshots),
+                "max_rows": self.max_rows,
+                "version": INDICATOR_SET_VERSION,
+            }
+
+    def _sync(self, symbol: str, timeframe: str, candles: List[Dict]) -> Optional[_SeriesEntry]:
+        """
+        Bring the cached series up to the last candle of `candles`.
+
+        Returns:
+            The cached entry, or None when the request cannot be served from
+            the cache (missing timestamps, a window longer than
+            max_entry_rows, or a window ending before the cached series)
+        """
+        first_ts = _timestamp_ns(candles[0])
+        last_ts = _timestamp_ns(candles[-1])
+        # A trimmed entry could never cover such a window and would rebuild every time
+        if first_ts is None or last_ts is None or len(candles) > self.max_entry_rows:
+            record_indicator_cache_request(timeframe, "bypass")
+            return None
+
+        key = (symbol, timeframe)
+        entry = self._series.get(key)
+        previous_rows = entry.rows if entry is not None else 0
+        result = "rebuild"
+
+        if entry is not None and entry.version == INDICATOR_SET_VERSION and entry.rows and entry.timestamps[0] <= first_ts:
+            cached_last = entry.timestamps[-1]
+            if last_ts < cached_last:
+                # Historical window; leave the live series alone
+                record_indicator_cache_request(timeframe, "bypass")
+                return None
+
+            position = self._locate(candles, cached_last)
+            if position is not None:
+                resume = position + 1
+                if _bar(candles[position]) != entry.last_bar:
+                    resume = position if entry.drop_last() else None
+                if resume is not None:
+                    new_candles = candles[resume:]
+                    if not new_candles:
+                        result = "hit"
+                    else:
+                        entry.fold(new_candles, [_timestamp_ns(c) for c in new_candles])
+                        result = "append" if resume > position else "refresh"
+
+        if result == "rebuild":
+            if entry is not None:
+                self._remove(key)
+                previous_rows = 0
+            entry = _SeriesEntry()
+            entry.fold(candles, [_timestamp_ns(c) for c in candles])
+            self._series[key] = entry
+            logger.debug(f"Indicator cache rebuilt {symbol} {timeframe} from {len(candles)} candles")
+
+        entry.trim(self.max_entry_rows)
+        self._total_rows += entry.rows - previous_rows
+        self._series.move_to_end(key)
+        self._evict(keep=key)
+        update_indicator_cache_size(len(self._series), self._total_rows)
+        record_indicator_cache_request(timeframe, result)
+        return entry
+
+    @staticmethod
+    def _locate(candles: List[Dict], timestamp: int) -> Optional[int]:
+        """Index of the candle at `timestamp`, scanning back from the newest candle"""
+        for i in range(len(candles) - 1, -1, -1):
+            ts = _timestamp_ns(candles[i])
+            if ts is None or ts < timestamp:
+                return None
+            if ts == timestamp:
+                return i
+        return None
+
+    def _remove(self, key: Tuple[str, str]):
+        entry = self._series.pop(key)
+        self._total_rows -= entry.rows
+
+    def _evict(self, keep: Tuple[str, str]):
+        """Evict least recently used series until within budget (never `keep`)"""
+        while self._total_rows > self.max_rows and len(self._series) > 1:
+            oldest = next(iter(self._series))
+            if oldest == keep:
+                break
+            self._remove(oldest)
+            logger.debug(f"Evicted cached indicators {oldest}")
+
+
+# Singleton instance
+indicator_cache = IndicatorCache(
+    max_rows=settings.indicator_cache_max_rows,
+    max_entry_rows=settings.indicator_cache_entry_rows
+)
@@ -26,6 +26,7 @@ import pandas_ta as ta
 import numpy as np
 from typing import Dict, List
 import logging
+from backend.utils.candle_frame import candles_to_dataframe
 
 logger = logging.getLogger(__name__)
 
@@ -221,24 +222,17 @@ def calculate_stochastic_rsi(df: pd.DataFrame, rsi_period: int = 14, stoch_perio
         
         # Apply Stochastic formula to RSI values
         # %K = (RSI - Lowest RSI in period) / (Highest RSI in period - Lowest RSI in period) * 100
-        stoch_rsi_k = pd.Series(index=rsi.index, dtype=float)
-        stoch_rsi_d = pd.Series(index=rsi.index, dtype=float)
+        # Rolling min/max skip NaN RSI values; windows need at least 2 valid values
+        rolling = rsi.rolling(window=stoch_period, min_periods=2)
+        lowest_rsi = rolling.min()
+        highest_rsi = rolling.max()
+        rsi_range = highest_rsi - lowest_rsi
         
-        for i in range(stoch_period - 1, len(rsi)):
-            rsi_window = rsi.iloc[i - stoch_period + 1:i + 1]
-            rsi_window_clean = rsi_window.dropna()
-            
-            if len(rsi_window_clean) < 2:
-                continue
-            
-            lowest_rsi = rsi_window_clean.min()
-            highest_rsi = rsi_window_clean.max()
-            current_rsi = rsi.iloc[i]
-            
-            if pd.notna(current_rsi) and (highest_rsi - lowest_rsi) > 0:
-                stoch_rsi_k.iloc[i] = ((current_rsi - lowest_rsi) / (highest_rsi - lowest_rsi)) * 100
-            else:
-                stoch_rsi_k.iloc[i] = 50.0  # Neutral value
+        stoch_rsi_k = ((rsi - lowest_rsi) / rsi_range.where(rsi_range > 0)) * 100
+        # Neutral value when the window is flat or the current RSI is missing
+        stoch_rsi_k = stoch_rsi_k.where(rsi.notna() & (rsi_range > 0), 50.0)
+        stoch_rsi_k = stoch_rsi_k.where(lowest_rsi.notna())
+        stoch_rsi_k.iloc[:stoch_period - 1] = np.nan
         
         # Smooth %K to get %D (moving average of %K)
         stoch_rsi_d = stoch_rsi_k.rolling(window=k_period).mean()
@@ -353,11 +347,14 @@ def calculate_all_indicators(candles: List[Dict]) -> pd.DataFrame:
     Returns:
         DataFrame with all indicators added
     """
-    if not candles:
+    if candles is None or len(candles) == 0:
         return pd.DataFrame()
     
-    # Convert to DataFrame
-    df = pd.DataFrame(candles)
+    # Convert to DataFrame (zero-copy for a CandleFrame)
+    df = candles_to_dataframe(candles)
+    if df is candles:
+        # Indicator columns are added in place; leave the caller's frame alone
+        df = df.copy()
     
     # Ensure proper column names
     df.columns = [col.lower() for col in df.columns]
@@ -2,7 +2,7 @@
 Prometheus metrics for monitoring predictions and performance.
 """
 from prometheus_client import Counter, Histogram, Gauge, generate_latest, CONTENT_TYPE_LATEST
-from typing import Dict
+from typing import Dict, Optional
 import time
 
 # Metrics
@@ -60,6 +60,151 @@ prediction_quality = Gauge(
     ['symbol', 'timeframe', 'metric']
 )
 
+model_cache_hits = Counter(
+    'model_cache_hits_total',
+    'Bot model loads served from the in-process model cache',
+    ['bot_name']
+)
+
+model_cache_misses = Counter(
+    'model_cache_misses_total',
+    'Bot model loads that had to deserialize from disk',
+    ['bot_name', 'reason']
+)
+
+model_cache_evictions = Counter(
+    'model_cache_evictions_total',
+    'Models evicted from the in-process model cache',
+    ['bot_name']
+)
+
+model_cache_entries = Gauge(
+    'model_cache_entries',
+    'Models currently held in the in-process model cache'
+)
+
+model_cache_bytes = Gauge(
+    'model_cache_bytes',
+    'On-disk size of the models held in the in-process model cache'
+)
+
+data_fetch_requests = Counter(
+    'data_fetch_requests_total',
+    'DataFetcher.fetch_candles calls by whether they started a fetch or joined one in flight',
+    ['interval', 'mode']
+)
+
+data_fetch_windows = Counter(
+    'data_fetch_windows_total',
+    'Provider fetches by window: full period or delta since the stored high-water mark',
+    ['interval', 'window']
+)
+
+data_fetch_bars = Counter(
+    'data_fetch_bars_total',
+    'Candles returned by provider fetches',
+    ['interval', 'window']
+)
+
+ingestion_queue_depth = Gauge(
+    'ingestion_queue_depth_rows',
+    'Candle rows buffered in the write-behind ingestion queue'
+)
+
+ingestion_flush_latency = Histogram(
+    'ingestion_flush_latency_seconds',
+    'Duration of one write-behind candle lake append',
+    ['timeframe'],
+    buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5]
+)
+
+ingestion_flushed_rows = Counter(
+    'ingestion_flushed_rows_total',
+    'Candle rows handed to the candle lake by the write-behind queue',
+    ['timeframe']
+)
+
+ingestion_backpressure = Histogram(
+    'ingestion_backpressure_wait_seconds',
+    'Time submitters blocked on a full ingestion queue, by outcome (waited, inline)',
+    ['outcome'],
+    buckets=[0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0]
+)
+
+provider_budget_requests = Counter(
+    'provider_budget_requests_total',
+    'Provider request budget acquisitions by priority and outcome (granted, refused)',
+    ['provider', 'priority', 'outcome']
+)
+
+provider_budget_wait = Histogram(
+    'provider_budget_wait_seconds',
+    'Time callers waited for provider request budget',
+    ['provider', 'priority'],
+    buckets=[0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 15.0, 60.0]
+)
+
+websocket_broadcast_recipients = Histogram(
+    'websocket_broadcast_recipients',
+    'Connections a broadcast was queued for, by message type',
+    ['message_type'],
+    buckets=[0, 1, 5, 10, 50, 100, 500, 1000]
+)
+
+websocket_send_latency = Histogram(
+    'websocket_send_latency_seconds',
+    'Time from broadcast to the frame being sent to a connection',
+    ['message_type'],
+    buckets=[0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0]
+)
+
+websocket_sent_bytes = Counter(
+    'websocket_sent_bytes_total',
+    'Encoded bytes of broadcast frames sent to WebSocket connections',
+    ['message_type']
+)
+
+websocket_conflated_messages = Counter(
+    'websocket_conflated_messages_total',
+    'Pending WebSocket updates replaced by a newer one for the same symbol/timeframe',
+    ['message_type']
+)
+
+websocket_slow_consumer_actions = Counter(
+    'websocket_slow_consumer_actions_total',
+    'Slow-consumer policy actions on full WebSocket event backlogs (drop_oldest, disconnect)',
+    ['action']
+)
+
+bar_close_jobs = Counter(
+    'bar_close_jobs_total',
+    'Bar close jobs by timeframe and outcome (ok, error, coalesced, idle)',
+    ['timeframe', 'outcome']
+)
+
+bar_close_job_latency = Histogram(
+    'bar_close_job_seconds',
+    'Duration of bar close fetch/predict/broadcast jobs',
+    ['timeframe'],
+    buckets=[0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0]
+)
+
+indicator_cache_requests = Counter(
+    'indicator_cache_requests_total',
+    'Indicator cache lookups by outcome (hit, append, refresh, rebuild, bypass)',
+    ['timeframe', 'result']
+)
+
+indicator_cache_entries = Gauge(
+    'indicator_cache_entries',
+    'Symbol/timeframe series held in the indicator cache'
+)
+
+indicator_cache_rows = Gauge(
+    'indicator_cache_rows',
+    'Candle rows of indicator values held in the indicator cache'
+)
+
 def record_prediction(bot_name: str, symbol: str, timeframe: str, latency: float):
     """Record a prediction metric"""
     prediction_counter.labels(
@@ -86,6 +231,84 @@ def update_cache_size(size: int):
     cache_size.set(size)
 
 
+def record_model_cache_hit(bot_name: str):
+    """Record a model cache hit"""
+    model_cache_hits.labels(bot_name=bot_name).inc()
+
+def record_model_cache_miss(bot_name: str, reason: str):
+    """Record a model cache miss ('cold' = not cached, 'stale' = files changed)"""
+    model_cache_misses.labels(bot_name=bot_name, reason=reason).inc()
+
+def record_model_cache_eviction(bot_name: str):
+    """Record an LRU eviction from the model cache"""
+    model_cache_evictions.labels(bot_name=bot_name).inc()
+
+def update_model_cache_size(entries: int, size_bytes: int):
+    """Update model cache occupancy gauges"""
+    model_cache_entries.set(entries)
+    model_cache_bytes.set(size_bytes)
+
+def record_fetch_request(interval: str, coalesced: bool):
+    """Record a candle fetch request ('coalesced' = awaited an identical in-flight fetch)"""
+    data_fetch_requests.labels(interval=interval, mode='coalesced' if coalesced else 'fetched').inc()
+
+def record_fetch_window(interval: str, window: str, bars: int):
+    """Record a provider fetch ('full' or 'delta') and the candles it returned"""
+    data_fetch_windows.labels(interval=interval, window=window).inc()
+    data_fetch_bars.labels(interval=interval, window=window).inc(bars)
+
+def update_ingestion_queue_depth(rows: int):
+    """Update the number of rows buffered for write-behind ingestion"""
+    ingestion_queue_depth.set(rows)
+
+def record_ingestion_flush(timeframe: str, rows: int, seconds: float):
+    """Record one write-behind lake append"""
+    ingestion_flush_latency.labels(timeframe=timeframe).observe(seconds)
+    ingestion_flushed_rows.labels(timeframe=timeframe).inc(rows)
+
+def record_ingestion_backpressure(outcome: str, seconds: float):
+    """Record a submit that blocked on a full ingestion queue"""
+    ingestion_backpressure.labels(outcome=outcome).observe(seconds)
+
+def record_provider_budget(provider: str, priority: str, granted: bool, waited: float):
+    """Record a provider budget acquisition and how long it waited"""
+    provider_budget_requests.labels(provider=provider, priority=priority, outcome='granted' if granted else 'refused').inc()
+    provider_budget_wait.labels(provider=provider, priority=priority).observe(waited)
+
+def record_websocket_broadcast(message_type: str, recipients: int):
+    """Record how many connections a broadcast was queued for"""
+    websocket_broadcast_recipients.labels(message_type=message_type).observe(recipients)
+
+def record_websocket_send(message_type: str, latency: float, size: int = 0):
+    """Record queueing latency (and size, when known) of a frame sent to one connection"""
+    websocket_send_latency.labels(message_type=message_type).observe(latency)
+    if size:
+        websocket_sent_bytes.labels(message_type=message_type).inc(size)
+
+def record_websocket_conflated(message_type: str):
+    """Record a pending WebSocket update superseded before it was sent"""
+    websocket_conflated_messages.labels(message_type=message_type).inc()
+
+def record_websocket_slow_consumer(action: str):
+    """Record a slow-consumer policy action"""
+    websocket_slow_consumer_actions.labels(action=action).inc()
+
+def record_bar_close_job(timeframe: str, outcome: str, seconds: Optional[float] = None):
+    """Record a bar close job outcome (and duration for jobs that ran)"""
+    bar_close_jobs.labels(timeframe=timeframe, outcome=outcome).inc()
+    if seconds is not None:
+        bar_close_job_latency.labels(timeframe=timeframe).observe(seconds)
+
+def record_indicator_cache_request(timeframe: str, result: str):
+    """Record an indicator cache lookup and how it was served"""
+    indicator_cache_requests.labels(timeframe=timeframe, result=result).inc()
+
+def update_indicator_cache_size(entries: int, rows: int):
+    """Update indicator cache occupancy gauges"""
+    indicator_cache_entries.set(entries)
+    indicator_cache_rows.set(rows)
+
+
 def record_regime(symbol: str, timeframe: str, regime: str):
     """Publish the current regime classification."""
     for label in REGIME_LABELS:
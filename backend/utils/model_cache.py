@@ -0,0 +1,154 @@
+"""
+Process-wide cache of deserialized bot models.
+
+Bots are shared across symbols and reload their Keras/pickle artifacts every
+time FreddyMerger switches their symbol/timeframe context. This cache keeps
+the loaded objects keyed by (bot_name, symbol, timeframe) together with the
+mtime/size of the files they were loaded from, so a context switch is a
+dictionary lookup unless the files changed on disk (e.g. after retraining),
+in which case the entry is reloaded. Entries are evicted least-recently-used
+once the total on-disk size of cached artifacts exceeds the configured budget.
+"""
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import os
+import threading
+from backend.config import settings
+from backend.utils.logger import get_logger
+from backend.utils.metrics import (
+    record_model_cache_hit,
+    record_model_cache_miss,
+    record_model_cache_eviction,
+    update_model_cache_size,
+)
+
+logger = get_logger(__name__)
+
+
+class _CacheEntry:
+    def __init__(self, signature: Tuple, value: Dict[str, Any], size_bytes: int):
+        self.signature = signature
+        self.value = value
+        self.size_bytes = size_bytes
+
+
+class ModelCache:
+    """Memory-bounded LRU of loaded models with file-change detection"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, Optional[str], Optional[str]], _CacheEntry]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.RLock()
+        # Per-key locks of loads in progress
+        self._loading: Dict[Tuple, threading.Lock] = {}
+
+    @staticmethod
+    def _file_signature(paths: List[str]) -> Tuple[Tuple[int, int], ...]:
+        """(mtime_ns, size) of each artifact; raises OSError if one is missing"""
+        signature = []
+        for path in paths:
+            stat = os.stat(path)
+            signature.append((stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    def get_or_load(
+        self,
+        bot_name: str,
+        symbol: Optional[str],
+        timeframe: Optional[str],
+        paths: List[str],
+        loader: Callable[[], Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Return the cached objects for a bot context, loading them if needed.
+
+        Args:
+            bot_name: Bot identifier
+            symbol: Symbol of the model context (None for the shared model)
+            timeframe: Timeframe of the model context
+            paths: Artifact files the objects are loaded from
+            loader: Callable that deserializes the artifacts into a dict
+
+        Returns:
+            Dict produced by `loader` (shared; callers must not mutate it)
+        """
+        key = (bot_name, symbol, timeframe)
+        signature = self._file_signature(paths)
+
+        with self._lock:
+            value = self._lookup(key, signature)
+            if value is not None:
+                return value
+            load_lock = self._loading.setdefault(key, threading.Lock())
+
+        # Deserialize outside the cache lock so a slow load never blocks other
+        # keys; concurrent misses on the same key wait for one load
+        with load_lock:
+            try:
+                with self._lock:
+                    value = self._lookup(key, signature)
+                    if value is not None:
+                        return value
+                    entry = self._entries.get(key)
+                    record_model_cache_miss(bot_name, "stale" if entry is not None else "cold")
+                if entry is not None:
+                    logger.info(f"Model files changed for {bot_name} {symbol} {timeframe}, reloading")
+
+                value = loader()
+                size_bytes = sum(size for _, size in signature)
+                with self._lock:
+                    if key in self._entries:
+                        self._remove(key)
+                    self._entries[key] = _CacheEntry(signature, value, size_bytes)
+                    self._total_bytes += size_bytes
+                    self._evict(keep=key)
+                    update_model_cache_size(len(self._entries), self._total_bytes)
+                return value
+            finally:
+                with self._lock:
+                    if self._loading.get(key) is load_lock:
+                        del self._loading[key]
+
+    def _lookup(self, key: Tuple, signature: Tuple) -> Optional[Dict[str, Any]]:
+        """Cached value if its files are unchanged (caller holds the lock)"""
+        entry = self._entries.get(key)
+        if entry is None or entry.signature != signature:
+            return None
+        self._entries.move_to_end(key)
+        record_model_cache_hit(key[0])
+        return entry.value
+
+    def invalidate(self, bot_name: Optional[str] = None):
+        """Drop all entries, or only those of one bot"""
+        with self._lock:
+            for key in [k for k in self._entries if bot_name is None or k[0] == bot_name]:
+                self._remove(key)
+            update_model_cache_size(len(self._entries), self._total_bytes)
+
+    def stats(self) -> Dict[str, Any]:
+        """Current cache occupancy"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _remove(self, key: Tuple):
+        entry = self._entries.pop(key)
+        self._total_bytes -= entry.size_bytes
+
+    def _evict(self, keep: Tuple):
+        """Evict least recently used entries until within budget (never `keep`)"""
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            oldest = next(iter(self._entries))
+            if oldest == keep:
+                break
+            self._remove(oldest)
+            record_model_cache_eviction(oldest[0])
+            logger.debug(f"Evicted cached model {oldest}")
+
+
+# Singleton instance
+model_cache = ModelCache(max_bytes=settings.model_cache_max_mb * 1024 * 1024)
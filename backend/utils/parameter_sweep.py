@@ -0,0 +1,244 @@
+"""
+Parameter sweep (grid search) over backtest settings.
+
+Runs every combination of a parameter grid through the vectorized
+BacktestEngine. The indicator frame is computed once per symbol and shipped
+to each worker process a single time (pool initializer), so each combination
+only pays for signal generation and position bookkeeping.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+import inspect
+import itertools
+import logging
+import os
+import pandas as pd
+from backend.utils.backtest_engine import BacktestEngine
+from backend.utils.signal_strategies import STRATEGIES
+
+logger = logging.getLogger(__name__)
+
+# Grid keys consumed by BacktestEngine.run_backtest; everything else goes to the strategy
+ENGINE_PARAMS = ("stop_loss_pct", "take_profit_pct", "position_size_pct", "max_positions", "order_type")
+
+# Metrics where a smaller value ranks higher
+ASCENDING_METRICS = {"max_drawdown_pct", "volatility_pct"}
+
+# Per-process state set by _init_worker
+_worker_candles: Optional[List[Dict]] = None
+_worker_frame: Optional[pd.DataFrame] = None
+
+
+def expand_grid(param_grid: Dict[str, Iterable[Any]]) -> List[Dict[str, Any]]:
+    """
+    Cartesian product of a parameter grid.
+
+    Args:
+        param_grid: Mapping of parameter name to candidate values
+            (scalars are treated as a single candidate)
+
+    Returns:
+        List of parameter dicts, one per combination
+    """
+    if not param_grid:
+        return [{}]
+
+    names = list(param_grid.keys())
+    values = []
+    for name in names:
+        candidates = param_grid[name]
+        if isinstance(candidates, (str, bytes)) or not isinstance(candidates, Iterable):
+            candidates = [candidates]
+        candidates = list(candidates)
+        if not candidates:
+            raise ValueError(f"Parameter '{name}' has no candidate values")
+        values.append(candidates)
+
+    return [dict(zip(names, combo)) for combo in itertools.product(*values)]
+
+
+def grid_size(param_grid: Dict[str, Iterable[Any]]) -> int:
+    """Number of combinations expand_grid would produce, without expanding the grid"""
+    size = 1
+    for candidates in param_grid.values():
+        if isinstance(candidates, (str, bytes)) or not isinstance(candidates, Iterable):
+            continue
+        size *= len(list(candidates))
+    return size
+
+
+def split_params(strategy_name: str, params: Dict[str, Any]) -> tuple:
+    """
+    Split one parameter combination into engine and strategy keyword arguments.
+
+    Raises:
+        ValueError: If the strategy is unknown or a parameter is not accepted
+    """
+    if strategy_name not in STRATEGIES:
+        raise ValueError(f"Unknown strategy '{strategy_name}'. Expected one of {list(STRATEGIES)}")
+
+    strategy_args = set(inspect.signature(STRATEGIES[strategy_name].__init__).parameters) - {"self"}
+    engine_params = {}
+    strategy_params = {}
+    for name, value in params.items():
+        if name in ENGINE_PARAMS:
+            engine_params[name] = value
+        elif name in strategy_args:
+            strategy_params[name] = value
+        else:
+            raise ValueError(f"Unknown parameter '{name}' for strategy '{strategy_name}'")
+    return engine_params, strategy_params
+
+
+def _init_worker(candles: List[Dict], indicator_frame: pd.DataFrame):
+    """Pool initializer: receive the shared candles/indicator frame once per process"""
+    global _worker_candles, _worker_frame
+    _worker_candles = candles
+    _worker_frame = indicator_frame
+
+
+def _run_combination(
+    symbol: str,
+    initial_capital: float,
+    strategy_name: str,
+    params: Dict[str, Any]
+) -> Dict:
+    """Run one grid point against the worker's shared candles and indicator frame"""
+    engine_params, strategy_params = split_params(strategy_name, params)
+    strategy = STRATEGIES[strategy_name](**strategy_params)
+
+    results = BacktestEngine().run_backtest(
+        symbol=symbol,
+        candles=_worker_candles,
+        initial_capital=initial_capital,
+        strategy=strategy,
+        mode="vectorized",
+        indicator_frame=_worker_frame,
+        **engine_params
+    )
+
+    return {
+        "params": params,
+        "metrics": results["metrics"],
+        "statistics": results["statistics"],
+        "final_value": results["final_value"],
+        "start_date": results["start_date"],
+        "end_date": results["end_date"],
+        "initial_capital": results["initial_capital"],
+        "total_trades": results["total_trades"],
+        "equity_curve": results["equity_curve"],
+        "trades": results["trades"],
+    }
+
+
+def _metric_value(result: Dict, rank_by: str) -> Optional[float]:
+    """Look up a ranking metric in metrics, the drawdown block or trade statistics"""
+    for source in (result["metrics"], result["metrics"].get("max_drawdown") or {}, result["statistics"]):
+        if isinstance(source, dict) and rank_by in source:
+            value = source[rank_by]
+            return float(value) if isinstance(value, (int, float)) else None
+    return None
+
+
+def rank_results(results: List[Dict], rank_by: str = "sharpe_ratio") -> List[Dict]:
+    """
+    Sort sweep results best-first by a metric and attach a 1-based rank.
+    Results missing the metric are placed last.
+    """
+    descending = rank_by not in ASCENDING_METRICS
+
+    def sort_key(result):
+        value = _metric_value(result, rank_by)
+        if value is None or value != value:
+            return (1, 0.0)
+        return (0, -value if descending else value)
+
+    ranked = sorted(results, key=sort_key)
+    for rank, result in enumerate(ranked, start=1):
+        result["rank"] = rank
+        result["score"] = _metric_value(result, rank_by)
+    return ranked
+
+
+def run_parameter_sweep(
+    symbol: str,
+    candles: List[Dict],
+    param_grid: Dict[str, Iterable[Any]],
+    strategy_name: str = "multi_indicator",
+    initial_capital: float = 100000.0,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    rank_by: str = "sharpe_ratio",
+    max_workers: Optional[int] = None
+) -> List[Dict]:
+    """
+    Backtest every combination of a parameter grid and rank the results.
+
+    Grid keys may be BacktestEngine settings (stop_loss_pct, take_profit_pct,
+    position_size_pct, max_positions, order_type) or constructor arguments of
+    the chosen strategy (e.g. overbought/oversold for "rsi", adx_threshold for
+    "adx").
+
+    Args:
+        symbol: Stock symbol
+        candles: Historical candle data
+        param_grid: Mapping of parameter name to candidate values
+        strategy_name: Strategy key from STRATEGIES
+        initial_capital: Starting capital for every run
+        start_date: Optional start of the backtest window
+        end_date: Optional end of the backtest window
+        rank_by: Metric used for ranking (e.g. sharpe_ratio, total_return_pct,
+            max_drawdown_pct, win_rate)
+        max_workers: Worker processes (default and upper bound: CPU count;
+            1 runs in-process)
+
+    Returns:
+        Ranked list of dicts with params, metrics, statistics and final_value
+    """
+    if not candles:
+        raise ValueError("No candles provided for sweep")
+
+    combinations = expand_grid(param_grid)
+    # Validate every combination up front instead of failing inside a worker
+    for params in combinations:
+        split_params(strategy_name, params)
+
+    engine = BacktestEngine()
+    candles = engine.filter_candles(candles, start_date, end_date)
+    if not candles:
+        raise ValueError("No candles in date range")
+
+    # One indicator pass shared by all combinations
+    indicator_frame = engine.prepare_indicator_frame(candles)
+
+    cpu_count = os.cpu_count() or 1
+    workers = min(max_workers or cpu_count, cpu_count)
+    workers = max(1, min(workers, len(combinations)))
+    logger.info(
+        f"Running parameter sweep for {symbol} ({strategy_name}): "
+        f"{len(combinations)} combinations on {workers} worker(s)"
+    )
+
+    if workers == 1:
+        _init_worker(candles, indicator_frame)
+        try:
+            results = [
+                _run_combination(symbol, initial_capital, strategy_name, params)
+                for params in combinations
+            ]
+        finally:
+            _init_worker(None, None)
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(candles, indicator_frame)
+        ) as executor:
+            futures = [
+                executor.submit(_run_combination, symbol, initial_capital, strategy_name, params)
+                for params in combinations
+            ]
+            results = [future.result() for future in futures]
+
+    return rank_results(results, rank_by)
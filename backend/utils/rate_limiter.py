@@ -0,0 +1,229 @@
+"""
+Per-provider request budgets shared by every fetch path.
+
+Each upstream provider (Yahoo Finance, Twelve Data, Freddy AI) has a token
+bucket refilled at its configured requests per minute. Callers take tokens
+before calling the provider. Waiting callers are served in priority order
+(live subscriptions, then history backfill, then training), and the last
+rate_limit_live_reserve share of every bucket is only handed to live
+fetches. A caller whose wait would exceed the limit for its priority is
+refused and is expected to serve cached data instead.
+
+The priority is carried in a context variable, so it follows a request
+through tasks and (with copy_context) executor threads:
+
+    with fetch_priority(FetchPriority.TRAINING):
+        candles = await data_fetcher.fetch_candles(...)
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Dict, Optional
+import asyncio
+import threading
+import time
+from backend.config import settings
+from backend.utils.logger import get_logger
+from backend.utils.metrics import record_provider_budget
+
+logger = get_logger(__name__)
+
+# Re-check interval while a higher-priority caller is queued ahead
+_POLL_SECONDS = 0.05
+
+
+class FetchPriority(IntEnum):
+    LIVE = 0
+    BACKFILL = 1
+    TRAINING = 2
+
+
+class BudgetExhausted(Exception):
+    """A provider call was refused because its request budget is used up"""
+
+    def __init__(self, provider: str):
+        super().__init__(f"{provider} request budget exhausted")
+        self.provider = provider
+
+
+_priority: ContextVar[FetchPriority] = ContextVar("fetch_priority", default=FetchPriority.BACKFILL)
+
+
+@contextmanager
+def fetch_priority(priority: FetchPriority):
+    """Run provider calls made inside the block at `priority`"""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> FetchPriority:
+    return _priority.get()
+
+
+class TokenBucket:
+    """Tokens refilled continuously at `rate_per_minute` up to `capacity`"""
+
+    def __init__(self, rate_per_minute: float, capacity: float):
+        self.rate = max(rate_per_minute, 1e-6) / 60.0
+        self.capacity = max(1.0, float(capacity))
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class FetchScheduler:
+    """Token buckets per provider with priority-ordered waiting (see module docstring)"""
+
+    def __init__(
+        self,
+        limits: Dict[str, float],
+        burst_seconds: float = 15.0,
+        live_reserve: float = 0.25,
+        max_wait: Optional[Dict[FetchPriority, float]] = None,
+    ):
+        """
+        Args:
+            limits: Requests per minute by provider name (providers not listed are unlimited)
+            burst_seconds: Bucket capacity, in seconds of refill
+            live_reserve: Share of each bucket only live fetches may take
+            max_wait: Longest a caller of each priority waits before it is refused
+        """
+        self._buckets = {
+            provider: TokenBucket(rate, rate * burst_seconds / 60.0)
+            for provider, rate in limits.items()
+        }
+        self.live_reserve = min(max(live_reserve, 0.0), 0.9)
+        self.max_wait = max_wait or {priority: 0.0 for priority in FetchPriority}
+        # provider -> callers currently waiting, per priority
+        self._waiting = {provider: [0] * len(FetchPriority) for provider in self._buckets}
+        self._lock = threading.Lock()
+
+    def _try_take(self, provider: str, priority: FetchPriority, tokens: float) -> float:
+        """Take tokens if allowed (lock held): 0.0 on success, else seconds until a retry may succeed"""
+        bucket = self._buckets[provider]
+        bucket.refill(time.monotonic())
+        if any(self._waiting[provider][:priority]):
+            return _POLL_SECONDS
+
+        floor = 0.0 if priority == FetchPriority.LIVE else bucket.capacity * self.live_reserve
+        # Requests larger than the bucket wait for it to fill, then leave it in debt
+        need = min(tokens, bucket.capacity - floor)
+        if bucket.tokens - floor >= need:
+            bucket.tokens -= tokens
+            return 0.0
+        return (need + floor - bucket.tokens) / bucket.rate
+
+    def _step(self, provider: str, priority: FetchPriority, tokens: float, deadline: float, queued: bool):
+        """One acquisition attempt: (granted, refused, delay); registers the caller as waiting"""
+        with self._lock:
+            delay = self._try_take(provider, priority, tokens)
+            if delay == 0.0:
+                return True, False, 0.0
+            if time.monotonic() + delay > deadline:
+                return False, True, 0.0
+            if not queued:
+                self._waiting[provider][priority] += 1
+            return False, False, delay
+
+    def _leave(self, provider: str, priority: FetchPriority):
+        with self._lock:
+            self._waiting[provider][priority] -= 1
+
+    def _finish(self, provider: str, priority: FetchPriority, granted: bool, started: float) -> bool:
+        waited = time.monotonic() - started
+        record_provider_budget(provider, priority.name.lower(), granted, waited)
+        if not granted:
+            logger.warning(
+                "Provider budget exhausted",
+                provider=provider,
+                priority=priority.name.lower(),
+                waited=round(waited, 3),
+            )
+        return granted
+
+    def _resolve(self, priority: Optional[FetchPriority], max_wait: Optional[float]):
+        priority = current_priority() if priority is None else priority
+        max_wait = self.max_wait.get(priority, 0.0) if max_wait is None else max_wait
+        return priority, max_wait
+
+    async def acquire(
+        self,
+        provider: str,
+        tokens: float = 1,
+        priority: Optional[FetchPriority] = None,
+        max_wait: Optional[float] = None,
+    ) -> bool:
+        """
+        Take `tokens` from the provider's budget, waiting up to max_wait seconds.
+
+        Args:
+            provider: Provider name ('yahoo', 'twelvedata', 'freddy')
+            tokens: Cost of the call (e.g. Twelve Data credits)
+            priority: Defaults to the priority of the current context
+            max_wait: Defaults to the configured wait limit of the priority
+
+        Returns:
+            False if the budget cannot cover the call in time (serve cached data)
+        """
+        if provider not in self._buckets:
+            return True
+        priority, max_wait = self._resolve(priority, max_wait)
+        started = time.monotonic()
+        queued = False
+        try:
+            while True:
+                granted, refused, delay = self._step(provider, priority, tokens, started + max_wait, queued)
+                if granted or refused:
+                    return self._finish(provider, priority, granted, started)
+                queued = True
+                await asyncio.sleep(delay)
+        finally:
+            if queued:
+                self._leave(provider, priority)
+
+    def acquire_sync(
+        self,
+        provider: str,
+        tokens: float = 1,
+        priority: Optional[FetchPriority] = None,
+        max_wait: Optional[float] = None,
+    ) -> bool:
+        """Blocking acquire() for worker threads"""
+        if provider not in self._buckets:
+            return True
+        priority, max_wait = self._resolve(priority, max_wait)
+        started = time.monotonic()
+        queued = False
+        try:
+            while True:
+                granted, refused, delay = self._step(provider, priority, tokens, started + max_wait, queued)
+                if granted or refused:
+                    return self._finish(provider, priority, granted, started)
+                queued = True
+                time.sleep(delay)
+        finally:
+            if queued:
+                self._leave(provider, priority)
+
+
+# Singleton instance
+fetch_scheduler = FetchScheduler(
+    limits={
+        "yahoo": settings.yahoo_requests_per_minute,
+        "twelvedata": settings.twelvedata_requests_per_minute,
+        "freddy": settings.freddy_requests_per_minute,
+    },
+    burst_seconds=settings.rate_limit_burst_seconds,
+    live_reserve=settings.rate_limit_live_reserve,
+    max_wait={
+        FetchPriority.LIVE: settings.rate_limit_max_wait_live_seconds,
+        FetchPriority.BACKFILL: settings.rate_limit_max_wait_backfill_seconds,
+        FetchPriority.TRAINING: settings.rate_limit_max_wait_training_seconds,
+    },
+)
@@ -3,12 +3,42 @@ Signal generation strategies using multiple technical indicators.
 Provides various trading strategies based on indicator combinations.
 """
 from typing import Dict, Optional, List
+import numpy as np
 import pandas as pd
 import logging
 from backend.utils.indicators import calculate_all_indicators
+from backend.utils.incremental_indicators import IncrementalIndicators
 
 logger = logging.getLogger(__name__)
 
+# Vectorized signal encoding used by generate_signals
+BUY = 1
+SELL = -1
+HOLD = 0
+
+
+def _column(frame: pd.DataFrame, name: str) -> np.ndarray:
+    """Indicator column as float array (all NaN if the column is missing)."""
+    if name not in frame.columns:
+        return np.full(len(frame), np.nan)
+    return frame[name].to_numpy(dtype=float, na_value=np.nan)
+
+
+def _actions(buy: np.ndarray, sell: np.ndarray) -> np.ndarray:
+    """Combine boolean masks into an action array; buy wins like the scalar if/elif."""
+    return np.where(buy, BUY, np.where(sell, SELL, HOLD)).astype(np.int8)
+
+
+def row_indicators(frame: pd.DataFrame, index: int) -> Dict:
+    """Indicator dict for one row of an indicator frame (NaN -> None)."""
+    latest = frame.iloc[index]
+    indicators = {}
+    for col in frame.columns:
+        if col not in ['start_ts', 'open', 'high', 'low', 'close', 'volume']:
+            value = latest[col]
+            indicators[col] = float(value) if pd.notna(value) else None
+    return indicators
+
 
 class SignalStrategy:
     """Base class for signal generation strategies"""
@@ -27,6 +57,30 @@ class SignalStrategy:
             Signal dictionary with 'action' ('buy', 'sell', None) and metadata
         """
         raise NotImplementedError
+    
+    def generate_signals(self, frame: pd.DataFrame) -> np.ndarray:
+        """
+        Generate signals for every row of a precomputed indicator frame.
+        
+        Subclasses override this with NumPy expressions equivalent to
+        generate_signal; the default evaluates generate_signal row by row.
+        
+        Args:
+            frame: DataFrame from calculate_all_indicators (OHLCV + indicators)
+        
+        Returns:
+            int8 array with BUY (1), SELL (-1) or HOLD (0) per row
+        """
+        actions = np.zeros(len(frame), dtype=np.int8)
+        for i in range(len(frame)):
+            candle = {"close": frame["close"].iloc[i]}
+            signal = self.generate_signal(candle, row_indicators(frame, i), i)
+            action = signal.get("action") if signal else None
+            if action == "buy":
+                actions[i] = BUY
+            elif action == "sell":
+                actions[i] = SELL
+        return actions
 
 
 class MultiIndicatorStrategy(SignalStrategy):
@@ -51,24 +105,23 @@ class MultiIndicatorStrategy(SignalStrategy):
         self.mfi_oversold = mfi_oversold
         self.require_confirmation = require_confirmation
     
-    @staticmethod
-    def generate_signal(candle: Dict, indicators: Dict, index: int = None) -> Optional[Dict]:
+    def generate_signal(self, candle: Dict, indicators: Dict, index: int = None) -> Optional[Dict]:
         """
         Generate signal using multiple indicators.
         
         BUY signals when:
-        - RSI oversold (< 30) AND
+        - RSI oversold (< rsi_oversold, default 30) AND
         - MACD bullish crossover AND
         - Price below lower Bollinger Band AND
-        - ADX > 25 (strong trend) AND
-        - MFI oversold (< 20)
+        - ADX > adx_threshold (default 25, strong trend) AND
+        - MFI oversold (< mfi_oversold, default 20)
         
         SELL signals when:
-        - RSI overbought (> 70) AND
+        - RSI overbought (> rsi_overbought, default 70) AND
         - MACD bearish crossover AND
         - Price above upper Bollinger Band AND
-        - ADX > 25 AND
-        - MFI overbought (> 80)
+        - ADX > adx_threshold AND
+        - MFI overbought (> mfi_overbought, default 80)
         """
         if not indicators:
             return None
@@ -94,10 +147,10 @@ class MultiIndicatorStrategy(SignalStrategy):
         reasons = []
         
         # RSI signals
-        if rsi < 30:
+        if rsi < self.rsi_oversold:
             buy_signals += 1
             reasons.append(f"RSI oversold ({rsi:.1f})")
-        elif rsi > 70:
+        elif rsi > self.rsi_overbought:
             sell_signals += 1
             reasons.append(f"RSI overbought ({rsi:.1f})")
         
@@ -118,16 +171,16 @@ class MultiIndicatorStrategy(SignalStrategy):
             reasons.append("Price above BB upper")
         
         # ADX (trend strength)
-        if adx > 25:
+        if adx > self.adx_threshold:
             buy_signals += 0.5  # Half signal for trend strength
             sell_signals += 0.5
             reasons.append(f"Strong trend (ADX: {adx:.1f})")
         
         # MFI signals
-        if mfi < 20:
+        if mfi < self.mfi_oversold:
             buy_signals += 1
             reasons.append(f"MFI oversold ({mfi:.1f})")
-        elif mfi > 80:
+        elif mfi > self.mfi_overbought:
             sell_signals += 1
             reasons.append(f"MFI overbought ({mfi:.1f})")
         
@@ -157,6 +210,43 @@ class MultiIndicatorStrategy(SignalStrategy):
             }
         
         return None
+    
+    def generate_signals(self, frame: pd.DataFrame) -> np.ndarray:
+        rsi = _column(frame, 'rsi_14')
+        macd = _column(frame, 'macd')
+        macd_signal = _column(frame, 'macd_signal')
+        macd_hist = _column(frame, 'macd_histogram')
+        price = _column(frame, 'close')
+        bb_upper = _column(frame, 'bb_upper')
+        bb_lower = _column(frame, 'bb_lower')
+        adx = _column(frame, 'adx')
+        mfi = _column(frame, 'mfi_14')
+        sma_20 = _column(frame, 'sma_20')
+        sma_50 = _column(frame, 'sma_50')
+        
+        ready = ~np.isnan(np.vstack([rsi, macd, macd_signal, price, bb_upper, bb_lower, adx, mfi])).any(axis=0)
+        
+        rsi_buy = rsi < self.rsi_oversold
+        rsi_sell = ~rsi_buy & (rsi > self.rsi_overbought)
+        macd_buy = (macd_hist > 0) & (macd > macd_signal)
+        macd_sell = ~macd_buy & (macd_hist < 0) & (macd < macd_signal)
+        bb_buy = price < bb_lower
+        bb_sell = ~bb_buy & (price > bb_upper)
+        trend = np.where(adx > self.adx_threshold, 0.5, 0.0)
+        mfi_buy = mfi < self.mfi_oversold
+        mfi_sell = ~mfi_buy & (mfi > self.mfi_overbought)
+        # `if sma_20 and sma_50` treats 0/None as missing
+        has_mas = ~np.isnan(sma_20) & ~np.isnan(sma_50) & (sma_20 != 0) & (sma_50 != 0)
+        ma_buy = has_mas & (sma_20 > sma_50)
+        ma_sell = has_mas & (sma_20 < sma_50)
+        
+        buy_signals = (
+            rsi_buy.astype(float) + macd_buy + bb_buy + trend + mfi_buy + 0.5 * ma_buy
+        )
+        sell_signals = (
+            rsi_sell.astype(float) + macd_sell + bb_sell + trend + mfi_sell + 0.5 * ma_sell
+        )
+        return _actions(ready & (buy_signals >= 3), ready & (sell_signals >= 3))
 
 
 class RSIStrategy(SignalStrategy):
@@ -166,26 +256,29 @@ class RSIStrategy(SignalStrategy):
         self.overbought = overbought
         self.oversold = oversold
     
-    @staticmethod
-    def generate_signal(candle: Dict, indicators: Dict, index: int = None) -> Optional[Dict]:
+    def generate_signal(self, candle: Dict, indicators: Dict, index: int = None) -> Optional[Dict]:
         rsi = indicators.get('rsi_14')
         if rsi is None:
             return None
         
-        if rsi < 30:
+        if rsi < self.oversold:
             return {
                 "action": "buy",
-                "confidence": (30 - rsi) / 30.0,  # More oversold = higher confidence
+                "confidence": (self.oversold - rsi) / 30.0,  # More oversold = higher confidence
                 "reasons": [f"RSI oversold ({rsi:.1f})"]
             }
-        elif rsi > 70:
+        elif rsi > self.overbought:
             return {
                 "action": "sell",
-                "confidence": (rsi - 70) / 30.0,
+                "confidence": (rsi - self.overbought) / 30.0,
                 "reasons": [f"RSI overbought ({rsi:.1f})"]
             }
         
         return None
+    
+    def generate_signals(self, frame: pd.DataFrame) -> np.ndarray:
+        rsi = _column(frame, 'rsi_14')
+        return _actions(rsi < self.oversold, rsi > self.overbought)
 
 
 class MACDCrossoverStrategy(SignalStrategy):
@@ -216,6 +309,15 @@ class MACDCrossoverStrategy(SignalStrategy):
             }
         
         return None
+    
+    def generate_signals(self, frame: pd.DataFrame) -> np.ndarray:
+        macd = _column(frame, 'macd')
+        macd_signal = _column(frame, 'macd_signal')
+        macd_hist = _column(frame, 'macd_histogram')
+        return _actions(
+            (macd_hist > 0) & (macd > macd_signal),
+            (macd_hist < 0) & (macd < macd_signal)
+        )
 
 
 class BollingerBandsStrategy(SignalStrategy):
@@ -247,6 +349,13 @@ class BollingerBandsStrategy(SignalStrategy):
             }
         
         return None
+    
+    def generate_signals(self, frame: pd.DataFrame) -> np.ndarray:
+        price = _column(frame, 'close')
+        bb_upper = _column(frame, 'bb_upper')
+        bb_lower = _column(frame, 'bb_lower')
+        ready = ~np.isnan(_column(frame, 'bb_middle'))
+        return _actions(ready & (price <= bb_lower), ready & (price >= bb_upper))
 
 
 class ADXTrendStrategy(SignalStrategy):
@@ -255,8 +364,7 @@ class ADXTrendStrategy(SignalStrategy):
     def __init__(self, adx_threshold: float = 25):
         self.adx_threshold = adx_threshold
     
-    @staticmethod
-    def generate_signal(candle: Dict, indicators: Dict, index: int = None, adx_threshold: float = 25) -> Optional[Dict]:
+    def generate_signal(self, candle: Dict, indicators: Dict, index: int = None) -> Optional[Dict]:
         adx = indicators.get('adx')
         plus_di = indicators.get('adx_plus_di')
         minus_di = indicators.get('adx_minus_di')
@@ -265,7 +373,7 @@ class ADXTrendStrategy(SignalStrategy):
             return None
         
         # Only trade when trend is strong (ADX > threshold)
-        if adx < adx_threshold:
+        if adx < self.adx_threshold:
             return None
         
         # Buy when +DI > -DI (uptrend)
@@ -284,6 +392,13 @@ class ADXTrendStrategy(SignalStrategy):
             }
         
         return None
+    
+    def generate_signals(self, frame: pd.DataFrame) -> np.ndarray:
+        adx = _column(frame, 'adx')
+        plus_di = _column(frame, 'adx_plus_di')
+        minus_di = _column(frame, 'adx_minus_di')
+        strong = adx >= self.adx_threshold
+        return _actions(strong & (plus_di > minus_di), strong & (minus_di > plus_di))
 
 
 class VWAPStrategy(SignalStrategy):
@@ -313,13 +428,22 @@ class VWAPStrategy(SignalStrategy):
             }
         
         return None
+    
+    def generate_signals(self, frame: pd.DataFrame) -> np.ndarray:
+        price = _column(frame, 'close')
+        vwap_intraday = _column(frame, 'vwap_intraday')
+        # `vwap_intraday or vwap`: fall back when missing or zero
+        use_intraday = ~np.isnan(vwap_intraday) & (vwap_intraday != 0)
+        vwap = np.where(use_intraday, vwap_intraday, _column(frame, 'vwap'))
+        return _actions(price < vwap * 0.98, price > vwap * 1.02)
 
 
 def generate_signal_from_indicators(
     candle: Dict,
-    candles: List[Dict],
+    candles: Optional[List[Dict]],
     strategy: SignalStrategy = None,
-    index: int = None
+    index: int = None,
+    indicator_state: Optional[IncrementalIndicators] = None
 ) -> Optional[Dict]:
     """
     Generate trading signal using all indicators.
@@ -329,28 +453,29 @@ def generate_signal_from_indicators(
         candles: List of all candles (for indicator calculation)
         strategy: Signal strategy to use (default: MultiIndicatorStrategy)
         index: Current candle index
+        indicator_state: Streaming indicator state already updated with `candle`.
+            When given, its latest values are used and `candles` is ignored.
     
     Returns:
         Signal dictionary or None
     """
-    if not candles:
-        return None
-    
-    # Calculate all indicators
-    df = calculate_all_indicators(candles)
-    
-    if df.empty:
-        return None
-    
-    # Get latest indicator values
-    latest_idx = len(df) - 1 if index is None else min(index, len(df) - 1)
-    latest = df.iloc[latest_idx]
-    
-    indicators = {}
-    for col in df.columns:
-        if col not in ['start_ts', 'open', 'high', 'low', 'close', 'volume']:
-            value = latest[col]
-            indicators[col] = float(value) if pd.notna(value) else None
+    if indicator_state is not None:
+        if indicator_state.count == 0:
+            return None
+        indicators = indicator_state.latest
+    else:
+        if not candles:
+            return None
+        
+        # Calculate all indicators
+        df = calculate_all_indicators(candles)
+        
+        if df.empty:
+            return None
+        
+        # Get latest indicator values
+        latest_idx = len(df) - 1 if index is None else min(index, len(df) - 1)
+        indicators = row_indicators(df, latest_idx)
     
     # Use default strategy if none provided
     if strategy is None:
@@ -359,3 +484,13 @@ def generate_signal_from_indicators(
     # Generate signal
     return strategy.generate_signal(candle, indicators, index)
 
+
+# Strategy classes by API name (used by the backtest routes and parameter sweeps)
+STRATEGIES: Dict[str, type] = {
+    "multi_indicator": MultiIndicatorStrategy,
+    "rsi": RSIStrategy,
+    "macd": MACDCrossoverStrategy,
+    "bollinger": BollingerBandsStrategy,
+    "adx": ADXTrendStrategy,
+    "vwap": VWAPStrategy,
+}
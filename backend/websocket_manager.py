@@ -1,25 +1,238 @@
 """
 WebSocket connection manager for broadcasting messages.
 Includes latency tagging, sequence numbers, and exponential backoff.
+
+Subscriptions are indexed by (symbol, timeframe), so a broadcast only visits
+that pair's subscribers. Each broadcast is JSON-encoded once and the same
+frame is queued for every recipient; per-connection tags (_connection_age_ms,
+_latency_ms) are opt-in via ws_connection_metadata since they force a copy and
+an encode per connection.
+
+Each connection has a ConflatingQueue instead of a plain bounded queue:
+candle and prediction updates replace any pending update for the same
+symbol/timeframe, so a slow client receives the latest state rather than
+being disconnected during bursts, while other events (training progress,
+model status) stay in order. Only those ordered events can accumulate; when
+a connection has ws_max_pending_events of them, ws_slow_consumer_policy
+decides whether the oldest one is dropped ("drop_oldest") or the
+connection is closed ("disconnect").
+
+Clients that subscribe with "delta": true get a delta stream instead of full
+updates: a candle:snapshot / prediction:snapshot on subscribe (and on a
+"resync" request), then candle:delta / prediction:delta messages carrying
+only the changed fields of the forming candle and the changed points of
+predicted_series. Each delta names the _sequence it applies to in
+_base_sequence; a client whose last applied _sequence differs has missed a
+message and asks for a resync. Heavy diagnostic fields (ws_delta_omit_fields)
+are left out of delta streams.
+
+Broadcasts go through a BroadcastBus (backend.utils.broadcast_bus): with the
+Redis bus every worker receives each event and delivers it to its own
+connections, so clients see the same updates whichever worker they are on.
 """
+from collections import OrderedDict
+from dataclasses import dataclass
 from fastapi import WebSocket
-from typing import Dict, Set, Optional
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Set, Optional, Tuple, Union
 from datetime import datetime
+import json
 import logging
 import asyncio
 import time
 import itertools
 
+from backend.config import settings
+from backend.utils.broadcast_bus import BroadcastBus, broadcast_bus
+from backend.utils.metrics import (
+    record_websocket_broadcast,
+    record_websocket_conflated,
+    record_websocket_send,
+    record_websocket_slow_consumer,
+)
+
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class _Frame:
+    """A broadcast encoded once and shared by every recipient queue"""
+    message_type: str
+    payload: Union[str, bytes]
+    created_at: float
+    size: int = 0
+
+
+@dataclass
+class _StreamState:
+    """Last state sent on a delta stream (candle or prediction of one symbol/timeframe)"""
+    state: Dict
+    sequence: int
+    created_at: float
+    snapshot: Optional[_Frame] = None
+
+
+# Message types where only the latest pending update per symbol/timeframe matters
+_CONFLATED_TYPES = {
+    "candle:update", "candle:snapshot", "candle:delta",
+    "prediction:update", "prediction:snapshot", "prediction:delta",
+}
+
+
+def _diff_fields(previous: Dict, current: Dict, skip: Tuple[str, ...] = ()) -> Tuple[Dict, List[str]]:
+    """Top-level fields that changed or appeared, and those that disappeared"""
+    changed = {
+        key: value for key, value in current.items()
+        if key not in skip and (key not in previous or previous[key] != value)
+    }
+    removed = [key for key in previous if key not in current and key not in skip]
+    return changed, removed
+
+
+def _diff_prediction(previous: Dict, current: Dict) -> Dict:
+    """Changed fields plus predicted_series points upserted/removed by ts ({} if unchanged)"""
+    changed, removed = _diff_fields(previous, current, skip=("predicted_series",))
+    old_points = {point["ts"]: point for point in previous.get("predicted_series") or []}
+    new_series = current.get("predicted_series") or []
+    upserts = [point for point in new_series if old_points.get(point["ts"]) != point]
+    new_ts = {point["ts"] for point in new_series}
+    stale = [ts for ts in old_points if ts not in new_ts]
+
+    delta = {}
+    if changed:
+        delta["fields"] = changed
+    if removed:
+        delta["removed_fields"] = removed
+    if upserts:
+        delta["series_upsert"] = upserts
+    if stale:
+        delta["series_remove"] = stale
+    return delta
+
+
+def _diff_candle(previous: Dict, current: Dict) -> Optional[Dict]:
+    """Changed fields of the forming candle ({} if unchanged, None for a new bar)"""
+    if previous.get("start_ts") != current.get("start_ts"):
+        return None
+    changed, removed = _diff_fields(previous, current)
+    if not changed and not removed:
+        return {}
+    return {"candle": {"start_ts": current.get("start_ts"), **changed}}
+
+
+def _created_at(message: Any) -> float:
+    return message.created_at if isinstance(message, _Frame) else message.get("_timestamp", time.time())
+
+
+class ConflatingQueue:
+    """
+    Outbound buffer for one connection (see module docstring).
+
+    Messages put with a conflation key overwrite a pending message with the
+    same key in place; messages without one are kept in order, up to
+    max_pending_events. Supports the asyncio.Queue calls the sender uses
+    (get, task_done, join, qsize).
+    """
+    
+    def __init__(self, max_pending_events: int = 100):
+        self.max_pending_events = max(1, int(max_pending_events))
+        self._items: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._event_ids = itertools.count()
+        self._events = 0
+        self._unfinished = 0
+        self._ready = asyncio.Event()
+        self._finished = asyncio.Event()
+        self._finished.set()
+        self.conflated = 0
+        self.dropped = 0
+    
+    def qsize(self) -> int:
+        return len(self._items)
+    
+    def lag_seconds(self, now: Optional[float] = None) -> float:
+        """Age of the oldest pending message"""
+        if not self._items:
+            return 0.0
+        oldest = next(iter(self._items.values()))
+        return max(0.0, (now or time.time()) - _created_at(oldest))
+    
+    def put(
+        self,
+        message: Any,
+        conflate_key: Optional[Hashable] = None,
+        supersede: Optional[Callable[[], Any]] = None,
+    ) -> str:
+        """
+        Queue a message without blocking. When a message with the same
+        conflation key is pending, it is replaced by `message`, or by
+        supersede() if given (a delta cannot replace the delta it builds on,
+        so delta streams supersede with a snapshot).
+        
+        Returns:
+            "queued", "conflated" (replaced a pending message) or "full"
+            (ordered backlog at max_pending_events, nothing queued)
+        """
+        if conflate_key is not None:
+            key = ("conflate", conflate_key)
+            if key in self._items:
+                self._items[key] = supersede() if supersede is not None else message
+                self.conflated += 1
+                return "conflated"
+        else:
+            if self._events >= self.max_pending_events:
+                return "full"
+            key = ("event", next(self._event_ids))
+            self._events += 1
+        
+        self._items[key] = message
+        self._unfinished += 1
+        self._finished.clear()
+        self._ready.set()
+        return "queued"
+    
+    def drop_oldest_event(self) -> bool:
+        """Discard the oldest pending ordered event; False if there is none"""
+        for key in self._items:
+            if key[0] == "event":
+                del self._items[key]
+                self._events -= 1
+                self.dropped += 1
+                self.task_done()
+                return True
+        return False
+    
+    async def get(self) -> Any:
+        while not self._items:
+            self._ready.clear()
+            await self._ready.wait()
+        key, message = self._items.popitem(last=False)
+        if key[0] == "event":
+            self._events -= 1
+        return message
+    
+    def task_done(self):
+        self._unfinished = max(0, self._unfinished - 1)
+        if not self._unfinished:
+            self._finished.set()
+    
+    async def join(self):
+        await self._finished.wait()
+
+
 class ConnectionManager:
     """Manages WebSocket connections and subscriptions"""
     
-    def __init__(self):
+    def __init__(self, bus: Optional[BroadcastBus] = None):
+        # Defaults to the in-process bus (deliver to this manager's connections only)
+        self.bus = bus or BroadcastBus()
         self.active_connections: Set[WebSocket] = set()
         self.subscriptions: Dict[WebSocket, Dict] = {}
-        self.message_queues: Dict[WebSocket, asyncio.Queue] = {}
+        # (symbol, timeframe) -> subscribed connections
+        self.subscribers: Dict[Tuple[str, str], Set[WebSocket]] = {}
+        # Connections subscribed to delta streams, and the last state of each
+        # stream keyed by (kind, symbol, timeframe)
+        self.delta_connections: Set[WebSocket] = set()
+        self.delta_streams: Dict[Tuple[str, str, str], _StreamState] = {}
+        self.message_queues: Dict[WebSocket, ConflatingQueue] = {}
         self._send_tasks: Dict[WebSocket, asyncio.Task] = {}
         
         # Sequence numbers for out-of-order message handling
@@ -34,7 +247,7 @@ class ConnectionManager:
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
         self.active_connections.add(websocket)
-        self.message_queues[websocket] = asyncio.Queue(maxsize=100)
+        self.message_queues[websocket] = ConflatingQueue(settings.ws_max_pending_events)
         
         # Initialize connection metadata
         self.connection_metadata[websocket] = {
@@ -86,21 +299,31 @@ class ConnectionManager:
                     
                     # Track latency: time from message creation to send
                     send_start_time = time.time()
-                    message_timestamp = message.get("_timestamp", send_start_time)
-                    latency_ms = (send_start_time - message_timestamp) * 1000
-                    
-                    # Update message with latency if not already set
-                    if "_latency_ms" not in message:
-                        message["_latency_ms"] = round(latency_ms, 2)
-                    
-                    await websocket.send_json(message)
+                    if isinstance(message, _Frame):
+                        if isinstance(message.payload, bytes):
+                            await websocket.send_bytes(message.payload)
+                        else:
+                            await websocket.send_text(message.payload)
+                        message_type = message.message_type
+                        latency = send_start_time - message.created_at
+                        size = message.size
+                    else:
+                        message_type = message.get("type", "unknown")
+                        latency = send_start_time - message.get("_timestamp", send_start_time)
+                        size = 0
+                        # Update message with latency if not already set
+                        if "_latency_ms" not in message:
+                            message["_latency_ms"] = round(latency * 1000, 2)
+                        await websocket.send_json(message, mode="binary" if settings.ws_binary_frames else "text")
                     queue.task_done()
+                    record_websocket_send(message_type, latency, size)
                     
                     # Update connection metadata
                     if websocket in self.connection_metadata:
                         meta = self.connection_metadata[websocket]
                         meta["last_message_time"] = send_start_time
                         meta["messages_sent"] = meta.get("messages_sent", 0) + 1
+                        meta["last_lag_ms"] = round(latency * 1000, 2)
                     
                 except asyncio.TimeoutError:
                     # No message in queue, continue waiting
@@ -121,8 +344,8 @@ class ConnectionManager:
     
     def disconnect(self, websocket: WebSocket):
         self.active_connections.discard(websocket)
-        if websocket in self.subscriptions:
-            del self.subscriptions[websocket]
+        self.unsubscribe(websocket)
+        self.delta_connections.discard(websocket)
         if websocket in self.message_queues:
             del self.message_queues[websocket]
         # Use pop with default to avoid KeyError
@@ -137,13 +360,49 @@ class ConnectionManager:
             self.reconnect_attempts[websocket] = self.reconnect_attempts.get(websocket, 0) + 1
         logger.info(f"WebSocket disconnected. Total connections: {len(self.active_connections)}")
     
-    def subscribe(self, websocket: WebSocket, symbol: str, timeframe: str):
-        """Subscribe a connection to symbol updates"""
+    def subscribe(self, websocket: WebSocket, symbol: str, timeframe: str, delta: bool = False):
+        """
+        Subscribe a connection to symbol updates (replaces its previous subscription).
+        
+        Args:
+            delta: Send snapshots then deltas instead of full updates; the
+                current snapshots are queued right away
+        """
+        self.unsubscribe(websocket)
         self.subscriptions[websocket] = {
             "symbol": symbol,
             "timeframe": timeframe
         }
-        logger.info(f"WebSocket subscribed to {symbol} {timeframe}")
+        self.subscribers.setdefault((symbol, timeframe), set()).add(websocket)
+        if delta:
+            self.delta_connections.add(websocket)
+            self.resync(websocket)
+        else:
+            self.delta_connections.discard(websocket)
+        logger.info(f"WebSocket subscribed to {symbol} {timeframe}{' (delta)' if delta else ''}")
+    
+    def resync(self, websocket: WebSocket):
+        """Queue the current candle/prediction snapshots of a delta subscriber's streams"""
+        sub = self.subscriptions.get(websocket)
+        queue = self.message_queues.get(websocket)
+        if sub is None or queue is None or websocket not in self.delta_connections:
+            return
+        for kind in ("candle", "prediction"):
+            key = (kind, sub["symbol"], sub["timeframe"])
+            if key in self.delta_streams:
+                queue.put(self._snapshot_item(key), key)
+    
+    def unsubscribe(self, websocket: WebSocket):
+        """Drop a connection's subscription, if any"""
+        sub = self.subscriptions.pop(websocket, None)
+        if sub is None:
+            return
+        key = (sub["symbol"], sub["timeframe"])
+        connections = self.subscribers.get(key)
+        if connections is not None:
+            connections.discard(websocket)
+            if not connections:
+                del self.subscribers[key]
     
     def get_all_subscriptions(self):
         """Get all active subscriptions"""
@@ -153,114 +412,236 @@ class ConnectionManager:
                 subscriptions.append(self.subscriptions[connection])
         return subscriptions
     
-    async def broadcast_candle(self, symbol: str, timeframe: str, candle: Dict):
-        """Broadcast candle update with queuing, latency tracking, and sequence numbers"""
-        base_message = {
-            "type": "candle:update",
+    def _new_message(self, message_type: str, payload: Dict, created_at: Optional[float] = None) -> Dict:
+        """Broadcast envelope with creation time and sequence number"""
+        return {
+            "type": message_type,
+            **payload,
+            "_timestamp": created_at or time.time(),  # Track when message was created
+            "_sequence": self._get_sequence_number()  # Sequence number for ordering
+        }
+    
+    async def _publish(self, message_type: str, payload: Dict):
+        """Send a broadcast to every worker through the bus (or straight to local connections)"""
+        event = {"type": message_type, "payload": payload, "published_at": time.time()}
+        if not await self.bus.publish(event):
+            await self.deliver(event)
+    
+    async def deliver(self, event: Dict):
+        """Fan a published event out to this worker's connections (the bus handler)"""
+        message = self._new_message(event["type"], event["payload"], event.get("published_at"))
+        if message["type"] == "candle:update":
+            self._deliver_candle(message)
+        elif message["type"] == "prediction:update":
+            self._deliver_prediction(message)
+        else:
+            self._fan_out(self.active_connections, message)
+    
+    @staticmethod
+    def _encode(message: Dict) -> Union[str, bytes]:
+        """Serialize like WebSocket.send_json, as bytes when binary frames are enabled"""
+        text = json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+        return text.encode("utf-8") if settings.ws_binary_frames else text
+    
+    def _make_frame(self, message: Dict) -> _Frame:
+        payload = self._encode(message)
+        size = len(payload) if isinstance(payload, bytes) else len(payload.encode("utf-8"))
+        return _Frame(message["type"], payload, message["_timestamp"], size)
+    
+    def _split_subscribers(self, key: Tuple[str, str]) -> Tuple[List[WebSocket], List[WebSocket]]:
+        """(full-update subscribers, delta subscribers) of a symbol/timeframe"""
+        full, delta = [], []
+        for connection in self.subscribers.get(key, ()):
+            (delta if connection in self.delta_connections else full).append(connection)
+        return full, delta
+    
+    def _snapshot_message(self, key: Tuple[str, str, str]) -> Dict:
+        kind, symbol, timeframe = key
+        stream = self.delta_streams[key]
+        body = {"candle": stream.state} if kind == "candle" else stream.state
+        return {
+            "type": f"{kind}:snapshot",
+            **body,
             "symbol": symbol,
             "timeframe": timeframe,
-            "candle": candle,
-            "_timestamp": time.time(),  # Track when message was created
-            "_sequence": self._get_sequence_number()  # Sequence number for ordering
+            "_timestamp": stream.created_at,
+            "_sequence": stream.sequence,
         }
+    
+    def _snapshot_item(self, key: Tuple[str, str, str]) -> Any:
+        """Snapshot of a stream as a queue item (frame encoded once per stream state)"""
+        if settings.ws_connection_metadata:
+            return self._snapshot_message(key)
+        stream = self.delta_streams[key]
+        if stream.snapshot is None:
+            stream.snapshot = self._make_frame(self._snapshot_message(key))
+        return stream.snapshot
+    
+    def _advance_stream(self, kind: str, symbol: str, timeframe: str, state: Dict, base: Dict, diff: bool) -> Optional[Dict]:
+        """
+        Record the new state of a delta stream.
         
-        disconnected = set()
-        for connection in self.active_connections:
-            sub = self.subscriptions.get(connection, {})
-            if sub.get("symbol") == symbol and sub.get("timeframe") == timeframe:
-                queue = self.message_queues.get(connection)
-                if queue:
-                    try:
-                        # Create connection-specific message copy with connection metadata
-                        message = base_message.copy()
-                        if connection in self.connection_metadata:
-                            meta = self.connection_metadata[connection]
-                            message["_connection_age_ms"] = round(
-                                (time.time() - meta["connected_at"]) * 1000, 2
-                            )
-                        
-                        queue.put_nowait(message)
-                    except asyncio.QueueFull:
-                        logger.warning(f"Message queue full for {connection}, dropping message")
-                        disconnected.add(connection)
-                else:
-                    disconnected.add(connection)
+        Returns:
+            Message for delta subscribers: a delta against the previous state,
+            a snapshot if there is nothing to diff against, None if nothing
+            changed or no diff was requested
+        """
+        key = (kind, symbol, timeframe)
+        previous = self.delta_streams.get(key)
+        changes = None
+        if diff and previous is not None:
+            changes = _diff_prediction(previous.state, state) if kind == "prediction" else _diff_candle(previous.state, state)
+            if changes is not None and not changes:
+                return None
         
-        # Clean up disconnected
-        for conn in disconnected:
-            self.disconnect(conn)
-    
-    async def broadcast_prediction(self, prediction: Dict):
-        """Broadcast prediction update with queuing, latency tracking, and sequence numbers"""
-        base_message = {
-            "type": "prediction:update",
-            **prediction,
-            "_timestamp": time.time(),  # Track when message was created
-            "_sequence": self._get_sequence_number()  # Sequence number for ordering
+        self.delta_streams[key] = _StreamState(state, base["_sequence"], base["_timestamp"])
+        if not diff:
+            return None
+        if changes is None:
+            return self._snapshot_message(key)
+        return {
+            "type": f"{kind}:delta",
+            "symbol": symbol,
+            "timeframe": timeframe,
+            **changes,
+            "_timestamp": base["_timestamp"],
+            "_sequence": base["_sequence"],
+            "_base_sequence": previous.sequence,
         }
+    
+    def _with_metadata(self, connection: WebSocket, message: Dict) -> Dict:
+        """Connection-specific copy of a message tagged with the connection age"""
+        message = message.copy()
+        meta = self.connection_metadata.get(connection)
+        if meta is not None:
+            message["_connection_age_ms"] = round(
+                (time.time() - meta["connected_at"]) * 1000, 2
+            )
+        return message
+    
+    def _fan_out(
+        self,
+        connections: Iterable[WebSocket],
+        message: Dict,
+        supersede: Optional[Callable[[], Any]] = None,
+    ):
+        """Queue a message for connections, conflating candle/prediction updates (see ConflatingQueue.put)"""
+        connections = list(connections)
+        message_type = message["type"]
+        record_websocket_broadcast(message_type, len(connections))
+        if not connections:
+            return
         
-        symbol = prediction.get("symbol")
-        timeframe = prediction.get("timeframe")
+        frame = None
+        if not settings.ws_connection_metadata:
+            try:
+                frame = self._make_frame(message)
+            except (TypeError, ValueError) as e:
+                logger.error(f"Could not encode {message_type} broadcast: {e}")
+                return
         
-        disconnected = set()
-        for connection in self.active_connections:
-            sub = self.subscriptions.get(connection, {})
-            if sub.get("symbol") == symbol and sub.get("timeframe") == timeframe:
-                queue = self.message_queues.get(connection)
-                if queue:
-                    try:
-                        # Create connection-specific message copy with connection metadata
-                        message = base_message.copy()
-                        if connection in self.connection_metadata:
-                            meta = self.connection_metadata[connection]
-                            message["_connection_age_ms"] = round(
-                                (time.time() - meta["connected_at"]) * 1000, 2
-                            )
-                        
-                        queue.put_nowait(message)
-                    except asyncio.QueueFull:
-                        logger.warning(f"Message queue full for {connection}, dropping message")
-                        disconnected.add(connection)
-                else:
-                    disconnected.add(connection)
+        conflate_key = None
+        if message_type in _CONFLATED_TYPES:
+            conflate_key = (message_type.split(":")[0], message.get("symbol"), message.get("timeframe"))
+        
+        disconnected = []
+        for connection in connections:
+            queue = self.message_queues.get(connection)
+            if queue is None:
+                disconnected.append(connection)
+                continue
+            item = frame if frame is not None else self._with_metadata(connection, message)
+            outcome = queue.put(item, conflate_key, supersede)
+            if outcome == "conflated":
+                record_websocket_conflated(message_type)
+            elif outcome == "full" and not self._handle_slow_consumer(connection, queue, item):
+                disconnected.append(connection)
         
         # Clean up disconnected
         for conn in disconnected:
             self.disconnect(conn)
     
+    def _handle_slow_consumer(self, connection: WebSocket, queue: ConflatingQueue, item: Any) -> bool:
+        """Apply ws_slow_consumer_policy to a full queue; False if the connection should be dropped"""
+        if settings.ws_slow_consumer_policy == "disconnect":
+            logger.warning(
+                f"Slow consumer {connection}: {queue.qsize()} messages pending, "
+                f"lag {queue.lag_seconds():.2f}s, disconnecting"
+            )
+            record_websocket_slow_consumer("disconnect")
+            return False
+        
+        queue.drop_oldest_event()
+        queue.put(item)
+        record_websocket_slow_consumer("drop_oldest")
+        if queue.dropped == 1 or queue.dropped % 100 == 0:
+            logger.warning(
+                f"Slow consumer {connection}: dropped {queue.dropped} events so far, "
+                f"lag {queue.lag_seconds():.2f}s"
+            )
+        return True
+    
+    def get_connection_stats(self):
+        """Per-connection backlog: pending messages, lag of the oldest, conflated/dropped counts"""
+        now = time.time()
+        stats = []
+        for connection in self.active_connections:
+            queue = self.message_queues.get(connection)
+            if queue is None:
+                continue
+            meta = self.connection_metadata.get(connection, {})
+            stats.append({
+                **self.subscriptions.get(connection, {}),
+                "pending": queue.qsize(),
+                "lag_ms": round(queue.lag_seconds(now) * 1000, 2),
+                "last_lag_ms": meta.get("last_lag_ms"),
+                "messages_sent": meta.get("messages_sent", 0),
+                "conflated": queue.conflated,
+                "dropped": queue.dropped,
+            })
+        return stats
+    
+    async def broadcast_candle(self, symbol: str, timeframe: str, candle: Dict):
+        """Broadcast candle update to the symbol/timeframe subscribers"""
+        await self._publish("candle:update", {
+            "symbol": symbol,
+            "timeframe": timeframe,
+            "candle": candle,
+        })
+    
+    async def broadcast_prediction(self, prediction: Dict):
+        """Broadcast prediction update to the symbol/timeframe subscribers"""
+        await self._publish("prediction:update", prediction)
+    
     async def broadcast_training_progress(self, progress_data: Dict):
-        """Broadcast training progress with latency tracking and sequence numbers"""
-        base_message = {
-            "type": "training:progress",
+        """Broadcast training progress to every connection"""
+        await self._publish("training:progress", {
             "timestamp": datetime.utcnow().isoformat(),
             **progress_data,
-            "_timestamp": time.time(),  # Track when message was created
-            "_sequence": self._get_sequence_number()  # Sequence number for ordering
-        }
+        })
+    
+    def _deliver_candle(self, message: Dict):
+        symbol, timeframe, candle = message["symbol"], message["timeframe"], message["candle"]
+        full, delta = self._split_subscribers((symbol, timeframe))
+        self._fan_out(full, message)
         
-        disconnected = set()
-        for connection in self.active_connections:
-            queue = self.message_queues.get(connection)
-            if queue:
-                try:
-                    # Create connection-specific message copy
-                    message = base_message.copy()
-                    if connection in self.connection_metadata:
-                        meta = self.connection_metadata[connection]
-                        message["_connection_age_ms"] = round(
-                            (time.time() - meta["connected_at"]) * 1000, 2
-                        )
-                    
-                    queue.put_nowait(message)
-                except asyncio.QueueFull:
-                    logger.warning(f"Message queue full for {connection}, dropping training progress")
-                    disconnected.add(connection)
-            else:
-                disconnected.add(connection)
+        stream_message = self._advance_stream("candle", symbol, timeframe, dict(candle), message, diff=bool(delta))
+        if stream_message is not None:
+            key = ("candle", symbol, timeframe)
+            self._fan_out(delta, stream_message, supersede=lambda: self._snapshot_item(key))
+    
+    def _deliver_prediction(self, message: Dict):
+        symbol, timeframe = message.get("symbol"), message.get("timeframe")
+        full, delta = self._split_subscribers((symbol, timeframe))
+        self._fan_out(full, message)
         
-        # Clean up disconnected
-        for conn in disconnected:
-            self.disconnect(conn)
+        omitted = {field.strip() for field in settings.ws_delta_omit_fields.split(",")}
+        omitted.update(("type", "_timestamp", "_sequence"))
+        state = {key: value for key, value in message.items() if key not in omitted}
+        stream_message = self._advance_stream("prediction", symbol, timeframe, state, message, diff=bool(delta))
+        if stream_message is not None:
+            key = ("prediction", symbol, timeframe)
+            self._fan_out(delta, stream_message, supersede=lambda: self._snapshot_item(key))
     
     async def broadcast_training_started(self, training_data: Dict):
         """Broadcast training started event"""
@@ -312,28 +693,10 @@ class ConnectionManager:
     
     async def broadcast_model_status_update(self, status_data: Dict):
         """Broadcast model status change (stale, fresh, etc.)"""
-        base_message = {
-            "type": "model:status_update",
+        await self._publish("model:status_update", {
             "timestamp": datetime.utcnow().isoformat(),
             **status_data,
-            "_timestamp": time.time(),
-            "_sequence": self._get_sequence_number()
-        }
-        
-        disconnected = set()
-        for connection in self.active_connections:
-            queue = self.message_queues.get(connection)
-            if queue:
-                try:
-                    queue.put_nowait(base_message.copy())
-                except asyncio.QueueFull:
-                    logger.warning(f"Message queue full for {connection}, dropping model status")
-                    disconnected.add(connection)
-            else:
-                disconnected.add(connection)
-        
-        for conn in disconnected:
-            self.disconnect(conn)
+        })
     
     def get_reconnect_delay(self, websocket: WebSocket) -> float:
         """
@@ -350,5 +713,5 @@ class ConnectionManager:
 
 
 # Singleton instance
-manager = ConnectionManager()
+manager = ConnectionManager(bus=broadcast_bus)
 
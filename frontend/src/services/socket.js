@@ -15,6 +15,9 @@ export class SocketService {
     this.reconnectAttempts = 0
     this.maxReconnectAttempts = 5
     this.reconnectDelay = 2000
+    // Delta streams: last full candle/prediction message per kind
+    this.streams = {}
+    this.resyncPending = false
   }
 
   /**
@@ -81,10 +84,15 @@ export class SocketService {
       return
     }
 
+    // Ask for snapshots + deltas; full candle/prediction messages are
+    // rebuilt here so listeners are unaffected
+    this.streams = {}
+    this.resyncPending = false
     const message = {
       action: 'subscribe',
       symbol,
-      timeframe
+      timeframe,
+      delta: true
     }
 
     this.ws.send(JSON.stringify(message))
@@ -136,7 +144,13 @@ export class SocketService {
   _handleMessage(message) {
     const type = message.type
 
-    if (type === 'candle:update') {
+    if (/^(candle|prediction):(snapshot|delta)$/.test(type)) {
+      const [kind, variant] = type.split(':')
+      const full = this._applyStream(kind, variant, message)
+      if (full) {
+        this._emit(`${kind}:update`, full)
+      }
+    } else if (type === 'candle:update') {
       this._emit('candle:update', message)
     } else if (type === 'prediction:update') {
       this._emit('prediction:update', message)
@@ -147,6 +161,56 @@ export class SocketService {
     }
   }
 
+  /**
+   * Apply a snapshot or delta to the stored stream state.
+   * Returns the full message, or null when a _sequence gap forced a resync.
+   */
+  _applyStream(kind, variant, message) {
+    const { _base_sequence, fields, removed_fields, series_upsert, series_remove, candle, ...meta } = message
+    let state
+
+    if (variant === 'snapshot') {
+      this.resyncPending = false
+      state = { ...message, type: `${kind}:update` }
+    } else {
+      const stream = this.streams[kind]
+      if (!stream || stream._sequence !== _base_sequence) {
+        this._resync()
+        return null
+      }
+      if (kind === 'candle') {
+        state = { ...stream, ...meta, type: 'candle:update', candle: { ...stream.candle, ...candle } }
+      } else {
+        state = { ...stream, ...fields, ...meta, type: 'prediction:update' }
+        for (const field of removed_fields || []) {
+          delete state[field]
+        }
+        const points = new Map((stream.predicted_series || []).map(point => [point.ts, point]))
+        for (const ts of series_remove || []) {
+          points.delete(ts)
+        }
+        for (const point of series_upsert || []) {
+          points.set(point.ts, point)
+        }
+        state.predicted_series = [...points.values()].sort((a, b) => Date.parse(a.ts) - Date.parse(b.ts))
+      }
+    }
+
+    this.streams[kind] = state
+    return state
+  }
+
+  /**
+   * Request fresh snapshots after a missed delta
+   */
+  _resync() {
+    if (this.resyncPending || !this.ws || this.ws.readyState !== WebSocket.OPEN) {
+      return
+    }
+    this.resyncPending = true
+    this.ws.send(JSON.stringify({ action: 'resync' }))
+  }
+
   /**
    * Emit event to listeners
    */